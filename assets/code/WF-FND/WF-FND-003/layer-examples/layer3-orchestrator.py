@@ -4,15 +4,18 @@ Core system orchestrator managing state, energy calculations, and 60Hz loop.
 """
 
 import asyncio
+import bisect
 import json
 import time
 import math
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Sequence
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 from collections import deque
 
+from rolling_correlation import RollingCorrelationMatrix  # Shared with the DECIPHER core (WF-FND-004)
+
 class EventType(Enum):
     TOKEN_STREAM = "TOKEN_STREAM"
     ENERGY_UPDATE = "ENERGY_UPDATE"
@@ -47,6 +50,45 @@ class SystemEvent:
     timestamp: float
     data: Dict[str, Any]
 
+class ModelTimeline:
+    """
+    Timestamp-sorted token events for one model.
+    
+    Tokens usually arrive in timestamp order, so append is O(1); late tokens
+    are placed with bisect. Expired events are dropped from the front.
+    """
+    
+    def __init__(self, max_events: int = 1000):
+        self.max_events = max_events
+        self.timestamps: List[float] = []
+        self.events: List[TokenEvent] = []
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def append(self, event: TokenEvent):
+        """Insert an event, keeping timestamps sorted"""
+        if not self.timestamps or event.timestamp >= self.timestamps[-1]:
+            self.timestamps.append(event.timestamp)
+            self.events.append(event)
+        else:
+            index = bisect.bisect_right(self.timestamps, event.timestamp)
+            self.timestamps.insert(index, event.timestamp)
+            self.events.insert(index, event)
+        
+        if len(self.timestamps) > self.max_events:
+            self._drop_front(len(self.timestamps) - self.max_events)
+    
+    def prune(self, cutoff: float):
+        """Drop events with timestamp <= cutoff"""
+        count = bisect.bisect_right(self.timestamps, cutoff)
+        if count:
+            self._drop_front(count)
+    
+    def _drop_front(self, count: int):
+        del self.timestamps[:count]
+        del self.events[:count]
+
 class Layer3_OrchestrationEnergy:
     """
     Layer 3: Orchestration & Energy Manager
@@ -72,7 +114,7 @@ class Layer3_OrchestrationEnergy:
                 "uptime": time.time()
             },
             "active_models": {},
-            "interference_buffer": deque(maxlen=1000)
+            "interference_buffer": {}  # model_name -> ModelTimeline
         }
         
         # Event publishing
@@ -96,6 +138,8 @@ class Layer3_OrchestrationEnergy:
         # Interference detection
         self.interference_window = 0.5  # 500ms window
         self.correlation_threshold = 0.7
+        self.energy_correlation = RollingCorrelationMatrix(window=30)  # 0.5s of frames
+        self.frame_model_energy: Dict[str, float] = {}
         
     async def start(self):
         """Start the 60Hz orchestration loop"""
@@ -121,6 +165,7 @@ class Layer3_OrchestrationEnergy:
                 
                 # Update energy calculations
                 self._update_energy_state()
+                self._record_energy_frame()
                 
                 # Detect interference patterns
                 self._detect_interference()
@@ -271,7 +316,10 @@ class Layer3_OrchestrationEnergy:
                 self._update_session_with_token(session_id, request_id, token_event)
                 
                 # Add to interference buffer
-                self.global_state["interference_buffer"].append(token_event)
+                self._buffer_interference_event(token_event)
+                self.frame_model_energy[token_event.model_name] = (
+                    self.frame_model_energy.get(token_event.model_name, 0.0) + energy
+                )
                 
                 # Emit token event
                 await self._emit_token_event(token_event)
@@ -341,23 +389,36 @@ class Layer3_OrchestrationEnergy:
             session["current_tps"] = current_tps
             session["last_update"] = now
     
+    def _record_energy_frame(self):
+        """Push this frame's per-model energy into the rolling correlation window"""
+        self.energy_correlation.update(self.frame_model_energy)
+        self.frame_model_energy = {}
+    
+    def _buffer_interference_event(self, token_event: TokenEvent):
+        """Add a token event to its model's timeline"""
+        timelines = self.global_state["interference_buffer"]
+        timeline = timelines.get(token_event.model_name)
+        if timeline is None:
+            timeline = timelines[token_event.model_name] = ModelTimeline()
+        timeline.append(token_event)
+    
     def _detect_interference(self):
         """Detect interference patterns between model streams"""
-        if len(self.global_state["interference_buffer"]) < 2:
+        timelines = self.global_state["interference_buffer"]
+        if len(timelines) < 2:
             return
         
-        now = time.time()
-        window_events = [
-            event for event in self.global_state["interference_buffer"]
-            if now - event.timestamp < self.interference_window
-        ]
-        
-        # Group by model
+        # Expire events outside the window; what remains is already grouped by model
+        cutoff = time.time() - self.interference_window
         model_streams = {}
-        for event in window_events:
-            if event.model_name not in model_streams:
-                model_streams[event.model_name] = []
-            model_streams[event.model_name].append(event)
+        for model_name, timeline in list(timelines.items()):
+            timeline.prune(cutoff)
+            if timeline:
+                model_streams[model_name] = timeline.timestamps
+            else:
+                # Model has gone quiet; release its correlation column too
+                del timelines[model_name]
+                self.energy_correlation.remove_stream(model_name)
         
         # Check for simultaneous tokens (constructive interference)
         if len(model_streams) >= 2:
@@ -371,22 +432,28 @@ class Layer3_OrchestrationEnergy:
                     
                     if abs(correlation) > self.correlation_threshold:
                         asyncio.create_task(self._emit_interference_event(
-                            models[i], models[j], correlation
+                            models[i], models[j], correlation,
+                            self.energy_correlation.correlation(models[i], models[j])
                         ))
     
-    def _calculate_stream_correlation(self, stream1: List[TokenEvent], stream2: List[TokenEvent]) -> float:
-        """Calculate correlation between two token streams"""
-        if not stream1 or not stream2:
+    def _calculate_stream_correlation(self, times1: Sequence[float], times2: Sequence[float]) -> float:
+        """Calculate timing correlation between two sorted timestamp sequences"""
+        if not times1 or not times2:
             return 0.0
         
-        # Simple timing correlation
-        time_diffs = []
-        for event1 in stream1:
-            closest_event2 = min(stream2, key=lambda e: abs(e.timestamp - event1.timestamp))
-            time_diff = abs(event1.timestamp - closest_event2.timestamp)
-            time_diffs.append(time_diff)
-        
-        avg_diff = sum(time_diffs) / len(time_diffs)
+        # Nearest-neighbour match by merging the two sorted sequences
+        last = len(times2) - 1
+        j = 0
+        total_diff = 0.0
+        for t in times1:
+            while j < last and times2[j + 1] <= t:
+                j += 1
+            diff = abs(t - times2[j])
+            if j < last:
+                diff = min(diff, times2[j + 1] - t)
+            total_diff += diff
+        
+        avg_diff = total_diff / len(times1)
         correlation = max(0, 1.0 - (avg_diff / 0.1))  # 100ms tolerance
         
         return correlation
@@ -443,7 +510,8 @@ class Layer3_OrchestrationEnergy:
         )
         await self.event_queue.put(event)
     
-    async def _emit_interference_event(self, model1: str, model2: str, correlation: float):
+    async def _emit_interference_event(self, model1: str, model2: str, correlation: float,
+                                       energy_correlation: float = 0.0):
         """Emit interference pattern detection"""
         pattern = "constructive" if correlation > 0 else "destructive"
         
@@ -455,6 +523,7 @@ class Layer3_OrchestrationEnergy:
                 "pattern": pattern,
                 "models": [model1, model2],
                 "correlation": correlation,
+                "energyCorrelation": energy_correlation,
                 "strength": abs(correlation)
             }
         )
@@ -0,0 +1,73 @@
+"""
+DECIPHER Adaptive Controller
+Load tracking and quality level for graceful degradation under frame pressure
+
+Shared by the DECIPHER frame loop (WF-FND-004) and the Decipher real-time loop
+(WF-TECH-005), which scales its particle budget with the quality level.
+"""
+
+from collections import deque
+from typing import Dict
+
+
+class AdaptiveController:
+    """Adaptive performance controller for dynamic load management"""
+    
+    def __init__(self):
+        self.load_history = deque(maxlen=60)  # 1 second of history
+        self.overrun_count = 0
+        self.skip_recommendations = {}
+        self.quality_level = 1.0  # 0.0 to 1.0
+    
+    def update_load(self, frame_duration_ms: float, budget_ms: float):
+        """Update load metrics"""
+        load_ratio = frame_duration_ms / budget_ms
+        self.load_history.append(load_ratio)
+        
+        if frame_duration_ms > budget_ms:
+            self.overrun_count += 1
+    
+    def get_skip_recommendations(self) -> Dict[str, bool]:
+        """Get task skip recommendations based on current load"""
+        if len(self.load_history) < 10:
+            return {}
+        
+        avg_load = sum(self.load_history) / len(self.load_history)
+        recent_load = sum(list(self.load_history)[-5:]) / 5
+        
+        recommendations = {}
+        
+        # Skip low priority tasks if consistently over budget
+        if avg_load > 1.1:
+            recommendations.update({
+                "pattern_analysis": True,
+                "detailed_metrics": True,
+                "history_cleanup": True
+            })
+        
+        # Skip medium priority tasks if recent overruns
+        if recent_load > 1.2:
+            recommendations.update({
+                "state_persistence": True,
+                "extended_validation": True
+            })
+        
+        # Emergency skipping for critical overruns
+        if recent_load > 1.5:
+            recommendations.update({
+                "all_optional": True
+            })
+        
+        return recommendations
+    
+    def update_quality_level(self):
+        """Update quality level based on performance"""
+        if len(self.load_history) < 10:
+            return
+        
+        avg_load = sum(self.load_history) / len(self.load_history)
+        
+        if avg_load < 0.7:
+            self.quality_level = min(1.0, self.quality_level + 0.01)
+        elif avg_load > 1.1:
+            self.quality_level = max(0.3, self.quality_level - 0.02)
@@ -9,14 +9,18 @@ AI token stream processing with energy metaphor visualization.
 import asyncio
 import time
 import json
-import threading
 from typing import Dict, List, Optional, Callable, Any
 from dataclasses import dataclass, asdict
 from collections import deque
 from enum import Enum
+from itertools import islice
 import logging
 import uuid
 
+import numpy as np
+
+from rolling_correlation import RollingCorrelationMatrix
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,72 +89,288 @@ class EMAFilter:
             self.value = self.alpha * new_value + (1 - self.alpha) * self.value
         return self.value
 
-class TokenQueue:
-    """Thread-safe token queue with backpressure management"""
+@dataclass
+class TokenRecords:
+    """
+    Struct-of-arrays view of drained token batches.
+    
+    Arrays are views into the ring buffer's drain buffers and are only valid
+    until the next drain call.
+    """
+    timestamp: np.ndarray
+    stream_index: np.ndarray
+    model_index: np.ndarray
+    token_count: np.ndarray
+    complexity: np.ndarray
+    speed: np.ndarray
+    metadata: List[Optional[Dict[str, Any]]]
+    stream_ids: List[str]  # stream_index -> stream id
+    model_ids: List[str]   # model_index -> model id
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    def to_batches(self) -> List[TokenBatch]:
+        """Materialize records as TokenBatch objects"""
+        return [
+            TokenBatch(
+                timestamp=timestamp,
+                stream_id=self.stream_ids[stream_idx],
+                model_id=self.model_ids[model_idx],
+                token_count=token_count,
+                complexity=complexity,
+                speed=speed,
+                metadata=metadata if metadata is not None else {}
+            )
+            for timestamp, stream_idx, model_idx, token_count, complexity, speed, metadata in zip(
+                self.timestamp.tolist(), self.stream_index.tolist(), self.model_index.tolist(),
+                self.token_count.tolist(), self.complexity.tolist(), self.speed.tolist(),
+                self.metadata
+            )
+        ]
+
+class TokenRingBuffer:
+    """
+    Lock-free single-producer/single-consumer ring of token batch records.
+    
+    Records live in preallocated struct-of-arrays storage. The producer only
+    advances the head and the consumer only advances the tail, so neither side
+    needs a lock as long as there is one producer thread (Layer 2 ingestion or
+    the event loop) and one consumer (the frame loop).
+    
+    Every record carries the sequence number of the batch it belongs to. A
+    batch that can be merged with the previous one on overflow is appended as
+    an extra record with the same sequence number and folded into it at drain
+    time, so the producer never rewrites a queued record to merge. Dropping
+    the oldest batches is applied by the consumer, which only delivers the
+    newest max_size batches it finds.
+    
+    If the consumer stalls until the ring is physically full, the producer
+    overwrites the oldest record so the freshest tokens are kept. It marks the
+    record lost before rewriting the slot, and the consumer discards any copy
+    of a record that was marked lost while it was draining.
+    """
+    
+    MERGE_WINDOW = 0.1  # seconds between batches of a stream eligible for merging
     
     def __init__(self, max_size: int = 1000):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
         self.max_size = max_size
-        self.queue = deque()
-        self.lock = threading.Lock()
-        self.overflow_count = 0
+        # Merge records take physical slots too, so keep headroom for them
+        self.capacity = 2 * max_size
+        
+        self._timestamp = np.zeros(self.capacity, dtype=np.float64)
+        self._stream_index = np.zeros(self.capacity, dtype=np.int32)
+        self._model_index = np.zeros(self.capacity, dtype=np.int32)
+        self._token_count = np.zeros(self.capacity, dtype=np.int64)
+        self._complexity = np.zeros(self.capacity, dtype=np.float64)
+        self._speed = np.zeros(self.capacity, dtype=np.float64)
+        self._batch_seq = np.zeros(self.capacity, dtype=np.int64)
+        self._metadata: List[Optional[Dict[str, Any]]] = [None] * self.capacity
+        
+        # Id tables are append-only, so the consumer can index them safely
+        self.stream_ids: List[str] = []
+        self.model_ids: List[str] = []
+        self._stream_lookup: Dict[str, int] = {}
+        self._model_lookup: Dict[str, int] = {}
+        
+        # Producer-owned positions and counters
+        self._head = 0           # physical records written
+        self._logical_head = 0   # batches queued (merge records excluded)
+        self._lost_upto = 0      # records before this position were overwritten
+        self._last_stream = -1
+        self._last_timestamp = 0.0
+        self.overflow_count = 0   # batches pushed out of the queue by newer ones
         self.merge_count = 0
+        self.overwrite_count = 0  # records overwritten while the consumer stalled
+        
+        # Consumer-owned positions and counters
+        self._tail = 0
+        self._logical_tail = 0
+        self.dropped_tokens = 0   # tokens in batches skipped because newer batches filled the queue
+        
+        # Consumer-owned drain buffers
+        self._out_timestamp = np.zeros(self.capacity, dtype=np.float64)
+        self._out_stream_index = np.zeros(self.capacity, dtype=np.int32)
+        self._out_model_index = np.zeros(self.capacity, dtype=np.int32)
+        self._out_token_count = np.zeros(self.capacity, dtype=np.int64)
+        self._out_complexity = np.zeros(self.capacity, dtype=np.float64)
+        self._out_speed = np.zeros(self.capacity, dtype=np.float64)
+        self._out_batch_seq = np.zeros(self.capacity, dtype=np.int64)
     
     def enqueue(self, batch: TokenBatch) -> bool:
         """Add token batch to queue with overflow protection"""
-        with self.lock:
-            if len(self.queue) >= self.max_size:
-                # Emergency merge or drop
-                if len(self.queue) > 0:
-                    last_batch = self.queue[-1]
-                    if (last_batch.stream_id == batch.stream_id and 
-                        batch.timestamp - last_batch.timestamp < 0.1):
-                        # Merge with last batch
-                        merged = self._merge_batches(last_batch, batch)
-                        self.queue[-1] = merged
-                        self.merge_count += 1
-                        return True
-                
-                # Drop oldest if no merge possible
-                self.queue.popleft()
+        return self.push(batch.timestamp, batch.stream_id, batch.model_id,
+                         batch.token_count, batch.complexity, batch.speed,
+                         batch.metadata)
+    
+    def push(self, timestamp: float, stream_id: str, model_id: str, token_count: int,
+             complexity: float, speed: float, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Append a token batch record without allocating a TokenBatch"""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            # Consumer has stalled long enough to fill the headroom. Publish the
+            # loss before rewriting the slot so a concurrent drain discards it.
+            self._lost_upto = head - self.capacity + 1
+            self.overwrite_count += 1
+        
+        stream_idx = self._stream_lookup.get(stream_id)
+        if stream_idx is None:
+            stream_idx = self._stream_lookup[stream_id] = len(self.stream_ids)
+            self.stream_ids.append(stream_id)
+        model_idx = self._model_lookup.get(model_id)
+        if model_idx is None:
+            model_idx = self._model_lookup[model_id] = len(self.model_ids)
+            self.model_ids.append(model_id)
+        
+        coalesce = False
+        if self._logical_head - self._logical_tail >= self.max_size:
+            if (self._last_stream == stream_idx and
+                    timestamp - self._last_timestamp < self.MERGE_WINDOW):
+                # Emergency merge with the previous batch
+                coalesce = True
+                self.merge_count += 1
+            else:
+                # The oldest batch falls out of the queue; the consumer skips it
                 self.overflow_count += 1
-            
-            self.queue.append(batch)
-            return True
+        
+        slot = head % self.capacity
+        self._timestamp[slot] = timestamp
+        self._stream_index[slot] = stream_idx
+        self._model_index[slot] = model_idx
+        self._token_count[slot] = token_count
+        self._complexity[slot] = complexity
+        self._speed[slot] = speed
+        self._batch_seq[slot] = self._logical_head - 1 if coalesce else self._logical_head
+        self._metadata[slot] = metadata
+        
+        self._last_stream = stream_idx
+        self._last_timestamp = timestamp
+        if not coalesce:
+            self._logical_head += 1
+        # Publishing the head makes the record visible to the consumer
+        self._head = head + 1
+        return True
+    
+    def drain_records(self, max_items: int = None) -> TokenRecords:
+        """Drain up to max_items of the newest max_size batches as NumPy views"""
+        head = self._head
+        start = max(self._tail, self._lost_upto)
+        count = head - start
+        cap = self.capacity
+        
+        # Copy the published range into the drain buffers (at most two segments)
+        first = start % cap
+        first_len = min(count, cap - first)
+        sources = (self._timestamp, self._stream_index, self._model_index,
+                   self._token_count, self._complexity, self._speed, self._batch_seq)
+        buffers = (self._out_timestamp, self._out_stream_index, self._out_model_index,
+                   self._out_token_count, self._out_complexity, self._out_speed,
+                   self._out_batch_seq)
+        for src, dst in zip(sources, buffers):
+            dst[:first_len] = src[first:first + first_len]
+            dst[first_len:count] = src[:count - first_len]
+        metadata = self._metadata[first:first + first_len] + self._metadata[:count - first_len]
+        
+        # Records the producer overwrote while they were being copied
+        lost = min(count, max(0, self._lost_upto - start))
+        
+        # Group records by batch; records of a batch drained on an earlier
+        # frame form a group of their own
+        seq = self._out_batch_seq[lost:count]
+        if len(seq):
+            group_starts = lost + np.flatnonzero(np.diff(seq, prepend=seq[0] - 1))
+            # Only the newest max_size batches are still queued
+            first_group = int(np.searchsorted(self._out_batch_seq[group_starts],
+                                              seq[-1] + 1 - self.max_size))
+        else:
+            group_starts = np.zeros(0, dtype=np.intp)
+            first_group = 0
+        skipped_end = int(group_starts[first_group]) if len(group_starts) else count
+        
+        last_group = len(group_starts)
+        if max_items is not None:
+            last_group = min(last_group, first_group + max_items)
+        consumed = int(group_starts[last_group]) if last_group < len(group_starts) else count
+        
+        batch_starts = group_starts[first_group:last_group]
+        records = self._fold_groups(batch_starts, consumed, metadata)
+        
+        # Publishing the tail hands the slots back to the producer
+        self.dropped_tokens += int(self._out_token_count[lost:skipped_end].sum())
+        if consumed > lost:
+            self._logical_tail = int(self._out_batch_seq[consumed - 1]) + 1
+        self._tail = start + consumed
+        return records
+    
+    def _fold_groups(self, batch_starts: np.ndarray, end: int,
+                     metadata: List[Optional[Dict[str, Any]]]) -> TokenRecords:
+        """Fold merge records into their batches in place in the drain buffers"""
+        n = len(batch_starts)
+        merged = n and (end - batch_starts[0] != n)
+        
+        if not merged:
+            offset = int(batch_starts[0]) if n else 0
+            view = slice(offset, offset + n)
+            return TokenRecords(
+                timestamp=self._out_timestamp[view],
+                stream_index=self._out_stream_index[view],
+                model_index=self._out_model_index[view],
+                token_count=self._out_token_count[view],
+                complexity=self._out_complexity[view],
+                speed=self._out_speed[view],
+                metadata=metadata[view],
+                stream_ids=self.stream_ids,
+                model_ids=self.model_ids
+            )
+        
+        lo = int(batch_starts[0])
+        rel = batch_starts - lo
+        token_count = self._out_token_count[lo:end]
+        weighted = np.add.reduceat(self._out_complexity[lo:end] * token_count, rel)
+        totals = np.add.reduceat(token_count, rel)
+        speed = np.maximum.reduceat(self._out_speed[lo:end], rel)
+        group_ends = np.append(batch_starts[1:], end)
+        
+        merged_metadata = []
+        for start, stop in zip(batch_starts.tolist(), group_ends.tolist()):
+            combined: Dict[str, Any] = {}
+            for m in metadata[start:stop]:
+                if m:
+                    combined.update(m)
+            merged_metadata.append(combined)
+        
+        # Results are written over the leading slots of the drain buffers
+        self._out_timestamp[:n] = self._out_timestamp[group_ends - 1]
+        self._out_stream_index[:n] = self._out_stream_index[batch_starts]
+        self._out_model_index[:n] = self._out_model_index[batch_starts]
+        self._out_token_count[:n] = totals
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._out_complexity[:n] = np.where(
+                totals > 0, weighted / np.maximum(totals, 1), self._out_complexity[batch_starts]
+            )
+        self._out_speed[:n] = speed
+        
+        return TokenRecords(
+            timestamp=self._out_timestamp[:n],
+            stream_index=self._out_stream_index[:n],
+            model_index=self._out_model_index[:n],
+            token_count=self._out_token_count[:n],
+            complexity=self._out_complexity[:n],
+            speed=self._out_speed[:n],
+            metadata=merged_metadata,
+            stream_ids=self.stream_ids,
+            model_ids=self.model_ids
+        )
     
     def drain(self, max_items: int = None) -> List[TokenBatch]:
         """Drain items from queue"""
-        with self.lock:
-            if max_items is None:
-                items = list(self.queue)
-                self.queue.clear()
-            else:
-                items = []
-                for _ in range(min(max_items, len(self.queue))):
-                    items.append(self.queue.popleft())
-            return items
+        return self.drain_records(max_items).to_batches()
     
     def size(self) -> int:
         """Get current queue size"""
-        with self.lock:
-            return len(self.queue)
-    
-    def _merge_batches(self, batch1: TokenBatch, batch2: TokenBatch) -> TokenBatch:
-        """Merge two token batches"""
-        total_tokens = batch1.token_count + batch2.token_count
-        weighted_complexity = (
-            (batch1.complexity * batch1.token_count + 
-             batch2.complexity * batch2.token_count) / total_tokens
-        )
-        
-        return TokenBatch(
-            timestamp=batch2.timestamp,
-            stream_id=batch1.stream_id,
-            model_id=batch1.model_id,
-            token_count=total_tokens,
-            complexity=weighted_complexity,
-            speed=max(batch1.speed, batch2.speed),
-            metadata={**batch1.metadata, **batch2.metadata}
-        )
+        return max(0, min(self.max_size, self._logical_head - self._logical_tail))
 
 class EnergyCalculator:
     """Energy calculation engine implementing WF-FND-002 formulas"""
@@ -170,17 +390,23 @@ class EnergyCalculator:
     
     def calculate_energy(self, batch: TokenBatch) -> float:
         """Calculate energy for token batch"""
+        return self.calculate_record_energy(batch.model_id, batch.token_count,
+                                            batch.complexity, batch.speed)
+    
+    def calculate_record_energy(self, model_id: str, token_count: int,
+                                complexity: float, speed: float) -> float:
+        """Calculate energy from the fields of a token batch record"""
         # Base energy calculation
-        base_eu = self.BASE_ENERGY * batch.token_count
+        base_eu = self.BASE_ENERGY * token_count
         
         # Apply complexity factor (0.1 - 10.0)
-        complexity_factor = max(0.1, min(10.0, batch.complexity))
+        complexity_factor = max(0.1, min(10.0, complexity))
         
         # Apply speed multiplier (higher speed = more energy)
-        speed_multiplier = 1.0 + (batch.speed / 100.0)  # Normalize speed
+        speed_multiplier = 1.0 + (speed / 100.0)  # Normalize speed
         
         # Apply model size factor
-        model_factor = self.model_factors.get(batch.model_id, 1.0)
+        model_factor = self.model_factors.get(model_id, 1.0)
         
         # Calculate final energy
         energy = base_eu * complexity_factor * speed_multiplier * model_factor
@@ -195,6 +421,16 @@ class PatternDetector:
         self.stream_history = {}
         self.interference_threshold = 0.7
         self.resonance_threshold = 5.0
+        self.correlations = RollingCorrelationMatrix(window=30)
+    
+    def record_frame(self, stream_energies: Dict[str, float]):
+        """Add one frame of per-stream energy to the rolling correlation window"""
+        if self.ux_level.value < 2:
+            return
+        self.correlations.update(stream_energies)
+        # A stream idle for the whole window only holds zeros; free its column
+        for stream_id in self.correlations.idle_streams(self.correlations.window):
+            self.correlations.remove_stream(stream_id)
     
     def analyze_patterns(self, streams: Dict[str, List[float]]) -> List[Dict]:
         """Analyze patterns across multiple streams"""
@@ -219,34 +455,21 @@ class PatternDetector:
     
     def _detect_interference(self, streams: Dict[str, List[float]]) -> Optional[Dict]:
         """Detect interference patterns between streams"""
-        stream_ids = list(streams.keys())
-        if len(stream_ids) < 2:
+        if len(streams) < 2:
             return None
         
-        # Simple correlation-based interference detection
-        correlations = []
-        for i in range(len(stream_ids)):
-            for j in range(i + 1, len(stream_ids)):
-                stream_a = streams[stream_ids[i]]
-                stream_b = streams[stream_ids[j]]
-                
-                if len(stream_a) >= 5 and len(stream_b) >= 5:
-                    correlation = self._calculate_correlation(stream_a[-5:], stream_b[-5:])
-                    correlations.append({
-                        'streams': [stream_ids[i], stream_ids[j]],
-                        'correlation': correlation
-                    })
-        
-        # Check for strong correlation (interference)
-        for corr in correlations:
-            if abs(corr['correlation']) > self.interference_threshold:
-                pattern_type = "constructive" if corr['correlation'] > 0 else "destructive"
-                return {
-                    'type': EventType.INTERFERENCE.value,
-                    'pattern': pattern_type,
-                    'strength': abs(corr['correlation']),
-                    'streams': corr['streams']
-                }
+        # Correlation over frame-aligned energy, maintained incrementally
+        for stream_a, stream_b, correlation in self.correlations.pairs_above(
+                self.interference_threshold):
+            if stream_a not in streams or stream_b not in streams:
+                continue
+            pattern_type = "constructive" if correlation > 0 else "destructive"
+            return {
+                'type': EventType.INTERFERENCE.value,
+                'pattern': pattern_type,
+                'strength': abs(correlation),
+                'streams': [stream_a, stream_b]
+            }
         
         return None
     
@@ -257,7 +480,7 @@ class PatternDetector:
         
         # Simple sustained high-energy detection
         total_energy = sum(
-            sum(stream[-10:]) if len(stream) >= 10 else sum(stream)
+            sum(islice(reversed(stream), 10))
             for stream in streams.values()
         )
         
@@ -271,23 +494,6 @@ class PatternDetector:
             }
         
         return None
-    
-    def _calculate_correlation(self, series_a: List[float], series_b: List[float]) -> float:
-        """Calculate correlation between two series"""
-        if len(series_a) != len(series_b) or len(series_a) == 0:
-            return 0.0
-        
-        mean_a = sum(series_a) / len(series_a)
-        mean_b = sum(series_b) / len(series_b)
-        
-        numerator = sum((a - mean_a) * (b - mean_b) for a, b in zip(series_a, series_b))
-        
-        sum_sq_a = sum((a - mean_a) ** 2 for a in series_a)
-        sum_sq_b = sum((b - mean_b) ** 2 for b in series_b)
-        
-        denominator = (sum_sq_a * sum_sq_b) ** 0.5
-        
-        return numerator / denominator if denominator != 0 else 0.0
 
 class DecipherCore:
     """Main DECIPHER engine - Layer 3 central compiler"""
@@ -301,7 +507,7 @@ class DecipherCore:
         self.frame_sequence = 0
         
         # Core components
-        self.token_queue = TokenQueue()
+        self.token_queue = TokenRingBuffer()
         self.energy_calculator = EnergyCalculator()
         self.pattern_detector = PatternDetector(ux_level)
         self.ema_filter = EMAFilter(alpha=0.1)
@@ -330,18 +536,9 @@ class DecipherCore:
     def ingest_tokens(self, stream_id: str, model_id: str, token_count: int, 
                      complexity: float = 1.0, speed: float = 50.0, 
                      metadata: Dict = None) -> bool:
-        """Ingest tokens from Layer 2"""
-        batch = TokenBatch(
-            timestamp=time.time(),
-            stream_id=stream_id,
-            model_id=model_id,
-            token_count=token_count,
-            complexity=complexity,
-            speed=speed,
-            metadata=metadata or {}
-        )
-        
-        return self.token_queue.enqueue(batch)
+        """Ingest tokens from Layer 2 (single producer thread)"""
+        return self.token_queue.push(time.time(), stream_id, model_id, token_count,
+                                     complexity, speed, metadata)
     
     async def start(self):
         """Start the DECIPHER engine"""
@@ -382,24 +579,37 @@ class DecipherCore:
         frame_id = f"frame_{self.frame_sequence}_{int(frame_start * 1000)}"
         
         # Step 1: Drain token queue (Priority 1)
-        batches = self.token_queue.drain(max_items=50)  # Limit batch size
+        records = self.token_queue.drain_records(max_items=50)  # Limit batch size
         
-        if not batches:
+        if not len(records):
             # No tokens to process, emit minimal update
+            self.pattern_detector.record_frame({})
             await self._emit_energy_event(frame_id, 0.0)
             return
         
         # Step 2: Calculate energy (Priority 1)
         total_energy = 0.0
-        tokens_processed = 0
-        
-        for batch in batches:
-            energy = self.energy_calculator.calculate_energy(batch)
+        tokens_processed = int(records.token_count.sum())
+        stream_ids = records.stream_ids
+        model_ids = records.model_ids
+        calculate = self.energy_calculator.calculate_record_energy
+        frame_energy: Dict[str, float] = {}
+        
+        for timestamp, stream_idx, model_idx, token_count, complexity, speed in zip(
+                records.timestamp.tolist(), records.stream_index.tolist(),
+                records.model_index.tolist(), records.token_count.tolist(),
+                records.complexity.tolist(), records.speed.tolist()):
+            model_id = model_ids[model_idx]
+            energy = calculate(model_id, token_count, complexity, speed)
             total_energy += energy
-            tokens_processed += batch.token_count
+            stream_id = stream_ids[stream_idx]
+            frame_energy[stream_id] = frame_energy.get(stream_id, 0.0) + energy
             
             # Update stream registry
-            self._update_stream_registry(batch, energy)
+            self._update_stream_registry(stream_id, model_id,
+                                         timestamp, token_count, energy)
+        
+        self.pattern_detector.record_frame(frame_energy)
         
         # Step 3: Update energy state (Priority 2)
         self.energy_state.current = total_energy
@@ -434,22 +644,21 @@ class DecipherCore:
         # Update performance metrics
         self._update_performance_metrics(tokens_processed, frame_start)
     
-    def _update_stream_registry(self, batch: TokenBatch, energy: float):
+    def _update_stream_registry(self, stream_id: str, model_id: str, timestamp: float,
+                                token_count: int, energy: float):
         """Update stream registry and history"""
-        stream_id = batch.stream_id
-        
         # Update registry
         if stream_id not in self.stream_registry:
             self.stream_registry[stream_id] = {
-                'model_id': batch.model_id,
-                'created': batch.timestamp,
+                'model_id': model_id,
+                'created': timestamp,
                 'token_count': 0,
                 'energy_contribution': 0.0
             }
         
-        self.stream_registry[stream_id]['token_count'] += batch.token_count
+        self.stream_registry[stream_id]['token_count'] += token_count
         self.stream_registry[stream_id]['energy_contribution'] += energy
-        self.stream_registry[stream_id]['last_activity'] = batch.timestamp
+        self.stream_registry[stream_id]['last_activity'] = timestamp
         
         # Update history for pattern detection
         if stream_id not in self.stream_history:
@@ -483,7 +692,7 @@ class DecipherCore:
                 'peak': self.energy_state.peak
             },
             'tokens': {
-                'count': len(self.token_queue.drain(0)),  # Current queue size
+                'count': self.token_queue.size(),  # Current queue size
                 'rate': self.performance_metrics['throughput']
             },
             'metadata': {
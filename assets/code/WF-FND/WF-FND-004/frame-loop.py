@@ -7,6 +7,8 @@ degradation under load to maintain 16.67ms frame budget compliance.
 """
 
 import asyncio
+import os
+import sys
 import time
 import threading
 from typing import Dict, List, Callable, Optional, Any
@@ -15,6 +17,14 @@ from enum import Enum
 import logging
 from collections import deque
 
+try:
+    from adaptive_controller import AdaptiveController
+    from frame_scheduler import FrameScheduler, MissedFramePolicy
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from adaptive_controller import AdaptiveController
+    from frame_scheduler import FrameScheduler, MissedFramePolicy
+
 logger = logging.getLogger(__name__)
 
 class TaskPriority(Enum):
@@ -54,73 +64,12 @@ class FrameMetrics:
     tasks_skipped: List[str]
     overrun_ms: float = 0.0
 
-class AdaptiveController:
-    """Adaptive performance controller for dynamic load management"""
-    
-    def __init__(self):
-        self.load_history = deque(maxlen=60)  # 1 second of history
-        self.overrun_count = 0
-        self.skip_recommendations = {}
-        self.quality_level = 1.0  # 0.0 to 1.0
-    
-    def update_load(self, frame_duration_ms: float, budget_ms: float):
-        """Update load metrics"""
-        load_ratio = frame_duration_ms / budget_ms
-        self.load_history.append(load_ratio)
-        
-        if frame_duration_ms > budget_ms:
-            self.overrun_count += 1
-    
-    def get_skip_recommendations(self) -> Dict[str, bool]:
-        """Get task skip recommendations based on current load"""
-        if len(self.load_history) < 10:
-            return {}
-        
-        avg_load = sum(self.load_history) / len(self.load_history)
-        recent_load = sum(list(self.load_history)[-5:]) / 5
-        
-        recommendations = {}
-        
-        # Skip low priority tasks if consistently over budget
-        if avg_load > 1.1:
-            recommendations.update({
-                "pattern_analysis": True,
-                "detailed_metrics": True,
-                "history_cleanup": True
-            })
-        
-        # Skip medium priority tasks if recent overruns
-        if recent_load > 1.2:
-            recommendations.update({
-                "state_persistence": True,
-                "extended_validation": True
-            })
-        
-        # Emergency skipping for critical overruns
-        if recent_load > 1.5:
-            recommendations.update({
-                "all_optional": True
-            })
-        
-        return recommendations
-    
-    def update_quality_level(self):
-        """Update quality level based on performance"""
-        if len(self.load_history) < 10:
-            return
-        
-        avg_load = sum(self.load_history) / len(self.load_history)
-        
-        if avg_load < 0.7:
-            self.quality_level = min(1.0, self.quality_level + 0.01)
-        elif avg_load > 1.1:
-            self.quality_level = max(0.3, self.quality_level - 0.02)
-
 class FrameLoop:
     """
     60Hz frame loop controller with adaptive performance management
     
     Maintains strict 16.67ms frame budget through:
+    - Absolute monotonic frame deadlines (no drift)
     - Priority-based task scheduling
     - Real-time budget monitoring
     - Adaptive task skipping
@@ -131,7 +80,7 @@ class FrameLoop:
     FRAME_BUDGET_MS = 16.67  # 1000ms / 60fps
     BUDGET_WARNING_THRESHOLD = 0.8  # 80% of budget
     
-    def __init__(self):
+    def __init__(self, missed_frame_policy: MissedFramePolicy = MissedFramePolicy.SKIP):
         self.running = False
         self.frame_sequence = 0
         self.start_time = 0.0
@@ -145,7 +94,7 @@ class FrameLoop:
         self.adaptive_controller = AdaptiveController()
         
         # Timing control
-        self.frame_timer = None
+        self.scheduler = FrameScheduler(self.TARGET_FPS, missed_frame_policy)
         self.last_frame_start = 0.0
         
         # Event callbacks
@@ -211,13 +160,16 @@ class FrameLoop:
     async def start(self):
         """Start the frame loop"""
         self.running = True
-        self.start_time = time.time()
+        self.scheduler.start()
+        self.start_time = self.scheduler.start_time
         self.last_frame_start = self.start_time
         
         logger.info(f"Frame loop starting - Target: {self.TARGET_FPS}Hz, Budget: {self.FRAME_BUDGET_MS:.2f}ms")
         
         while self.running:
-            frame_start = time.time()
+            # Sleep until the next absolute deadline (t0 + n * period)
+            tick = await self.scheduler.wait_next_frame()
+            frame_start = tick.start
             
             try:
                 await self._process_frame(frame_start)
@@ -225,13 +177,6 @@ class FrameLoop:
                 logger.error(f"Frame processing error: {e}")
                 await self._handle_frame_error(e)
             
-            # Calculate sleep time for next frame
-            frame_duration = time.time() - frame_start
-            sleep_time = max(0, (self.FRAME_BUDGET_MS / 1000) - frame_duration)
-            
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-            
             self.last_frame_start = frame_start
     
     async def _process_frame(self, frame_start: float):
@@ -283,7 +228,7 @@ class FrameLoop:
                     break
         
         # Finalize frame metrics
-        frame_end = time.time()
+        frame_end = time.perf_counter()
         metrics.end_time = frame_end
         metrics.duration_ms = (frame_end - frame_start) * 1000
         
@@ -324,7 +269,7 @@ class FrameLoop:
             return False
         
         # Check elapsed time vs remaining budget
-        elapsed_ms = (time.time() - frame_start) * 1000
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
         remaining_budget = self.FRAME_BUDGET_MS - elapsed_ms
         
         # Skip if not enough budget for estimated duration
@@ -348,7 +293,7 @@ class FrameLoop:
     async def _execute_task_with_timeout(self, task: FrameTask, frame_start: float):
         """Execute task with timeout protection"""
         # Calculate remaining budget
-        elapsed_ms = (time.time() - frame_start) * 1000
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
         remaining_budget_s = max(0.001, (self.FRAME_BUDGET_MS - elapsed_ms) / 1000)
         
         # Execute with timeout
@@ -398,10 +343,11 @@ class FrameLoop:
         logger.error(f"Frame error: {error}")
         
         # Create error metrics
+        now = time.perf_counter()
         error_metrics = FrameMetrics(
             sequence=self.frame_sequence,
-            start_time=time.time(),
-            end_time=time.time(),
+            start_time=now,
+            end_time=now,
             duration_ms=0.0,
             budget_ms=self.FRAME_BUDGET_MS,
             status=FrameStatus.ERROR,
@@ -454,6 +400,7 @@ class FrameLoop:
                 "p95_ms": percentile(durations, 95),
                 "p99_ms": percentile(durations, 99)
             },
+            "jitter": self.scheduler.get_jitter_report(),
             "overruns": {
                 "total": self.stats["overrun_frames"],
                 "recent": overrun_count,
@@ -0,0 +1,222 @@
+"""
+DECIPHER Frame Scheduler
+Drift-free 60Hz deadline scheduling on the monotonic clock
+
+Frames are released at absolute deadlines t0 + n·period measured with
+time.perf_counter_ns, so processing time and sleep overshoot never accumulate
+into drift and wall-clock steps (NTP) cannot produce negative or huge frames.
+Shared by the DECIPHER frame loop (WF-FND-004) and the Decipher real-time loop
+(WF-TECH-005).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+class MissedFramePolicy(Enum):
+    """What to do with frames whose deadline passed during an overrun"""
+    SKIP = "skip"           # Drop missed frames, resume at the latest passed deadline
+    CATCH_UP = "catch_up"   # Run missed frames back to back, up to max_catch_up
+
+
+@dataclass
+class FrameTick:
+    """Release information for one scheduled frame"""
+    index: int          # Position on the frame grid (deadline = t0 + index * period)
+    deadline_ns: int
+    start_ns: int
+    lateness_ns: int    # start_ns - deadline_ns
+    skipped: int        # Frames dropped right before this one
+    early: bool = False  # Released before its deadline by a wakeup event
+
+    @property
+    def start(self) -> float:
+        """Frame start on the perf_counter clock, in seconds"""
+        return self.start_ns / 1e9
+
+
+class JitterHistogram:
+    """
+    Fixed-size log-linear histogram of frame lateness in microseconds
+
+    Values below 32us get their own bucket; above that each power of two is
+    split into 16 buckets, so percentiles are within ~6% of the true value
+    and memory stays constant however long the loop runs.
+    """
+
+    LINEAR_BUCKETS = 32
+    SUB_BUCKETS = 16
+    MAX_SHIFT = 22  # Upper bucket edge ~134s
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (self.LINEAR_BUCKETS + self.MAX_SHIFT * self.SUB_BUCKETS)
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def _bucket(self, value_us: int) -> int:
+        if value_us < self.LINEAR_BUCKETS:
+            return value_us
+        shift = min(value_us.bit_length() - 5, self.MAX_SHIFT)
+        sub = min(value_us >> shift, 2 * self.SUB_BUCKETS - 1) - self.SUB_BUCKETS
+        return self.LINEAR_BUCKETS + (shift - 1) * self.SUB_BUCKETS + sub
+
+    def _bucket_upper(self, index: int) -> int:
+        if index < self.LINEAR_BUCKETS:
+            return index
+        shift, sub = divmod(index - self.LINEAR_BUCKETS, self.SUB_BUCKETS)
+        return ((sub + self.SUB_BUCKETS + 1) << (shift + 1)) - 1
+
+    def record(self, lateness_ns: int):
+        value_us = max(0, lateness_ns) // 1000
+        self.counts[self._bucket(value_us)] += 1
+        self.total += 1
+        self.sum_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the p-th percentile, in microseconds"""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(self.total * p / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(min(self._bucket_upper(index), self.max_us))
+        return float(self.max_us)
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "frames": self.total,
+            "mean_ms": (self.sum_us / self.total / 1000) if self.total else 0.0,
+            "p50_ms": self.percentile(50) / 1000,
+            "p95_ms": self.percentile(95) / 1000,
+            "p99_ms": self.percentile(99) / 1000,
+            "max_ms": self.max_us / 1000
+        }
+
+
+class FrameScheduler:
+    """
+    Absolute-deadline frame scheduler for asyncio loops
+
+    Usage:
+        scheduler.start()
+        while running:
+            tick = await scheduler.wait_next_frame()
+            ... process frame ...
+
+    Waiting is hybrid: a coarse asyncio.sleep until spin_threshold_ms before
+    the deadline, then asyncio.sleep(0) spin-yields so other tasks still run
+    while the loop closes in on the deadline.
+    """
+
+    def __init__(self, target_fps: float = 60.0,
+                 policy: MissedFramePolicy = MissedFramePolicy.SKIP,
+                 max_catch_up: int = 2, spin_threshold_ms: float = 1.5,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        if target_fps <= 0:
+            raise ValueError(f"target_fps must be positive, got {target_fps}")
+        self.period_ns = round(1e9 / target_fps)
+        self.policy = MissedFramePolicy(policy)
+        self.max_catch_up = max_catch_up
+        self.spin_threshold_ns = int(spin_threshold_ms * 1e6)
+        self.clock = clock
+
+        self.jitter = JitterHistogram()
+        self.skipped_frames = 0
+        self.caught_up_frames = 0
+        self.early_wakeups = 0
+        self._t0_ns = clock()
+        self._wall_t0 = time.time()
+        self._next_index = 0
+
+    def start(self):
+        """Anchor the frame grid at the current instant"""
+        self._t0_ns = self.clock()
+        self._wall_t0 = time.time()
+        self._next_index = 0
+        self.skipped_frames = 0
+        self.caught_up_frames = 0
+        self.early_wakeups = 0
+        self.jitter.reset()
+
+    @property
+    def start_time(self) -> float:
+        """Grid origin on the perf_counter clock, in seconds"""
+        return self._t0_ns / 1e9
+
+    def wall_time(self, perf_seconds: float) -> float:
+        """Epoch seconds for a perf_counter reading, anchored at start() (immune to clock steps)"""
+        return self._wall_t0 + (perf_seconds - self._t0_ns / 1e9)
+
+    async def wait_next_frame(self, wakeup: Optional[asyncio.Event] = None) -> FrameTick:
+        """
+        Wait for the next frame deadline, applying the missed-frame policy first
+        
+        If wakeup is given and gets set, the frame is released early (and the
+        event cleared); the following frame still waits for its own deadline,
+        so early frames do not move the grid.
+        """
+        now = self.clock()
+        deadline = self._t0_ns + self._next_index * self.period_ns
+
+        skipped = 0
+        behind = (now - deadline) // self.period_ns  # Later deadlines that already passed
+        if behind > 0:
+            if self.policy is MissedFramePolicy.SKIP:
+                skipped = behind
+            else:
+                skipped = max(0, behind - self.max_catch_up)
+                self.caught_up_frames += 1
+            if skipped:
+                self._next_index += skipped
+                deadline += skipped * self.period_ns
+                self.skipped_frames += skipped
+
+        remaining = deadline - now
+        if remaining > self.spin_threshold_ns:
+            timeout = (remaining - self.spin_threshold_ns) / 1e9
+            if wakeup is None:
+                await asyncio.sleep(timeout)
+            elif not wakeup.is_set():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        while self.clock() < deadline and not (wakeup and wakeup.is_set()):
+            await asyncio.sleep(0)
+
+        start = self.clock()
+        early = start < deadline
+        if wakeup is not None:
+            wakeup.clear()  # This frame serves the wakeup, early or not
+        tick = FrameTick(self._next_index, deadline, start, start - deadline, skipped, early)
+        self._next_index += 1
+        if early:
+            self.early_wakeups += 1
+        else:
+            self.jitter.record(tick.lateness_ns)
+        return tick
+
+    def get_jitter_report(self) -> Dict[str, Any]:
+        """Frame start lateness percentiles and missed-frame counters"""
+        report = self.jitter.to_dict()
+        report.update({
+            "period_ms": self.period_ns / 1e6,
+            "policy": self.policy.value,
+            "skipped_frames": self.skipped_frames,
+            "caught_up_frames": self.caught_up_frames,
+            "early_wakeups": self.early_wakeups
+        })
+        return report
@@ -0,0 +1,213 @@
+"""
+DECIPHER Rolling Correlation Matrix
+Incremental Pearson correlation between frame-aligned energy streams
+
+Keeps running sums (Σx, Σx², Σxy) over a sliding window of frames so each new
+frame updates every stream pair in O(1), instead of recomputing correlations
+from the raw window for every pair on every frame. Shared by the DECIPHER
+pattern detector (WF-FND-004) and the Layer 3 orchestrator (WF-FND-003).
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class RollingCorrelationMatrix:
+    """
+    Sliding-window Pearson correlation for a dynamic set of streams.
+
+    Every call to update() adds one frame-aligned sample per registered
+    stream (streams without a value that frame contribute 0.0). Running sums
+    are refreshed from the stored window every recompute_interval frames to
+    bound floating point drift.
+
+    Removed streams free their column for reuse, lowest column first, so the
+    columns in use stay packed and update() only touches that prefix.
+    """
+
+    # Variance below this fraction of n*Σx² is cancellation noise from a
+    # constant stream; such streams report a correlation of 0.0
+    VARIANCE_EPSILON = 1e-10
+
+    def __init__(self, window: int = 30, min_samples: int = 5,
+                 recompute_interval: int = 1024, initial_streams: int = 8):
+        if window < 2:
+            raise ValueError(f"window must be at least 2, got {window}")
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.recompute_interval = recompute_interval
+
+        self.stream_ids: List[Optional[str]] = []
+        self._index: Dict[str, int] = {}
+        self._free: List[int] = []
+
+        capacity = max(2, initial_streams)
+        self._history = np.zeros((window, capacity))
+        self._sum = np.zeros(capacity)
+        self._sum_sq = np.zeros(capacity)
+        self._sum_xy = np.zeros((capacity, capacity))
+        self._scratch = np.zeros(capacity)
+        self._last_sample = np.zeros(capacity, dtype=np.int64)  # frame of last sample per column
+
+        self._frames = 0
+        self._position = 0
+        self._count = 0
+        self._updates_since_recompute = 0
+
+    @property
+    def sample_count(self) -> int:
+        """Number of frames currently in the window"""
+        return self._count
+
+    def __contains__(self, stream_id: str) -> bool:
+        return stream_id in self._index
+
+    def add_stream(self, stream_id: str) -> int:
+        """Register a stream; its earlier frames in the window count as 0.0"""
+        idx = self._index.get(stream_id)
+        if idx is not None:
+            return idx
+
+        idx = None
+        while self._free:
+            # Entries past the end were trimmed by remove_stream
+            candidate = heapq.heappop(self._free)
+            if candidate < len(self.stream_ids):
+                idx = candidate
+                self.stream_ids[idx] = stream_id
+                break
+        if idx is None:
+            idx = len(self.stream_ids)
+            if idx >= self._history.shape[1]:
+                self._grow(2 * self._history.shape[1])
+            self.stream_ids.append(stream_id)
+
+        self._index[stream_id] = idx
+        self._last_sample[idx] = self._frames
+        return idx
+
+    def remove_stream(self, stream_id: str):
+        """Forget a stream and recycle its column"""
+        idx = self._index.pop(stream_id, None)
+        if idx is None:
+            return
+        self.stream_ids[idx] = None
+        heapq.heappush(self._free, idx)
+        self._history[:, idx] = 0.0
+        self._sum[idx] = 0.0
+        self._sum_sq[idx] = 0.0
+        self._sum_xy[idx, :] = 0.0
+        self._sum_xy[:, idx] = 0.0
+        while self.stream_ids and self.stream_ids[-1] is None:
+            self.stream_ids.pop()
+
+    def idle_streams(self, frames: int) -> List[str]:
+        """Streams without a sample in the last `frames` updates"""
+        k = len(self.stream_ids)
+        idle = np.flatnonzero(self._frames - self._last_sample[:k] >= frames)
+        return [self.stream_ids[i] for i in idle.tolist() if self.stream_ids[i] is not None]
+
+    def update(self, samples: Dict[str, float]):
+        """Add one frame of samples, evicting the oldest frame from the window"""
+        for stream_id in samples:
+            if stream_id not in self._index:
+                self.add_stream(stream_id)
+
+        self._frames += 1
+        # Columns past the last stream in use are all zero and stay untouched
+        k = len(self.stream_ids)
+        x = self._scratch[:k]
+        x.fill(0.0)
+        for stream_id, value in samples.items():
+            idx = self._index[stream_id]
+            x[idx] = value
+            self._last_sample[idx] = self._frames
+
+        row = self._history[self._position, :k]
+        sum_xy = self._sum_xy[:k, :k]
+        if self._count == self.window:
+            # O(1) per pair: remove the outgoing frame, add the incoming one
+            self._sum[:k] += x - row
+            self._sum_sq[:k] += x * x - row * row
+            sum_xy += np.outer(x, x) - np.outer(row, row)
+        else:
+            self._sum[:k] += x
+            self._sum_sq[:k] += x * x
+            sum_xy += np.outer(x, x)
+            self._count += 1
+        row[:] = x
+        self._position = (self._position + 1) % self.window
+
+        self._updates_since_recompute += 1
+        if self._updates_since_recompute >= self.recompute_interval:
+            self._recompute()
+
+    def correlation(self, stream_a: str, stream_b: str) -> float:
+        """Pearson correlation of two streams over the current window"""
+        a = self._index.get(stream_a)
+        b = self._index.get(stream_b)
+        if a is None or b is None or self._count < self.min_samples:
+            return 0.0
+
+        n = self._count
+        cov = n * self._sum_xy[a, b] - self._sum[a] * self._sum[b]
+        var_a = n * self._sum_sq[a] - self._sum[a] ** 2
+        var_b = n * self._sum_sq[b] - self._sum[b] ** 2
+        if (var_a <= self.VARIANCE_EPSILON * n * self._sum_sq[a] or
+                var_b <= self.VARIANCE_EPSILON * n * self._sum_sq[b]):
+            return 0.0
+        return float(max(-1.0, min(1.0, cov / (var_a * var_b) ** 0.5)))
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Correlation matrix for all active streams, in registration order"""
+        active = [i for i, stream_id in enumerate(self.stream_ids) if stream_id is not None]
+        ids = [self.stream_ids[i] for i in active]
+        k = len(active)
+        if k == 0 or self._count < self.min_samples:
+            return ids, np.zeros((k, k))
+
+        idx = np.asarray(active)
+        n = self._count
+        sums = self._sum[idx]
+        cov = n * self._sum_xy[np.ix_(idx, idx)] - np.outer(sums, sums)
+        var = n * self._sum_sq[idx] - sums * sums
+        varying = var > self.VARIANCE_EPSILON * n * self._sum_sq[idx]
+        var = np.where(varying, var, 1.0)
+
+        corr = cov / np.sqrt(np.outer(var, var))
+        corr[~varying, :] = 0.0
+        corr[:, ~varying] = 0.0
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return ids, corr
+
+    def pairs_above(self, threshold: float) -> List[Tuple[str, str, float]]:
+        """Stream pairs whose |correlation| exceeds threshold, in (i, j) order"""
+        ids, corr = self.matrix()
+        if len(ids) < 2:
+            return []
+        upper = np.triu(np.abs(corr) > threshold, k=1)
+        return [(ids[i], ids[j], float(corr[i, j])) for i, j in np.argwhere(upper)]
+
+    def _recompute(self):
+        """Rebuild running sums from the stored window"""
+        window = self._history if self._count == self.window else self._history[:self._count]
+        self._sum = window.sum(axis=0)
+        self._sum_sq = (window * window).sum(axis=0)
+        self._sum_xy = window.T @ window
+        self._updates_since_recompute = 0
+
+    def _grow(self, capacity: int):
+        """Widen storage for more streams"""
+        old = self._history.shape[1]
+        history = np.zeros((self.window, capacity))
+        history[:, :old] = self._history
+        self._history = history
+        self._sum = np.concatenate((self._sum, np.zeros(capacity - old)))
+        self._sum_sq = np.concatenate((self._sum_sq, np.zeros(capacity - old)))
+        sum_xy = np.zeros((capacity, capacity))
+        sum_xy[:old, :old] = self._sum_xy
+        self._sum_xy = sum_xy
+        self._scratch = np.zeros(capacity)
+        self._last_sample = np.concatenate((self._last_sample, np.zeros(capacity - old, dtype=np.int64)))
@@ -19,12 +19,17 @@ from dataclasses import dataclass
 from pathlib import Path
 import threading
 import queue
+import mmap
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # Performance monitoring
 import psutil
 from performance_hooks import FrameBudgetMonitor, PerformanceTracker
+from chunk_store import ChunkStore, ContentChunker, zstandard
+from manifest_index import IndexEntry, ManifestIndex, trusted_mtime_ns
 
 CHUNK_SIZE = 1024 * 1024  # 1MB chunks for file processing
+COPY_BUFFER_SIZE = 4 * 1024 * 1024  # Per-worker page-aligned copy buffer
 FRAME_BUDGET_MS = 16.67   # 60Hz frame budget
 
 @dataclass
@@ -37,6 +42,9 @@ class BackupItem:
     encrypted: bool = False
     modified_utc: str = ""
     permissions: str = ""
+    chunks: Optional[List[Tuple[str, int]]] = None  # (sha256, size) in file order; None if copied whole
+    mtime_ns: int = 0  # 0 when too recent to trust for change detection
+    inode: int = 0
 
 @dataclass
 class BackupManifest:
@@ -54,10 +62,78 @@ class BackupManifest:
     performance: Dict[str, Any]
     dependencies: Dict[str, Any]
 
+class ThroughputTuner:
+    """
+    Chooses how many file copies run concurrently from measured disk throughput
+    
+    Hill-climbs between min_workers and max_workers: after each sample
+    window the concurrency keeps moving in the same direction while
+    throughput improves by more than `gain`, reverses when it drops by more
+    than `gain`, and holds otherwise. A fixed worker count is either too
+    low for SSDs and network storage or thrashes spinning disks; measuring
+    adapts to whichever the backup runs on.
+    """
+    
+    def __init__(self, min_workers: int = 2, max_workers: int = 16,
+                 window_seconds: float = 0.5, gain: float = 0.05):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.window_seconds = window_seconds
+        self.gain = gain
+        self.workers = self.min_workers
+        self.direction = 1
+        self.history: List[Tuple[int, float]] = []  # (workers, MB/s) per window
+        
+        self._window_start = None
+        self._window_bytes = 0
+        self._last_rate: Optional[float] = None
+    
+    def record(self, nbytes: int):
+        """Account bytes copied; adjusts `workers` at the end of each window"""
+        now = time.perf_counter()
+        if self._window_start is None:
+            self._window_start = now
+        self._window_bytes += nbytes
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        
+        rate = self._window_bytes / elapsed
+        self.history.append((self.workers, rate / (1024 * 1024)))
+        if self._last_rate is not None:
+            if rate < self._last_rate * (1 - self.gain):
+                self.direction = -self.direction
+            elif rate <= self._last_rate * (1 + self.gain):
+                self.direction = 0 if self.direction else 1  # Plateau: hold, then probe again
+        step = self.direction * max(1, self.workers // 4)
+        self.workers = min(self.max_workers, max(self.min_workers, self.workers + step))
+        self._last_rate = rate
+        self._window_start = now
+        self._window_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "best_mb_per_second": max((rate for _, rate in self.history), default=0.0),
+            "windows": len(self.history)
+        }
+
 class WirthForgeBackupEngine:
     """
     Local-first backup engine that creates content-addressed backups
     with SHA-256 integrity verification and frame budget compliance
+    
+    Directory components go through a bounded pool of copy workers. Each
+    file is read once: the same buffer is hashed and written, and
+    verification checks the written size against that hash instead of
+    reading the copy back (unless verify_read_back is set).
+    
+    With the chunk store enabled (the default) files are not copied into the
+    backup directory: they are split into content-defined chunks stored once
+    under <backup_root>/chunks, and each manifest item lists its chunks.
+    Unchanged regions of databases and logs cost nothing in later backups.
     """
     
     def __init__(self, config_path: str = "config/backup-engine.json"):
@@ -74,9 +150,35 @@ class WirthForgeBackupEngine:
         self.progress_callback = None
         self.current_operation = None
         
+        # Copy pipeline
+        self.buffer_size = self.config.get("copy_buffer_size", COPY_BUFFER_SIZE)
+        self.io_tuner = ThroughputTuner(
+            self.config.get("io_workers_min", 2),
+            self.config.get("io_workers_max", min(32, (os.cpu_count() or 4) * 4))
+        )
+        self._buffers = threading.local()
+        self._created_dirs = set()
+        
         # Ensure backup directory exists
         self.backup_root.mkdir(parents=True, exist_ok=True)
         
+        # Shared deduplicating chunk store
+        self.chunk_store = None
+        if self.config.get("chunk_store_enabled", True):
+            compression = "none"
+            if self.config.get("compression_enabled", True):
+                compression = "zstd" if zstandard is not None else "zlib"
+            self.chunk_store = ChunkStore(
+                self.backup_root / "chunks",
+                compression=compression,
+                compression_level=self.config.get("compression_level", 6),
+                chunker=ContentChunker(
+                    self.config.get("chunk_min_size", 16 * 1024),
+                    self.config.get("chunk_avg_size", 64 * 1024),
+                    self.config.get("chunk_max_size", 256 * 1024)
+                )
+            )
+        
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
@@ -98,7 +200,15 @@ class WirthForgeBackupEngine:
             "frame_budget_ms": 16.67,
             "max_frame_overruns": 5,
             "chunk_size": 1024 * 1024,
+            "copy_buffer_size": COPY_BUFFER_SIZE,
+            "io_workers_min": 2,
+            "io_workers_max": min(32, (os.cpu_count() or 4) * 4),
             "verify_after_backup": True,
+            "verify_read_back": False,
+            "chunk_store_enabled": True,
+            "chunk_min_size": 16 * 1024,
+            "chunk_avg_size": 64 * 1024,
+            "chunk_max_size": 256 * 1024,
             "component_paths": {
                 "db": "data/wirthforge.db",
                 "config": "config/",
@@ -119,6 +229,7 @@ class WirthForgeBackupEngine:
         
         start_time = time.perf_counter()
         self.performance_tracker.start_operation(backup_id)
+        referenced_chunks: List[str] = []
         
         try:
             self.logger.info(f"Starting backup {backup_id} with strategy {strategy}")
@@ -126,6 +237,9 @@ class WirthForgeBackupEngine:
             # Create backup directory
             backup_dir = self.backup_root / backup_id
             backup_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.clear()
+            if self.chunk_store:
+                self.chunk_store.reset_stats()
             
             # Initialize manifest
             manifest = BackupManifest(
@@ -148,13 +262,19 @@ class WirthForgeBackupEngine:
                 dependencies={}
             )
             
-            # Set up dependencies for incremental/differential backups
+            # Set up dependencies for incremental/differential backups; the
+            # parent chain is read once into a path-keyed index
+            parent_index = ManifestIndex(None, None)
+            change_index = None
             if parent_backup_id:
+                parent_index = ManifestIndex.load(self.backup_root, parent_backup_id)
                 manifest.dependencies = {
                     "parent_backup_id": parent_backup_id
                 }
                 if strategy == "incremental":
-                    manifest.dependencies["base_backup_id"] = self._find_base_backup(parent_backup_id)
+                    manifest.dependencies["base_backup_id"] = parent_index.base_backup_id
+                if strategy in ["incremental", "differential"]:
+                    change_index = parent_index
             
             # Process each component
             total_size = 0
@@ -176,7 +296,7 @@ class WirthForgeBackupEngine:
                 
                 # Process component with frame budget monitoring
                 component_items, component_size, overruns = self._backup_component(
-                    source_path, backup_dir, component, strategy, parent_backup_id
+                    source_path, backup_dir, component, change_index
                 )
                 
                 manifest.items.extend(component_items)
@@ -201,14 +321,24 @@ class WirthForgeBackupEngine:
                 "avg_frame_time_ms": performance_metrics.get("avg_frame_time_ms", 0),
                 "max_frame_time_ms": performance_metrics.get("max_frame_time_ms", 0),
                 "frame_overruns": frame_overruns,
-                "bytes_per_second": int(total_size / (end_time - start_time)) if end_time > start_time else 0
+                "bytes_per_second": int(total_size / (end_time - start_time)) if end_time > start_time else 0,
+                "io_workers": self.io_tuner.get_stats()
             }
+            if self.chunk_store:
+                manifest.performance["chunk_store"] = self.chunk_store.get_stats()
             
             # Update governance flags based on performance
             manifest.governance["frame_budget_respected"] = frame_overruns <= self.config.get("max_frame_overruns", 5)
             
-            # Save manifest
+            # Reference the chunks before the manifest exists, so a crash
+            # in between can leak chunks but never collect live ones
+            if self.chunk_store:
+                referenced_chunks = [digest for item in manifest.items for digest, _ in item.chunks or []]
+                self.chunk_store.add_refs(referenced_chunks)
+            
+            # Save manifest, and the merged chain index the next backup starts from
             self._save_manifest(manifest, backup_dir)
+            parent_index.extend(backup_id, manifest.items, full=strategy == "full").save(backup_dir)
             
             # Verify backup if configured
             if self.config.get("verify_after_backup", True):
@@ -220,6 +350,8 @@ class WirthForgeBackupEngine:
             
         except Exception as e:
             self.logger.error(f"Backup {backup_id} failed: {e}")
+            if referenced_chunks:
+                self.chunk_store.release_refs(referenced_chunks)
             # Cleanup partial backup
             backup_dir = self.backup_root / backup_id
             if backup_dir.exists():
@@ -230,8 +362,7 @@ class WirthForgeBackupEngine:
                          source_path: Path, 
                          backup_dir: Path, 
                          component: str,
-                         strategy: str,
-                         parent_backup_id: Optional[str]) -> Tuple[List[BackupItem], int, int]:
+                         change_index: Optional[ManifestIndex]) -> Tuple[List[BackupItem], int, int]:
         """Backup a single component with frame budget monitoring"""
         
         items = []
@@ -240,70 +371,106 @@ class WirthForgeBackupEngine:
         
         if source_path.is_file():
             # Single file
-            item, size, overruns = self._backup_file(source_path, backup_dir, strategy, parent_backup_id)
+            item, size, overruns = self._backup_file(source_path, backup_dir, change_index)
             if item:
                 items.append(item)
                 total_size += size
                 frame_overruns += overruns
         
         elif source_path.is_dir():
-            # Directory - recursively backup all files
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    frame_start = time.perf_counter()
-                    
-                    item, size, overruns = self._backup_file(file_path, backup_dir, strategy, parent_backup_id)
-                    if item:
-                        items.append(item)
-                        total_size += size
-                        frame_overruns += overruns
-                    
-                    # Check frame budget
-                    frame_time = (time.perf_counter() - frame_start) * 1000
-                    self.frame_monitor.record_frame_time(frame_time)
-                    self.performance_tracker.record_frame_time(self.current_operation or "backup", frame_time)
-                    
-                    if frame_time > FRAME_BUDGET_MS:
-                        frame_overruns += 1
-                        # Brief pause to allow UI updates
-                        time.sleep(0.001)
+            # Directory - copy files on the worker pool, keeping rglob order
+            files = (p for p in source_path.rglob("*") if p.is_file())
+            results = self._run_pipeline(files, backup_dir, change_index)
+            for item, size, overruns, frame_time in results:
+                if item:
+                    items.append(item)
+                    total_size += size
+                    frame_overruns += overruns
+                
+                # Check frame budget (per-file processing time on its worker)
+                self.frame_monitor.record_frame_time(frame_time)
+                self.performance_tracker.record_frame_time(self.current_operation or "backup", frame_time)
+                if frame_time > FRAME_BUDGET_MS:
+                    frame_overruns += 1
         
         return items, total_size, frame_overruns
     
+    def _run_pipeline(self, files: Iterator[Path], backup_dir: Path,
+                      change_index: Optional[ManifestIndex]) -> List[Tuple[Optional[BackupItem], int, int, float]]:
+        """
+        Back up files on a bounded worker pool
+        
+        At most io_tuner.workers files are in flight; the limit is re-read
+        after every completion, so throughput measurements take effect
+        immediately. Returns (item, size, overruns, frame_time_ms) in input order.
+        """
+        def task(file_path: Path):
+            frame_start = time.perf_counter()
+            item, size, overruns = self._backup_file(file_path, backup_dir, change_index)
+            return item, size, overruns, (time.perf_counter() - frame_start) * 1000
+        
+        results: Dict[int, Tuple[Optional[BackupItem], int, int, float]] = {}
+        in_flight: Dict[Any, int] = {}
+        
+        def collect(done):
+            for future in done:
+                index = in_flight.pop(future)
+                results[index] = future.result()
+                self.io_tuner.record(results[index][1])
+        
+        with ThreadPoolExecutor(max_workers=self.io_tuner.max_workers,
+                                thread_name_prefix="backup-io") as pool:
+            for index, file_path in enumerate(files):
+                while len(in_flight) >= self.io_tuner.workers:
+                    collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+                in_flight[pool.submit(task, file_path)] = index
+            while in_flight:
+                collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+        
+        return [results[index] for index in range(len(results))]
+    
     def _backup_file(self, 
                     source_path: Path, 
                     backup_dir: Path, 
-                    strategy: str,
-                    parent_backup_id: Optional[str]) -> Tuple[Optional[BackupItem], int, int]:
+                    change_index: Optional[ManifestIndex]) -> Tuple[Optional[BackupItem], int, int]:
         """Backup a single file with content addressing"""
         
         frame_overruns = 0
         
         try:
-            # Calculate file hash
-            file_hash = self._sha256_file(source_path)
+            relative_path = source_path.relative_to(self.source_root)
             
-            # For incremental/differential, check if file changed
-            if strategy in ["incremental", "differential"] and parent_backup_id:
-                if not self._file_changed_since_backup(source_path, file_hash, parent_backup_id):
-                    # File unchanged, skip
+            # For incremental/differential, skip files whose size, mtime and
+            # inode match the parent chain without reading them
+            previous = None
+            if change_index is not None:
+                previous = change_index.get(str(relative_path))
+                if previous and change_index.metadata_matches(previous, source_path.stat()):
                     return None, 0, 0
             
-            # Determine destination path
-            relative_path = source_path.relative_to(self.source_root)
-            dest_path = backup_dir / relative_path
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file with hash verification
-            file_size = source_path.stat().st_size
-            copied_hash = self._copy_with_hash(source_path, dest_path)
+            if self.chunk_store:
+                return self._backup_file_chunked(source_path, relative_path, previous)
             
-            # Verify hash matches
-            if copied_hash != file_hash:
-                raise RuntimeError(f"Hash mismatch for {source_path}: expected {file_hash}, got {copied_hash}")
+            # Metadata changed; only the content hash can tell
+            if previous and self._sha256_file(source_path) == previous.sha256:
+                return None, 0, 0
             
-            # Get file metadata
-            stat = source_path.stat()
+            # Determine destination path
+            dest_path = backup_dir / relative_path
+            if dest_path.parent not in self._created_dirs:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                self._created_dirs.add(dest_path.parent)
+            
+            # Copy and hash in one pass; retry if the file changes underneath us
+            for attempt in range(3):
+                before = source_path.stat()
+                file_hash, file_size = self._copy_with_hash(source_path, dest_path)
+                stat = source_path.stat()
+                unchanged = (before.st_size, before.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+                if unchanged and file_size == stat.st_size:
+                    break
+            else:
+                raise RuntimeError(f"File kept changing during backup: {source_path}")
             
             # Create backup item
             item = BackupItem(
@@ -313,7 +480,9 @@ class WirthForgeBackupEngine:
                 compressed=False,  # Compression handled separately if needed
                 encrypted=False,
                 modified_utc=datetime.fromtimestamp(stat.st_mtime).isoformat() + "Z",
-                permissions=oct(stat.st_mode)[-3:]
+                permissions=oct(stat.st_mode)[-3:],
+                mtime_ns=trusted_mtime_ns(stat),
+                inode=stat.st_ino
             )
             
             return item, file_size, frame_overruns
@@ -322,74 +491,81 @@ class WirthForgeBackupEngine:
             self.logger.error(f"Failed to backup file {source_path}: {e}")
             return None, 0, frame_overruns
     
+    def _backup_file_chunked(self,
+                             source_path: Path,
+                             relative_path: Path,
+                             previous: Optional[IndexEntry]) -> Tuple[Optional[BackupItem], int, int]:
+        """Store a file's chunks; hashing, chunking and change detection share one read"""
+        for attempt in range(3):
+            before = source_path.stat()
+            with open(source_path, 'rb') as f:
+                file_hash, file_size, chunks, compressed = self.chunk_store.put_stream(f)
+            stat = source_path.stat()
+            unchanged = (before.st_size, before.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+            if unchanged and file_size == stat.st_size:
+                break
+        else:
+            raise RuntimeError(f"File kept changing during backup: {source_path}")
+        
+        # Touched but identical files are skipped; their chunks were deduplicated, not rewritten
+        if previous and previous.sha256 == file_hash:
+            return None, 0, 0
+        
+        item = BackupItem(
+            path=str(relative_path),
+            size=file_size,
+            sha256=file_hash,
+            compressed=compressed,
+            encrypted=False,
+            modified_utc=datetime.fromtimestamp(stat.st_mtime).isoformat() + "Z",
+            permissions=oct(stat.st_mode)[-3:],
+            chunks=chunks,
+            mtime_ns=trusted_mtime_ns(stat),
+            inode=stat.st_ino
+        )
+        return item, file_size, 0
+    
     def _sha256_file(self, file_path: Path) -> str:
         """Calculate SHA-256 hash of a file"""
         hash_obj = hashlib.sha256()
+        buffer = self._copy_buffer()
         
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
-                hash_obj.update(chunk)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hash_obj.update(buffer[:n])
         
         return hash_obj.hexdigest()
     
-    def _copy_with_hash(self, source_path: Path, dest_path: Path) -> str:
-        """Copy file while calculating hash"""
+    def _copy_with_hash(self, source_path: Path, dest_path: Path) -> Tuple[str, int]:
+        """Copy file while calculating hash; returns (sha256, bytes copied)"""
         hash_obj = hashlib.sha256()
+        buffer = self._copy_buffer()
+        size = 0
         
-        with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
-            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
-                dst.write(chunk)
+        with open(source_path, 'rb', buffering=0) as src, open(dest_path, 'wb', buffering=0) as dst:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            while True:
+                n = src.readinto(buffer)
+                if not n:
+                    break
+                chunk = buffer[:n]
                 hash_obj.update(chunk)
+                while chunk:  # Raw writes may be partial
+                    chunk = chunk[dst.write(chunk):]
+                size += n
         
-        return hash_obj.hexdigest()
-    
-    def _file_changed_since_backup(self, file_path: Path, current_hash: str, parent_backup_id: str) -> bool:
-        """Check if file has changed since parent backup"""
-        try:
-            parent_manifest_path = self.backup_root / parent_backup_id / "manifest.json"
-            if not parent_manifest_path.exists():
-                return True  # Parent backup not found, assume changed
-            
-            with open(parent_manifest_path, 'r') as f:
-                parent_manifest = json.load(f)
-            
-            relative_path = str(file_path.relative_to(self.source_root))
-            
-            for item in parent_manifest.get("items", []):
-                if item["path"] == relative_path:
-                    return item["sha256"] != current_hash
-            
-            return True  # File not in parent backup, assume new
-            
-        except Exception as e:
-            self.logger.warning(f"Could not check file change status: {e}")
-            return True  # Assume changed on error
+        return hash_obj.hexdigest(), size
     
-    def _find_base_backup(self, parent_backup_id: str) -> str:
-        """Find the base full backup for incremental chains"""
-        try:
-            parent_manifest_path = self.backup_root / parent_backup_id / "manifest.json"
-            if not parent_manifest_path.exists():
-                return parent_backup_id
-            
-            with open(parent_manifest_path, 'r') as f:
-                parent_manifest = json.load(f)
-            
-            if parent_manifest.get("strategy") == "full":
-                return parent_backup_id
-            
-            # Recursively find base backup
-            parent_deps = parent_manifest.get("dependencies", {})
-            if "base_backup_id" in parent_deps:
-                return parent_deps["base_backup_id"]
-            elif "parent_backup_id" in parent_deps:
-                return self._find_base_backup(parent_deps["parent_backup_id"])
-            
-            return parent_backup_id
-            
-        except Exception as e:
-            self.logger.warning(f"Could not find base backup: {e}")
-            return parent_backup_id
+    def _copy_buffer(self) -> memoryview:
+        """This thread's reusable copy buffer (anonymous mmap, so page-aligned)"""
+        buffer = getattr(self._buffers, "view", None)
+        if buffer is None:
+            buffer = self._buffers.view = memoryview(mmap.mmap(-1, self.buffer_size))
+        return buffer
     
     def _calculate_root_hash(self, items: List[BackupItem]) -> str:
         """Calculate root hash for the entire backup"""
@@ -417,15 +593,7 @@ class WirthForgeBackupEngine:
             "includes": manifest.includes,
             "excludes": manifest.excludes,
             "root_hash": manifest.root_hash,
-            "items": [{
-                "path": item.path,
-                "size": item.size,
-                "sha256": item.sha256,
-                "compressed": item.compressed,
-                "encrypted": item.encrypted,
-                "modified_utc": item.modified_utc,
-                "permissions": item.permissions
-            } for item in manifest.items],
+            "items": [self._item_to_dict(item) for item in manifest.items],
             "wf_version": manifest.wf_version,
             "engine_ver": manifest.engine_ver,
             "governance": manifest.governance,
@@ -436,23 +604,52 @@ class WirthForgeBackupEngine:
         with open(manifest_path, 'w') as f:
             json.dump(manifest_dict, f, indent=2)
     
+    def _item_to_dict(self, item: BackupItem) -> Dict[str, Any]:
+        item_dict = {
+            "path": item.path,
+            "size": item.size,
+            "sha256": item.sha256,
+            "compressed": item.compressed,
+            "encrypted": item.encrypted,
+            "modified_utc": item.modified_utc,
+            "permissions": item.permissions,
+            "mtime_ns": item.mtime_ns,
+            "inode": item.inode
+        }
+        if item.chunks is not None:
+            item_dict["chunks"] = [[digest, size] for digest, size in item.chunks]
+        return item_dict
+    
     def _verify_backup(self, manifest: BackupManifest, backup_dir: Path) -> bool:
         """Verify backup integrity"""
         self.logger.info(f"Verifying backup {manifest.backup_id}")
         
         try:
-            # Verify each file
+            # Verify each file. The item hashes were computed over the exact
+            # bytes written, so a complete copy is one of the recorded size;
+            # reading it back is only needed to catch storage corruption.
+            read_back = self.config.get("verify_read_back", False)
             for item in manifest.items:
+                if item.chunks is not None:
+                    if not self._verify_chunked_item(item, read_back):
+                        return False
+                    continue
+                
                 file_path = backup_dir / item.path
-                if not file_path.exists():
+                try:
+                    size = file_path.stat().st_size
+                except FileNotFoundError:
                     self.logger.error(f"Backup file missing: {item.path}")
                     return False
-                
-                # Verify file hash
-                actual_hash = self._sha256_file(file_path)
-                if actual_hash != item.sha256:
-                    self.logger.error(f"Hash mismatch for {item.path}: expected {item.sha256}, got {actual_hash}")
+                if size != item.size:
+                    self.logger.error(f"Size mismatch for {item.path}: expected {item.size}, got {size}")
                     return False
+                
+                if read_back:
+                    actual_hash = self._sha256_file(file_path)
+                    if actual_hash != item.sha256:
+                        self.logger.error(f"Hash mismatch for {item.path}: expected {item.sha256}, got {actual_hash}")
+                        return False
             
             # Verify root hash
             calculated_root_hash = self._calculate_root_hash(manifest.items)
@@ -467,6 +664,26 @@ class WirthForgeBackupEngine:
             self.logger.error(f"Backup verification failed: {e}")
             return False
     
+    def _verify_chunked_item(self, item: BackupItem, read_back: bool) -> bool:
+        """Check a chunked item's chunks are stored and add up to the file"""
+        if sum(size for _, size in item.chunks) != item.size:
+            self.logger.error(f"Chunk sizes for {item.path} do not add up to {item.size}")
+            return False
+        
+        missing = [digest for digest, _ in item.chunks if not self.chunk_store.contains(digest)]
+        if missing:
+            self.logger.error(f"Backup file {item.path} is missing {len(missing)} chunks")
+            return False
+        
+        if read_back:
+            hash_obj = hashlib.sha256()
+            for data in self.chunk_store.iter_file(item.chunks):
+                hash_obj.update(data)
+            if hash_obj.hexdigest() != item.sha256:
+                self.logger.error(f"Hash mismatch for {item.path}: expected {item.sha256}, got {hash_obj.hexdigest()}")
+                return False
+        return True
+    
     def load_manifest(self, backup_id: str) -> Optional[BackupManifest]:
         """Load backup manifest from file"""
         try:
@@ -486,7 +703,10 @@ class WirthForgeBackupEngine:
                     compressed=item_data.get("compressed", False),
                     encrypted=item_data.get("encrypted", False),
                     modified_utc=item_data.get("modified_utc", ""),
-                    permissions=item_data.get("permissions", "")
+                    permissions=item_data.get("permissions", ""),
+                    chunks=[tuple(chunk) for chunk in item_data["chunks"]] if "chunks" in item_data else None,
+                    mtime_ns=item_data.get("mtime_ns", 0),
+                    inode=item_data.get("inode", 0)
                 )
                 items.append(item)
             
@@ -542,6 +762,28 @@ class WirthForgeBackupEngine:
             "governance": manifest.governance
         }
     
+    def delete_backup(self, backup_id: str) -> bool:
+        """Delete a backup and release its chunk references"""
+        backup_dir = self.backup_root / backup_id
+        if not backup_dir.is_dir():
+            return False
+        
+        manifest = self.load_manifest(backup_id)
+        if manifest and self.chunk_store:
+            self.chunk_store.release_refs(digest for item in manifest.items for digest, _ in item.chunks or [])
+        shutil.rmtree(backup_dir)
+        self.logger.info(f"Deleted backup {backup_id}")
+        return True
+    
+    def collect_garbage(self) -> Dict[str, int]:
+        """Remove chunks no longer referenced by any backup"""
+        if not self.chunk_store:
+            return {"chunks_removed": 0, "bytes_freed": 0}
+        result = self.chunk_store.collect_garbage()
+        self.logger.info(f"Chunk store GC removed {result['chunks_removed']} chunks, "
+                         f"freed {result['bytes_freed']} bytes")
+        return result
+    
     def set_progress_callback(self, callback):
         """Set progress callback function"""
         self.progress_callback = callback
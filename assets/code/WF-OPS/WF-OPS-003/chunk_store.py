@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+WF-OPS-003 Content-Addressed Chunk Store
+Deduplicated, optionally compressed chunk storage shared by all backups
+
+Files are split with FastCDC content-defined chunking: a gear rolling hash
+picks cut points from the data itself, so inserting or rewriting bytes in a
+large SQLite database or an appended log only changes the chunks around the
+edit. Each chunk is stored once under objects/<xx>/<sha256>, compressed per
+chunk when that saves space, and tracked in a small SQLite index with a
+reference count per backup that uses it. Unreferenced chunks are removed by
+collect_garbage().
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - pure Python cut-point search
+    np = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zlib only
+    zstandard = None
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {"none": CODEC_RAW, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+READ_SIZE = 4 * 1024 * 1024  # Bytes read per chunking pass
+GEAR_BITS = 32  # Hash width, and so the rolling window in bytes
+_GEAR_MASK = (1 << GEAR_BITS) - 1
+
+# Gear table: 256 fixed pseudo-random 32-bit values. Chunk boundaries depend
+# on it, so it must never change once backups exist.
+_GEAR = [int.from_bytes(hashlib.sha256(b"wf-ops-003-gear-%d" % i).digest()[:4], "little")
+         for i in range(256)]
+_GEAR_NP = np.array(_GEAR, dtype=np.uint32) if np is not None else None
+
+
+def _top_mask(bits: int) -> int:
+    """Mask over the top `bits` bits; those depend on the whole window"""
+    return ((1 << bits) - 1) << (GEAR_BITS - bits)
+
+
+class ContentChunker:
+    """
+    FastCDC chunker with normalized chunking
+
+    The 32-bit gear hash h = (h << 1) + GEAR[byte] only remembers the last
+    32 bytes, so a cut decision depends on local content alone. Cuts are never
+    taken in the first min_size bytes of a chunk. Up to avg_size a stricter
+    mask is used and after it a looser one, which pulls chunk sizes towards
+    avg_size; max_size forces a cut.
+
+    With numpy the hash of every position is computed in five vectorized
+    doubling steps; the pure Python loop produces identical boundaries.
+    """
+
+    def __init__(self, min_size: int = 16 * 1024, avg_size: int = 64 * 1024,
+                 max_size: int = 256 * 1024, normalization: int = 2):
+        if not GEAR_BITS <= min_size < avg_size < max_size:
+            raise ValueError(f"chunk sizes must satisfy {GEAR_BITS} <= min_size < avg_size < max_size")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        bits = max(1, avg_size.bit_length() - 1)
+        self.mask_s = _top_mask(min(GEAR_BITS - 1, bits + normalization))
+        self.mask_l = _top_mask(max(1, bits - normalization))
+
+    def split(self, stream: BinaryIO, read_size: int = READ_SIZE) -> Iterator[bytes]:
+        """Yield the chunks of a binary stream; their concatenation is the stream"""
+        pending = b""
+        while True:
+            block = stream.read(read_size)
+            final = not block
+            buf = pending + block
+            if not buf:
+                return
+
+            cuts, consumed = self.cut_points(buf, final)
+            start = 0
+            view = memoryview(buf)
+            for end in cuts:
+                yield bytes(view[start:end])
+                start = end
+            pending = bytes(view[consumed:])
+            if final:
+                return
+
+    def cut_points(self, buf: bytes, final: bool) -> Tuple[List[int], int]:
+        """
+        Chunk end offsets within buf and the number of bytes they cover
+
+        buf must start at a chunk boundary. Unless final, a chunk is only
+        emitted once max_size bytes are available after its start, so the
+        decision can no longer depend on bytes that have not been read.
+        """
+        n = len(buf)
+        small, large = self._candidates(buf)
+        cuts = []
+        start = 0
+        while start < n:
+            remaining = n - start
+            if not final and remaining < self.max_size:
+                break
+            if remaining <= self.min_size:
+                end = n
+            else:
+                end = self._find_cut(start, n, small, large)
+            cuts.append(end)
+            start = end
+        return cuts, start
+
+    def _find_cut(self, start: int, n: int, small: List[int], large: List[int]) -> int:
+        normal_end = min(start + self.avg_size, n)
+        i = bisect_left(small, start + self.min_size)
+        if i < len(small) and small[i] < normal_end:
+            return small[i] + 1
+
+        max_end = min(start + self.max_size, n)
+        i = bisect_left(large, normal_end)
+        if i < len(large) and large[i] < max_end:
+            return large[i] + 1
+        return max_end
+
+    def _candidates(self, buf: bytes) -> Tuple[List[int], List[int]]:
+        """Positions whose gear hash clears the strict / loose mask"""
+        if np is not None and len(buf) > self.min_size:
+            hashes = _gear_hashes(buf)
+            small = np.flatnonzero((hashes & np.uint32(self.mask_s)) == 0).tolist()
+            large = np.flatnonzero((hashes & np.uint32(self.mask_l)) == 0).tolist()
+            return small, large
+
+        mask_s, mask_l, gear = self.mask_s, self.mask_l, _GEAR
+        small, large = [], []
+        h = 0
+        for i, byte in enumerate(buf):
+            h = ((h << 1) + gear[byte]) & _GEAR_MASK
+            if not h & mask_l:
+                large.append(i)
+                if not h & mask_s:  # mask_s covers mask_l's bits
+                    small.append(i)
+        return small, large
+
+
+def _gear_hashes(buf: bytes):
+    """
+    Gear hash at every position of buf (numpy)
+
+    h_w[i] = sum(GEAR[buf[i-k]] << k for k < w), and
+    h_2w[i] = h_w[i] + (h_w[i-w] << w), so five doublings give the 32-byte
+    window. Positions before byte 31 see a shorter window; cut points are
+    never taken there.
+    """
+    hashes = np.take(_GEAR_NP, np.frombuffer(buf, dtype=np.uint8))
+    shifted = np.empty_like(hashes)
+    width = 1
+    while width < GEAR_BITS:
+        np.left_shift(hashes[:-width], np.uint32(width), out=shifted[width:])
+        hashes[width:] += shifted[width:]
+        width *= 2
+    return hashes
+
+
+class ChunkStore:
+    """
+    Content-addressed chunk storage with reference counting
+
+    put() stores a chunk unless its SHA-256 is already known and is safe to
+    call from many copy workers at once. New chunks start with zero
+    references; add_refs() is called once per committed backup with the
+    chunks it uses and release_refs() when that backup is deleted. Chunks
+    still at zero references, including those left by failed backups, are
+    deleted by collect_garbage(), which must not run while a backup is being
+    written.
+    """
+
+    def __init__(self, root: Path, compression: str = "zstd", compression_level: int = 3,
+                 chunker: Optional[ContentChunker] = None):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.chunker = chunker or ContentChunker()
+
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        if compression not in CODEC_NAMES:
+            raise ValueError(f"Unknown chunk compression: {compression}")
+        self.codec = CODEC_NAMES[compression]
+        self.compression_level = compression_level
+        self._codec_state = threading.local()
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                codec INTEGER NOT NULL,
+                refs INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.commit()
+
+        # digest -> codec for every chunk in the index or written since the last flush
+        self._known: Dict[str, int] = dict(self._conn.execute("SELECT digest, codec FROM chunks"))
+        self._inflight: Dict[str, threading.Event] = {}
+        self._pending: List[Tuple[str, int, int, int]] = []
+        self.reset_stats()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def contains(self, digest: str) -> bool:
+        return digest in self._known
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """Store a chunk; returns (sha256, whether it was stored compressed)"""
+        digest = hashlib.sha256(data).hexdigest()
+        waiter = None
+        with self._lock:
+            self.stats["bytes_in"] += len(data)
+            codec = self._known.get(digest)
+            if codec is None:
+                waiter = self._inflight.get(digest)
+                if waiter is None:
+                    self._inflight[digest] = threading.Event()
+            if codec is not None or waiter is not None:
+                self.stats["chunks_deduplicated"] += 1
+
+        if codec is not None:
+            return digest, codec != CODEC_RAW
+        if waiter is not None:
+            # Another worker is writing the same chunk
+            waiter.wait()
+            codec = self._known.get(digest)
+            if codec is None:
+                raise RuntimeError(f"Concurrent write of chunk {digest} failed")
+            return digest, codec != CODEC_RAW
+
+        try:
+            codec, payload = self._encode(data)
+            path = self._object_path(digest)
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(bytes((codec,)))
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self._known[digest] = codec
+                self._pending.append((digest, len(data), len(payload) + 1, codec))
+                self.stats["chunks_written"] += 1
+                self.stats["bytes_written"] += len(payload) + 1
+        finally:
+            with self._lock:
+                self._inflight.pop(digest).set()
+
+        return digest, codec != CODEC_RAW
+
+    def put_stream(self, stream: BinaryIO) -> Tuple[str, int, List[Tuple[str, int]], bool]:
+        """
+        Chunk and store a stream in one pass
+
+        Returns (sha256 of the whole stream, size, [(chunk sha256, chunk size)],
+        whether any chunk is stored compressed).
+        """
+        file_hash = hashlib.sha256()
+        size = 0
+        chunks = []
+        compressed = False
+        for data in self.chunker.split(stream):
+            file_hash.update(data)
+            digest, packed = self.put(data)
+            chunks.append((digest, len(data)))
+            compressed = compressed or packed
+            size += len(data)
+        return file_hash.hexdigest(), size, chunks, compressed
+
+    def get(self, digest: str) -> bytes:
+        """Read a chunk back; raises ValueError if it does not match its digest"""
+        with open(self._object_path(digest), "rb") as f:
+            raw = f.read()
+        data = self._decode(raw[0], raw[1:])
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def iter_file(self, chunks: Iterable[Tuple[str, int]]) -> Iterator[bytes]:
+        """Yield a file's bytes from its chunk list"""
+        for digest, size in chunks:
+            data = self.get(digest)
+            if len(data) != size:
+                raise ValueError(f"Chunk {digest} has size {len(data)}, expected {size}")
+            yield data
+
+    def _encode(self, data: bytes) -> Tuple[int, bytes]:
+        if self.codec == CODEC_RAW:
+            return CODEC_RAW, data
+        if self.codec == CODEC_ZSTD:
+            compressor = getattr(self._codec_state, "compressor", None)
+            if compressor is None:
+                compressor = self._codec_state.compressor = zstandard.ZstdCompressor(
+                    level=self.compression_level)
+            packed = compressor.compress(data)
+        else:
+            packed = zlib.compress(data, self.compression_level)
+        # Keep incompressible chunks (model weights, already-compressed files) raw
+        if len(packed) >= len(data) - (len(data) >> 4):
+            return CODEC_RAW, data
+        return self.codec, packed
+
+    def _decode(self, codec: int, payload: bytes) -> bytes:
+        if codec == CODEC_RAW:
+            return payload
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed chunks")
+            decompressor = getattr(self._codec_state, "decompressor", None)
+            if decompressor is None:
+                decompressor = self._codec_state.decompressor = zstandard.ZstdDecompressor()
+            return decompressor.decompress(payload)
+        raise ValueError(f"Unknown chunk codec {codec}")
+
+    def flush(self):
+        """Write index rows for chunks stored since the last flush"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO chunks (digest, size, stored_size, codec) VALUES (?, ?, ?, ?)",
+                    rows)
+                self._conn.commit()
+
+    def add_refs(self, digests: Iterable[str]):
+        """Record one more backup referencing each of these chunks"""
+        self._adjust_refs(digests, 1)
+
+    def release_refs(self, digests: Iterable[str]):
+        """Drop one backup's reference to each of these chunks"""
+        self._adjust_refs(digests, -1)
+
+    def _adjust_refs(self, digests: Iterable[str], delta: int):
+        self.flush()
+        rows = [(delta, digest) for digest in set(digests)]
+        with self._lock:
+            self._conn.executemany("UPDATE chunks SET refs = MAX(0, refs + ?) WHERE digest = ?", rows)
+            self._conn.commit()
+
+    def collect_garbage(self) -> Dict[str, int]:
+        """Delete unreferenced chunks and stray object files"""
+        self.flush()
+        removed = freed = 0
+        with self._lock:
+            dead = self._conn.execute(
+                "SELECT digest, stored_size FROM chunks WHERE refs <= 0").fetchall()
+            for digest, stored_size in dead:
+                try:
+                    self._object_path(digest).unlink()
+                    freed += stored_size
+                except FileNotFoundError:
+                    pass
+                self._known.pop(digest, None)
+                removed += 1
+            self._conn.executemany("DELETE FROM chunks WHERE digest = ?", [(d,) for d, _ in dead])
+            self._conn.commit()
+
+            # Objects written before a crash but never indexed, and temp files
+            for path in self.objects_dir.glob("*/*"):
+                if path.name not in self._known and path.name.split(".")[0] not in self._inflight:
+                    freed += path.stat().st_size
+                    path.unlink()
+                    removed += 1
+
+        return {"chunks_removed": removed, "bytes_freed": freed}
+
+    def reset_stats(self):
+        self.stats = {"chunks_written": 0, "chunks_deduplicated": 0,
+                      "bytes_in": 0, "bytes_written": 0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["chunks_indexed"] = len(self._known)
+        stats["dedup_ratio"] = (stats["bytes_in"] / stats["bytes_written"]
+                                if stats["bytes_written"] else 0.0)
+        return stats
+
+    def close(self):
+        self.flush()
+        self._conn.close()
@@ -3,18 +3,39 @@
 WF-OPS-003 Encryption Helper Module
 Privacy-preserving encryption for optional backup exports with explicit user consent.
 Supports AES-256-GCM encryption with secure key derivation and metadata protection.
+
+Content is encrypted as a stream of fixed-size segments, each sealed with
+AES-256-GCM (the STREAM construction used by Tink and age). The nonce of
+segment i is a random per-file prefix, the 32-bit counter i and a flag byte
+that is 1 only on the final segment, so segments cannot be reordered,
+dropped or truncated at a boundary without failing authentication. Files
+stream through one segment at a time, and segments can be verified
+independently in parallel.
+
+Keys come from a two-level hierarchy: the password is stretched with PBKDF2
+once per export session into a master key, and each file gets its own key
+from the master via HKDF-SHA256 with a fresh per-file salt. Master keys are
+held in a short-lived in-memory KeyRing and zeroized on expiry.
 """
 
+import io
 import os
 import json
+import struct
+import hmac
 import hashlib
 import secrets
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import BinaryIO, Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import logging
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
@@ -24,16 +45,34 @@ from cryptography.hazmat.backends import default_backend
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Segmented stream format: header, then segments of segment_size plaintext
+# bytes plus a 16-byte tag (the last one may be shorter)
+STREAM_FORMAT = "aes-256-gcm-stream-v1"
+STREAM_MAGIC = b"WFSE"
+STREAM_VERSION = 1
+STREAM_HEADER = struct.Struct(">4sBI7s")  # magic, version, segment_size, nonce prefix
+NONCE_PREFIX_SIZE = 7
+MAX_SEGMENTS = 2 ** 32
+
+# Master key (PBKDF2) -> per-file key (HKDF) hierarchy
+HIERARCHICAL_KEY_DERIVATION = "PBKDF2-SHA256+HKDF-SHA256"
+FILE_KEY_INFO = b"WF-OPS-003 export file key v1"
+
 @dataclass
 class EncryptionConfig:
     """Configuration for encryption operations"""
     algorithm: str = "AES-256-GCM"
     key_derivation: str = "PBKDF2-SHA256"
     iterations: int = 100000
+    min_iterations: int = 100000  # Floor for calibrate_kdf
+    kdf_target_ms: float = 0.0  # Calibrate iterations on startup when > 0
+    key_ttl_seconds: float = 300.0  # Keyring lifetime of master keys
     salt_size: int = 32
     nonce_size: int = 12
     tag_size: int = 16
     chunk_size: int = 8192
+    segment_size: int = 1024 * 1024  # Plaintext bytes per sealed segment
+    verify_workers: int = 4
     
 @dataclass
 class EncryptionMetadata:
@@ -49,6 +88,78 @@ class EncryptionMetadata:
     timestamp: str
     user_consent: bool
     export_purpose: str
+    format: str = ""  # STREAM_FORMAT, or "" for single-shot GCM from older exports
+    segment_size: int = 0
+    content_size: int = 0
+    master_salt: str = ""  # PBKDF2 salt of the master key; "" if salt feeds PBKDF2 directly
+
+def zeroize(buffer: bytearray):
+    """Overwrite key material in place"""
+    buffer[:] = bytes(len(buffer))
+
+@dataclass
+class KeyringEntry:
+    """A cached master key and the parameters it was derived with"""
+    key: bytearray
+    salt: bytes
+    iterations: int
+    verifier: bytes  # HMAC(key, password): confirms a cached key belongs to a password
+    expires_at: float = 0.0
+
+class KeyRing:
+    """
+    Short-lived in-memory cache of derived keys
+    
+    Entries expire after ttl_seconds and are zeroized on expiry, discard()
+    and clear(). get() hands out a copy of the key so that expiry on another
+    thread never changes a key in use; callers zeroize their copy when done.
+    Python and OpenSSL may still hold transient copies, so zeroization is
+    best-effort.
+    """
+    
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple, KeyringEntry] = {}
+        self._lock = threading.Lock()
+        
+    def put(self, key_id: Tuple, entry: KeyringEntry):
+        stored = KeyringEntry(bytearray(entry.key), entry.salt, entry.iterations, entry.verifier,
+                              time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            previous = self._entries.pop(key_id, None)
+            if previous:
+                zeroize(previous.key)
+            self._entries[key_id] = stored
+            
+    def get(self, key_id: Tuple) -> Optional[KeyringEntry]:
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.get(key_id)
+            if entry is None:
+                return None
+            return KeyringEntry(bytearray(entry.key), entry.salt, entry.iterations,
+                                entry.verifier, entry.expires_at)
+            
+    def discard(self, key_id: Tuple):
+        with self._lock:
+            entry = self._entries.pop(key_id, None)
+            if entry:
+                zeroize(entry.key)
+                
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                zeroize(entry.key)
+            self._entries.clear()
+            
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._entries)
+            
+    def _expire(self, now: float):
+        for key_id in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            zeroize(self._entries.pop(key_id).key)
 
 class FrameBudgetMonitor:
     """Monitor frame budget during encryption operations"""
@@ -97,24 +208,119 @@ class EncryptionHelper:
         self.config = config or EncryptionConfig()
         self.frame_monitor = FrameBudgetMonitor()
         self.consent_manager = ConsentManager()
+        self.keyring = KeyRing(self.config.key_ttl_seconds)
+        
+        if self.config.kdf_target_ms > 0:
+            self.calibrate_kdf(self.config.kdf_target_ms)
         
-    def derive_key(self, password: str, salt: bytes) -> bytes:
+    def derive_key(self, password: str, salt: bytes, iterations: Optional[int] = None) -> bytes:
         """Derive encryption key from password using PBKDF2"""
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,  # 256 bits
             salt=salt,
-            iterations=self.config.iterations,
+            iterations=iterations or self.config.iterations,
             backend=default_backend()
         )
         return kdf.derive(password.encode('utf-8'))
         
-    def encrypt_content(self, content: bytes, password: str, 
-                       export_purpose: str = "backup_export") -> Tuple[bytes, EncryptionMetadata]:
-        """Encrypt content with AES-256-GCM"""
-        # Request user consent
+    def calibrate_kdf(self, target_ms: float = 250.0, probe_iterations: int = 20000) -> Dict[str, Any]:
+        """
+        Set PBKDF2 iterations so one master key derivation takes about target_ms here
+        
+        Never goes below config.min_iterations. Metadata records the count
+        each export used, so calibrating does not affect older exports.
+        """
+        salt = secrets.token_bytes(self.config.salt_size)
+        start = time.perf_counter()
+        self.derive_key("wf-ops-003-calibration", salt, probe_iterations)
+        per_iteration_s = (time.perf_counter() - start) / probe_iterations
+        
+        calibrated = int(target_ms / 1000 / per_iteration_s) // 1000 * 1000
+        self.config.iterations = max(self.config.min_iterations, calibrated)
+        self.keyring.discard(("encrypt",))  # Next export derives with the new count
+        
+        result = {
+            "target_ms": target_ms,
+            "iterations_per_second": int(1 / per_iteration_s),
+            "calibrated_iterations": calibrated,
+            "iterations": self.config.iterations,
+            "expected_ms": self.config.iterations * per_iteration_s * 1000
+        }
+        logger.info(f"PBKDF2 calibrated to {self.config.iterations} iterations "
+                    f"(~{result['expected_ms']:.0f} ms)")
+        return result
+        
+    @staticmethod
+    def _master_verifier(master: bytearray, password: str) -> bytes:
+        return hmac.new(master, password.encode('utf-8'), hashlib.sha256).digest()
+        
+    def _cached_master(self, key_id: Tuple, password: str) -> Optional[KeyringEntry]:
+        entry = self.keyring.get(key_id)
+        if entry is None:
+            return None
+        if not hmac.compare_digest(self._master_verifier(entry.key, password), entry.verifier):
+            zeroize(entry.key)
+            return None
+        return entry
+        
+    def _derive_master(self, password: str, salt: bytes, iterations: int) -> KeyringEntry:
+        """PBKDF2 master key, cached for decryption of other files from its session"""
+        master = bytearray(self.derive_key(password, salt, iterations))
+        entry = KeyringEntry(master, salt, iterations, self._master_verifier(master, password))
+        self.keyring.put(("master", salt, iterations), entry)
+        return entry
+        
+    def _encryption_master(self, password: str) -> KeyringEntry:
+        """Master key of the current export session, derived on first use"""
+        entry = self._cached_master(("encrypt",), password)
+        if entry is not None and entry.iterations == self.config.iterations:
+            return entry
+        if entry is not None:
+            zeroize(entry.key)
+        entry = self._derive_master(password, secrets.token_bytes(self.config.salt_size),
+                                    self.config.iterations)
+        self.keyring.put(("encrypt",), entry)
+        return entry
+        
+    def _file_key(self, master: bytearray, file_salt: bytes) -> bytearray:
+        """Per-file key: HKDF-SHA256 of the master key with the file's own salt"""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=file_salt,
+            info=FILE_KEY_INFO,
+            backend=default_backend()
+        )
+        return bytearray(hkdf.derive(bytes(master)))
+        
+    def _metadata_key(self, metadata: EncryptionMetadata, password: str) -> bytearray:
+        """Key an export was encrypted with, reusing a cached master key when possible"""
+        salt = bytes.fromhex(metadata.salt)
+        if not metadata.master_salt:
+            return bytearray(self.derive_key(password, salt, metadata.iterations))
+        
+        master_salt = bytes.fromhex(metadata.master_salt)
+        entry = self._cached_master(("master", master_salt, metadata.iterations), password)
+        if entry is None:
+            entry = self._derive_master(password, master_salt, metadata.iterations)
+        try:
+            return self._file_key(entry.key, salt)
+        finally:
+            zeroize(entry.key)
+            
+    def end_export_session(self):
+        """Zeroize the session master key; the next export derives a new one"""
+        self.keyring.discard(("encrypt",))
+        
+    def clear_keys(self):
+        """Zeroize every cached key"""
+        self.keyring.clear()
+        
+    def _request_consent(self, export_purpose: str, data_description: str) -> str:
+        """Ask for consent and log the decision; returns the consent timestamp"""
         consent_granted = self.consent_manager.request_encryption_consent(
-            export_purpose, f"Content size: {len(content)} bytes"
+            export_purpose, data_description
         )
         
         if not consent_granted:
@@ -122,61 +328,173 @@ class EncryptionHelper:
             
         timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         self.consent_manager.log_consent_decision(True, export_purpose, timestamp)
+        return timestamp
         
-        # Generate cryptographic materials
-        salt = secrets.token_bytes(self.config.salt_size)
-        nonce = secrets.token_bytes(self.config.nonce_size)
-        key = self.derive_key(password, salt)
-        
-        # Calculate original content hash
-        content_hash = hashlib.sha256(content).hexdigest()
-        
-        # Encrypt content
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.GCM(nonce),
-            backend=default_backend()
+    @staticmethod
+    def _segment_nonce(prefix: bytes, index: int, last: bool) -> bytes:
+        """12-byte nonce: 7-byte file prefix, 32-bit segment counter, final flag"""
+        if index >= MAX_SEGMENTS:
+            raise ValueError("Encrypted stream exceeds the maximum segment count")
+        return prefix + struct.pack(">IB", index, 1 if last else 0)
+        
+    def encrypt_stream(self, source: BinaryIO, sink: BinaryIO, password: str,
+                       export_purpose: str = "backup_export",
+                       size_hint: Optional[int] = None) -> EncryptionMetadata:
+        """Encrypt source into sink segment by segment with constant memory"""
+        timestamp = self._request_consent(
+            export_purpose,
+            f"Content size: {size_hint} bytes" if size_hint is not None else "Streamed content"
         )
-        encryptor = cipher.encryptor()
         
+        # Generate cryptographic materials: a fresh file key under the session master
+        master = self._encryption_master(password)
+        salt = secrets.token_bytes(self.config.salt_size)
+        prefix = secrets.token_bytes(NONCE_PREFIX_SIZE)
+        key = self._file_key(master.key, salt)
+        zeroize(master.key)
+        aead = AESGCM(bytes(key))  # AESGCM may keep the buffer; zeroize only our copy
+        zeroize(key)
+        segment_size = self.config.segment_size
+        
+        header = STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, segment_size, prefix)
+        sink.write(header)
+        content_hash = hashlib.sha256()
+        encrypted_hash = hashlib.sha256(header)
+        content_size = 0
+        
+        # Read one segment ahead so the final one can be flagged
         self.frame_monitor.start_frame()
-        encrypted_content = b""
-        
-        # Process in chunks to maintain frame budget
-        for i in range(0, len(content), self.config.chunk_size):
-            chunk = content[i:i + self.config.chunk_size]
-            encrypted_content += encryptor.update(chunk)
+        index = 0
+        segment = self._read_segment(source, segment_size)
+        while True:
+            following = self._read_segment(source, segment_size) if len(segment) == segment_size else b""
+            last = not following
+            sealed = aead.encrypt(self._segment_nonce(prefix, index, last), segment, header)
+            sink.write(sealed)
+            content_hash.update(segment)
+            encrypted_hash.update(sealed)
+            content_size += len(segment)
             self.frame_monitor.yield_if_needed()
+            if last:
+                break
+            segment = following
+            index += 1
             
-        encryptor.finalize()
-        tag = encryptor.tag
-        
-        # Calculate encrypted content hash
-        encrypted_hash = hashlib.sha256(encrypted_content + tag).hexdigest()
-        
-        # Create metadata
-        metadata = EncryptionMetadata(
+        return EncryptionMetadata(
             algorithm=self.config.algorithm,
-            key_derivation=self.config.key_derivation,
-            iterations=self.config.iterations,
+            key_derivation=HIERARCHICAL_KEY_DERIVATION,
+            iterations=master.iterations,
             salt=salt.hex(),
-            nonce=nonce.hex(),
-            tag=tag.hex(),
-            content_hash=content_hash,
-            encrypted_hash=encrypted_hash,
+            nonce=prefix.hex(),
+            tag=sealed[-self.config.tag_size:].hex(),  # Final segment's tag
+            content_hash=content_hash.hexdigest(),
+            encrypted_hash=encrypted_hash.hexdigest(),
             timestamp=timestamp,
             user_consent=True,
-            export_purpose=export_purpose
+            export_purpose=export_purpose,
+            format=STREAM_FORMAT,
+            segment_size=segment_size,
+            content_size=content_size,
+            master_salt=master.salt.hex()
         )
         
-        return encrypted_content + tag, metadata
+    @staticmethod
+    def _read_segment(source: BinaryIO, size: int) -> bytes:
+        """Read exactly size bytes unless the stream ends (pipes may return short reads)"""
+        data = source.read(size)
+        if not data or len(data) == size:
+            return data
+        parts = [data]
+        remaining = size - len(data)
+        while remaining:
+            more = source.read(remaining)
+            if not more:
+                break
+            parts.append(more)
+            remaining -= len(more)
+        return b"".join(parts)
+        
+    def _read_stream_header(self, source: BinaryIO) -> Tuple[bytes, int, bytes]:
+        """Read and check the stream header; returns (header, segment_size, nonce prefix)"""
+        header = source.read(STREAM_HEADER.size)
+        if len(header) != STREAM_HEADER.size:
+            raise ValueError("Encrypted stream is truncated")
+        magic, version, segment_size, prefix = STREAM_HEADER.unpack(header)
+        if magic != STREAM_MAGIC or version != STREAM_VERSION or segment_size <= 0:
+            raise ValueError("Not a WF-OPS-003 encrypted stream")
+        return header, segment_size, prefix
+        
+    def _stream_layout(self, body_size: int, segment_size: int) -> Tuple[int, int]:
+        """(segment count, size of the final sealed segment) for a stream body"""
+        sealed_size = segment_size + self.config.tag_size
+        count = max(1, -(-body_size // sealed_size))
+        last_size = body_size - (count - 1) * sealed_size
+        if last_size < self.config.tag_size:
+            raise ValueError("Encrypted stream is truncated")
+        return count, last_size
+        
+    def decrypt_stream(self, source: BinaryIO, sink: BinaryIO, metadata: EncryptionMetadata,
+                       password: str, body_size: int) -> None:
+        """
+        Decrypt a segmented stream into sink with constant memory
+        
+        body_size is the number of bytes after the header. Plaintext of a
+        segment is only written once its tag has verified; a failure part
+        way leaves a partial sink, which callers discard.
+        """
+        header, segment_size, prefix = self._read_stream_header(source)
+        if prefix.hex() != metadata.nonce:
+            raise ValueError("Encrypted stream does not match its metadata")
+        count, last_size = self._stream_layout(body_size, segment_size)
+        key = self._metadata_key(metadata, password)
+        aead = AESGCM(bytes(key))  # AESGCM may keep the buffer; zeroize only our copy
+        zeroize(key)
+        sealed_size = segment_size + self.config.tag_size
+        
+        content_hash = hashlib.sha256()
+        encrypted_hash = hashlib.sha256(header)
+        self.frame_monitor.start_frame()
+        for index in range(count):
+            last = index == count - 1
+            sealed = source.read(last_size if last else sealed_size)
+            encrypted_hash.update(sealed)
+            try:
+                segment = aead.decrypt(self._segment_nonce(prefix, index, last), sealed, header)
+            except InvalidTag:
+                raise ValueError(f"Encrypted segment {index} failed authentication") from None
+            sink.write(segment)
+            content_hash.update(segment)
+            self.frame_monitor.yield_if_needed()
+            
+        if encrypted_hash.hexdigest() != metadata.encrypted_hash:
+            raise ValueError("Encrypted content integrity check failed")
+        if content_hash.hexdigest() != metadata.content_hash:
+            raise ValueError("Decrypted content integrity check failed")
+        
+    def encrypt_content(self, content: bytes, password: str, 
+                       export_purpose: str = "backup_export") -> Tuple[bytes, EncryptionMetadata]:
+        """Encrypt content with segmented AES-256-GCM"""
+        sink = io.BytesIO()
+        metadata = self.encrypt_stream(io.BytesIO(content), sink, password, export_purpose,
+                                       size_hint=len(content))
+        return sink.getvalue(), metadata
         
     def decrypt_content(self, encrypted_data: bytes, metadata: EncryptionMetadata, 
                        password: str) -> bytes:
         """Decrypt content with AES-256-GCM"""
+        if metadata.format == STREAM_FORMAT:
+            sink = io.BytesIO()
+            self.decrypt_stream(io.BytesIO(encrypted_data), sink, metadata, password,
+                                len(encrypted_data) - STREAM_HEADER.size)
+            return sink.getvalue()
+        return self._decrypt_single_shot(encrypted_data, metadata, password)
+        
+    def _decrypt_single_shot(self, encrypted_data: bytes, metadata: EncryptionMetadata,
+                             password: str) -> bytes:
+        """Decrypt an export written before segmented streams (one GCM message)"""
         # Extract tag from encrypted data
         tag = encrypted_data[-self.config.tag_size:]
-        encrypted_content = encrypted_data[:-self.config.tag_size]
+        encrypted_content = memoryview(encrypted_data)[:-self.config.tag_size]
         
         # Verify encrypted content hash
         calculated_hash = hashlib.sha256(encrypted_data).hexdigest()
@@ -184,28 +502,29 @@ class EncryptionHelper:
             raise ValueError("Encrypted content integrity check failed")
             
         # Derive key
-        salt = bytes.fromhex(metadata.salt)
         nonce = bytes.fromhex(metadata.nonce)
-        key = self.derive_key(password, salt)
+        key = self._metadata_key(metadata, password)
         
         # Decrypt content
         cipher = Cipher(
-            algorithms.AES(key),
+            algorithms.AES(bytes(key)),
             modes.GCM(nonce, tag),
             backend=default_backend()
         )
         decryptor = cipher.decryptor()
+        zeroize(key)
         
         self.frame_monitor.start_frame()
-        decrypted_content = b""
+        decrypted_chunks = []
         
         # Process in chunks to maintain frame budget
         for i in range(0, len(encrypted_content), self.config.chunk_size):
             chunk = encrypted_content[i:i + self.config.chunk_size]
-            decrypted_content += decryptor.update(chunk)
+            decrypted_chunks.append(decryptor.update(chunk))
             self.frame_monitor.yield_if_needed()
             
         decryptor.finalize()
+        decrypted_content = b"".join(decrypted_chunks)
         
         # Verify original content hash
         calculated_hash = hashlib.sha256(decrypted_content).hexdigest()
@@ -214,22 +533,24 @@ class EncryptionHelper:
             
         return decrypted_content
         
+    def _load_metadata(self, encrypted_path: Path) -> EncryptionMetadata:
+        metadata_path = encrypted_path.with_suffix(encrypted_path.suffix + '.meta')
+        if not metadata_path.exists():
+            raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+            
+        with open(metadata_path, 'r') as f:
+            return EncryptionMetadata(**json.load(f))
+        
     def encrypt_file(self, file_path: Path, output_path: Path, password: str,
                     export_purpose: str = "file_export") -> EncryptionMetadata:
         """Encrypt a file and save encrypted version"""
         if not file_path.exists():
             raise FileNotFoundError(f"Source file not found: {file_path}")
             
-        # Read file content
-        with open(file_path, 'rb') as f:
-            content = f.read()
-            
-        # Encrypt content
-        encrypted_data, metadata = self.encrypt_content(content, password, export_purpose)
-        
-        # Write encrypted file
-        with open(output_path, 'wb') as f:
-            f.write(encrypted_data)
+        # Stream file to file, one segment in memory at a time
+        with open(file_path, 'rb') as src, open(output_path, 'wb') as dst:
+            metadata = self.encrypt_stream(src, dst, password, export_purpose,
+                                           size_hint=os.fstat(src.fileno()).st_size)
             
         # Write metadata file
         metadata_path = output_path.with_suffix(output_path.suffix + '.meta')
@@ -246,24 +567,26 @@ class EncryptionHelper:
             raise FileNotFoundError(f"Encrypted file not found: {encrypted_path}")
             
         # Read metadata
-        metadata_path = encrypted_path.with_suffix(encrypted_path.suffix + '.meta')
-        if not metadata_path.exists():
-            raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
-            
-        with open(metadata_path, 'r') as f:
-            metadata_dict = json.load(f)
-            metadata = EncryptionMetadata(**metadata_dict)
-            
-        # Read encrypted content
-        with open(encrypted_path, 'rb') as f:
-            encrypted_data = f.read()
-            
-        # Decrypt content
-        decrypted_content = self.decrypt_content(encrypted_data, metadata, password)
+        metadata = self._load_metadata(encrypted_path)
         
-        # Write decrypted file
-        with open(output_path, 'wb') as f:
-            f.write(decrypted_content)
+        if metadata.format != STREAM_FORMAT:
+            with open(encrypted_path, 'rb') as f:
+                decrypted_content = self._decrypt_single_shot(f.read(), metadata, password)
+            with open(output_path, 'wb') as f:
+                f.write(decrypted_content)
+            logger.info(f"File decrypted: {encrypted_path} -> {output_path}")
+            return True
+            
+        # Decrypt next to the output and rename, so a failed check leaves no partial file
+        tmp_path = output_path.with_name(output_path.name + '.partial')
+        try:
+            with open(encrypted_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                body_size = os.fstat(src.fileno()).st_size - STREAM_HEADER.size
+                self.decrypt_stream(src, dst, metadata, password, body_size)
+            os.replace(tmp_path, output_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
             
         logger.info(f"File decrypted: {encrypted_path} -> {output_path}")
         return True
@@ -280,64 +603,68 @@ class EncryptionHelper:
         encrypted_manifest = backup_manifest.copy()
         encrypted_files = []
         
-        # Encrypt each file in the backup
-        for file_entry in backup_manifest.get('files', []):
-            file_path = Path(file_entry['path'])
-            if not file_path.exists():
-                logger.warning(f"File not found for encryption: {file_path}")
-                continue
-                
-            # Create encrypted file path
-            encrypted_path = file_path.with_suffix(file_path.suffix + '.enc')
-            
-            try:
-                metadata = self.encrypt_file(file_path, encrypted_path, password, export_purpose)
-                
-                # Update file entry with encryption info
-                encrypted_entry = file_entry.copy()
-                encrypted_entry['encrypted'] = True
-                encrypted_entry['encrypted_path'] = str(encrypted_path)
-                encrypted_entry['encryption_metadata'] = asdict(metadata)
-                encrypted_files.append(encrypted_entry)
+        # One export session: PBKDF2 runs once, each file gets an HKDF key
+        self.end_export_session()
+        try:
+            # Encrypt each file in the backup
+            for file_entry in backup_manifest.get('files', []):
+                file_path = Path(file_entry['path'])
+                if not file_path.exists():
+                    logger.warning(f"File not found for encryption: {file_path}")
+                    continue
+                    
+                # Create encrypted file path
+                encrypted_path = file_path.with_suffix(file_path.suffix + '.enc')
                 
-            except Exception as e:
-                logger.error(f"Failed to encrypt file {file_path}: {e}")
-                continue
+                try:
+                    metadata = self.encrypt_file(file_path, encrypted_path, password, export_purpose)
+                    
+                    # Update file entry with encryption info
+                    encrypted_entry = file_entry.copy()
+                    encrypted_entry['encrypted'] = True
+                    encrypted_entry['encrypted_path'] = str(encrypted_path)
+                    encrypted_entry['encryption_metadata'] = asdict(metadata)
+                    encrypted_files.append(encrypted_entry)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to encrypt file {file_path}: {e}")
+                    continue
+        finally:
+            self.end_export_session()
                 
         # Update manifest
         encrypted_manifest['files'] = encrypted_files
         encrypted_manifest['encrypted'] = True
         encrypted_manifest['encryption_config'] = {
             'algorithm': self.config.algorithm,
-            'key_derivation': self.config.key_derivation,
+            'key_derivation': HIERARCHICAL_KEY_DERIVATION,
+            'iterations': self.config.iterations,
             'export_purpose': export_purpose,
             'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         }
         
         return encrypted_manifest
         
-    def verify_encryption_integrity(self, encrypted_path: Path) -> bool:
-        """Verify integrity of encrypted file"""
+    def verify_encryption_integrity(self, encrypted_path: Path,
+                                    password: Optional[str] = None) -> bool:
+        """
+        Verify integrity of encrypted file
+        
+        Without a password the SHA-256 of the encrypted file is checked
+        against its metadata. With one, every segment of a segmented stream
+        is authenticated, across verify_workers threads each reading its
+        own segments, which also proves the data decrypts under that key.
+        """
         try:
-            metadata_path = encrypted_path.with_suffix(encrypted_path.suffix + '.meta')
+            metadata = self._load_metadata(encrypted_path)
             
-            if not metadata_path.exists():
-                logger.error(f"Metadata file missing: {metadata_path}")
-                return False
-                
-            # Read metadata
-            with open(metadata_path, 'r') as f:
-                metadata_dict = json.load(f)
-                metadata = EncryptionMetadata(**metadata_dict)
+            if password is not None and metadata.format == STREAM_FORMAT:
+                ok = self._verify_segments(encrypted_path, metadata, password)
+            else:
+                ok = self._file_sha256(encrypted_path) == metadata.encrypted_hash
                 
-            # Read encrypted file
-            with open(encrypted_path, 'rb') as f:
-                encrypted_data = f.read()
-                
-            # Verify encrypted content hash
-            calculated_hash = hashlib.sha256(encrypted_data).hexdigest()
-            if calculated_hash != metadata.encrypted_hash:
-                logger.error(f"Encrypted content hash mismatch: {encrypted_path}")
+            if not ok:
+                logger.error(f"Encrypted content integrity check failed: {encrypted_path}")
                 return False
                 
             logger.info(f"Encryption integrity verified: {encrypted_path}")
@@ -346,6 +673,47 @@ class EncryptionHelper:
         except Exception as e:
             logger.error(f"Failed to verify encryption integrity: {e}")
             return False
+            
+    def _file_sha256(self, path: Path) -> str:
+        hash_obj = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.config.segment_size), b''):
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+        
+    def _verify_segments(self, encrypted_path: Path, metadata: EncryptionMetadata,
+                         password: str) -> bool:
+        """Authenticate every segment of a stream in parallel"""
+        with open(encrypted_path, 'rb') as f:
+            header, segment_size, prefix = self._read_stream_header(f)
+            body_size = os.fstat(f.fileno()).st_size - STREAM_HEADER.size
+        if prefix.hex() != metadata.nonce:
+            return False
+        count, last_size = self._stream_layout(body_size, segment_size)
+        key = self._metadata_key(metadata, password)
+        aead = AESGCM(bytes(key))  # AESGCM may keep the buffer; zeroize only our copy
+        zeroize(key)
+        sealed_size = segment_size + self.config.tag_size
+        workers = max(1, min(self.config.verify_workers, count))
+        
+        def verify_range(first: int, stop: int) -> bool:
+            with open(encrypted_path, 'rb') as f:
+                f.seek(STREAM_HEADER.size + first * sealed_size)
+                for index in range(first, stop):
+                    last = index == count - 1
+                    sealed = f.read(last_size if last else sealed_size)
+                    try:
+                        aead.decrypt(self._segment_nonce(prefix, index, last), sealed, header)
+                    except InvalidTag:
+                        logger.error(f"Encrypted segment {index} failed authentication: {encrypted_path}")
+                        return False
+            return True
+            
+        # Contiguous runs of segments per worker keep reads sequential
+        bounds = [count * i // workers for i in range(workers + 1)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wf-enc-verify") as pool:
+            results = pool.map(verify_range, bounds[:-1], bounds[1:])
+            return all(results)
 
 def main():
     """Example usage of encryption helper"""
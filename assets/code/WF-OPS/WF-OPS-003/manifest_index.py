@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+WF-OPS-003 Manifest Index
+Path-keyed view of a backup chain for incremental change detection
+
+An incremental backup only lists files that changed, so "what did this path
+look like last time" can live in any ancestor back to the full backup. The
+index merges the chain once, nearest backup first, into a dict keyed by
+path. Each completed backup persists its merged view as chain-index.json
+next to its manifest, so the next backup loads one file instead of walking
+and parsing every manifest in the chain.
+
+Files whose (size, mtime_ns, inode) still match the index are unchanged and
+are skipped without being read. A file modified within RACY_WINDOW_NS of the
+moment it was backed up is recorded with mtime_ns 0: on filesystems with
+coarse timestamps a later write could keep the same mtime, so such files
+are always hashed.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+INDEX_FILENAME = "chain-index.json"
+INDEX_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000  # FAT mtime granularity
+
+
+class IndexEntry(NamedTuple):
+    """Last backed-up state of one path"""
+    size: int
+    mtime_ns: int  # 0 when unknown or too recent to trust
+    inode: int
+    sha256: str
+    backup_id: str  # Backup in the chain that holds this version
+
+
+def trusted_mtime_ns(stat: os.stat_result, now_ns: Optional[int] = None) -> int:
+    """stat's mtime_ns, or 0 if it is too close to now to rule out a same-tick write"""
+    now_ns = time.time_ns() if now_ns is None else now_ns
+    if stat.st_mtime_ns >= now_ns - RACY_WINDOW_NS:
+        return 0
+    return stat.st_mtime_ns
+
+
+class ManifestIndex:
+    """
+    Merged path -> IndexEntry view of a backup and its ancestors
+
+    base_backup_id is the full backup the chain starts from (or the oldest
+    backup reached if the chain is broken).
+    """
+
+    def __init__(self, backup_id: Optional[str], base_backup_id: Optional[str],
+                 entries: Optional[Dict[str, IndexEntry]] = None):
+        self.backup_id = backup_id
+        self.base_backup_id = base_backup_id
+        self.entries: Dict[str, IndexEntry] = entries or {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, path: str) -> Optional[IndexEntry]:
+        return self.entries.get(path)
+
+    @staticmethod
+    def metadata_matches(entry: IndexEntry, stat: os.stat_result) -> bool:
+        """True if stat shows the file untouched since entry was recorded"""
+        return (entry.mtime_ns != 0
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+                and entry.inode == stat.st_ino)
+
+    @classmethod
+    def load(cls, backup_root: Path, backup_id: str) -> "ManifestIndex":
+        """
+        Index for backup_id and its ancestors
+
+        Uses the persisted chain index when present; otherwise walks the
+        manifests towards the full backup, stopping early at any ancestor
+        that has a chain index. A missing backup yields an empty index.
+        """
+        backup_root = Path(backup_root)
+        entries: Dict[str, IndexEntry] = {}
+        base_backup_id = backup_id
+        seen = set()
+        current: Optional[str] = backup_id
+
+        while current and current not in seen:
+            seen.add(current)
+            base_backup_id = current
+            backup_dir = backup_root / current
+
+            persisted = cls._read_persisted(backup_dir / INDEX_FILENAME)
+            if persisted is not None:
+                for path, entry in persisted.entries.items():
+                    entries.setdefault(path, entry)
+                base_backup_id = persisted.base_backup_id
+                break
+
+            try:
+                with open(backup_dir / "manifest.json", 'r') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                break
+
+            for item in manifest.get("items", []):
+                entries.setdefault(item["path"], IndexEntry(
+                    item["size"], item.get("mtime_ns", 0), item.get("inode", 0),
+                    item["sha256"], current))
+
+            if manifest.get("strategy") == "full":
+                break
+            current = manifest.get("dependencies", {}).get("parent_backup_id")
+
+        return cls(backup_id, base_backup_id, entries)
+
+    @classmethod
+    def _read_persisted(cls, path: Path) -> Optional["ManifestIndex"]:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        backup_id = data["backup_id"]
+        entries = {p: IndexEntry(size, mtime_ns, inode, sha256, owner or backup_id)
+                   for p, (size, mtime_ns, inode, sha256, owner) in data["entries"].items()}
+        return cls(backup_id, data["base_backup_id"], entries)
+
+    def extend(self, backup_id: str, items: Iterable[Any], full: bool = False) -> "ManifestIndex":
+        """
+        Index for a new backup built on this one
+
+        items are the new backup's BackupItems. A full backup starts a new
+        chain and does not inherit entries.
+        """
+        entries = {} if full else dict(self.entries)
+        for item in items:
+            entries[item.path] = IndexEntry(item.size, item.mtime_ns, item.inode,
+                                            item.sha256, backup_id)
+        base_backup_id = backup_id if full or not self.base_backup_id else self.base_backup_id
+        return ManifestIndex(backup_id, base_backup_id, entries)
+
+    def save(self, backup_dir: Path):
+        """Persist next to the backup's manifest"""
+        # Entries owned by this backup store None to keep the file compact
+        data = {
+            "version": INDEX_VERSION,
+            "backup_id": self.backup_id,
+            "base_backup_id": self.base_backup_id,
+            "created_utc": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "entries": {path: [e.size, e.mtime_ns, e.inode, e.sha256,
+                               None if e.backup_id == self.backup_id else e.backup_id]
+                        for path, e in self.entries.items()}
+        }
+        tmp_path = Path(backup_dir) / (INDEX_FILENAME + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, Path(backup_dir) / INDEX_FILENAME)
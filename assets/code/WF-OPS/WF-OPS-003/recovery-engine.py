@@ -20,6 +20,8 @@ from pathlib import Path
 import threading
 import tempfile
 
+from chunk_store import ChunkStore
+
 @dataclass
 class RecoveryPlan:
     """Recovery plan configuration"""
@@ -62,6 +64,7 @@ class WirthForgeRecoveryEngine:
         self.current_recovery: Optional[RecoveryState] = None
         self.progress_callback: Optional[Callable] = None
         self.emergency_backup_path: Optional[Path] = None
+        self._chunk_store: Optional[ChunkStore] = None
         
         # Ensure directories exist
         self.temp_root.mkdir(parents=True, exist_ok=True)
@@ -220,13 +223,16 @@ class WirthForgeRecoveryEngine:
             
             # Verify each file
             for item in manifest.get("items", []):
-                file_path = backup_dir / item["path"]
-                if not file_path.exists():
-                    self.logger.error(f"Backup file missing: {item['path']}")
-                    return False
+                if "chunks" in item:
+                    actual_hash = self._calculate_chunked_hash(item)
+                else:
+                    file_path = backup_dir / item["path"]
+                    if not file_path.exists():
+                        self.logger.error(f"Backup file missing: {item['path']}")
+                        return False
+                    actual_hash = self._calculate_file_hash(file_path)
                 
-                # Calculate and verify hash
-                actual_hash = self._calculate_file_hash(file_path)
+                # Verify hash
                 expected_hash = item["sha256"]
                 
                 if actual_hash != expected_hash:
@@ -432,6 +438,14 @@ class WirthForgeRecoveryEngine:
             # Ensure target directory exists
             target_path.parent.mkdir(parents=True, exist_ok=True)
             
+            # Reassemble chunked items from the chunk store
+            if "chunks" in item:
+                copied_hash = self._restore_chunked_item(item, target_path)
+                if copied_hash != item["sha256"]:
+                    self.logger.error(f"Hash verification failed for {item['path']}")
+                    return False
+                return True
+            
             # Copy file with verification if enabled
             if plan.safety_checks.get("during_recovery", {}).get("verify_file_hashes", True):
                 copied_hash = self._copy_with_verification(source_path, target_path)
@@ -461,6 +475,23 @@ class WirthForgeRecoveryEngine:
         
         return hash_obj.hexdigest()
     
+    def _get_chunk_store(self) -> ChunkStore:
+        """Chunk store shared by the backups under backup_root"""
+        if self._chunk_store is None:
+            self._chunk_store = ChunkStore(self.backup_root / "chunks")
+        return self._chunk_store
+    
+    def _restore_chunked_item(self, item: Dict, target_path: Path) -> str:
+        """Write a chunked item's chunks to target_path; returns the SHA-256 written"""
+        hash_obj = hashlib.sha256()
+        
+        with open(target_path, 'wb') as dst:
+            for data in self._get_chunk_store().iter_file(item["chunks"]):
+                dst.write(data)
+                hash_obj.update(data)
+        
+        return hash_obj.hexdigest()
+    
     def _execute_post_recovery_checks(self, plan: RecoveryPlan) -> bool:
         """Execute post-recovery validation"""
         self._update_progress(85, "Post-recovery validation")
@@ -652,6 +683,13 @@ class WirthForgeRecoveryEngine:
                 hash_obj.update(chunk)
         return hash_obj.hexdigest()
     
+    def _calculate_chunked_hash(self, item: Dict) -> str:
+        """Calculate SHA-256 of a chunked item without reassembling it on disk"""
+        hash_obj = hashlib.sha256()
+        for data in self._get_chunk_store().iter_file(item["chunks"]):
+            hash_obj.update(data)
+        return hash_obj.hexdigest()
+    
     def _calculate_backup_size(self, backup_id: str) -> int:
         """Calculate total size of backup"""
         try:
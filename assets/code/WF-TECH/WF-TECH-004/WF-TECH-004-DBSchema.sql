@@ -1,7 +1,7 @@
 -- WF-TECH-004 Database Schema Definition
 -- WIRTHFORGE State Management & Storage System
 -- Local SQLite Database Schema for Energy State, Session History, and User Progress
--- Version: 1.0.0
+-- Version: 1.1.0
 -- Compatible with: SQLite 3.35+, MariaDB 10.5+ (local only)
 
 -- Enable foreign key constraints (SQLite specific)
@@ -82,7 +82,7 @@ CREATE TABLE IF NOT EXISTS snapshot (
     session_id TEXT NOT NULL,
     timestamp TEXT NOT NULL,
     snapshot_type TEXT NOT NULL DEFAULT 'periodic' CHECK (snapshot_type IN ('periodic', 'session_end', 'migration', 'manual')),
-    state TEXT NOT NULL, -- JSON blob of serialized state
+    state BLOB NOT NULL, -- Encoded full base or delta against the previous snapshot
     last_event_id INTEGER NULL,
     energy_accumulator REAL NOT NULL DEFAULT 0.0,
     frame_count INTEGER NOT NULL DEFAULT 0,
@@ -90,10 +90,7 @@ CREATE TABLE IF NOT EXISTS snapshot (
     created_at TEXT NOT NULL DEFAULT (datetime('now', 'utc')),
     
     FOREIGN KEY (session_id) REFERENCES session(session_id) ON DELETE CASCADE,
-    FOREIGN KEY (last_event_id) REFERENCES event(event_id) ON DELETE SET NULL,
-    
-    -- Validate JSON structure
-    CHECK (json_valid(state))
+    FOREIGN KEY (last_event_id) REFERENCES event(event_id) ON DELETE SET NULL
 );
 
 -- =============================================================================
@@ -272,7 +269,7 @@ CREATE TABLE IF NOT EXISTS schema_info (
 );
 
 -- Insert current schema version
-INSERT OR REPLACE INTO schema_info (key, value) VALUES ('version', '1.0.0');
+INSERT OR REPLACE INTO schema_info (key, value) VALUES ('version', '1.1.0');
 INSERT OR REPLACE INTO schema_info (key, value) VALUES ('created_at', datetime('now', 'utc'));
 INSERT OR REPLACE INTO schema_info (key, value) VALUES ('description', 'WIRTHFORGE State Management & Storage Schema');
 
@@ -355,10 +352,16 @@ VALUES ('20250817T194800Z_001', '2025-08-17T19:48:10.000Z',
 -- MIGRATION SUPPORT
 -- =============================================================================
 
+-- 1.0.0 -> 1.1.0 (WF-TECH-004-MIGRATION-001): snapshot.state became BLOB and
+-- the CHECK (json_valid(state)) was dropped so encoded base/delta snapshots
+-- can be stored. SQLite cannot alter a column in place, so StateManager
+-- rebuilds the snapshot table on first open of a 1.0.0 database
+-- (StateManager._migrate_db_schema) and bumps schema_info.version.
+
 -- Future schema migrations would add entries here:
 -- Example:
 -- ALTER TABLE user ADD COLUMN new_field TEXT DEFAULT NULL;
--- UPDATE schema_info SET value = '1.1.0' WHERE key = 'version';
+-- UPDATE schema_info SET value = '1.2.0' WHERE key = 'version';
 
 -- =============================================================================
 -- END OF SCHEMA DEFINITION
@@ -6,6 +6,11 @@ WIRTHFORGE State Management & Storage System
 This tool reads events from a session log and replays them through a simulated
 pipeline to reproduce outputs and validate deterministic behavior.
 
+Long sessions can be replayed in streaming mode: events are read from the
+database cursor (or the binary event log) in chunks, optionally restricted to
+a frame or timestamp window, and only rolling summary statistics are kept.
+Independent sessions can be replayed across a process pool.
+
 Version: 1.0.0
 Compatible with: Python 3.11+, SQLite 3.35+
 """
@@ -13,10 +18,14 @@ Compatible with: Python 3.11+, SQLite 3.35+
 import sqlite3
 import json
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import argparse
+import importlib.util
+import multiprocessing
 import sys
 from dataclasses import dataclass, asdict
 import time
@@ -25,6 +34,11 @@ import time
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Streaming replay defaults
+DEFAULT_CHUNK_SIZE = 2000      # Rows fetched from the cursor per round trip
+SUMMARY_SAMPLE_SIZE = 50       # Replay results kept verbatim in a summary
+PROGRESS_INTERVAL = 10000      # Events between progress log lines when streaming
+
 @dataclass
 class ReplayState:
     """State tracking during replay"""
@@ -43,6 +57,50 @@ class ReplayState:
         if self.energy_peaks is None:
             self.energy_peaks = []
 
+class ReplaySummary:
+    """
+    Rolling replay statistics
+
+    Memory stays constant regardless of session length: per-type counters,
+    error/warning totals, the covered frame and timestamp range, the first
+    sample_size results verbatim and the last few results with errors.
+    """
+
+    def __init__(self, sample_size: int = SUMMARY_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.total_events = 0
+        self.errors = 0
+        self.warnings = 0
+        self.event_types: Dict[str, int] = {}
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+        self.first_frame: Optional[int] = None
+        self.last_frame: Optional[int] = None
+        self.sample: List[Dict[str, Any]] = []
+        self.recent_errors: deque = deque(maxlen=10)
+
+    def add(self, event: Dict[str, Any], result: Dict[str, Any]):
+        """Fold one replay result into the summary"""
+        self.total_events += 1
+        event_type = result['type']
+        self.event_types[event_type] = self.event_types.get(event_type, 0) + 1
+        self.warnings += len(result['validation_notes'])
+        if result.get('error'):
+            self.errors += 1
+            self.recent_errors.append(result)
+
+        if self.first_timestamp is None:
+            self.first_timestamp = result['timestamp']
+        self.last_timestamp = result['timestamp']
+        frame_id = event.get('frame_id')
+        if frame_id is not None:
+            if self.first_frame is None:
+                self.first_frame = frame_id
+            self.last_frame = frame_id
+
+        if len(self.sample) < self.sample_size:
+            self.sample.append(result)
+
 class EventReplayer:
     """
     Event replay system for debugging and validation
@@ -57,15 +115,22 @@ class EventReplayer:
         self.replay_log: List[Dict[str, Any]] = []
         self.validation_errors: List[str] = []
         
+    def _open_db(self) -> bool:
+        """Open the session database once"""
+        if self.db is not None:
+            return True
+        if not self.db_path or not self.db_path.exists():
+            logger.error(f"Database file not found: {self.db_path}")
+            return False
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        return True
+
     def load_events_from_db(self, session_id: str) -> bool:
         """Load events from database for a specific session"""
         try:
-            if not self.db_path or not self.db_path.exists():
-                logger.error(f"Database file not found: {self.db_path}")
+            if not self._open_db():
                 return False
-                
-            self.db = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.db.row_factory = sqlite3.Row
             
             # Get session info
             session_info = self.db.execute("""
@@ -108,6 +173,100 @@ class EventReplayer:
         except Exception as e:
             logger.error(f"Failed to load events from database: {e}")
             return False
+
+    def iter_events_from_db(self, session_id: str,
+                            start_frame: Optional[int] = None, end_frame: Optional[int] = None,
+                            start_time: Optional[str] = None, end_time: Optional[str] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a session's events in chronological order, chunk_size rows at a time
+
+        A frame range is resolved to the timestamp window spanning those
+        frames (idx_event_frame_id), so events without a frame_id that fall
+        inside the window are replayed too. The window itself is read as a
+        range scan on idx_event_session_timestamp.
+        """
+        if not self._open_db():
+            return
+
+        if start_frame is not None or end_frame is not None:
+            window = self._frame_time_range_db(session_id, start_frame, end_frame)
+            if window is None:
+                logger.warning(f"No frames in [{start_frame}, {end_frame}] for session {session_id}")
+                return
+            start_time = max(start_time, window[0]) if start_time else window[0]
+            end_time = min(end_time, window[1]) if end_time else window[1]
+
+        query = ["SELECT event_id, timestamp, type, data, frame_id, energy_delta",
+                 "FROM event WHERE session_id = ?"]
+        params: List[Any] = [session_id]
+        if start_time is not None:
+            query.append("AND timestamp >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            query.append("AND timestamp <= ?")
+            params.append(end_time)
+        query.append("ORDER BY timestamp ASC")
+
+        cursor = self.db.execute(" ".join(query), params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for event_id, timestamp, event_type, data, frame_id, energy_delta in rows:
+                    yield {
+                        'event_id': event_id,
+                        'timestamp': timestamp,
+                        'type': event_type,
+                        'data': json.loads(data),
+                        'frame_id': frame_id,
+                        'energy_delta': energy_delta
+                    }
+        finally:
+            cursor.close()
+
+    def _frame_time_range_db(self, session_id: str, start_frame: Optional[int],
+                             end_frame: Optional[int]) -> Optional[Tuple[str, str]]:
+        query = "SELECT MIN(timestamp), MAX(timestamp) FROM event WHERE session_id = ? AND frame_id IS NOT NULL"
+        params: List[Any] = [session_id]
+        if start_frame is not None:
+            query += " AND frame_id >= ?"
+            params.append(start_frame)
+        if end_frame is not None:
+            query += " AND frame_id <= ?"
+            params.append(end_frame)
+        first, last = self.db.execute(query, params).fetchone()
+        return (first, last) if first is not None else None
+
+    def iter_events_from_log(self, log_dir: str, session_id: str,
+                             start_frame: Optional[int] = None, end_frame: Optional[int] = None,
+                             start_time: Optional[str] = None,
+                             end_time: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a session's events from the StateManager binary event log
+
+        Blocks outside the requested window are skipped via the log's sparse
+        index. Events come back in write order, which is the order the
+        StateManager processed them. The log is opened read-only, so a torn
+        tail from a live or crashed writer is skipped rather than truncated.
+        """
+        log = _load_state_module().EventLog(Path(log_dir), read_only=True)
+        if not log.has_session(session_id):
+            logger.error(f"Session {session_id} not found in event log {log_dir}")
+            return
+        session_log = log.session(session_id)
+        try:
+            if start_frame is not None or end_frame is not None:
+                window = session_log.frame_time_range(start_frame, end_frame)
+                if window is None:
+                    logger.warning(f"No frames in [{start_frame}, {end_frame}] for session {session_id}")
+                    return
+                start_time = max(start_time, window[0]) if start_time else window[0]
+                end_time = min(end_time, window[1]) if end_time else window[1]
+            yield from session_log.iter_events(start_time, end_time)
+        finally:
+            log.close()
     
     def load_events_from_json(self) -> bool:
         """Load events from JSON file"""
@@ -137,12 +296,14 @@ class EventReplayer:
             logger.error(f"Failed to load events from JSON: {e}")
             return False
     
-    def replay_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+    def replay_event(self, event: Dict[str, Any], capture_state: bool = True) -> Dict[str, Any]:
         """
         Replay a single event and update state
         
         Args:
             event: Event to replay
+            capture_state: Whether to copy the full state before and after
+                the event into the result (skipped when streaming)
             
         Returns:
             Dict containing replay result and state changes
@@ -155,7 +316,7 @@ class EventReplayer:
             'event_id': event.get('event_id'),
             'timestamp': timestamp,
             'type': event_type,
-            'state_before': asdict(self.replay_state),
+            'state_before': asdict(self.replay_state) if capture_state else None,
             'state_changes': {},
             'validation_notes': []
         }
@@ -197,7 +358,8 @@ class EventReplayer:
             
             # Update last timestamp
             self.replay_state.last_timestamp = timestamp
-            result['state_after'] = asdict(self.replay_state)
+            if capture_state:
+                result['state_after'] = asdict(self.replay_state)
             
         except Exception as e:
             result['error'] = str(e)
@@ -389,11 +551,13 @@ class EventReplayer:
         
         logger.info(f"Starting replay of {len(self.events)} events")
         start_time = time.time()
+        rolling = ReplaySummary()
         
         # Process each event
         for i, event in enumerate(self.events):
             result = self.replay_event(event)
             self.replay_log.append(result)
+            rolling.add(event, result)
             
             if verbose:
                 self._print_event_result(result, i + 1)
@@ -405,7 +569,7 @@ class EventReplayer:
         replay_time = time.time() - start_time
         
         # Generate summary
-        summary = self._generate_replay_summary(replay_time)
+        summary = self._generate_replay_summary(replay_time, rolling)
         
         if validate:
             self._run_validation_checks(summary)
@@ -413,6 +577,53 @@ class EventReplayer:
         logger.info(f"Replay completed in {replay_time:.2f} seconds")
         
         return summary
+
+    def run_streaming_replay(self, events: Iterable[Dict[str, Any]], verbose: bool = False,
+                             validate: bool = True,
+                             sample_size: int = SUMMARY_SAMPLE_SIZE) -> Dict[str, Any]:
+        """
+        Replay events from an iterator without materializing them
+
+        Nothing is appended to replay_log and per-event state copies are
+        skipped, so memory does not grow with the number of events. The
+        summary has the same shape as run_replay's, with replay_log holding
+        the first sample_size results.
+
+        Args:
+            events: Event iterator, e.g. from iter_events_from_db()
+            verbose: Whether to output detailed replay information
+            validate: Whether to perform validation checks
+            sample_size: Number of results kept verbatim in the summary
+
+        Returns:
+            Dict containing replay results and statistics
+        """
+        start_time = time.time()
+        rolling = ReplaySummary(sample_size)
+
+        for event in events:
+            result = self.replay_event(event, capture_state=False)
+            rolling.add(event, result)
+
+            if verbose:
+                self._print_event_result(result, rolling.total_events)
+            if rolling.total_events % PROGRESS_INTERVAL == 0:
+                logger.info(f"Processed {rolling.total_events} events")
+
+        if rolling.total_events == 0:
+            logger.error("No events loaded for replay")
+            return {"error": "No events to replay"}
+
+        replay_time = time.time() - start_time
+        summary = self._generate_replay_summary(replay_time, rolling)
+
+        if validate:
+            self._run_validation_checks(summary)
+
+        logger.info(f"Streaming replay of {rolling.total_events} events completed "
+                    f"in {replay_time:.2f} seconds")
+
+        return summary
     
     def _print_event_result(self, result: Dict[str, Any], event_num: int):
         """Print detailed event replay result"""
@@ -432,33 +643,28 @@ class EventReplayer:
             for note in result['validation_notes']:
                 print(f"  ⚠️  {note}")
     
-    def _generate_replay_summary(self, replay_time: float) -> Dict[str, Any]:
+    def _generate_replay_summary(self, replay_time: float, rolling: ReplaySummary) -> Dict[str, Any]:
         """Generate replay summary statistics"""
-        event_types = {}
-        errors = 0
-        warnings = 0
-        
-        for result in self.replay_log:
-            event_type = result['type']
-            event_types[event_type] = event_types.get(event_type, 0) + 1
-            
-            if result.get('error'):
-                errors += 1
-            
-            warnings += len(result.get('validation_notes', []))
-        
+        total = rolling.total_events
         return {
             'replay_statistics': {
-                'total_events': len(self.events),
+                'total_events': total,
                 'replay_time_seconds': replay_time,
-                'events_per_second': len(self.events) / replay_time if replay_time > 0 else 0,
-                'errors': errors,
-                'warnings': warnings
+                'events_per_second': total / replay_time if replay_time > 0 else 0,
+                'errors': rolling.errors,
+                'warnings': rolling.warnings
+            },
+            'event_type_distribution': rolling.event_types,
+            'replay_range': {
+                'first_timestamp': rolling.first_timestamp,
+                'last_timestamp': rolling.last_timestamp,
+                'first_frame': rolling.first_frame,
+                'last_frame': rolling.last_frame
             },
-            'event_type_distribution': event_types,
             'final_state': asdict(self.replay_state),
             'validation_errors': self.validation_errors,
-            'replay_log': self.replay_log if len(self.replay_log) <= 50 else self.replay_log[:50]  # Limit output
+            'recent_errors': list(rolling.recent_errors),
+            'replay_log': rolling.sample  # Limit output
         }
     
     def _run_validation_checks(self, summary: Dict[str, Any]):
@@ -487,10 +693,83 @@ class EventReplayer:
                 f"state_total={final_state.token_count}"
             )
         
-        # Update summary with validation results
-        summary['validation_errors'].extend(self.validation_errors)
+        # Update summary with validation results (the summary shares self.validation_errors)
         summary['validation_passed'] = len(self.validation_errors) == 0
 
+_state_module = None
+
+def _load_state_module():
+    """Load the StateManager module (event log reader) from this directory"""
+    global _state_module
+    if _state_module is None:
+        _state_module = sys.modules.get('wf_tech_004_snapshot_recovery')
+    if _state_module is None:
+        path = Path(__file__).with_name('WF-TECH-004-snapshot-recovery.py')
+        spec = importlib.util.spec_from_file_location('wf_tech_004_snapshot_recovery', path)
+        _state_module = importlib.util.module_from_spec(spec)
+        sys.modules['wf_tech_004_snapshot_recovery'] = _state_module
+        spec.loader.exec_module(_state_module)
+    return _state_module
+
+def _replay_session_worker(task: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Stream-replay one session; runs in a worker process"""
+    session_id = task['session_id']
+    replayer = EventReplayer(task.get('db_path'))
+    window = task['window']
+    try:
+        if task.get('event_log_dir'):
+            events = replayer.iter_events_from_log(task['event_log_dir'], session_id, **window)
+        else:
+            events = replayer.iter_events_from_db(session_id, chunk_size=task['chunk_size'], **window)
+        summary = replayer.run_streaming_replay(events, validate=task['validate'],
+                                                sample_size=task['sample_size'])
+    except Exception as e:
+        summary = {"error": f"Replay failed: {e}"}
+    finally:
+        if replayer.db is not None:
+            replayer.db.close()
+    return session_id, summary
+
+def replay_sessions_parallel(session_ids: List[str], db_path: Optional[str] = None,
+                             event_log_dir: Optional[str] = None, workers: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE, validate: bool = True,
+                             sample_size: int = 0, **window) -> Dict[str, Dict[str, Any]]:
+    """
+    Stream-replay independent sessions across a process pool
+
+    Each worker opens its own connection (or event log) and returns only the
+    session summary. window takes the start_frame/end_frame/start_time/end_time
+    arguments of iter_events_from_db(). workers=1 replays in-process.
+
+    Returns:
+        Dict of session_id -> replay summary, in the order given
+    """
+    tasks = [
+        {
+            'session_id': session_id,
+            'db_path': db_path,
+            'event_log_dir': event_log_dir,
+            'chunk_size': chunk_size,
+            'validate': validate,
+            'sample_size': sample_size,
+            'window': window
+        }
+        for session_id in session_ids
+    ]
+    if workers == 1 or len(tasks) <= 1:
+        return dict(map(_replay_session_worker, tasks))
+
+    # Workers resolve this module by name; fork keeps a file-path-loaded module importable
+    context = None
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return dict(pool.map(_replay_session_worker, tasks))
+
+def _list_sessions(db_path: str) -> List[str]:
+    with sqlite3.connect(db_path) as conn:
+        return [row[0] for row in conn.execute("SELECT session_id FROM session ORDER BY start_time")]
+
 def main():
     """Command-line interface for the replay tool"""
     parser = argparse.ArgumentParser(description="WIRTHFORGE Event Replay Tool")
@@ -500,31 +779,96 @@ def main():
     parser.add_argument("--output", help="Output file for replay results (JSON)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--no-validate", action="store_true", help="Skip validation checks")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream events in chunks and keep only rolling summaries")
+    parser.add_argument("--event-log", help="StateManager event log directory (implies --stream)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows fetched per cursor round trip when streaming")
+    parser.add_argument("--start-frame", type=int, help="First frame_id to replay")
+    parser.add_argument("--end-frame", type=int, help="Last frame_id to replay")
+    parser.add_argument("--start-time", help="First event timestamp to replay (ISO 8601)")
+    parser.add_argument("--end-time", help="Last event timestamp to replay (ISO 8601)")
+    parser.add_argument("--sessions", nargs="+",
+                        help="Replay several sessions in parallel ('all' for every session)")
+    parser.add_argument("--workers", type=int, help="Worker processes for --sessions")
     
     args = parser.parse_args()
     
-    if not args.database and not args.json:
-        parser.error("Either --database or --json must be specified")
+    if not args.database and not args.json and not args.event_log:
+        parser.error("One of --database, --event-log or --json must be specified")
     
-    if args.database and not args.session:
-        parser.error("--session is required when using --database")
+    if (args.database or args.event_log) and not args.session and not args.sessions:
+        parser.error("--session or --sessions is required when using --database or --event-log")
+
+    window = {
+        'start_frame': args.start_frame,
+        'end_frame': args.end_frame,
+        'start_time': args.start_time,
+        'end_time': args.end_time
+    }
+    streaming = args.stream or args.event_log or any(v is not None for v in window.values())
+
+    if args.sessions:
+        if args.sessions == ['all']:
+            if not args.database:
+                parser.error("--sessions all requires --database")
+            session_ids = _list_sessions(args.database)
+        else:
+            session_ids = args.sessions
+        summaries = replay_sessions_parallel(
+            session_ids, db_path=args.database, event_log_dir=args.event_log,
+            workers=args.workers, chunk_size=args.chunk_size,
+            validate=not args.no_validate, **window
+        )
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(summaries, f, indent=2)
+            logger.info(f"Replay results saved to {args.output}")
+
+        failed = 0
+        print(f"\n🎬 Replay Summary ({len(summaries)} sessions):")
+        for session_id, summary in summaries.items():
+            if 'error' in summary:
+                failed += 1
+                print(f"  {session_id}: ❌ {summary['error']}")
+                continue
+            stats = summary['replay_statistics']
+            status = "✅" if not summary['validation_errors'] else "❌"
+            failed += bool(summary['validation_errors'])
+            print(f"  {session_id}: {status} {stats['total_events']} events, "
+                  f"{stats['errors']} errors, {stats['warnings']} warnings")
+        sys.exit(1 if failed else 0)
     
     # Create replayer
     replayer = EventReplayer(args.database, args.json)
     
-    # Load events
-    if args.database:
-        if not replayer.load_events_from_db(args.session):
+    if streaming and not args.json:
+        if args.event_log:
+            events = replayer.iter_events_from_log(args.event_log, args.session, **window)
+        else:
+            events = replayer.iter_events_from_db(args.session, chunk_size=args.chunk_size, **window)
+        results = replayer.run_streaming_replay(
+            events,
+            verbose=args.verbose,
+            validate=not args.no_validate
+        )
+        if 'error' in results:
+            logger.error(results['error'])
             sys.exit(1)
     else:
-        if not replayer.load_events_from_json():
-            sys.exit(1)
-    
-    # Run replay
-    results = replayer.run_replay(
-        verbose=args.verbose,
-        validate=not args.no_validate
-    )
+        # Load events
+        if args.database:
+            if not replayer.load_events_from_db(args.session):
+                sys.exit(1)
+        else:
+            if not replayer.load_events_from_json():
+                sys.exit(1)
+        
+        # Run replay
+        results = replayer.run_replay(
+            verbose=args.verbose,
+            validate=not args.no_validate
+        )
     
     # Output results
     if args.output:
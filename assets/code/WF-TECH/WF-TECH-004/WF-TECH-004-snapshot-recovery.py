@@ -15,12 +15,26 @@ import json
 import sqlite3
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
+import copy
 import hashlib
 import gzip
+import mmap
+import os
 import pickle
+import queue
+import re
+import struct
+import threading
+import time
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # Event log falls back to JSON payloads
+    msgpack = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -116,25 +130,805 @@ class StateSnapshot:
                 "clean_shutdown": True
             }
 
+# Event log framing
+SEGMENT_MAGIC = b"WFEL"
+SEGMENT_VERSION = 1
+SEGMENT_HEADER = struct.Struct("<4sBB2x")  # magic, version, codec
+BLOCK_HEADER = struct.Struct("<IIQI")      # payload length, crc32, first sequence, event count
+INDEX_HEADER = struct.Struct("<I")         # index record length
+CODEC_MSGPACK = 1
+CODEC_JSON = 2
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def _encode_payload(codec: int, value: Any) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _decode_payload(codec: int, payload) -> Any:
+    if codec == CODEC_MSGPACK:
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(bytes(payload))
+
+
+# Snapshot framing: a full base, or a delta against the previous snapshot
+SNAPSHOT_MAGIC = b"WFSN"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sBBBBQ")  # magic, version, kind, codec, flags, base snapshot id
+SNAPSHOT_FULL = 0
+SNAPSHOT_DELTA = 1
+SNAPSHOT_COMPRESSED = 0x01
+SNAPSHOT_COMPRESS_THRESHOLD = 1024
+SNAPSHOT_SECTIONS = ("frame_state", "energy_accumulator", "session_context")
+
+# Schema 1.1.0 stores snapshot.state as BLOB; 1.0.0 tables carry a
+# CHECK (json_valid(state)) that rejects encoded snapshots
+DB_SCHEMA_VERSION = "1.1.0"
+_JSON_STATE_CHECK = re.compile(
+    r",?(?:\s|--[^\n]*\n)*CHECK\s*\(\s*json_valid\s*\(\s*state\s*\)\s*\)", re.IGNORECASE)
+_STATE_TEXT_COLUMN = re.compile(r"\bstate\s+TEXT\b", re.IGNORECASE)
+_CREATE_SNAPSHOT_TABLE = re.compile(
+    r"^(CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?)[\"`\[]?snapshot[\"`\]]?", re.IGNORECASE)
+
+
+def _encode_snapshot(kind: int, base_id: int, payload: Dict[str, Any]) -> bytes:
+    codec = CODEC_MSGPACK if msgpack else CODEC_JSON
+    body = _encode_payload(codec, payload)
+    flags = 0
+    if len(body) > SNAPSHOT_COMPRESS_THRESHOLD:
+        body = zlib.compress(body, 1)
+        flags |= SNAPSHOT_COMPRESSED
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind, codec, flags, base_id) + body
+
+
+def _decode_snapshot(blob: bytes) -> Tuple[int, int, Dict[str, Any]]:
+    """Return (kind, base snapshot id, payload)"""
+    magic, version, kind, codec, flags, base_id = SNAPSHOT_HEADER.unpack_from(blob, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot encoding (version {version})")
+    body = blob[SNAPSHOT_HEADER.size:]
+    if flags & SNAPSHOT_COMPRESSED:
+        body = zlib.decompress(body)
+    return kind, base_id, _decode_payload(codec, body)
+
+
+@dataclass(frozen=True)
+class _ListMark:
+    """What a delta needs to remember about an append-only list"""
+    length: int
+    last: Any
+
+
+def _mark_fields(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy field values for the next diff; lists keep only length and last item"""
+    marks = {}
+    for key, value in values.items():
+        if isinstance(value, list):
+            marks[key] = _ListMark(len(value), copy.deepcopy(value[-1]) if value else None)
+        else:
+            marks[key] = copy.deepcopy(value)
+    return marks
+
+
+def _diff_fields(marks: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields changed since marks were taken
+
+    Lists are treated as append-only (energy_peaks, models_available): if the
+    previously seen tail is still in place only the new items are recorded,
+    otherwise the whole list is.
+    """
+    changed = {}
+    appended = {}
+    for key, value in values.items():
+        mark = marks.get(key)
+        if isinstance(value, list) and isinstance(mark, _ListMark):
+            seen = mark.length
+            if len(value) >= seen and (seen == 0 or value[seen - 1] == mark.last):
+                if len(value) > seen:
+                    appended[key] = value[seen:]
+                continue
+        elif key in marks and value == mark:
+            continue
+        changed[key] = value
+
+    diff = {}
+    if changed:
+        diff["set"] = changed
+    if appended:
+        diff["append"] = appended
+    return diff
+
+
+def _apply_fields(values: Dict[str, Any], diff: Dict[str, Any]):
+    values.update(diff.get("set", {}))
+    for key, items in diff.get("append", {}).items():
+        values.setdefault(key, []).extend(items)
+
+
+@dataclass
+class LogIndexEntry:
+    """Sparse index entry for one block in a segment"""
+    offset: int
+    first_seq: int
+    count: int
+    min_timestamp: str
+    max_timestamp: str
+    min_frame_id: Optional[int] = None
+    max_frame_id: Optional[int] = None
+
+    @property
+    def end_seq(self) -> int:
+        return self.first_seq + self.count
+
+
+class SessionEventLog:
+    """
+    Segmented, append-only event log for a single session
+
+    Each write_batch() call appends one columnar block (length, crc32, first
+    sequence number, event count, then a msgpack payload of per-field
+    columns) to the active segment and one entry to the segment's sparse
+    index sidecar. Event ids are per-session sequence numbers. Torn blocks
+    left by a crash are truncated when the log is reopened.
+
+    With read_only=True (replay, inspection) nothing on disk is modified:
+    reading stops at the last block whose crc32 checks out, and a torn tail
+    is left for the writer to repair.
+    """
+
+    def __init__(self, directory: Path, segment_max_bytes: int = 64 * 1024 * 1024,
+                 fsync_policy: str = "interval", fsync_interval: float = 1.0,
+                 read_only: bool = False):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}, got {fsync_policy!r}")
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.read_only = read_only
+
+        # first_seq -> sparse index for that segment
+        self.segments: Dict[int, List[LogIndexEntry]] = {}
+        self.next_seq = 1
+        self._segment_file = None
+        self._index_file = None
+        self._segment_seq: Optional[int] = None
+        self._segment_size = 0
+        self._last_fsync = time.monotonic()
+
+        if not read_only:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_segments()
+
+    @staticmethod
+    def _segment_path(directory: Path, first_seq: int) -> Path:
+        return directory / f"{first_seq:020d}.seg"
+
+    @staticmethod
+    def _index_path(directory: Path, first_seq: int) -> Path:
+        return directory / f"{first_seq:020d}.idx"
+
+    def _load_segments(self):
+        """Load sparse indexes, rebuilding and (unless read-only) truncating the tail if needed"""
+        for path in sorted(self.directory.glob("*.seg")):
+            first_seq = int(path.stem)
+            entries = self._load_index(first_seq)
+            self.segments[first_seq] = self._repair_segment(first_seq, entries)
+
+        if self.segments:
+            last_seq = max(self.segments)
+            entries = self.segments[last_seq]
+            self.next_seq = entries[-1].end_seq if entries else last_seq
+
+    def _load_index(self, first_seq: int) -> List[LogIndexEntry]:
+        path = self._index_path(self.directory, first_seq)
+        if not path.exists():
+            return []
+        data = path.read_bytes()
+        entries = []
+        pos = 0
+        while pos + INDEX_HEADER.size <= len(data):
+            (length,) = INDEX_HEADER.unpack_from(data, pos)
+            start = pos + INDEX_HEADER.size
+            if start + length > len(data):
+                break  # Torn index record
+            entries.append(LogIndexEntry(*json.loads(data[start:start + length])))
+            pos = start + length
+        return entries
+
+    def _repair_segment(self, first_seq: int, entries: List[LogIndexEntry]) -> List[LogIndexEntry]:
+        """Validate the index tail against the segment and index any unindexed blocks"""
+        path = self._segment_path(self.directory, first_seq)
+        size = path.stat().st_size
+        if size < SEGMENT_HEADER.size:
+            if self.read_only:
+                return []
+            path.unlink()
+            self._index_path(self.directory, first_seq).unlink(missing_ok=True)
+            return []
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            codec = self._read_codec(mapped, path)
+            view = memoryview(mapped)
+            try:
+                # Blocks are fsynced before their index entries, so only the
+                # newest entries can point past the end of the segment
+                valid = list(entries)
+                while valid:
+                    block = self._read_block_header(view, valid[-1].offset)
+                    if block is not None and block[2] == valid[-1].first_seq:
+                        break
+                    valid.pop()
+
+                pos = SEGMENT_HEADER.size
+                if valid:
+                    length = BLOCK_HEADER.unpack_from(view, valid[-1].offset)[0]
+                    pos = valid[-1].offset + BLOCK_HEADER.size + length
+
+                indexed = len(valid)
+                while pos < size:
+                    block = self._read_block_header(view, pos)
+                    if block is None:
+                        break
+                    length, _, block_seq, _ = block
+                    start = pos + BLOCK_HEADER.size
+                    columns = _decode_payload(codec, view[start:start + length])
+                    valid.append(self._index_entry(pos, block_seq, columns))
+                    pos = start + length
+            finally:
+                view.release()
+
+        if self.read_only:
+            if pos < size:
+                logger.warning(f"Ignoring torn event log tail in {path.name} after offset {pos}")
+            return valid
+        if pos < size:
+            logger.warning(f"Truncating torn event log tail in {path.name} at offset {pos}")
+            with open(path, "r+b") as f:
+                f.truncate(pos)
+        if len(valid) != len(entries) or indexed != len(entries):
+            self._rewrite_index(first_seq, valid)
+        return valid
+
+    @staticmethod
+    def _read_codec(data, path: Path) -> int:
+        magic, version, codec = SEGMENT_HEADER.unpack_from(data, 0)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+            raise ValueError(f"Not a v{SEGMENT_VERSION} event log segment: {path}")
+        if codec == CODEC_MSGPACK and msgpack is None:
+            raise RuntimeError(f"msgpack is required to read {path}")
+        return codec
+
+    @staticmethod
+    def _read_block_header(data, offset: int) -> Optional[Tuple[int, int, int, int]]:
+        """Return the block header at offset if the whole block is present and intact"""
+        if offset + BLOCK_HEADER.size > len(data):
+            return None
+        header = BLOCK_HEADER.unpack_from(data, offset)
+        start = offset + BLOCK_HEADER.size
+        end = start + header[0]
+        if end > len(data) or zlib.crc32(data[start:end]) != header[1]:
+            return None
+        return header
+
+    @staticmethod
+    def _index_entry(offset: int, first_seq: int, columns: Dict[str, Any]) -> LogIndexEntry:
+        timestamps = columns["ts"]
+        frames = [frame for frame in columns["frame"] if frame is not None]
+        return LogIndexEntry(
+            offset=offset,
+            first_seq=first_seq,
+            count=len(timestamps),
+            min_timestamp=min(timestamps),
+            max_timestamp=max(timestamps),
+            min_frame_id=min(frames) if frames else None,
+            max_frame_id=max(frames) if frames else None
+        )
+
+    def _rewrite_index(self, first_seq: int, entries: List[LogIndexEntry]):
+        path = self._index_path(self.directory, first_seq)
+        with open(path, "wb") as f:
+            for entry in entries:
+                f.write(self._frame_index_entry(entry))
+
+    @staticmethod
+    def _frame_index_entry(entry: LogIndexEntry) -> bytes:
+        record = json.dumps(list(asdict(entry).values()), separators=(',', ':')).encode()
+        return INDEX_HEADER.pack(len(record)) + record
+
+    def _open_segment(self):
+        """Open the newest segment for appending, or start a new one"""
+        if self.segments:
+            first_seq = max(self.segments)
+            path = self._segment_path(self.directory, first_seq)
+            with open(path, "rb") as f:
+                codec = self._read_codec(f.read(SEGMENT_HEADER.size), path)
+            if codec == (CODEC_MSGPACK if msgpack else CODEC_JSON) and \
+                    path.stat().st_size < self.segment_max_bytes:
+                self._segment_file = open(path, "ab")
+                self._index_file = open(self._index_path(self.directory, first_seq), "ab")
+                self._segment_seq = first_seq
+                self._segment_size = self._segment_file.tell()
+                return
+        self._start_segment()
+
+    def _start_segment(self):
+        self._close_segment()
+        first_seq = self.next_seq
+        codec = CODEC_MSGPACK if msgpack else CODEC_JSON
+        self._segment_file = open(self._segment_path(self.directory, first_seq), "wb")
+        self._segment_file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, codec))
+        self._index_file = open(self._index_path(self.directory, first_seq), "wb")
+        self._segment_seq = first_seq
+        self._segment_size = SEGMENT_HEADER.size
+        self.segments[first_seq] = []
+
+    def _close_segment(self):
+        if self._segment_file is None:
+            return
+        self._sync(force=True)
+        self._segment_file.close()
+        self._index_file.close()
+        self._segment_file = None
+        self._index_file = None
+        self._segment_seq = None
+
+    def _sync(self, force: bool = False):
+        """Flush and fsync according to the configured policy"""
+        self._segment_file.flush()
+        self._index_file.flush()
+        if self.fsync_policy == "never" and not force:
+            return
+        now = time.monotonic()
+        if force or self.fsync_policy == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._segment_file.fileno())
+            os.fsync(self._index_file.fileno())
+            self._last_fsync = now
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> int:
+        """Append events as one columnar block; returns the last event id"""
+        if self.read_only:
+            raise RuntimeError(f"Event log {self.directory} is open read-only")
+        if not events:
+            return self.next_seq - 1
+
+        types: List[str] = []
+        type_codes: Dict[str, int] = {}
+        columns = {
+            "types": types,
+            "type": [],
+            "ts": [],
+            "frame": [],
+            "delta": [],
+            "data": []
+        }
+        for event in events:
+            event_type = event['type']
+            code = type_codes.get(event_type)
+            if code is None:
+                code = type_codes[event_type] = len(types)
+                types.append(event_type)
+            columns["type"].append(code)
+            columns["ts"].append(event['timestamp'])
+            columns["frame"].append(event.get('frame_id'))
+            columns["delta"].append(event.get('energy_delta'))
+            columns["data"].append(event['data'])
+
+        if self._segment_file is None:
+            self._open_segment()
+        codec = CODEC_MSGPACK if msgpack else CODEC_JSON
+        payload = _encode_payload(codec, columns)
+        block_size = BLOCK_HEADER.size + len(payload)
+        if self._segment_size > SEGMENT_HEADER.size and \
+                self._segment_size + block_size > self.segment_max_bytes:
+            self._start_segment()
+
+        first_seq = self.next_seq
+        offset = self._segment_size
+        self._segment_file.write(
+            BLOCK_HEADER.pack(len(payload), zlib.crc32(payload), first_seq, len(events)) + payload
+        )
+        entry = self._index_entry(offset, first_seq, columns)
+        self._index_file.write(self._frame_index_entry(entry))
+        self.segments[self._segment_seq].append(entry)
+
+        self._segment_size += block_size
+        self.next_seq += len(events)
+        self._sync()
+        return self.next_seq - 1
+
+    def _iter_blocks(self, wanted: Callable[[LogIndexEntry], bool]) -> Iterator[Tuple[LogIndexEntry, Dict[str, Any]]]:
+        """Decode the blocks whose index entries pass wanted(), one at a time, from mmapped segments"""
+        if self._segment_file is not None:
+            self._segment_file.flush()
+
+        for first_seq in sorted(self.segments):
+            entries = [entry for entry in self.segments[first_seq] if wanted(entry)]
+            if not entries:
+                continue
+            path = self._segment_path(self.directory, first_seq)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                codec = self._read_codec(mapped, path)
+                view = memoryview(mapped)
+                try:
+                    for entry in entries:
+                        length = BLOCK_HEADER.unpack_from(mapped, entry.offset)[0]
+                        start = entry.offset + BLOCK_HEADER.size
+                        yield entry, _decode_payload(codec, view[start:start + length])
+                finally:
+                    view.release()
+
+    def read_after(self, timestamp: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Events with timestamp > the given one, ordered by (timestamp, event id)
+
+        Uses the sparse index to skip blocks entirely before the timestamp and
+        decodes the remaining blocks straight from a memory-mapped segment.
+        """
+        events = []
+        for entry, columns in self._iter_blocks(
+                lambda entry: timestamp is None or entry.max_timestamp > timestamp):
+            events.extend(self._iter_block(entry.first_seq, columns, timestamp))
+        events.sort(key=lambda event: event['timestamp'])
+        return events
+
+    def iter_events(self, start_timestamp: Optional[str] = None,
+                    end_timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream events with start_timestamp <= timestamp <= end_timestamp in write order
+
+        Only one decoded block is held at a time; blocks whose index range
+        lies outside the window are never read.
+        """
+        def overlaps(entry: LogIndexEntry) -> bool:
+            return ((start_timestamp is None or entry.max_timestamp >= start_timestamp) and
+                    (end_timestamp is None or entry.min_timestamp <= end_timestamp))
+
+        for entry, columns in self._iter_blocks(overlaps):
+            for event in self._iter_block(entry.first_seq, columns, None):
+                timestamp = event['timestamp']
+                if (start_timestamp is None or timestamp >= start_timestamp) and \
+                        (end_timestamp is None or timestamp <= end_timestamp):
+                    yield event
+
+    def frame_time_range(self, start_frame: Optional[int] = None,
+                         end_frame: Optional[int] = None) -> Optional[Tuple[str, str]]:
+        """First and last timestamp of the frames in [start_frame, end_frame], or None"""
+        def overlaps(entry: LogIndexEntry) -> bool:
+            if entry.min_frame_id is None:
+                return False
+            return ((start_frame is None or entry.max_frame_id >= start_frame) and
+                    (end_frame is None or entry.min_frame_id <= end_frame))
+
+        first = last = None
+        for _, columns in self._iter_blocks(overlaps):
+            for frame, timestamp in zip(columns["frame"], columns["ts"]):
+                if frame is None or (start_frame is not None and frame < start_frame) or \
+                        (end_frame is not None and frame > end_frame):
+                    continue
+                if first is None or timestamp < first:
+                    first = timestamp
+                if last is None or timestamp > last:
+                    last = timestamp
+        return (first, last) if first is not None else None
+
+    @staticmethod
+    def _iter_block(first_seq: int, columns: Dict[str, Any], after: Optional[str]):
+        types = columns["types"]
+        for i, (code, ts, frame, delta, data) in enumerate(zip(
+                columns["type"], columns["ts"], columns["frame"],
+                columns["delta"], columns["data"])):
+            if after is None or ts > after:
+                yield {
+                    'event_id': first_seq + i,
+                    'timestamp': ts,
+                    'type': types[code],
+                    'data': data,
+                    'frame_id': frame,
+                    'energy_delta': delta
+                }
+
+    def close(self):
+        """Fsync and close the active segment"""
+        self._close_segment()
+
+
+class EventLog:
+    """
+    Append-only binary event storage, one SessionEventLog per session
+
+    Replaces per-row JSON inserts into the SQLite event table; SQLite keeps
+    the session and snapshot metadata only.
+    """
+
+    def __init__(self, root: Path, **options):
+        self.root = Path(root)
+        self.options = options
+        self.sessions: Dict[str, SessionEventLog] = {}
+
+    def session(self, session_id: str) -> SessionEventLog:
+        log = self.sessions.get(session_id)
+        if log is None:
+            directory = self.root / re.sub(r'[^A-Za-z0-9_.-]', '_', session_id)
+            log = self.sessions[session_id] = SessionEventLog(directory, **self.options)
+        return log
+
+    def has_session(self, session_id: str) -> bool:
+        directory = self.root / re.sub(r'[^A-Za-z0-9_.-]', '_', session_id)
+        return session_id in self.sessions or directory.is_dir()
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Append events grouped by session; returns the groups that were written"""
+        by_session: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            by_session.setdefault(event['session_id'], []).append(event)
+        for session_id, session_events in by_session.items():
+            self.session(session_id).write_batch(session_events)
+        return by_session
+
+    def read_after(self, session_id: str, timestamp: Optional[str]) -> List[Dict[str, Any]]:
+        if not self.has_session(session_id):
+            return []
+        return self.session(session_id).read_after(timestamp)
+
+    def close(self):
+        for log in self.sessions.values():
+            log.close()
+        self.sessions.clear()
+
+
+class EventWriter:
+    """
+    Dedicated event writer thread with its own SQLite connection
+
+    The asyncio side only hands over lists of events (submit never blocks),
+    so a slow disk cannot stall the frame loop. The thread opens the
+    database in WAL mode with synchronous=NORMAL, sizes each batch from the
+    current queue depth and writes it with executemany in one transaction.
+    With group_commit_ms > 0 a small batch waits that long for more events
+    before committing. The thread closes the event log itself once it has
+    drained, so closing can never race a write still in progress.
+    """
+
+    INSERT_EVENT_SQL = """
+        INSERT INTO event (
+            session_id, timestamp, type, data, frame_id, energy_delta
+        ) VALUES (?, ?, ?, ?, ?, ?)
+    """
+    UPDATE_SESSION_SQL = """
+        UPDATE session
+        SET total_events = total_events + ?,
+            total_energy = total_energy + ?
+        WHERE session_id = ?
+    """
+
+    def __init__(self, db_path: Path, event_log: Optional[EventLog] = None,
+                 min_batch: int = 32, max_batch: int = 4096, group_commit_ms: float = 0.0):
+        self.db_path = db_path
+        self.event_log = event_log
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.group_commit_ms = group_commit_ms
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = 0  # Events submitted but not yet written
+        self._pending_lock = threading.Lock()
+        self._idle = threading.Condition(self._pending_lock)
+        self._carry: List[Dict[str, Any]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self.metrics = {
+            "events_written": 0,
+            "batches_written": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_commit_ms": 0.0,
+            "avg_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+            "write_errors": 0
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="state-event-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, events: List[Dict[str, Any]]):
+        """Queue events for the writer thread; never blocks on I/O"""
+        if not events:
+            return
+        with self._pending_lock:
+            self._pending += len(events)
+        self._queue.put(events)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted event has been written"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> bool:
+        """Write everything still queued, then stop the thread; False if it is still draining"""
+        if self._thread is None:
+            return True
+        if not self._stopping:
+            self._stopping = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"Event writer still draining {self._pending} events after {timeout}s; "
+                         f"it will close the event log when done")
+            return False
+        self._thread = None
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.metrics, "queue_depth": self._pending}
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, isolation_level=None)
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        db.execute("PRAGMA foreign_keys = ON")
+        return db
+
+    def _run(self):
+        db = self._connect()
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                self._write(db, batch)
+        finally:
+            db.close()
+            if self.event_log is not None:
+                self.event_log.close()
+
+    def _target_batch_size(self) -> int:
+        """Grow batches with the backlog so a burst drains in few transactions"""
+        depth = self._pending
+        return max(self.min_batch, min(self.max_batch, 1 << max(depth - 1, 0).bit_length()))
+
+    def _next_batch(self) -> Optional[List[Dict[str, Any]]]:
+        """Collect up to the target batch size; None once stopped and drained"""
+        batch = self._carry
+        self._carry = []
+        if not batch:
+            item = self._queue.get()
+            if item is None:
+                return None
+            batch = list(item)
+
+        target = self._target_batch_size()
+        deadline = time.monotonic() + self.group_commit_ms / 1000.0
+        while len(batch) < target:
+            try:
+                if self.group_commit_ms > 0 and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Stop after this batch
+                self._stopping = True
+                break
+            batch.extend(item)
+
+        if len(batch) > target:
+            self._carry = batch[target:]
+            batch = batch[:target]
+        return batch
+
+    def _write(self, db: sqlite3.Connection, batch: List[Dict[str, Any]]):
+        start = time.perf_counter()
+        try:
+            db.execute("BEGIN")
+            if self.event_log is not None:
+                by_session = self.event_log.write_batch(batch)
+                # The SQLite event triggers no longer fire, so keep session totals here
+                db.executemany(self.UPDATE_SESSION_SQL, [
+                    (
+                        len(session_events),
+                        sum(event.get('energy_delta') or 0.0 for event in session_events),
+                        session_id
+                    )
+                    for session_id, session_events in by_session.items()
+                ])
+            else:
+                db.executemany(self.INSERT_EVENT_SQL, [
+                    (
+                        event['session_id'],
+                        event['timestamp'],
+                        event['type'],
+                        json.dumps(event['data']),
+                        event.get('frame_id'),
+                        event.get('energy_delta')
+                    )
+                    for event in batch
+                ])
+            db.execute("COMMIT")
+        except Exception as e:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            self.metrics["write_errors"] += 1
+            logger.error(f"Failed to write event batch of {len(batch)}: {e}")
+        else:
+            commit_ms = (time.perf_counter() - start) * 1000
+            metrics = self.metrics
+            metrics["events_written"] += len(batch)
+            metrics["batches_written"] += 1
+            metrics["last_batch_size"] = len(batch)
+            metrics["max_batch_size"] = max(metrics["max_batch_size"], len(batch))
+            metrics["last_commit_ms"] = commit_ms
+            metrics["avg_commit_ms"] += 0.1 * (commit_ms - metrics["avg_commit_ms"])
+            metrics["max_commit_ms"] = max(metrics["max_commit_ms"], commit_ms)
+            logger.debug(f"Wrote batch of {len(batch)} events in {commit_ms:.2f}ms")
+        finally:
+            with self._idle:
+                self._pending -= len(batch)
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+
 class StateManager:
     """
     State Manager for WIRTHFORGE with snapshot and recovery capabilities
     """
     
-    def __init__(self, db_path: str = "wirthforge_state.db"):
+    def __init__(self, db_path: str = "wirthforge_state.db", event_store: str = "sqlite",
+                 event_log_dir: Optional[str] = None, fsync_policy: str = "interval",
+                 segment_max_bytes: int = 64 * 1024 * 1024, group_commit_ms: float = 0.0,
+                 full_snapshot_interval: int = 10):
+        if event_store not in ("log", "sqlite"):
+            raise ValueError(f"event_store must be 'log' or 'sqlite', got {event_store!r}")
         self.db_path = Path(db_path)
         self.current_state: Optional[StateSnapshot] = None
         self.event_queue: asyncio.Queue = asyncio.Queue()
         self.background_writer_task: Optional[asyncio.Task] = None
         self.is_running = False
+        self.db = None
+        
+        # Event stream storage: per-row SQLite, or the append-only binary log.
+        # SQLite stays the default while the validator and backup CLI still
+        # read events from the event table.
+        self.event_store = event_store
+        self.event_log: Optional[EventLog] = None
+        if event_store == "log":
+            self.event_log = EventLog(
+                Path(event_log_dir) if event_log_dir else self.db_path.with_suffix(".events"),
+                segment_max_bytes=segment_max_bytes,
+                fsync_policy=fsync_policy
+            )
+        self.group_commit_ms = group_commit_ms
+        self.event_writer: Optional[EventWriter] = None
+        
+        # Periodic snapshots are deltas against the previous one; every
+        # full_snapshot_interval deltas (or on any non-periodic snapshot) a
+        # full base is written instead
+        self.full_snapshot_interval = full_snapshot_interval
+        self._snapshot_chain: Optional[Dict[str, Any]] = None
         
     async def initialize(self) -> bool:
         """Initialize state manager and check for recovery needs"""
         try:
             # Initialize database connection
             self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode = WAL")
+            self.db.execute("PRAGMA synchronous = NORMAL")
+            self._migrate_db_schema()
             self.db.execute("PRAGMA foreign_keys = ON")
-            
+
             # Check for unclean shutdown
             unclean_sessions = self.db.execute("""
                 SELECT session_id, start_time, total_energy, total_events 
@@ -153,7 +947,10 @@ class StateManager:
             else:
                 logger.info("Clean startup - no recovery needed")
                 
-            # Start background writer
+            # Start writer thread and the task that feeds it
+            self.event_writer = EventWriter(self.db_path, self.event_log,
+                                            group_commit_ms=self.group_commit_ms)
+            self.event_writer.start()
             self.background_writer_task = asyncio.create_task(self._background_writer())
             self.is_running = True
             
@@ -162,7 +959,52 @@ class StateManager:
         except Exception as e:
             logger.error(f"Failed to initialize state manager: {e}")
             return False
-    
+
+    def _migrate_db_schema(self):
+        """
+        Bring a 1.0.0 database up to 1.1.0 before anything is written
+
+        SQLite cannot alter a column type or drop a CHECK in place, so the
+        snapshot table is rebuilt from its stored definition with state as
+        BLOB and the json_valid CHECK removed, existing rows are copied
+        across and its indexes recreated. Must run before foreign keys are
+        enabled, since the old table is dropped.
+        """
+        row = self.db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'snapshot'"
+        ).fetchone()
+        if not row or not _JSON_STATE_CHECK.search(row[0]):
+            return
+
+        table_sql = _JSON_STATE_CHECK.sub("", row[0])
+        table_sql = _STATE_TEXT_COLUMN.sub("state BLOB", table_sql)
+        table_sql = _CREATE_SNAPSHOT_TABLE.sub(r"\1snapshot_migrating", table_sql, count=1)
+        columns = ", ".join(info[1] for info in self.db.execute("PRAGMA table_info(snapshot)"))
+        index_sql = [sql for (sql,) in self.db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'snapshot' "
+            "AND sql IS NOT NULL"
+        )]
+        has_schema_info = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_info'"
+        ).fetchone()
+
+        with self.db:
+            self.db.execute("BEGIN")  # DDL does not open a transaction implicitly
+            self.db.execute(table_sql)
+            self.db.execute(f"INSERT INTO snapshot_migrating ({columns}) "
+                            f"SELECT {columns} FROM snapshot")
+            self.db.execute("DROP TABLE snapshot")
+            self.db.execute("ALTER TABLE snapshot_migrating RENAME TO snapshot")
+            for sql in index_sql:
+                self.db.execute(sql)
+            if has_schema_info:
+                self.db.execute("INSERT OR REPLACE INTO schema_info (key, value) VALUES ('version', ?)",
+                                (DB_SCHEMA_VERSION,))
+                self.db.execute("INSERT OR REPLACE INTO schema_info (key, value) "
+                                "VALUES ('last_migration', 'WF-TECH-004-MIGRATION-001')")
+
+        logger.info(f"Migrated snapshot table to schema {DB_SCHEMA_VERSION} (binary state)")
+
     async def recover_from_crash(self, session_id: str) -> bool:
         """
         Recover state from the most recent snapshot and replay events
@@ -182,19 +1024,21 @@ class StateManager:
                        energy_accumulator, frame_count, schema_version
                 FROM snapshot 
                 WHERE session_id = ? 
-                ORDER BY timestamp DESC 
+                ORDER BY timestamp DESC, snapshot_id DESC 
                 LIMIT 1
             """, (session_id,)).fetchone()
             
+            restored = None
             if snapshot_row:
-                snapshot_id, snapshot_timestamp, state_json, last_event_id, \
-                energy_acc, frame_count, schema_version = snapshot_row
+                # Step 2: Deserialize snapshot state (base + deltas)
+                restored = self._restore_snapshot_state(session_id, snapshot_row[0], snapshot_row[2])
+            
+            if restored:
+                snapshot_id, snapshot_timestamp, state_data = restored
+                last_event_id, schema_version = snapshot_row[3], snapshot_row[6]
                 
                 logger.info(f"Found snapshot {snapshot_id} from {snapshot_timestamp}")
                 
-                # Step 2: Deserialize snapshot state
-                state_data = json.loads(state_json)
-                
                 # Handle schema version compatibility
                 if schema_version != "1.0.0":
                     state_data = await self._migrate_snapshot_schema(state_data, schema_version)
@@ -203,33 +1047,18 @@ class StateManager:
                 self.current_state = self._deserialize_state(state_data)
                 
                 # Step 3: Get events after snapshot
-                events_to_replay = self.db.execute("""
-                    SELECT event_id, timestamp, type, data, frame_id, energy_delta
-                    FROM event 
-                    WHERE session_id = ? AND timestamp > ?
-                    ORDER BY timestamp ASC
-                """, (session_id, snapshot_timestamp)).fetchall()
+                events_to_replay = self._load_events_after(session_id, snapshot_timestamp)
                 
                 logger.info(f"Found {len(events_to_replay)} events to replay")
                 
                 # Step 4: Replay events in order
-                for event_row in events_to_replay:
-                    event_id, timestamp, event_type, data_json, frame_id, energy_delta = event_row
-                    event_data = json.loads(data_json)
-                    
-                    await self._replay_event({
-                        'event_id': event_id,
-                        'timestamp': timestamp,
-                        'type': event_type,
-                        'data': event_data,
-                        'frame_id': frame_id,
-                        'energy_delta': energy_delta
-                    })
+                for event in events_to_replay:
+                    await self._replay_event(event)
                 
                 # Step 5: Update recovery context
                 self.current_state.recovery_context.update({
                     "last_snapshot_id": snapshot_id,
-                    "last_event_id": events_to_replay[-1][0] if events_to_replay else last_event_id,
+                    "last_event_id": events_to_replay[-1]['event_id'] if events_to_replay else last_event_id,
                     "clean_shutdown": False
                 })
                 
@@ -244,6 +1073,103 @@ class StateManager:
             logger.error(f"Crash recovery failed: {e}")
             return False
     
+    def _restore_snapshot_state(self, session_id: str, snapshot_id: int,
+                                raw_state: Any) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Rebuild state data for a snapshot, applying deltas on top of their base
+        
+        Args:
+            session_id: Session the snapshot belongs to
+            snapshot_id: Latest snapshot ID
+            raw_state: Stored state column of that snapshot
+            
+        Returns:
+            (snapshot_id, timestamp, state_data) of the newest snapshot that
+            could be restored, or None if no usable base exists
+        """
+        if isinstance(raw_state, str):
+            # Snapshots written before binary encoding: JSON text, or gzip stored as latin1
+            try:
+                state_data = json.loads(raw_state)
+            except json.JSONDecodeError:
+                state_data = json.loads(gzip.decompress(raw_state.encode('latin1')))
+            timestamp = self.db.execute(
+                "SELECT timestamp FROM snapshot WHERE snapshot_id = ?", (snapshot_id,)
+            ).fetchone()[0]
+            return snapshot_id, timestamp, state_data
+        
+        kind, base_id, _ = _decode_snapshot(raw_state)
+        if kind == SNAPSHOT_FULL:
+            base_id = snapshot_id
+        
+        chain = self.db.execute("""
+            SELECT snapshot_id, timestamp, state
+            FROM snapshot
+            WHERE session_id = ? AND snapshot_id BETWEEN ? AND ?
+            ORDER BY snapshot_id ASC
+        """, (session_id, base_id, snapshot_id)).fetchall()
+        
+        state_data = None
+        restored_id = restored_timestamp = None
+        for row_id, row_timestamp, row_state in chain:
+            if isinstance(row_state, str):
+                continue
+            kind, row_base, payload = _decode_snapshot(row_state)
+            if row_id == base_id:
+                if kind != SNAPSHOT_FULL:
+                    break
+                state_data = payload
+            elif kind != SNAPSHOT_DELTA or row_base != base_id:
+                continue  # Snapshot from another chain
+            elif state_data is None or payload["parent"] != restored_id:
+                break
+            else:
+                _apply_fields(state_data, payload.get("top", {}))
+                for section, diff in payload.get("sections", {}).items():
+                    _apply_fields(state_data.setdefault(section, {}), diff)
+            restored_id, restored_timestamp = row_id, row_timestamp
+        
+        if state_data is None:
+            logger.warning(f"Base snapshot {base_id} for snapshot {snapshot_id} is missing")
+            return None
+        if restored_id != snapshot_id:
+            logger.warning(f"Snapshot chain broken after {restored_id}; "
+                           f"replaying events from there instead of {snapshot_id}")
+        return restored_id, restored_timestamp, state_data
+    
+    def _load_events_after(self, session_id: str, timestamp: str) -> List[Dict[str, Any]]:
+        """
+        Load a session's events newer than timestamp, in timestamp order
+        
+        Args:
+            session_id: Session whose events to load
+            timestamp: Snapshot timestamp; only later events are returned
+            
+        Returns:
+            List of event dictionaries ready for _replay_event
+        """
+        if self.event_log is not None:
+            return self.event_log.read_after(session_id, timestamp)
+        
+        rows = self.db.execute("""
+            SELECT event_id, timestamp, type, data, frame_id, energy_delta
+            FROM event 
+            WHERE session_id = ? AND timestamp > ?
+            ORDER BY timestamp ASC
+        """, (session_id, timestamp)).fetchall()
+        
+        return [
+            {
+                'event_id': event_id,
+                'timestamp': event_timestamp,
+                'type': event_type,
+                'data': json.loads(data_json),
+                'frame_id': frame_id,
+                'energy_delta': energy_delta
+            }
+            for event_id, event_timestamp, event_type, data_json, frame_id, energy_delta in rows
+        ]
+    
     async def _replay_event(self, event: Dict[str, Any]) -> None:
         """
         Replay a single event to update state
@@ -327,23 +1253,29 @@ class StateManager:
             return None
             
         try:
-            # Serialize current state
-            state_data = {
-                "frame_state": asdict(self.current_state.frame_state),
-                "energy_accumulator": asdict(self.current_state.energy_accumulator),
-                "session_context": asdict(self.current_state.session_context),
-                "performance_metrics": self.current_state.performance_metrics,
-                "recovery_context": self.current_state.recovery_context,
-                "schema_version": self.current_state.schema_version
-            }
-            
-            state_json = json.dumps(state_data, separators=(',', ':'))
+            sections = self._snapshot_sections()
+            chain = self._snapshot_chain
+            full = (chain is None or chain["session_id"] != session_id
+                    or snapshot_type != "periodic"
+                    or chain["deltas"] >= self.full_snapshot_interval)
             
-            # Compress if large
-            compressed = False
-            if len(state_json) > 1024:  # Compress if > 1KB
-                state_json = gzip.compress(state_json.encode()).decode('latin1')
-                compressed = True
+            if full:
+                state_blob = _encode_snapshot(SNAPSHOT_FULL, 0, sections)
+            else:
+                # Only fields changed since the previous snapshot
+                delta = {"parent": chain["last_id"]}
+                top_level = {k: v for k, v in sections.items() if k not in SNAPSHOT_SECTIONS}
+                top_diff = _diff_fields(chain["marks"]["top"], top_level)
+                if top_diff:
+                    delta["top"] = top_diff
+                section_diffs = {}
+                for section in SNAPSHOT_SECTIONS:
+                    diff = _diff_fields(chain["marks"][section], sections[section])
+                    if diff:
+                        section_diffs[section] = diff
+                if section_diffs:
+                    delta["sections"] = section_diffs
+                state_blob = _encode_snapshot(SNAPSHOT_DELTA, chain["base_id"], delta)
             
             timestamp = datetime.now(timezone.utc).isoformat()
             
@@ -357,7 +1289,7 @@ class StateManager:
                 session_id,
                 timestamp,
                 snapshot_type,
-                state_json,
+                state_blob,
                 self.current_state.energy_accumulator.total_energy,
                 self.current_state.energy_accumulator.frame_count,
                 self.current_state.schema_version
@@ -366,8 +1298,23 @@ class StateManager:
             snapshot_id = cursor.lastrowid
             self.db.commit()
             
+            marks = {
+                "top": _mark_fields({k: v for k, v in sections.items() if k not in SNAPSHOT_SECTIONS}),
+                **{section: _mark_fields(sections[section]) for section in SNAPSHOT_SECTIONS}
+            }
+            if full:
+                self._snapshot_chain = {
+                    "session_id": session_id,
+                    "base_id": snapshot_id,
+                    "last_id": snapshot_id,
+                    "deltas": 0,
+                    "marks": marks
+                }
+            else:
+                chain.update(last_id=snapshot_id, deltas=chain["deltas"] + 1, marks=marks)
+            
             logger.info(f"Created snapshot {snapshot_id} (type: {snapshot_type}, "
-                       f"compressed: {compressed}, size: {len(state_json)} bytes)")
+                       f"{'full' if full else 'delta'}, size: {len(state_blob)} bytes)")
             
             return snapshot_id
             
@@ -375,6 +1322,21 @@ class StateManager:
             logger.error(f"Failed to create snapshot: {e}")
             return None
     
+    def _snapshot_sections(self) -> Dict[str, Any]:
+        """Current state as plain fields, without copying nested values"""
+        state = self.current_state
+        return {
+            "frame_state": {f.name: getattr(state.frame_state, f.name)
+                            for f in fields(state.frame_state)},
+            "energy_accumulator": {f.name: getattr(state.energy_accumulator, f.name)
+                                   for f in fields(state.energy_accumulator)},
+            "session_context": {f.name: getattr(state.session_context, f.name)
+                                for f in fields(state.session_context)},
+            "performance_metrics": state.performance_metrics,
+            "recovery_context": state.recovery_context,
+            "schema_version": state.schema_version
+        }
+    
     def _deserialize_state(self, state_data: Dict[str, Any]) -> StateSnapshot:
         """
         Deserialize state data into StateSnapshot object
@@ -483,53 +1445,25 @@ class StateManager:
             return False
     
     async def _background_writer(self):
-        """Background task for writing events to database"""
-        batch_events = []
-        batch_timeout = 0.2  # 200ms batch window
-        
+        """Hand queued events to the writer thread; never touches SQLite"""
         while self.is_running:
             try:
-                # Wait for events with timeout
-                try:
-                    event = await asyncio.wait_for(self.event_queue.get(), timeout=batch_timeout)
-                    batch_events.append(event)
-                except asyncio.TimeoutError:
-                    pass
-                
-                # Process batch if we have events or timeout occurred
-                if batch_events:
-                    await self._write_event_batch(batch_events)
-                    batch_events.clear()
+                batch_events = [await self.event_queue.get()]
+                while not self.event_queue.empty():
+                    batch_events.append(self.event_queue.get_nowait())
+                self.event_writer.submit(batch_events)
                     
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Background writer error: {e}")
                 await asyncio.sleep(1)  # Brief pause before retry
     
-    async def _write_event_batch(self, events: List[Dict[str, Any]]):
-        """Write a batch of events to database"""
-        try:
-            self.db.execute("BEGIN TRANSACTION")
-            
-            for event in events:
-                self.db.execute("""
-                    INSERT INTO event (
-                        session_id, timestamp, type, data, frame_id, energy_delta
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    event['session_id'],
-                    event['timestamp'],
-                    event['type'],
-                    json.dumps(event['data']),
-                    event.get('frame_id'),
-                    event.get('energy_delta')
-                ))
-            
-            self.db.execute("COMMIT")
-            logger.debug(f"Wrote batch of {len(events)} events")
-            
-        except Exception as e:
-            self.db.execute("ROLLBACK")
-            logger.error(f"Failed to write event batch: {e}")
+    def get_writer_metrics(self) -> Dict[str, Any]:
+        """Event writer queue depth, batch size and commit latency"""
+        metrics = self.event_writer.get_metrics() if self.event_writer else {}
+        metrics["pending_handoff"] = self.event_queue.qsize()
+        return metrics
     
     async def shutdown(self):
         """Graceful shutdown of state manager"""
@@ -546,11 +1480,15 @@ class StateManager:
         # Flush any remaining events
         remaining_events = []
         while not self.event_queue.empty():
-            remaining_events.append(await self.event_queue.get())
+            remaining_events.append(self.event_queue.get_nowait())
         
-        if remaining_events:
-            await self._write_event_batch(remaining_events)
-            logger.info(f"Flushed {len(remaining_events)} remaining events")
+        if self.event_writer:
+            # The writer thread closes the event log after its last batch
+            self.event_writer.submit(remaining_events)
+            if await asyncio.get_running_loop().run_in_executor(None, self.event_writer.stop):
+                logger.info(f"Flushed {len(remaining_events)} remaining events")
+        elif self.event_log is not None:
+            self.event_log.close()
         
         if self.db:
             self.db.close()
@@ -25,6 +25,10 @@ import argparse
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Schema 1.1.0 snapshots are encoded base/delta BLOBs (see
+# WF-TECH-004-snapshot-recovery.py); only legacy snapshots are JSON text
+SNAPSHOT_MAGIC = b"WFSN"
+
 class DataValidator:
     """
     Comprehensive data validator for WIRTHFORGE state database
@@ -267,6 +271,10 @@ class DataValidator:
             snapshots = self.db.execute("SELECT snapshot_id, state FROM snapshot").fetchall()
             
             for snapshot_id, state in snapshots:
+                if isinstance(state, bytes):
+                    if not state.startswith(SNAPSHOT_MAGIC):
+                        invalid_json_snapshots.append((snapshot_id, "unrecognized binary state"))
+                    continue
                 try:
                     json.loads(state)
                 except json.JSONDecodeError as e:
@@ -399,6 +407,8 @@ class DataValidator:
                 """).fetchall()
                 
                 for snapshot_id, state in snapshots:
+                    if isinstance(state, bytes):
+                        continue  # Deltas are only meaningful applied to their base
                     try:
                         state_obj = json.loads(state)
                         jsonschema.validate(state_obj, self.schemas['energy_state'])
@@ -6,25 +6,47 @@ This module implements the core 60Hz real-time loop that converts AI token strea
 into structured energy events with <16.67ms frame budget compliance.
 
 Key Features:
-- 60Hz frame-locked processing loop
+- 60Hz frame-locked processing loop on absolute monotonic deadlines
+- Batched per-model token intake with optional early wakeup
 - Token-to-energy conversion using WF-FND-002 formulas
 - Adaptive load management and frame dropping
+- Vectorized struct-of-arrays particle engine capped by quality level
 - WebSocket event emission
 - State machine management (IDLE, CHARGING, FLOWING, STALLING, DRAINED)
 - Multi-model support with interference/resonance detection
 """
 
 import asyncio
+import os
+import sys
 import time
 import json
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterable, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from collections import deque
 from enum import Enum
 import uuid
 from datetime import datetime, timezone
 
+import numpy as np
+
+try:
+    from adaptive_controller import AdaptiveController
+    from frame_scheduler import FrameScheduler, MissedFramePolicy
+except ImportError:
+    # Shared with the DECIPHER frame loop (WF-FND-004)
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 os.pardir, os.pardir, "WF-FND", "WF-FND-004"))
+    from adaptive_controller import AdaptiveController
+    from frame_scheduler import FrameScheduler, MissedFramePolicy
+
+try:
+    from particle_engine import ParticleEngine, SPARK, BOLT, BURST, FADE
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from particle_engine import ParticleEngine, SPARK, BOLT, BURST, FADE
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -75,8 +97,10 @@ class DecipherConfig:
     """Configuration for Decipher loop"""
     target_fps: int = 60
     frame_budget_ms: float = 16.67  # 1000ms / 60fps
-    max_queue_size: int = 1000
+    max_queue_size: int = 1000          # Token backlog across all models
     max_tokens_per_frame: int = 10
+    intake_wake_threshold: int = 0      # Backlog that releases the next frame early (0 = off)
+    missed_frame_policy: str = "skip"  # "skip" or "catch_up" after an overrun
     
     # Energy calculation parameters
     energy_smoothing_alpha: float = 0.35  # EMA smoothing factor
@@ -93,11 +117,130 @@ class DecipherConfig:
     enable_resonance_detection: bool = True
     enable_interference_detection: bool = True
     enable_particle_effects: bool = True
+    max_particles: int = 512             # Hard cap at quality level 1.0
+    min_particles: int = 32              # Cap floor however low quality drops
+    degraded_particle_quality: float = 0.25  # Quality ceiling for particles in degraded mode
+    particle_format: str = "packed"      # "packed" arrays or legacy "dicts"
     
     # Adaptive degradation thresholds
     degradation_queue_threshold: int = 100
     degradation_overrun_threshold: int = 5
 
+class TokenIntake:
+    """
+    Per-model token buffers drained by the frame loop.
+    
+    Producers append to their model's list; the loop takes up to a frame's
+    worth of tokens, sharing the quota fairly across models. A buffer that is
+    drained completely is swapped for a fresh list, so the common case costs
+    O(1) per model instead of one queue operation per token.
+    """
+    
+    COMPACT_AFTER = 1024  # Consumed slots kept before a partially drained buffer is trimmed
+    
+    def __init__(self, max_backlog: int, wake_threshold: int = 0):
+        self.max_backlog = max_backlog
+        self.wake_threshold = wake_threshold
+        self.wakeup = asyncio.Event()
+        self.buffers: Dict[str, List[TokenData]] = {}
+        self._heads: Dict[str, int] = {}  # Next unread index per buffer
+        self.backlog = 0
+        self.ingested = 0
+        self.dropped = 0
+        self.wakeups = 0
+        
+    def put(self, tokens: List[TokenData]) -> int:
+        """Append tokens to their models' buffers; returns how many fit in the backlog"""
+        room = self.max_backlog - self.backlog
+        if len(tokens) > room:
+            self.dropped += len(tokens) - max(room, 0)
+            tokens = tokens[:max(room, 0)]
+        if not tokens:
+            return 0
+            
+        buffers = self.buffers
+        model_id = None
+        for token in tokens:
+            if token.model_id != model_id:
+                model_id = token.model_id
+                buffer = buffers.get(model_id)
+                if buffer is None:
+                    buffer = buffers[model_id] = []
+                    self._heads[model_id] = 0
+                append = buffer.append
+            append(token)
+            
+        before = self.backlog
+        self.backlog += len(tokens)
+        self.ingested += len(tokens)
+        if self.wake_threshold and before < self.wake_threshold <= self.backlog:
+            self.wakeups += 1
+            self.wakeup.set()
+        return len(tokens)
+        
+    def take(self, max_tokens: int) -> List[TokenData]:
+        """Remove up to max_tokens tokens, in per-model arrival order"""
+        if not self.backlog:
+            return []
+        buffers, heads = self.buffers, self._heads
+        pending = [m for m, buffer in buffers.items() if len(buffer) > heads[m]]
+        
+        tokens: List[TokenData] = []
+        if self.backlog <= max_tokens:
+            # Everything fits: swap each buffer out
+            for model_id in pending:
+                buffer, head = buffers[model_id], heads[model_id]
+                tokens.extend(buffer[head:] if head else buffer)
+                buffers[model_id] = []
+                heads[model_id] = 0
+            self.backlog = 0
+            return tokens
+            
+        # Fair share: split the remaining quota evenly over models that still have tokens
+        remaining = max_tokens
+        while remaining and pending:
+            share = max(1, remaining // len(pending))
+            still_pending = []
+            for model_id in pending:
+                buffer, head = buffers[model_id], heads[model_id]
+                n = min(share, len(buffer) - head, remaining)
+                tokens.extend(buffer[head:head + n])
+                head += n
+                remaining -= n
+                if head == len(buffer):
+                    buffers[model_id] = []
+                    head = 0
+                else:
+                    if head > self.COMPACT_AFTER and head * 2 > len(buffer):
+                        del buffer[:head]
+                        head = 0
+                    still_pending.append(model_id)
+                heads[model_id] = head
+                if not remaining:
+                    break
+            pending = still_pending
+        self.backlog -= len(tokens)
+        return tokens
+        
+    def get_stats(self, now: float = None) -> Dict[str, Any]:
+        """Backlog and age of the oldest waiting token, per model"""
+        now = time.time() if now is None else now
+        models = {}
+        for model_id, buffer in self.buffers.items():
+            head = self._heads[model_id]
+            backlog = len(buffer) - head
+            models[model_id] = {
+                "backlog": backlog,
+                "oldest_age_ms": round((now - buffer[head].timestamp) * 1000, 2) if backlog else 0.0
+            }
+        return {
+            "backlog": self.backlog,
+            "ingested": self.ingested,
+            "dropped": self.dropped,
+            "wakeups": self.wakeups,
+            "models": models
+        }
+
 class DecipherLoop:
     """
     Main Decipher real-time processing loop.
@@ -109,6 +252,8 @@ class DecipherLoop:
     def __init__(self, config: DecipherConfig = None):
         self.config = config or DecipherConfig()
         self.frame_interval = 1.0 / self.config.target_fps
+        self.scheduler = FrameScheduler(self.config.target_fps,
+                                        MissedFramePolicy(self.config.missed_frame_policy))
         
         # Core state
         self.running = False
@@ -120,7 +265,7 @@ class DecipherLoop:
         self.session_start_time = 0.0
         
         # Token processing
-        self.token_queue = asyncio.Queue(maxsize=self.config.max_queue_size)
+        self.intake = TokenIntake(self.config.max_queue_size, self.config.intake_wake_threshold)
         self.active_models = {}  # model_id -> model state
         
         # Performance tracking
@@ -134,6 +279,10 @@ class DecipherLoop:
         # Adaptive degradation state
         self.degraded_mode = False
         self.consecutive_overruns = 0
+        self.adaptive_controller = AdaptiveController()
+        
+        # Particle state (struct-of-arrays, advanced once per frame)
+        self.particles = ParticleEngine(self.config.max_particles, self.config.min_particles)
         
         # Pattern detection state
         self.interference_history = deque(maxlen=30)  # 0.5s history at 60fps
@@ -148,18 +297,27 @@ class DecipherLoop:
         Ingest a token from the AI model.
         Non-blocking - queues token for processing in next frame.
         """
-        try:
-            self.token_queue.put_nowait(token)
+        await self.ingest_tokens((token,))
+        
+    async def ingest_tokens(self, tokens: Iterable[TokenData]) -> int:
+        """
+        Ingest a batch of tokens from one or more models.
+        Non-blocking - buffers tokens for the next frames; returns how many were accepted.
+        """
+        tokens = list(tokens)
+        accepted = self.intake.put(tokens)
+        
+        if accepted < len(tokens):
+            # Backlog full - drop tokens and count them
+            self.dropped_tokens += len(tokens) - accepted
+            logger.warning(f"Token backlog full, dropped {len(tokens) - accepted} tokens")
             
-            # Update state machine on first token
-            if self.current_state == EnergyState.CHARGING:
-                self.current_state = EnergyState.FLOWING
-                self.last_token_time = time.time()
-                
-        except asyncio.QueueFull:
-            # Queue full - drop token and count it
-            self.dropped_tokens += 1
-            logger.warning(f"Token queue full, dropped token from {token.model_id}")
+        # Update state machine on first token
+        if accepted and self.current_state == EnergyState.CHARGING:
+            self.current_state = EnergyState.FLOWING
+            self.last_token_time = time.time()
+            
+        return accepted
             
     async def start_session(self, session_id: str = None):
         """Start a new Decipher session"""
@@ -195,20 +353,21 @@ class DecipherLoop:
         self.running = True
         logger.info("Starting Decipher 60Hz loop")
         
+        self.scheduler.start()
         try:
             while self.running:
-                frame_start = time.time()
+                # Wait for the next absolute deadline to maintain 60Hz without drift
+                # (or until the token backlog crosses the wake threshold)
+                tick = await self.scheduler.wait_next_frame(
+                    self.intake.wakeup if self.config.intake_wake_threshold else None
+                )
+                frame_start = tick.start
                 
                 # Process frame
                 await self._process_frame(frame_start)
                 
-                # Calculate sleep time to maintain 60Hz
-                frame_duration = time.time() - frame_start
-                sleep_time = max(0, self.frame_interval - frame_duration)
-                
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                else:
+                frame_duration = time.perf_counter() - frame_start
+                if frame_duration > self.frame_interval:
                     # Frame overrun
                     self.frame_overruns += 1
                     self.consecutive_overruns += 1
@@ -222,9 +381,18 @@ class DecipherLoop:
         """Stop the processing loop gracefully"""
         self.running = False
         logger.info("Stopping Decipher loop")
+
+    def get_timing_report(self) -> Dict[str, Any]:
+        """Frame start jitter percentiles and missed-frame counters"""
+        report = self.scheduler.get_jitter_report()
+        report["frame_overruns"] = self.frame_overruns
+        report["intake"] = self.intake.get_stats()
+        report["quality_level"] = self.adaptive_controller.quality_level
+        report["particles"] = self.particles.get_stats()
+        return report
         
     async def _process_frame(self, frame_start: float):
-        """Process a single frame within the 16.67ms budget"""
+        """Process a single frame within the 16.67ms budget (frame_start on the perf_counter clock)"""
         frame_id = self.frame_count
         self.frame_count += 1
         
@@ -234,13 +402,19 @@ class DecipherLoop:
         self._update_state_machine()
         
         # Check timing after essential work
-        elapsed = (time.time() - frame_start) * 1000
+        elapsed = (time.perf_counter() - frame_start) * 1000
         budget_used = elapsed / self.config.frame_budget_ms
         
         # Phase 2: Optional enhancements (if time permits)
-        particles = []
-        if budget_used < 0.5 and self.config.enable_particle_effects:
-            particles = self._generate_particles(tokens_this_frame, frame_energy)
+        particles = None
+        if self.config.enable_particle_effects:
+            self.particles.step(self.frame_interval * 1000)
+            if budget_used < 0.5:
+                self._generate_particles(tokens_this_frame, frame_energy)
+            if self.config.particle_format == "dicts":
+                particles = self.particles.to_dicts()
+            else:
+                particles = self.particles.to_packed()
             
         # Phase 3: Pattern detection (if time permits and enabled)
         interference_data = None
@@ -259,31 +433,33 @@ class DecipherLoop:
         )
         
         # Phase 5: Performance tracking and adaptation
-        final_duration = (time.time() - frame_start) * 1000
+        final_duration = (time.perf_counter() - frame_start) * 1000
         self.processing_times.append(final_duration)
         
         if final_duration <= self.config.frame_budget_ms:
             self.consecutive_overruns = 0
         
         # Adaptive degradation
+        self.adaptive_controller.update_load(final_duration, self.config.frame_budget_ms)
+        self.adaptive_controller.update_quality_level()
         self._update_degradation_state()
         
+        quality = self.adaptive_controller.quality_level
+        if self.degraded_mode:
+            quality = min(quality, self.config.degraded_particle_quality)
+        self.particles.set_quality(quality)
+        
     async def _collect_tokens(self) -> List[TokenData]:
-        """Collect tokens from queue for this frame"""
-        tokens = []
+        """Collect tokens from the intake buffers for this frame"""
         max_tokens = self.config.max_tokens_per_frame
         
         # In degraded mode, process more tokens per frame to catch up
         if self.degraded_mode:
             max_tokens *= 2
             
-        try:
-            while len(tokens) < max_tokens:
-                token = self.token_queue.get_nowait()
-                tokens.append(token)
-                self.last_token_time = time.time()
-        except asyncio.QueueEmpty:
-            pass
+        tokens = self.intake.take(max_tokens)
+        if tokens:
+            self.last_token_time = time.time()
             
         return tokens
         
@@ -348,32 +524,27 @@ class DecipherLoop:
         if hasattr(self, '_received_final_token') and self._received_final_token:
             self.current_state = EnergyState.DRAINED
             
-    def _generate_particles(self, tokens: List[TokenData], frame_energy: float) -> List[Dict]:
-        """Generate particle effects for visualization"""
-        particles = []
-        
-        for i, token in enumerate(tokens):
-            particle_energy = frame_energy / len(tokens) if tokens else 0
-            
-            particle = {
-                "id": f"particle_{self.frame_count}_{i}",
-                "type": "spark" if particle_energy < 0.5 else "bolt",
-                "energy": round(particle_energy, 3),
-                "intensity": min(particle_energy * 2.0, 1.0),
-                "model_id": token.model_id,
-                "timestamp": token.timestamp
-            }
+    def _generate_particles(self, tokens: List[TokenData], frame_energy: float) -> int:
+        """Spawn one particle per token into the particle engine; returns how many were kept"""
+        if not tokens:
+            return 0
             
-            # Add special effects based on state
-            if self.current_state == EnergyState.STALLING:
-                particle["type"] = "fade"
-                particle["intensity"] *= 0.5
-            elif particle_energy > 1.0:
-                particle["type"] = "burst"
-                
-            particles.append(particle)
+        particle_energy = frame_energy / len(tokens)
+        intensity = min(particle_energy * 2.0, 1.0)
+        
+        # Special effects based on state
+        if self.current_state == EnergyState.STALLING:
+            particle_type = FADE
+            intensity *= 0.5
+        elif particle_energy > 1.0:
+            particle_type = BURST
+        else:
+            particle_type = SPARK if particle_energy < 0.5 else BOLT
             
-        return particles
+        return self.particles.spawn(
+            [token.model_id for token in tokens],
+            np.float32(particle_energy), np.float32(intensity), np.float32(particle_type)
+        )
         
     def _detect_interference(self) -> Optional[Dict]:
         """Detect interference patterns between multiple models"""
@@ -434,7 +605,7 @@ class DecipherLoop:
         
     def _update_degradation_state(self):
         """Update adaptive degradation state based on performance"""
-        queue_size = self.token_queue.qsize()
+        queue_size = self.intake.backlog
         
         # Enter degraded mode if consistently overloaded
         if (queue_size > self.config.degradation_queue_threshold or 
@@ -451,14 +622,15 @@ class DecipherLoop:
             
     async def _emit_frame_event(self, frame_id: int, frame_start: float, 
                                tokens: List[TokenData], frame_energy: float,
-                               particles: List[Dict], interference_data: Optional[Dict],
+                               particles: Optional[Any], interference_data: Optional[Dict],
                                resonance_data: Optional[Dict]):
         """Emit the main frame event to UI"""
+        frame_time = self.scheduler.wall_time(frame_start)
         
         event = {
             "id": f"frame-{frame_id}",
             "type": "energy.update",
-            "timestamp": int(frame_start * 1000),
+            "timestamp": int(frame_time * 1000),
             "payload": {
                 "frame_id": frame_id,
                 "new_tokens": len(tokens),
@@ -466,10 +638,10 @@ class DecipherLoop:
                 "total_energy": round(self.total_energy, 3),
                 "energy_rate": round(self.energy_rate_ema, 3),
                 "state": self.current_state.value,
-                "queue_depth": self.token_queue.qsize(),
-                "processing_time_ms": round((time.time() - frame_start) * 1000, 2),
+                "queue_depth": self.intake.backlog,
+                "processing_time_ms": round((time.perf_counter() - frame_start) * 1000, 2),
                 
-                # Visual elements
+                # Visual elements (packed particle arrays unless particle_format is "dicts")
                 "particles": particles,
                 
                 # Pattern detection
@@ -479,6 +651,7 @@ class DecipherLoop:
                 # Performance metrics
                 "performance": {
                     "frame_overruns": self.frame_overruns,
+                    "skipped_frames": self.scheduler.skipped_frames,
                     "dropped_tokens": self.dropped_tokens,
                     "degraded_mode": self.degraded_mode,
                     "avg_frame_time_ms": round(
@@ -493,7 +666,7 @@ class DecipherLoop:
         # Store frame data for pattern detection
         self.resonance_history.append({
             "energy": frame_energy,
-            "timestamp": frame_start,
+            "timestamp": frame_time,
             "state": self.current_state.value
         })
         
@@ -12,15 +12,18 @@ Key Features:
 - Multi-model energy calculation
 - Pattern-aware energy adjustments (burst/stall detection)
 - Performance-optimized calculations for 60Hz processing
+- Vectorized columnar batch mode for high-throughput replay
 """
 
 import math
+import sys
 import time
 from typing import Dict, List, Optional, Tuple, Any
+import dataclasses
 from dataclasses import dataclass
 from enum import Enum
 import numpy as np
-from collections import deque
+from collections import OrderedDict, deque
 
 class TokenType(Enum):
     """Token classification for energy calculation"""
@@ -30,6 +33,9 @@ class TokenType(Enum):
     FINAL = "final"      # Last token in generation
     SPECIAL = "special"  # Special tokens (start, end, etc.)
 
+# Integer codes used by the columnar batch engine
+TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(TokenType)}
+
 @dataclass
 class EnergyComponents:
     """Breakdown of energy calculation components"""
@@ -40,6 +46,33 @@ class EnergyComponents:
     pattern_modifier: float
     total_energy: float
 
+@dataclass
+class EnergyBatch:
+    """Columnar energy results for a batch of tokens"""
+    base_energy: np.ndarray
+    velocity_component: np.ndarray
+    certainty_component: np.ndarray
+    friction_component: np.ndarray
+    pattern_modifier: np.ndarray
+    total_energy: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.total_energy)
+        
+    def to_components(self) -> List[EnergyComponents]:
+        """Expand columnar results into per-token EnergyComponents"""
+        return [
+            EnergyComponents(*fields)
+            for fields in zip(
+                self.base_energy.tolist(),
+                self.velocity_component.tolist(),
+                self.certainty_component.tolist(),
+                self.friction_component.tolist(),
+                self.pattern_modifier.tolist(),
+                self.total_energy.tolist()
+            )
+        ]
+
 @dataclass
 class TokenMetrics:
     """Comprehensive token analysis for energy calculation"""
@@ -68,6 +101,166 @@ class TokenMetrics:
     model_temperature: Optional[float] = None
     model_top_p: Optional[float] = None
 
+@dataclass
+class TokenColumns:
+    """
+    Struct-of-arrays token frame for the vectorized batch engine.
+    
+    Optional per-token values use NaN for "not available", mirroring the
+    None fields of TokenMetrics.
+    """
+    timestamps: np.ndarray                # float64 seconds
+    token_length: np.ndarray              # token lengths
+    confidence: np.ndarray                # float64, NaN where unavailable
+    token_type: np.ndarray                # TOKEN_TYPE_CODES
+    entropy: np.ndarray                   # logprob entropy in bits, NaN where unavailable
+    model_index: np.ndarray               # index into model_ids
+    model_ids: List[str]
+    has_logprobs: Optional[np.ndarray] = None          # logprobs present (possibly malformed)
+    time_since_last: Optional[np.ndarray] = None       # derived from timestamps when omitted
+    generation_velocity: Optional[np.ndarray] = None   # NaN = estimate from model history
+    position_in_sequence: Optional[np.ndarray] = None
+    total_sequence_length: Optional[np.ndarray] = None  # NaN where unknown
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+        
+    def take(self, indices: np.ndarray) -> "TokenColumns":
+        """Rows at indices, in order; model_ids is shared with this frame"""
+        def pick(column):
+            return None if column is None else column[indices]
+        return TokenColumns(
+            timestamps=self.timestamps[indices],
+            token_length=self.token_length[indices],
+            confidence=self.confidence[indices],
+            token_type=self.token_type[indices],
+            entropy=self.entropy[indices],
+            model_index=self.model_index[indices],
+            model_ids=self.model_ids,
+            has_logprobs=pick(self.has_logprobs),
+            time_since_last=pick(self.time_since_last),
+            generation_velocity=pick(self.generation_velocity),
+            position_in_sequence=pick(self.position_in_sequence),
+            total_sequence_length=pick(self.total_sequence_length)
+        )
+
+# Approximate per-entry bookkeeping cost of an OrderedDict node plus the
+# (result, model_id, size) tuple stored for each cached calculation
+_CACHE_ENTRY_OVERHEAD_BYTES = 160
+
+CacheKey = Tuple[int, Optional[float], int, int]
+
+class EnergyCache:
+    """
+    Bounded LRU cache for energy calculations.
+    
+    Capacity is a byte budget rather than an entry count. Hit, miss and
+    eviction counters are tracked per model so operators can see which
+    streams benefit from caching.
+    """
+    
+    def __init__(self, max_bytes: int, time_bucket_ms: float):
+        self.max_bytes = max_bytes
+        self.time_bucket_ms = time_bucket_ms
+        self._inv_bucket = 1000.0 / time_bucket_ms
+        self._entries: "OrderedDict[CacheKey, Tuple[EnergyComponents, str, int]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.model_counters: Dict[str, List[int]] = {}  # model_id -> [hits, misses, evictions]
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def make_key(self, token_metrics: TokenMetrics) -> CacheKey:
+        """Build a tuple key, quantizing time_since_last into buckets"""
+        return (
+            token_metrics.token_length,
+            token_metrics.confidence,
+            TOKEN_TYPE_CODES[token_metrics.token_type],
+            round((token_metrics.time_since_last or 0.0) * self._inv_bucket)
+        )
+        
+    def make_column_keys(self, columns: TokenColumns, time_since_last: np.ndarray) -> List[CacheKey]:
+        """make_key for every row of a columnar frame"""
+        inv_bucket = self._inv_bucket
+        return [
+            (int(length), None if math.isnan(confidence) else confidence, type_code,
+             round((0.0 if math.isnan(tsl) else tsl) * inv_bucket))
+            for length, confidence, type_code, tsl in zip(
+                columns.token_length.tolist(), columns.confidence.tolist(),
+                columns.token_type.tolist(), time_since_last.tolist())
+        ]
+        
+    def get(self, key: CacheKey, model_id: str) -> Optional[EnergyComponents]:
+        """Look up a result, refreshing its recency on a hit"""
+        counters = self.model_counters.get(model_id)
+        if counters is None:
+            counters = self.model_counters[model_id] = [0, 0, 0]
+            
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            counters[1] += 1
+            return None
+            
+        self._entries.move_to_end(key)
+        self.hits += 1
+        counters[0] += 1
+        return entry[0]
+        
+    def put(self, key: CacheKey, result: EnergyComponents, model_id: str):
+        """Store a result, evicting least recently used entries over budget"""
+        size = (sys.getsizeof(key) + sys.getsizeof(result) +
+                sys.getsizeof(result.__dict__) + _CACHE_ENTRY_OVERHEAD_BYTES)
+        if size > self.max_bytes:
+            return
+            
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous[2]
+            
+        self._entries[key] = (result, model_id, size)
+        self.current_bytes += size
+        
+        while self.current_bytes > self.max_bytes:
+            _, (_, owner, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+            owner_counters = self.model_counters.get(owner)
+            if owner_counters is not None:
+                owner_counters[2] += 1
+                
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.model_counters.clear()
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache occupancy and per-model hit rates"""
+        per_model = {}
+        for model_id, (hits, misses, evictions) in self.model_counters.items():
+            lookups = hits + misses
+            per_model[model_id] = {
+                "hits": hits,
+                "misses": misses,
+                "evictions": evictions,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0
+            }
+        return {
+            "cache_size": len(self._entries),
+            "cache_bytes": self.current_bytes,
+            "cache_max_bytes": self.max_bytes,
+            "cache_evictions": self.evictions,
+            "cache_time_bucket_ms": self.time_bucket_ms,
+            "cache_by_model": per_model
+        }
+
 class EnergyMapper:
     """
     Core energy calculation engine implementing WF-FND-002 formulas.
@@ -89,9 +282,18 @@ class EnergyMapper:
         self.stall_detectors = {}  # model_id -> stall detection state
         
         # Performance optimization
-        self.calculation_cache = {}  # Cache for repeated calculations
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self.calculation_cache = EnergyCache(
+            max_bytes=self.config["cache_max_bytes"],
+            time_bucket_ms=self.config["cache_time_bucket_ms"]
+        )
+        
+    @property
+    def cache_hits(self) -> int:
+        return self.calculation_cache.hits
+        
+    @property
+    def cache_misses(self) -> int:
+        return self.calculation_cache.misses
         
     def _load_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Load configuration with defaults from WF-FND-002"""
@@ -137,8 +339,13 @@ class EnergyMapper:
             
             # Performance tuning
             "enable_caching": True,
-            "cache_size_limit": 1000,
-            "precision_digits": 3
+            "cache_max_bytes": 256 * 1024,
+            "cache_time_bucket_ms": 10.0,  # time_since_last quantization for cache keys
+            "precision_digits": 3,
+            
+            # Vectorized batch engine
+            "enable_vectorized_batch": True,
+            "vectorized_batch_min_size": 32
         }
         
         # Merge with provided config
@@ -152,6 +359,9 @@ class EnergyMapper:
         if abs(weight_sum - 1.0) > 0.01:
             raise ValueError(f"Component weights must sum to 1.0, got {weight_sum}")
             
+        if merged["cache_time_bucket_ms"] <= 0:
+            raise ValueError(f"cache_time_bucket_ms must be positive, got {merged['cache_time_bucket_ms']}")
+            
         return merged
         
     def calculate_energy(self, token_metrics: TokenMetrics) -> EnergyComponents:
@@ -162,12 +372,12 @@ class EnergyMapper:
         """
         
         # Check cache first
-        cache_key = self._get_cache_key(token_metrics)
-        if self.config["enable_caching"] and cache_key in self.calculation_cache:
-            self.cache_hits += 1
-            return self.calculation_cache[cache_key]
-            
-        self.cache_misses += 1
+        caching = self.config["enable_caching"]
+        if caching:
+            cache_key = self.calculation_cache.make_key(token_metrics)
+            cached = self.calculation_cache.get(cache_key, token_metrics.model_id)
+            if cached is not None:
+                return cached
         
         # Calculate base energy
         base_energy = self._calculate_base_energy(token_metrics)
@@ -208,8 +418,8 @@ class EnergyMapper:
         )
         
         # Cache result
-        if self.config["enable_caching"]:
-            self._cache_result(cache_key, result)
+        if caching:
+            self.calculation_cache.put(cache_key, result, token_metrics.model_id)
             
         # Update model history
         self._update_model_history(token_metrics)
@@ -354,7 +564,7 @@ class EnergyMapper:
             
         # Calculate velocity from recent history
         window_size = min(self.config["velocity_window_size"], len(history))
-        recent_tokens = history[-window_size:]
+        recent_tokens = list(history)[-window_size:]
         
         time_deltas = []
         for i in range(1, len(recent_tokens)):
@@ -372,14 +582,27 @@ class EnergyMapper:
         
     def _calculate_confidence_from_logprobs(self, logprobs: Dict) -> float:
         """Calculate confidence from log probabilities using entropy"""
-        if not logprobs or "top_logprobs" not in logprobs:
+        entropy = self._calculate_logprob_entropy(logprobs)
+        if entropy is None:
             return 0.5
             
+        # Normalize entropy to confidence (0-1)
+        max_entropy = self.config["max_entropy_bits"]
+        normalized_entropy = min(entropy / max_entropy, 1.0)
+        confidence = 1.0 - normalized_entropy  # High entropy = low confidence
+        
+        return confidence
+        
+    @staticmethod
+    def _calculate_logprob_entropy(logprobs: Optional[Dict]) -> Optional[float]:
+        """Entropy in bits of the top logprobs, or None if unavailable"""
+        if not logprobs or "top_logprobs" not in logprobs:
+            return None
+            
         top_logprobs = logprobs["top_logprobs"]
         if not top_logprobs:
-            return 0.5
+            return None
             
-        # Calculate entropy from top logprobs
         entropy = 0.0
         for token_data in top_logprobs:
             if "logprob" in token_data:
@@ -387,12 +610,7 @@ class EnergyMapper:
                 if prob > 0:
                     entropy -= prob * math.log2(prob)
                     
-        # Normalize entropy to confidence (0-1)
-        max_entropy = self.config["max_entropy_bits"]
-        normalized_entropy = min(entropy / max_entropy, 1.0)
-        confidence = 1.0 - normalized_entropy  # High entropy = low confidence
-        
-        return confidence
+        return entropy
         
     def _is_burst_token(self, token_metrics: TokenMetrics) -> bool:
         """Detect if token is part of a burst sequence"""
@@ -422,28 +640,13 @@ class EnergyMapper:
             "energy": None  # Will be filled by caller
         })
         
-    def _get_cache_key(self, token_metrics: TokenMetrics) -> str:
-        """Generate cache key for token metrics"""
-        # Create key from relevant fields only
-        key_parts = [
-            str(token_metrics.token_length),
-            str(token_metrics.confidence or "none"),
-            str(token_metrics.token_type.value),
-            str(round(token_metrics.time_since_last or 0, 2))
-        ]
-        return "|".join(key_parts)
-        
-    def _cache_result(self, cache_key: str, result: EnergyComponents):
-        """Cache calculation result with size limit"""
-        if len(self.calculation_cache) >= self.config["cache_size_limit"]:
-            # Remove oldest entry (simple FIFO)
-            oldest_key = next(iter(self.calculation_cache))
-            del self.calculation_cache[oldest_key]
-            
-        self.calculation_cache[cache_key] = result
-        
     def batch_calculate_energy(self, token_list: List[TokenMetrics]) -> List[EnergyComponents]:
         """Calculate energy for multiple tokens efficiently"""
+        if (self.config["enable_vectorized_batch"] and
+                len(token_list) >= self.config["vectorized_batch_min_size"]):
+            columns = self.build_token_columns(token_list)
+            return self.calculate_energy_columns(columns).to_components()
+            
         results = []
         
         for i, token_metrics in enumerate(token_list):
@@ -458,25 +661,314 @@ class EnergyMapper:
             
         return results
         
+    def build_token_columns(self, token_list: List[TokenMetrics]) -> TokenColumns:
+        """
+        Convert TokenMetrics into a columnar frame.
+        
+        Applies the same time_since_last update as the scalar batch path.
+        """
+        n = len(token_list)
+        nan = math.nan
+        model_lookup: Dict[str, int] = {}
+        
+        timestamps = np.empty(n, dtype=np.float64)
+        token_length = np.empty(n, dtype=np.float64)
+        confidence = np.empty(n, dtype=np.float64)
+        token_type = np.empty(n, dtype=np.int8)
+        entropy = np.empty(n, dtype=np.float64)
+        has_logprobs = np.empty(n, dtype=bool)
+        model_index = np.empty(n, dtype=np.int32)
+        time_since_last = np.empty(n, dtype=np.float64)
+        velocity = np.empty(n, dtype=np.float64)
+        position = np.empty(n, dtype=np.float64)
+        total_length = np.empty(n, dtype=np.float64)
+        
+        previous = None
+        for i, token in enumerate(token_list):
+            if previous is not None:
+                token.time_since_last = token.timestamp - previous.timestamp
+            previous = token
+            
+            timestamps[i] = token.timestamp
+            token_length[i] = token.token_length
+            confidence[i] = nan if token.confidence is None else token.confidence
+            token_type[i] = TOKEN_TYPE_CODES[token.token_type]
+            has_logprobs[i] = token.logprobs is not None
+            token_entropy = self._calculate_logprob_entropy(token.logprobs)
+            entropy[i] = nan if token_entropy is None else token_entropy
+            model_index[i] = model_lookup.setdefault(token.model_id, len(model_lookup))
+            time_since_last[i] = nan if token.time_since_last is None else token.time_since_last
+            velocity[i] = nan if token.generation_velocity is None else token.generation_velocity
+            position[i] = token.position_in_sequence
+            total_length[i] = (nan if token.total_sequence_length is None
+                               else token.total_sequence_length)
+            
+        return TokenColumns(
+            timestamps=timestamps,
+            token_length=token_length,
+            confidence=confidence,
+            token_type=token_type,
+            entropy=entropy,
+            model_index=model_index,
+            model_ids=list(model_lookup),
+            has_logprobs=has_logprobs,
+            time_since_last=time_since_last,
+            generation_velocity=velocity,
+            position_in_sequence=position,
+            total_sequence_length=total_length
+        )
+        
+    def calculate_energy_columns(self, columns: TokenColumns) -> EnergyBatch:
+        """
+        Vectorized energy calculation for a whole frame of tokens.
+        
+        Produces the same rounded values as calling calculate_energy on each
+        token in order, and advances the model histories and the calculation
+        cache the same way.
+        """
+        n = len(columns)
+        time_since_last = columns.time_since_last
+        if time_since_last is None:
+            time_since_last = np.empty(n, dtype=np.float64)
+            if n:
+                time_since_last[0] = math.nan
+                np.subtract(columns.timestamps[1:], columns.timestamps[:-1], out=time_since_last[1:])
+            columns = dataclasses.replace(columns, time_since_last=time_since_last)
+            
+        if not self.config["enable_caching"]:
+            return self._calculate_columns_uncached(columns)
+            
+        # Replay the scalar path's cache traffic in token order. A miss stores
+        # a placeholder that is filled in once the misses have been computed,
+        # so later tokens of this frame can hit it; hits do not advance the
+        # model histories, exactly as in calculate_energy.
+        cache = self.calculation_cache
+        model_ids = columns.model_ids
+        results: List[EnergyComponents] = []
+        missed: List[int] = []
+        for i, (key, model_idx) in enumerate(zip(cache.make_column_keys(columns, time_since_last),
+                                                  columns.model_index.tolist())):
+            model_id = model_ids[model_idx]
+            cached = cache.get(key, model_id)
+            if cached is None:
+                cached = EnergyComponents(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+                cache.put(key, cached, model_id)
+                missed.append(i)
+            results.append(cached)
+            
+        if missed:
+            computed = self._calculate_columns_uncached(columns.take(np.asarray(missed, dtype=np.intp)))
+            for i, components in zip(missed, computed.to_components()):
+                results[i].__dict__.update(components.__dict__)
+                
+        return EnergyBatch(*(
+            np.array([getattr(result, field.name) for result in results], dtype=np.float64)
+            for field in dataclasses.fields(EnergyComponents)
+        ))
+        
+    def _calculate_columns_uncached(self, columns: TokenColumns) -> EnergyBatch:
+        """calculate_energy_columns without the calculation cache"""
+        cfg = self.config
+        n = len(columns)
+        types = columns.token_type
+        is_burst_type = types == TOKEN_TYPE_CODES[TokenType.BURST]
+        is_stall_type = types == TOKEN_TYPE_CODES[TokenType.STALL]
+        
+        time_since_last = columns.time_since_last
+        has_tsl = ~np.isnan(time_since_last)
+        
+        # Base energy
+        base = np.full(n, float(cfg["base_energy_per_token"]))
+        if cfg["use_length_based_energy"]:
+            base = base + columns.token_length * cfg["length_energy_factor"]
+        base = base * cfg["energy_unit_scale"]
+        
+        # Velocity component
+        min_vel = cfg["min_velocity_tokens_per_sec"]
+        max_vel = cfg["max_velocity_tokens_per_sec"]
+        velocity = self._estimate_velocity_columns(columns)
+        if columns.generation_velocity is not None:
+            given = ~np.isnan(columns.generation_velocity)
+            velocity = np.where(given, columns.generation_velocity, velocity)
+        velocity = np.maximum(min_vel, np.minimum(max_vel, velocity))
+        velocity_component = _exact_unary(math.log, velocity / min_vel) / math.log(max_vel / min_vel)
+        velocity_component = np.maximum(0.0, np.minimum(1.0, velocity_component))
+        
+        # Certainty component
+        has_conf = ~np.isnan(columns.confidence)
+        if cfg["use_fallback_confidence"]:
+            certainty = np.full(n, float(cfg["fallback_confidence_value"]))
+        else:
+            certainty = np.zeros(n)
+        if cfg["entropy_calculation_enabled"]:
+            has_logprobs = columns.has_logprobs
+            if has_logprobs is None:
+                has_logprobs = ~np.isnan(columns.entropy)
+            logprob_conf = np.where(
+                np.isnan(columns.entropy), 0.5,
+                1.0 - np.minimum(columns.entropy / cfg["max_entropy_bits"], 1.0)
+            )
+            certainty = np.where(has_logprobs, logprob_conf, certainty)
+        certainty = np.where(has_conf, columns.confidence, certainty)
+        
+        high_thresh = cfg["confidence_threshold_high"]
+        low_thresh = cfg["confidence_threshold_low"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            certainty = np.where(
+                certainty >= high_thresh,
+                0.8 + 0.2 * ((certainty - high_thresh) / (1.0 - high_thresh)),
+                np.where(
+                    certainty <= low_thresh,
+                    0.2 * (certainty / low_thresh),
+                    0.2 + 0.6 * ((certainty - low_thresh) / (high_thresh - low_thresh))
+                )
+            )
+        certainty_component = np.maximum(0.0, np.minimum(1.0, certainty))
+        
+        # Friction component
+        friction = np.ones(n)
+        stall_threshold = cfg["stall_threshold_ms"] / 1000.0
+        with np.errstate(invalid="ignore"):
+            stalled = has_tsl & (time_since_last > stall_threshold)
+            bursting = has_tsl & (time_since_last < cfg["burst_threshold_ms"] / 1000.0)
+        if stalled.any():
+            stall_factor = np.minimum(time_since_last[stalled] / stall_threshold, 3.0)
+            decay = cfg["friction_decay_factor"]
+            friction[stalled] *= _exact_unary(lambda x: decay ** x, stall_factor)
+        friction = np.where(bursting, friction * cfg["friction_amplification"], friction)
+        friction = np.where(is_stall_type, friction * 0.5,
+                            np.where(is_burst_type, friction * 1.2, friction))
+        friction_component = np.maximum(0.1, np.minimum(2.0, friction))
+        
+        # Pattern modifier
+        multipliers = np.ones(len(TOKEN_TYPE_CODES))
+        multipliers[TOKEN_TYPE_CODES[TokenType.BURST]] = cfg["burst_energy_multiplier"]
+        multipliers[TOKEN_TYPE_CODES[TokenType.STALL]] = cfg["stall_energy_multiplier"]
+        multipliers[TOKEN_TYPE_CODES[TokenType.FINAL]] = cfg["final_token_multiplier"]
+        multipliers[TOKEN_TYPE_CODES[TokenType.SPECIAL]] = cfg["special_token_multiplier"]
+        pattern_modifier = 1.0 * multipliers[types]
+        if columns.total_sequence_length is not None and columns.position_in_sequence is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                near_end = (columns.position_in_sequence / columns.total_sequence_length) > 0.8
+            pattern_modifier = np.where(near_end, pattern_modifier * 1.1, pattern_modifier)
+            
+        # Combine components using WF-FND-002 formula
+        weighted_sum = (
+            velocity_component * cfg["velocity_weight"] +
+            certainty_component * cfg["certainty_weight"] +
+            friction_component * cfg["friction_weight"]
+        )
+        total_energy = base * weighted_sum * pattern_modifier
+        
+        self._update_model_history_columns(columns)
+        
+        precision = cfg["precision_digits"]
+        return EnergyBatch(
+            base_energy=_round_half_even(base, precision),
+            velocity_component=_round_half_even(velocity_component, precision),
+            certainty_component=_round_half_even(certainty_component, precision),
+            friction_component=_round_half_even(friction_component, precision),
+            pattern_modifier=_round_half_even(pattern_modifier, precision),
+            total_energy=_round_half_even(total_energy, precision)
+        )
+        
+    def _estimate_velocity_columns(self, columns: TokenColumns) -> np.ndarray:
+        """
+        Vectorized counterpart of _estimate_velocity.
+        
+        Each token sees the model history as it was just before that token,
+        i.e. the stored history followed by the earlier tokens of the same
+        model in this batch. Deltas are summed oldest-first so the average
+        matches the scalar path exactly.
+        """
+        min_vel = self.config["min_velocity_tokens_per_sec"]
+        window = self.config["velocity_window_size"]
+        velocity = np.full(len(columns), float(min_vel))
+        if window < 2:
+            return velocity
+            
+        for model_idx, model_id in enumerate(columns.model_ids):
+            token_idx = np.flatnonzero(columns.model_index == model_idx)
+            if not len(token_idx):
+                continue
+            history = self.model_histories.get(model_id, ())
+            prior = [entry["timestamp"] for entry in history]
+            seq = np.concatenate((np.asarray(prior, dtype=np.float64),
+                                  columns.timestamps[token_idx]))
+            
+            # deltas[q] = seq[q] - seq[q-1]; deltas[0] is never part of a window
+            deltas = np.zeros(len(seq))
+            deltas[1:] = seq[1:] - seq[:-1]
+            positive = deltas > 0
+            positive[0] = False
+            
+            # Token at seq position p averages positive deltas q in [p-window+1, p-1]
+            targets = np.arange(len(prior), len(seq))
+            delta_sum = np.zeros(len(targets))
+            delta_count = np.zeros(len(targets))
+            for offset in range(window - 1):
+                q = targets - (window - 1) + offset
+                valid = q >= 1
+                q = np.where(valid, q, 0)
+                take = valid & positive[q]
+                delta_sum = delta_sum + np.where(take, deltas[q], 0.0)
+                delta_count = delta_count + take
+                
+            with np.errstate(divide="ignore", invalid="ignore"):
+                estimated = 1.0 / (delta_sum / delta_count)
+            velocity[token_idx] = np.where(delta_count > 0, estimated, min_vel)
+            
+        return velocity
+        
+    def _update_model_history_columns(self, columns: TokenColumns):
+        """Advance model and global histories as the scalar path would"""
+        window = self.config["velocity_window_size"]
+        timestamps = columns.timestamps.tolist()
+        lengths = columns.token_length.tolist()
+        confidences = [None if math.isnan(c) else c for c in columns.confidence.tolist()]
+        model_index = columns.model_index
+        
+        for model_idx, model_id in enumerate(columns.model_ids):
+            token_idx = np.flatnonzero(model_index == model_idx)
+            if not len(token_idx):
+                continue
+            if model_id not in self.model_histories:
+                self.model_histories[model_id] = deque(maxlen=window)
+            history = self.model_histories[model_id]
+            for i in token_idx[-window:].tolist():
+                history.append({
+                    "timestamp": timestamps[i],
+                    "token_length": int(lengths[i]),
+                    "confidence": confidences[i]
+                })
+                
+        global_size = self.global_history.maxlen or len(timestamps)
+        start = max(0, len(timestamps) - global_size)
+        for i in range(start, len(timestamps)):
+            self.global_history.append({
+                "timestamp": timestamps[i],
+                "model_id": columns.model_ids[model_index[i]],
+                "energy": None
+            })
+            
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
         total_requests = self.cache_hits + self.cache_misses
         hit_rate = self.cache_hits / total_requests if total_requests > 0 else 0
         
-        return {
+        stats = {
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "cache_hit_rate": round(hit_rate, 3),
-            "cache_size": len(self.calculation_cache),
             "models_tracked": len(self.model_histories),
             "global_history_size": len(self.global_history)
         }
+        stats.update(self.calculation_cache.get_stats())
+        return stats
         
     def reset_cache(self):
         """Reset calculation cache"""
         self.calculation_cache.clear()
-        self.cache_hits = 0
-        self.cache_misses = 0
         
     def configure_for_model(self, model_id: str, model_config: Dict[str, Any]):
         """Configure energy mapping for specific model characteristics"""
@@ -485,6 +977,30 @@ class EnergyMapper:
         if model_id not in self.model_histories:
             self.model_histories[model_id] = deque(maxlen=self.config["velocity_window_size"])
 
+def _exact_unary(func, values: np.ndarray) -> np.ndarray:
+    """
+    Apply a math-module function elementwise.
+    
+    NumPy's SIMD transcendentals may differ from libm in the last ulp; using
+    the math module keeps the vectorized path identical to the scalar one.
+    """
+    return np.fromiter(map(func, values.tolist()), dtype=np.float64, count=len(values))
+
+def _round_half_even(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Round like Python's round() on every element.
+    
+    np.round scales by 10**digits first, which can land on the wrong side of
+    a decimal tie; values close to a tie are rounded with round() instead.
+    """
+    rounded = np.round(values, digits)
+    scaled = values * (10.0 ** digits)
+    tie_distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = np.flatnonzero(tie_distance <= 1e-6 * np.maximum(1.0, np.abs(scaled)))
+    for i in near_tie.tolist():
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
 # Utility functions for common use cases
 
 def create_token_metrics_from_simple_data(content: str, model_id: str, 
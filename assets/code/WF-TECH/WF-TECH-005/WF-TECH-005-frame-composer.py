@@ -11,19 +11,31 @@ Key Features:
 - Efficient serialization for 60Hz performance
 - Multi-channel event routing (energy.*, experience.*, etc.)
 - Event validation and error handling
-- Performance optimization with object pooling
+- Bounded object pooling for events, particle dicts and SoA particle buffers
+- Pluggable encoders: schema-specialized JSON and negotiable msgpack
+- Concurrent callback dispatch with a per-callback time budget
 """
 
+import bisect
+import functools
+import itertools
 import json
+import math
 import time
 import uuid
-from typing import Dict, List, Optional, Any, Callable, Union
+from json.encoder import c_make_encoder, encode_basestring_ascii as _json_str
+from typing import Dict, List, Optional, Any, Callable, Sequence, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
 from datetime import datetime, timezone
 import logging
 
+try:
+    import msgpack
+except ImportError:  # Binary wire format is optional; clients fall back to JSON
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 class EventType(Enum):
@@ -67,6 +79,143 @@ class ParticleEffect:
     lifetime_ms: Optional[float] = None
     model_id: Optional[str] = None
 
+class ObjectPool:
+    """
+    Bounded free-list pool with explicit acquire/release ownership.
+    
+    The pool is filled with `size` objects up front. acquire() hands out a
+    pooled object (hit) or builds a new one when the free list is empty
+    (miss); release() resets the object and keeps it if there is room. An
+    object must be released exactly once, by whoever acquired it. A size of
+    0 disables pooling while keeping the same call pattern.
+    """
+    
+    def __init__(self, factory: Callable[[], Any], reset: Callable[[Any], None], size: int):
+        self.factory = factory
+        self.reset = reset
+        self.size = size
+        self._free = [factory() for _ in range(size)]
+        self.in_use = 0
+        self.high_water = 0
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        
+    def acquire(self) -> Any:
+        if self._free:
+            obj = self._free.pop()
+            self.hits += 1
+        else:
+            obj = self.factory()
+            self.misses += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+        
+    def release(self, obj: Any):
+        if self.in_use == 0:
+            raise ValueError("release() without a matching acquire()")
+        self.in_use -= 1
+        if len(self._free) < self.size:
+            self.reset(obj)
+            self._free.append(obj)
+        else:
+            self.discarded += 1
+            
+    @property
+    def free(self) -> int:
+        return len(self._free)
+        
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "free": len(self._free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded
+        }
+
+class ParticleBuffer:
+    """
+    Struct-of-arrays particle storage for one frame.
+    
+    Columns are preallocated to `capacity` and overwritten in place, and each
+    slot owns a row dict with a fixed key order, so a buffer reused from a
+    pool allocates no per-particle containers. The optional columns carried
+    are fixed per buffer; every added particle provides them.
+    """
+    
+    OPTIONAL_FIELDS = ("position", "velocity", "color", "lifetime_ms", "model_id")
+    
+    def __init__(self, capacity: int = 64, fields: Sequence[str] = ("lifetime_ms", "model_id")):
+        unknown = set(fields) - set(self.OPTIONAL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown particle fields: {sorted(unknown)}")
+        self.fields = tuple(name for name in self.OPTIONAL_FIELDS if name in fields)
+        self.capacity = 0
+        self.count = 0
+        self.ids: List[Optional[str]] = []
+        self.types: List[Optional[str]] = []
+        self.energy: List[float] = []
+        self.intensity: List[float] = []
+        self.columns: Dict[str, List[Any]] = {name: [] for name in self.fields}
+        self._optional = [self.columns.get(name) for name in self.OPTIONAL_FIELDS]
+        self._rows: List[Dict[str, Any]] = []
+        self._grow(capacity)
+        
+    def _grow(self, capacity: int):
+        extra = capacity - self.capacity
+        self.ids.extend([None] * extra)
+        self.types.extend([None] * extra)
+        self.energy.extend([0.0] * extra)
+        self.intensity.extend([0.0] * extra)
+        for column in self.columns.values():
+            column.extend([None] * extra)
+        keys = ("id", "type", "energy", "intensity") + self.fields
+        self._rows.extend(dict.fromkeys(keys) for _ in range(extra))
+        self.capacity = capacity
+        
+    def add(self, particle_id: str, particle_type: str, energy: float, intensity: float,
+            position: Optional[Dict[str, float]] = None, velocity: Optional[Dict[str, float]] = None,
+            color: Optional[str] = None, lifetime_ms: Optional[float] = None,
+            model_id: Optional[str] = None) -> int:
+        """Append one particle; returns its slot"""
+        i = self.count
+        if i == self.capacity:
+            self._grow(max(16, self.capacity * 2))
+        self.ids[i] = particle_id
+        self.types[i] = particle_type
+        self.energy[i] = energy
+        self.intensity[i] = intensity
+        for column, value in zip(self._optional, (position, velocity, color, lifetime_ms, model_id)):
+            if column is not None:
+                column[i] = value
+        self.count = i + 1
+        return i
+        
+    def clear(self):
+        """Forget the particles; storage is kept for the next frame"""
+        self.count = 0
+        
+    def rows(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Particles as the slot-owned row dicts (valid until the buffer is reused)"""
+        count = self.count if limit is None else min(self.count, limit)
+        rows = self._rows
+        ids, types, energy, intensity = self.ids, self.types, self.energy, self.intensity
+        columns = [(name, self.columns[name]) for name in self.fields]
+        for i in range(count):
+            row = rows[i]
+            row["id"] = ids[i]
+            row["type"] = types[i]
+            row["energy"] = round(energy[i], 3)
+            row["intensity"] = round(intensity[i], 3)
+            for name, column in columns:
+                row[name] = column[i]
+        return rows[:count]
+
 @dataclass
 class InterferenceData:
     """Interference pattern data"""
@@ -98,6 +247,196 @@ class PerformanceMetrics:
     dropped_events: int = 0
     degraded_mode: bool = False
 
+class SerializationHistogram:
+    """Fixed-size histogram of serialization times in microseconds"""
+    
+    BOUNDS_US = (2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+        
+    def record(self, duration_us: float):
+        self.counts[bisect.bisect_left(self.BOUNDS_US, duration_us)] += 1
+        self.count += 1
+        self.total_us += duration_us
+        if duration_us > self.max_us:
+            self.max_us = duration_us
+            
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bound, count in zip(self.BOUNDS_US, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max_us)
+        return self.max_us
+        
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_us / self.count, 2) if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "max_us": round(self.max_us, 2)
+        }
+
+class EventEncoder:
+    """Serializes composed events for one wire format"""
+    
+    wire_format = "json"
+    
+    def encode(self, event: Dict[str, Any]) -> Union[str, bytes]:
+        raise NotImplementedError
+
+class JsonEventEncoder(EventEncoder):
+    """Generic JSON encoder (any event shape)"""
+    
+    def __init__(self, compact: bool = True):
+        if compact:
+            self._encode = json.JSONEncoder(separators=(',', ':')).encode
+        else:
+            self._encode = json.JSONEncoder(indent=2).encode
+            
+    def encode(self, event: Dict[str, Any]) -> str:
+        return self._encode(event)
+
+class SchemaJsonEncoder(JsonEventEncoder):
+    """
+    Compact JSON encoder specialized for the fixed high-rate event types.
+    
+    energy.update, experience.token, council.interference and
+    council.resonance are written from precompiled templates in the exact
+    byte layout of compact json.dumps; nested variable-length parts go
+    through the C encoder. Events that do not match the expected shape
+    (debug info, extra keys, non-finite numbers, unexpected types) fall back
+    to the generic encoder, so output is identical to json.dumps.
+    """
+    
+    ENVELOPE = '{"id":%s,"type":"%s","timestamp":%r,"version":"1.0","payload":%s}'
+    ENERGY_UPDATE = ('{"frame_id":%r,"new_tokens":%r,"energy_generated":%r,"total_energy":%r,'
+                     '"energy_rate":%r,"state":%s,"particles":%s,"interference":%s,'
+                     '"resonance":%s,"performance":%s}')
+    TOKEN = ('{"content":%s,"model_id":%s,"energy":%r,"confidence":%s,"position":%r,'
+             '"is_final":%s,"content_hash":%s}')
+    INTERFERENCE = ('{"type":%s,"strength":%r,"models_involved":%s,"frequency":%r,'
+                    '"duration_ms":%r,"phase_offset":%s}')
+    RESONANCE = ('{"type":%s,"strength":%r,"frequency":%r,"amplification":%r,'
+                 '"duration_ms":%r,"coherence":%s}')
+    
+    def __init__(self):
+        super().__init__(compact=True)
+        if c_make_encoder is not None:
+            # Reusable C encoder for nested parts; JSONEncoder.encode builds one per call
+            iterencode = c_make_encoder({}, json.JSONEncoder().default, _json_str, None,
+                                        ':', ',', False, False, True)
+            self._nested = lambda value: ''.join(iterencode(value, 0))
+        else:
+            self._nested = self._encode
+        # event type -> (payload key count, payload encoder)
+        self._payload_encoders = {
+            EventType.ENERGY_UPDATE.value: (10, self._energy_update),
+            EventType.EXPERIENCE_TOKEN.value: (7, self._token),
+            EventType.COUNCIL_INTERFERENCE.value: (6, self._interference),
+            EventType.COUNCIL_RESONANCE.value: (6, self._resonance)
+        }
+        
+    def encode(self, event: Dict[str, Any]) -> str:
+        try:
+            size, payload_encoder = self._payload_encoders[event["type"]]
+            payload = event["payload"]
+            if len(event) == 5 and len(payload) == size:
+                return self.ENVELOPE % (_json_str(event["id"]), event["type"], event["timestamp"],
+                                        payload_encoder(payload))
+        except (KeyError, TypeError, ValueError):
+            pass
+        return self._encode(event)
+        
+    # Payload encoders raise TypeError/ValueError on anything outside the
+    # schema (isfinite() rejects NaN/inf via ValueError below and non-numbers)
+    
+    def _energy_update(self, p: Dict[str, Any]) -> str:
+        encode = self._nested
+        interference, resonance, performance = p["interference"], p["resonance"], p["performance"]
+        _check_finite(p["frame_id"], p["new_tokens"], p["energy_generated"],
+                      p["total_energy"], p["energy_rate"])
+        return self.ENERGY_UPDATE % (
+            p["frame_id"], p["new_tokens"], p["energy_generated"], p["total_energy"],
+            p["energy_rate"], _json_str(p["state"]), encode(p["particles"]),
+            "null" if interference is None else encode(interference),
+            "null" if resonance is None else encode(resonance),
+            "null" if performance is None else encode(performance)
+        )
+        
+    def _token(self, p: Dict[str, Any]) -> str:
+        confidence, content_hash, is_final = p["confidence"], p["content_hash"], p["is_final"]
+        _check_finite(p["energy"], p["position"], 0.0 if confidence is None else confidence)
+        return self.TOKEN % (
+            _json_str(p["content"]), _json_str(p["model_id"]), p["energy"],
+            "null" if confidence is None else repr(confidence), p["position"],
+            "true" if is_final is True else "false" if is_final is False else _reject(is_final),
+            "null" if content_hash is None else _json_str(content_hash)
+        )
+        
+    def _interference(self, p: Dict[str, Any]) -> str:
+        phase_offset = p["phase_offset"]
+        _check_finite(p["strength"], p["frequency"], p["duration_ms"],
+                      0.0 if phase_offset is None else phase_offset)
+        return self.INTERFERENCE % (
+            _json_str(p["type"]), p["strength"], self._nested(p["models_involved"]),
+            p["frequency"], p["duration_ms"], "null" if phase_offset is None else repr(phase_offset)
+        )
+        
+    def _resonance(self, p: Dict[str, Any]) -> str:
+        coherence = p["coherence"]
+        _check_finite(p["strength"], p["frequency"], p["amplification"], p["duration_ms"],
+                      0.0 if coherence is None else coherence)
+        return self.RESONANCE % (
+            _json_str(p["type"]), p["strength"], p["frequency"], p["amplification"],
+            p["duration_ms"], "null" if coherence is None else repr(coherence)
+        )
+
+def _check_finite(*values: Any):
+    """Raise unless every value is a finite int/float (bools excluded)"""
+    for value in values:
+        if value.__class__ is not float and value.__class__ is not int:
+            raise TypeError(f"not a JSON number: {value!r}")
+        if not math.isfinite(value):
+            raise ValueError(f"non-finite number: {value!r}")
+
+def _reject(value: Any):
+    raise TypeError(f"unexpected value: {value!r}")
+
+class MsgpackEventEncoder(EventEncoder):
+    """Binary msgpack wire format for clients that negotiate it"""
+    
+    wire_format = "msgpack"
+    
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        self._packer = msgpack.Packer()
+        
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return self._packer.pack(event)
+
+@dataclass
+class EventSubscriber:
+    """Registered event callback and its delivery statistics"""
+    callback: Callable
+    wire_format: str = "json"
+    is_async: bool = False
+    pending: Optional[asyncio.Future] = None  # Delivery still running past its budget
+    deliveries: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    errors: int = 0
+
 class FrameComposer:
     """
     Composes and emits frame events with JSON schema compliance.
@@ -109,17 +448,30 @@ class FrameComposer:
     def __init__(self, config: Dict[str, Any] = None):
         self.config = self._load_config(config or {})
         
-        # Event emission callbacks
-        self.event_callbacks = []
+        # Event emission callbacks and their wire formats
+        self.subscribers: List[EventSubscriber] = []
+        self.encoders: Dict[str, EventEncoder] = {}
+        self._setup_encoders()
+        
+        # Monotonic per-session event ids
+        self._event_id_prefix = f"{uuid.uuid4().hex[:12]}-"
+        self._event_ids = itertools.count(1)
         
         # Performance tracking
         self.events_emitted = 0
-        self.serialization_times = []
+        self.serialization_histograms: Dict[str, Dict[str, SerializationHistogram]] = {}
         self.emission_errors = 0
-        
-        # Object pooling for performance
-        self.event_pool = []
-        self.particle_pool = []
+        self.dropped_events = 0
+        
+        # Object pooling for performance (size 0 when disabled)
+        pool_size = self.config["pool_size_limit"] if self.config["enable_object_pooling"] else 0
+        buffer_pool_size = self.config["particle_buffer_pool_size"] if self.config["enable_object_pooling"] else 0
+        max_particles = self.config["max_particles_per_frame"]
+        self.event_pool = ObjectPool(dict, dict.clear, pool_size)
+        self.particle_pool = ObjectPool(dict, dict.clear, pool_size)
+        self.particle_buffer_pool = ObjectPool(
+            lambda: ParticleBuffer(max_particles), ParticleBuffer.clear, buffer_pool_size
+        )
         
         # Schema validation (if enabled)
         self.schema_validator = None
@@ -132,6 +484,7 @@ class FrameComposer:
             # Performance settings
             "enable_object_pooling": True,
             "pool_size_limit": 100,
+            "particle_buffer_pool_size": 4,  # Frames in flight per composer
             "enable_schema_validation": False,  # Disable in production for performance
             "max_serialization_time_ms": 5.0,
             
@@ -139,6 +492,8 @@ class FrameComposer:
             "timestamp_precision": "milliseconds",  # "seconds", "milliseconds", "microseconds"
             "include_debug_info": False,
             "compact_json": True,  # No indentation for smaller payloads
+            "event_encoder": "schema",  # "schema" (specialized) or "generic" JSON
+            "callback_budget_ms": 5.0,  # Max wait per async callback before moving on
             
             # Field limits for performance
             "max_particles_per_frame": 50,
@@ -155,39 +510,97 @@ class FrameComposer:
         merged.update(config)
         return merged
         
-    def add_event_callback(self, callback: Callable[[Dict], Any]):
+    def _setup_encoders(self):
+        """Create the JSON encoder and any available binary encoders"""
+        if self.config["compact_json"] and self.config["event_encoder"] == "schema":
+            self.register_encoder(SchemaJsonEncoder())
+        else:
+            self.register_encoder(JsonEventEncoder(self.config["compact_json"]))
+        if msgpack is not None:
+            self.register_encoder(MsgpackEventEncoder())
+            
+    def register_encoder(self, encoder: EventEncoder):
+        """Register (or replace) the encoder for its wire format"""
+        self.encoders[encoder.wire_format] = encoder
+        
+    def negotiate_wire_format(self, accepted: List[str]) -> str:
+        """Pick the first wire format the client accepts that we can encode"""
+        for wire_format in accepted:
+            if wire_format in self.encoders:
+                return wire_format
+        return "json"
+        
+    def add_event_callback(self, callback: Callable[[Union[str, bytes]], Any], wire_format: str = "json"):
         """Add callback for event emission (typically WebSocket send)"""
-        self.event_callbacks.append(callback)
+        if wire_format not in self.encoders:
+            logger.warning(f"Wire format '{wire_format}' unavailable, falling back to JSON")
+            wire_format = "json"
+        self.subscribers.append(EventSubscriber(
+            callback=callback,
+            wire_format=wire_format,
+            is_async=asyncio.iscoroutinefunction(callback)
+        ))
+        
+    def acquire_particle_buffer(self) -> ParticleBuffer:
+        """Get an empty particle buffer; the caller releases it after emitting"""
+        return self.particle_buffer_pool.acquire()
+        
+    def release_particle_buffer(self, buffer: ParticleBuffer):
+        """Return a particle buffer once its frame has been emitted"""
+        self.particle_buffer_pool.release(buffer)
         
     async def emit_energy_update(self, frame_id: int, timestamp: float,
                                 new_tokens: int, energy_generated: float,
                                 total_energy: float, energy_rate: float,
-                                state: str, particles: List[ParticleEffect] = None,
+                                state: str,
+                                particles: Union[List[ParticleEffect], ParticleBuffer] = None,
                                 interference: InterferenceData = None,
                                 resonance: ResonanceData = None,
                                 performance: PerformanceMetrics = None) -> bool:
-        """Emit main energy update event"""
+        """
+        Emit main energy update event
+        
+        particles may be a list of ParticleEffect or a ParticleBuffer; a buffer
+        stays owned by the caller and is not modified.
+        """
         
         event = self._create_base_event(EventType.ENERGY_UPDATE, timestamp)
+        max_particles = self.config["max_particles_per_frame"]
         
-        # Limit particles for performance
-        if particles:
-            particles = particles[:self.config["max_particles_per_frame"]]
+        # Particle dicts come from the pool as they are serialized, so they
+        # are tracked from the first acquire and released however we exit
+        pooled_particles: List[Dict[str, Any]] = []
+        try:
+            try:
+                # Limit particles for performance
+                if isinstance(particles, ParticleBuffer):
+                    particle_dicts = particles.rows(max_particles)
+                else:
+                    particle_dicts = pooled_particles
+                    for particle in (particles or [])[:max_particles]:
+                        pooled_particles.append(self._serialize_particle(particle))
+                    
+                event["payload"] = {
+                    "frame_id": frame_id,
+                    "new_tokens": new_tokens,
+                    "energy_generated": round(energy_generated, 3),
+                    "total_energy": round(total_energy, 3),
+                    "energy_rate": round(energy_rate, 3),
+                    "state": state,
+                    "particles": particle_dicts,
+                    "interference": self._serialize_interference(interference) if interference else None,
+                    "resonance": self._serialize_resonance(resonance) if resonance else None,
+                    "performance": self._serialize_performance(performance) if performance else None
+                }
+            except Exception:
+                # _emit_event releases the event; it was never reached
+                self.event_pool.release(event)
+                raise
             
-        event["payload"] = {
-            "frame_id": frame_id,
-            "new_tokens": new_tokens,
-            "energy_generated": round(energy_generated, 3),
-            "total_energy": round(total_energy, 3),
-            "energy_rate": round(energy_rate, 3),
-            "state": state,
-            "particles": [self._serialize_particle(p) for p in (particles or [])],
-            "interference": self._serialize_interference(interference) if interference else None,
-            "resonance": self._serialize_resonance(resonance) if resonance else None,
-            "performance": self._serialize_performance(performance) if performance else None
-        }
-        
-        return await self._emit_event(event)
+            return await self._emit_event(event)
+        finally:
+            for particle in pooled_particles:
+                self.particle_pool.release(particle)
         
     async def emit_token_event(self, token_content: str, model_id: str,
                               energy: float, confidence: Optional[float] = None,
@@ -227,6 +640,10 @@ class FrameComposer:
     async def emit_session_start(self, session_id: str, config: Dict[str, Any]) -> bool:
         """Emit session start event"""
         
+        # Event ids restart per session: "<session_id>:<n>"
+        self._event_id_prefix = f"{session_id}:"
+        self._event_ids = itertools.count(1)
+        
         event = self._create_base_event(EventType.SESSION_START)
         event["payload"] = {
             "session_id": session_id,
@@ -282,15 +699,9 @@ class FrameComposer:
     def _create_base_event(self, event_type: EventType, timestamp: float = None) -> Dict[str, Any]:
         """Create base event structure"""
         
-        # Use object pool if enabled
-        if self.config["enable_object_pooling"] and self.event_pool:
-            event = self.event_pool.pop()
-            event.clear()
-        else:
-            event = {}
-            
+        event = self.event_pool.acquire()
         event.update({
-            "id": str(uuid.uuid4()),
+            "id": self._next_event_id(),
             "type": event_type.value,
             "timestamp": self._format_timestamp(timestamp or time.time()),
             "version": "1.0"
@@ -304,21 +715,21 @@ class FrameComposer:
             
         return event
         
+    def _next_event_id(self) -> str:
+        """Cheap monotonic event id, unique within the session"""
+        return f"{self._event_id_prefix}{next(self._event_ids)}"
+        
     def _serialize_particle(self, particle: ParticleEffect) -> Dict[str, Any]:
         """Serialize particle effect to JSON-compatible dict"""
         
-        # Use object pool if enabled
-        if self.config["enable_object_pooling"] and self.particle_pool:
-            result = self.particle_pool.pop()
-            result.clear()
-        else:
-            result = {}
-            
+        # Round before acquiring so a bad value cannot strand a pooled dict
+        energy, intensity = round(particle.energy, 3), round(particle.intensity, 3)
+        result = self.particle_pool.acquire()
         result.update({
             "id": particle.id,
             "type": particle.type,
-            "energy": round(particle.energy, 3),
-            "intensity": round(particle.intensity, 3)
+            "energy": energy,
+            "intensity": intensity
         })
         
         # Optional fields
@@ -402,48 +813,16 @@ class FrameComposer:
         return hashlib.sha256(content.encode()).hexdigest()[:16]
         
     async def _emit_event(self, event: Dict[str, Any]) -> bool:
-        """Emit event to all registered callbacks"""
-        
-        start_time = time.time()
+        """Encode the event once per subscribed wire format and dispatch it"""
         
         try:
             # Validate schema if enabled
             if self.config["enable_schema_validation"] and self.schema_validator:
                 self._validate_event_schema(event)
                 
-            # Serialize to JSON
-            if self.config["compact_json"]:
-                json_data = json.dumps(event, separators=(',', ':'))
-            else:
-                json_data = json.dumps(event, indent=2)
-                
-            # Check serialization time
-            serialization_time = (time.time() - start_time) * 1000
-            self.serialization_times.append(serialization_time)
-            
-            if serialization_time > self.config["max_serialization_time_ms"]:
-                logger.warning(f"Slow serialization: {serialization_time:.2f}ms for {event['type']}")
-                
-            # Emit to all callbacks
-            success = True
-            for callback in self.event_callbacks:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(json_data)
-                    else:
-                        callback(json_data)
-                except Exception as e:
-                    success = False
-                    self.emission_errors += 1
-                    if self.config["log_emission_errors"]:
-                        logger.error(f"Event emission error: {e}")
-                        
+            encoded = self._encode_event(event)
+            success = await self._dispatch(encoded)
             self.events_emitted += 1
-            
-            # Return objects to pool
-            if self.config["enable_object_pooling"]:
-                self._return_to_pool(event)
-                
             return success
             
         except Exception as e:
@@ -457,11 +836,105 @@ class FrameComposer:
                 
             return False
             
+        finally:
+            # Callbacks only hold the encoded data, so the event can be reused
+            self.event_pool.release(event)
+            
+    def _encode_event(self, event: Dict[str, Any]) -> Dict[str, Union[str, bytes]]:
+        """Serialize once per wire format in use, recording time per event type"""
+        encoded = {}
+        event_type = event["type"]
+        for subscriber in self.subscribers:
+            wire_format = subscriber.wire_format
+            if wire_format in encoded:
+                continue
+            start = time.perf_counter_ns()
+            encoded[wire_format] = self.encoders[wire_format].encode(event)
+            duration_us = (time.perf_counter_ns() - start) / 1000
+            
+            histograms = self.serialization_histograms.setdefault(wire_format, {})
+            histogram = histograms.get(event_type)
+            if histogram is None:
+                histogram = histograms[event_type] = SerializationHistogram()
+            histogram.record(duration_us)
+            
+            if duration_us > self.config["max_serialization_time_ms"] * 1000:
+                logger.warning(f"Slow serialization: {duration_us / 1000:.2f}ms for {event_type}")
+        return encoded
+        
+    async def _dispatch(self, encoded: Dict[str, Union[str, bytes]]) -> bool:
+        """
+        Deliver encoded data to every subscriber
+        
+        Async callbacks run concurrently and are awaited for at most
+        callback_budget_ms. A callback still running after its budget keeps
+        going in the background, and the subscriber skips new events until
+        it finishes, so a slow client cannot stall the frame or reorder its
+        own events.
+        """
+        success = True
+        tasks: Dict[asyncio.Future, EventSubscriber] = {}
+        
+        for subscriber in self.subscribers:
+            data = encoded[subscriber.wire_format]
+            if subscriber.is_async:
+                if subscriber.pending is not None:
+                    subscriber.skipped += 1
+                    self.dropped_events += 1
+                    success = False
+                    continue
+                tasks[asyncio.ensure_future(subscriber.callback(data))] = subscriber
+            else:
+                try:
+                    subscriber.callback(data)
+                    subscriber.deliveries += 1
+                except Exception as e:
+                    success = False
+                    self._record_callback_error(subscriber, e)
+                    
+        if not tasks:
+            return success
+            
+        done, pending = await asyncio.wait(tasks, timeout=self.config["callback_budget_ms"] / 1000)
+        for task in done:
+            subscriber = tasks[task]
+            error = task.exception()
+            if error is None:
+                subscriber.deliveries += 1
+            else:
+                success = False
+                self._record_callback_error(subscriber, error)
+        for task in pending:
+            subscriber = tasks[task]
+            subscriber.timeouts += 1
+            subscriber.pending = task
+            task.add_done_callback(functools.partial(self._finish_late_delivery, subscriber))
+            success = False
+            
+        return success
+        
+    def _finish_late_delivery(self, subscriber: EventSubscriber, task: asyncio.Future):
+        """Completion of a delivery that exceeded its budget"""
+        subscriber.pending = None
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            subscriber.deliveries += 1
+        else:
+            self._record_callback_error(subscriber, error)
+            
+    def _record_callback_error(self, subscriber: EventSubscriber, error: BaseException):
+        subscriber.errors += 1
+        self.emission_errors += 1
+        if self.config["log_emission_errors"]:
+            logger.error(f"Event emission error: {error}")
+            
     async def _emit_minimal_event(self, event_type: str, error_info: str) -> bool:
         """Emit minimal event as fallback"""
         
         minimal_event = {
-            "id": str(uuid.uuid4()),
+            "id": self._next_event_id(),
             "type": "system.error",
             "timestamp": self._get_timestamp(),
             "payload": {
@@ -471,32 +944,10 @@ class FrameComposer:
         }
         
         try:
-            json_data = json.dumps(minimal_event)
-            for callback in self.event_callbacks:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(json_data)
-                else:
-                    callback(json_data)
-            return True
-        except:
+            return await self._dispatch(self._encode_event(minimal_event))
+        except Exception:
             return False
             
-    def _return_to_pool(self, event: Dict[str, Any]):
-        """Return event object to pool for reuse"""
-        
-        if len(self.event_pool) < self.config["pool_size_limit"]:
-            # Clean sensitive data
-            event.clear()
-            self.event_pool.append(event)
-            
-        # Return particle objects to pool
-        payload = event.get("payload", {})
-        particles = payload.get("particles", [])
-        for particle in particles:
-            if isinstance(particle, dict) and len(self.particle_pool) < self.config["pool_size_limit"]:
-                particle.clear()
-                self.particle_pool.append(particle)
-                
     def _initialize_schema_validator(self):
         """Initialize JSON schema validator"""
         try:
@@ -516,24 +967,46 @@ class FrameComposer:
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
         
-        avg_serialization = (sum(self.serialization_times) / len(self.serialization_times) 
-                           if self.serialization_times else 0)
+        histograms = [h for by_type in self.serialization_histograms.values() for h in by_type.values()]
+        count = sum(h.count for h in histograms)
+        avg_serialization_us = sum(h.total_us for h in histograms) / count if count else 0
         
         return {
             "events_emitted": self.events_emitted,
             "emission_errors": self.emission_errors,
-            "avg_serialization_time_ms": round(avg_serialization, 2),
-            "max_serialization_time_ms": round(max(self.serialization_times), 2) if self.serialization_times else 0,
-            "event_pool_size": len(self.event_pool),
-            "particle_pool_size": len(self.particle_pool),
-            "callbacks_registered": len(self.event_callbacks)
+            "dropped_events": self.dropped_events,
+            "avg_serialization_time_ms": round(avg_serialization_us / 1000, 3),
+            "max_serialization_time_ms": round(max((h.max_us for h in histograms), default=0) / 1000, 3),
+            "serialization_by_type": {
+                wire_format: {event_type: h.to_dict() for event_type, h in by_type.items()}
+                for wire_format, by_type in self.serialization_histograms.items()
+            },
+            "event_pool_size": self.event_pool.free,
+            "particle_pool_size": self.particle_pool.free,
+            "pools": {
+                "events": self.event_pool.get_stats(),
+                "particles": self.particle_pool.get_stats(),
+                "particle_buffers": self.particle_buffer_pool.get_stats()
+            },
+            "callbacks_registered": len(self.subscribers),
+            "callbacks": [
+                {
+                    "wire_format": sub.wire_format,
+                    "deliveries": sub.deliveries,
+                    "timeouts": sub.timeouts,
+                    "skipped": sub.skipped,
+                    "errors": sub.errors
+                }
+                for sub in self.subscribers
+            ]
         }
         
     def reset_stats(self):
         """Reset performance statistics"""
         self.events_emitted = 0
         self.emission_errors = 0
-        self.serialization_times.clear()
+        self.dropped_events = 0
+        self.serialization_histograms.clear()
 
 # Utility functions for creating common event data
 
@@ -555,6 +1028,17 @@ def create_particle_burst(energy: float, model_id: str, count: int = 3) -> List[
         
     return particles
 
+def add_particle_burst(buffer: ParticleBuffer, energy: float, model_id: str, count: int = 3):
+    """Write a burst of particle effects into a particle buffer"""
+    burst_id = f"burst_{int(time.time()*1000)}_"
+    particle_energy = energy / count
+    particle_type = "spark" if particle_energy < 0.5 else "bolt"
+    intensity = min(particle_energy * 2, 1.0)
+    
+    for i in range(count):
+        buffer.add(f"{burst_id}{i}", particle_type, particle_energy, intensity,
+                   lifetime_ms=200 + i * 50, model_id=model_id)
+
 def create_interference_pattern(models: List[str], strength: float, 
                               pattern_type: str = "constructive") -> InterferenceData:
     """Create interference pattern data"""
@@ -63,6 +63,31 @@ class WebSocketConfig:
     heartbeat_interval: float = 5.0
 
 
+# Events that must never be dropped to make room in a full connection queue
+CRITICAL_EVENT_TYPES = frozenset(['system.error', 'session.end'])
+
+# Connection states that still accept queued events
+_SENDABLE_STATES = (ConnectionState.ACTIVE, ConnectionState.DEGRADED)
+
+
+@dataclass(frozen=True)
+class EncodedEvent:
+    """Event serialized once and shared by every connection it is queued to"""
+    event_type: str
+    payload: str
+    critical: bool = False
+
+    @classmethod
+    def from_event(cls, event: Dict[str, Any]) -> 'EncodedEvent':
+        """Encode an event dict into an immutable wire payload"""
+        event_type = event.get('type', '')
+        return cls(
+            event_type=event_type,
+            payload=json.dumps(event),
+            critical=event_type in CRITICAL_EVENT_TYPES
+        )
+
+
 class WebSocketConnection:
     """Manages individual WebSocket connection with backpressure handling"""
     
@@ -94,28 +119,55 @@ class WebSocketConnection:
     async def send_event(self, event: Dict[str, Any]) -> bool:
         """Send event to client with backpressure handling"""
         try:
-            # Check if client is subscribed to this event type
-            event_type = event.get('type', '')
-            if self.subscriptions and event_type not in self.subscriptions:
-                return True  # Skip unsubscribed events
-                
-            # Apply backpressure if queue is full
-            if self.message_queue.full():
-                if self.metrics.state == ConnectionState.ACTIVE:
-                    self.metrics.state = ConnectionState.DEGRADED
-                    logger.warning(f"Connection {self.connection_id} entering degraded mode")
-                
-                # Drop oldest non-critical events
-                if event_type not in ['system.error', 'session.end']:
-                    try:
-                        self.message_queue.get_nowait()  # Drop oldest
-                    except asyncio.QueueEmpty:
-                        pass
-                        
-            await self.message_queue.put(event)
+            encoded = EncodedEvent.from_event(event)
+        except Exception as e:
+            self.metrics.messages_failed += 1
+            logger.error(f"Failed to encode event for {self.connection_id}: {e}")
+            return False
+        return await self.send_encoded(encoded)
+
+    def accepts(self, event_type: str) -> bool:
+        """Check whether the client is subscribed to an event type"""
+        return not self.subscriptions or event_type in self.subscriptions
+
+    def enqueue_encoded(self, encoded: EncodedEvent) -> bool:
+        """Queue a pre-encoded event without awaiting.
+
+        Returns False only when the queue is full and the event is critical,
+        in which case the caller must fall back to ``send_encoded``.
+        """
+        if not self.accepts(encoded.event_type):
+            return True  # Skip unsubscribed events
+
+        queue = self.message_queue
+        if queue.full():
+            if self.metrics.state == ConnectionState.ACTIVE:
+                self.metrics.state = ConnectionState.DEGRADED
+                logger.warning(f"Connection {self.connection_id} entering degraded mode")
+
+            if encoded.critical:
+                return False
+
+            # Drop oldest non-critical events
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+
+        queue.put_nowait(encoded)
+        self.metrics.queue_depth = queue.qsize()
+        return True
+
+    async def send_encoded(self, encoded: EncodedEvent) -> bool:
+        """Queue a pre-encoded event, waiting for space if it is critical"""
+        try:
+            if self.enqueue_encoded(encoded):
+                return True
+
+            await self.message_queue.put(encoded)
             self.metrics.queue_depth = self.message_queue.qsize()
             return True
-            
+
         except Exception as e:
             logger.error(f"Failed to queue event for {self.connection_id}: {e}")
             return False
@@ -124,10 +176,10 @@ class WebSocketConnection:
         """Background task to send queued messages"""
         try:
             while True:
-                event = await self.message_queue.get()
+                encoded = await self.message_queue.get()
                 
                 try:
-                    message = json.dumps(event)
+                    message = encoded.payload
                     await self.websocket.send(message)
                     
                     self.metrics.messages_sent += 1
@@ -227,25 +279,50 @@ class DecipherWebSocketServer:
         logger.info("WebSocket server stopped")
         
     async def broadcast_event(self, event: Dict[str, Any]) -> int:
-        """Broadcast event to all connected clients"""
+        """Broadcast event to all connected clients.
+
+        The event is serialized once and the same immutable payload is queued
+        to every subscribed connection.
+        """
         if not self.connections:
             return 0
-            
-        send_tasks = []
+
+        try:
+            encoded = EncodedEvent.from_event(event)
+        except Exception as e:
+            self.stats['events_failed'] += 1
+            logger.error(f"Failed to encode broadcast event: {e}")
+            return 0
+
+        success_count = 0
+        failed_count = 0
+        blocked: List[WebSocketConnection] = []
         for connection in self.connections.values():
-            if connection.metrics.state in [ConnectionState.ACTIVE, ConnectionState.DEGRADED]:
-                send_tasks.append(connection.send_event(event))
-                
-        if send_tasks:
-            results = await asyncio.gather(*send_tasks, return_exceptions=True)
-            success_count = sum(1 for result in results if result is True)
-            
-            self.stats['events_sent'] += success_count
-            self.stats['events_failed'] += len(results) - success_count
-            
-            return success_count
-            
-        return 0
+            if connection.metrics.state not in _SENDABLE_STATES:
+                continue
+            try:
+                if connection.enqueue_encoded(encoded):
+                    success_count += 1
+                else:
+                    blocked.append(connection)
+            except Exception as e:
+                failed_count += 1
+                logger.error(f"Failed to queue event for {connection.connection_id}: {e}")
+
+        # Critical events wait for queue space on saturated connections
+        if blocked:
+            results = await asyncio.gather(
+                *(connection.send_encoded(encoded) for connection in blocked),
+                return_exceptions=True
+            )
+            blocked_success = sum(1 for result in results if result is True)
+            success_count += blocked_success
+            failed_count += len(results) - blocked_success
+
+        self.stats['events_sent'] += success_count
+        self.stats['events_failed'] += failed_count
+
+        return success_count
         
     async def send_to_connection(self, connection_id: str, event: Dict[str, Any]) -> bool:
         """Send event to specific connection"""
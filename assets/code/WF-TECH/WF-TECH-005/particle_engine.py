@@ -0,0 +1,211 @@
+"""
+WF-TECH-005 Decipher Particle Engine
+Struct-of-arrays particle state advanced and culled with vectorized updates
+
+All live particles sit in one preallocated float32 matrix (one row per
+particle, one column per field), so a frame's update is a handful of NumPy
+operations regardless of particle count, and the frame event ships the live
+rows as a single packed array instead of a list of dicts. A hard cap tied to
+the AdaptiveController quality level bounds the work per frame; when it is
+exceeded the oldest particles are evicted first.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+PARTICLE_TYPES = ("spark", "bolt", "burst", "fade")
+SPARK, BOLT, BURST, FADE = range(len(PARTICLE_TYPES))
+
+# Column layout of the packed particle matrix
+PACKED_FIELDS = ("x", "y", "vx", "vy", "energy", "intensity", "age_ms", "lifetime_ms",
+                 "color", "model", "type")
+X, Y, VX, VY, ENERGY, INTENSITY, AGE_MS, LIFETIME_MS, COLOR, MODEL, TYPE = range(len(PACKED_FIELDS))
+
+
+class ParticleEngine:
+    """
+    Fixed-capacity particle system in struct-of-arrays layout.
+
+    Rows [0, count) are live and kept in spawn order, so eviction under the
+    cap drops a prefix. Model ids are interned to small integers and colors
+    are palette indices, which keeps every field representable in float32.
+    """
+
+    PALETTE_SIZE = 8
+
+    def __init__(self, capacity: int = 512, min_particles: int = 32,
+                 base_lifetime_ms: float = 250.0, base_speed: float = 0.4,
+                 seed: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.min_particles = min(min_particles, capacity)
+        self.base_lifetime_ms = base_lifetime_ms
+        self.base_speed = base_speed
+        self.max_particles = capacity  # Current hard cap, set by set_quality()
+
+        self._state = np.zeros((capacity, len(PACKED_FIELDS)), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.uint32)
+        self._rng = np.random.default_rng(seed)
+        self.count = 0
+
+        self.model_ids: List[str] = []
+        self._model_index: Dict[str, int] = {}
+
+        self._next_id = 0
+        self.spawned = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def set_quality(self, quality_level: float):
+        """Scale the hard cap with an AdaptiveController quality level (0.0-1.0)"""
+        quality_level = min(1.0, max(0.0, quality_level))
+        self.max_particles = max(self.min_particles, int(self.capacity * quality_level))
+        if self.count > self.max_particles:
+            self._evict(self.count - self.max_particles)
+
+    def spawn(self, model_ids: Sequence[str], energy: np.ndarray,
+              intensity: np.ndarray, particle_type: np.ndarray) -> int:
+        """
+        Add one particle per entry; returns how many were added
+
+        Particles start at the origin with a random heading, speed scaled by
+        energy and lifetime scaled by intensity.
+        """
+        k = len(model_ids)
+        if k == 0:
+            return 0
+        cap = self.max_particles
+        skip = max(0, k - cap)  # Only the newest `cap` of an oversized batch can be kept
+        k -= skip
+        self._next_id += skip
+        self.evicted += skip
+        overflow = self.count + k - cap
+        if overflow > 0:
+            self._evict(overflow)
+
+        models = np.fromiter((self._intern(model_id) for model_id in model_ids[skip:]),
+                             dtype=np.float32, count=k)
+        energy = np.broadcast_to(np.asarray(energy, dtype=np.float32), (k + skip,))[skip:]
+        intensity = np.broadcast_to(np.asarray(intensity, dtype=np.float32), (k + skip,))[skip:]
+        particle_type = np.broadcast_to(np.asarray(particle_type, dtype=np.float32), (k + skip,))[skip:]
+
+        start, end = self.count, self.count + k
+        rows = self._state[start:end]
+        heading = self._rng.uniform(0.0, 2.0 * np.pi, k)
+        speed = self.base_speed * (0.5 + np.minimum(energy, 2.0))
+        rows[:, X:Y + 1] = 0.0
+        rows[:, VX] = np.cos(heading) * speed
+        rows[:, VY] = np.sin(heading) * speed
+        rows[:, ENERGY] = energy
+        rows[:, INTENSITY] = intensity
+        rows[:, AGE_MS] = 0.0
+        rows[:, LIFETIME_MS] = self.base_lifetime_ms * (1.0 + intensity)
+        rows[:, COLOR] = models % self.PALETTE_SIZE
+        rows[:, MODEL] = models
+        rows[:, TYPE] = particle_type
+        self._ids[start:end] = np.arange(self._next_id, self._next_id + k, dtype=np.uint32)
+
+        self._next_id += k
+        self.count = end
+        self.spawned += k
+        return k
+
+    def step(self, dt_ms: float):
+        """Advance positions and ages by dt_ms and cull expired particles"""
+        n = self.count
+        if n == 0:
+            return
+        live = self._state[:n]
+        live[:, X:Y + 1] += live[:, VX:VY + 1] * (dt_ms / 1000.0)
+        live[:, AGE_MS] += dt_ms
+
+        alive = live[:, AGE_MS] < live[:, LIFETIME_MS]
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            self._state[:kept] = live[alive]
+            self._ids[:kept] = self._ids[:n][alive]
+            self.count = kept
+            self.expired += n - kept
+
+    def clear(self):
+        self.count = 0
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Copies of the live particle ids and packed state matrix"""
+        return {"ids": self._ids[:self.count].copy(), "state": self._state[:self.count].copy()}
+
+    def to_packed(self) -> Dict[str, Any]:
+        """
+        Live particles as one JSON-safe packed array
+
+        "data" is the row-major little-endian float32 matrix (count x fields)
+        and "ids" the matching uint32 ids, both base64 encoded; "model" and
+        "type" columns index into "models" and "types".
+        """
+        n = self.count
+        return {
+            "count": n,
+            "fields": PACKED_FIELDS,
+            "dtype": "<f4",
+            "data": base64.b64encode(self._state[:n].astype("<f4", copy=False).tobytes()).decode("ascii"),
+            "ids": base64.b64encode(self._ids[:n].astype("<u4", copy=False).tobytes()).decode("ascii"),
+            "models": list(self.model_ids),
+            "types": PARTICLE_TYPES
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Live particles as per-particle dicts, for consumers of the old payload"""
+        rows = self._state[:self.count].tolist()
+        return [
+            {
+                "id": f"particle_{particle_id}",
+                "type": PARTICLE_TYPES[int(row[TYPE])],
+                "energy": round(row[ENERGY], 3),
+                "intensity": round(row[INTENSITY], 3),
+                "model_id": self.model_ids[int(row[MODEL])],
+                "position": {"x": row[X], "y": row[Y]},
+                "velocity": {"x": row[VX], "y": row[VY]},
+                "age_ms": row[AGE_MS],
+                "lifetime_ms": row[LIFETIME_MS]
+            }
+            for particle_id, row in zip(self._ids[:self.count].tolist(), rows)
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "live": self.count,
+            "max_particles": self.max_particles,
+            "capacity": self.capacity,
+            "spawned": self.spawned,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+    def _intern(self, model_id: str) -> int:
+        index = self._model_index.get(model_id)
+        if index is None:
+            index = self._model_index[model_id] = len(self.model_ids)
+            self.model_ids.append(model_id)
+        return index
+
+    def _evict(self, k: int):
+        """Drop the k oldest particles"""
+        n = self.count
+        k = min(k, n)
+        self._state[:n - k] = self._state[k:n]
+        self._ids[:n - k] = self._ids[k:n]
+        self.count = n - k
+        self.evicted += k
+
+
+def unpack_particles(packed: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Decode ParticleEngine.to_packed() output back into ids and a state matrix"""
+    fields = len(packed["fields"])
+    state = np.frombuffer(base64.b64decode(packed["data"]), dtype=packed["dtype"])
+    return {
+        "ids": np.frombuffer(base64.b64decode(packed["ids"]), dtype="<u4"),
+        "state": state.reshape(packed["count"], fields)
+    }
@@ -9,7 +9,7 @@ import json
 import time
 import threading
 import uuid
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
 from pathlib import Path
@@ -60,19 +60,44 @@ class AlertRule:
             self.adaptation_response = []
 
 class AlertEvaluator:
-    """Evaluates metrics against alert rules"""
+    """
+    Evaluates metrics against alert rules
+    
+    Rules are compiled against the flattened metric schema: each rule's name
+    is resolved to one concrete metric path, and a path -> rules index is
+    kept. Compilation only reruns when the rule set or the set of metric
+    paths changes. An evaluation then touches the rules whose metric value
+    changed, plus the rules whose condition held last time (cooldown, burst
+    and alert duration depend on time, not only on the value).
+    """
     
     def __init__(self, config_path: str = None):
         self.config_path = config_path or "WF-TECH-009-alert-thresholds.yaml"
         self.rules = {}
         self.global_settings = {}
-        self.load_configuration()
         
         # Alert state tracking
         self.active_alerts = {}  # rule_name -> Alert
         self.alert_history = deque(maxlen=10000)
         self.cooldown_tracker = {}  # rule_name -> last_triggered_time
-        self.burst_tracker = defaultdict(list)  # rule_name -> [timestamps]
+        self.burst_tracker = {}  # rule_name -> deque(maxlen=burst_threshold) of timestamps
+        
+        # Compiled rule index
+        self._rules_version = 0  # Bumped on every rule set change
+        self._compiled_version = -1
+        self._metric_paths: Tuple[str, ...] = ()
+        self._rule_metric: Dict[str, str] = {}  # rule_name -> resolved metric path
+        self._rules_by_metric: Dict[str, List[AlertRule]] = {}
+        self._rule_order: Dict[str, int] = {}
+        self._last_values: Dict[str, float] = {}
+        self._condition_held: Set[str] = set()  # Rules whose condition was met last evaluation
+        self.engine_stats = {
+            "compilations": 0,
+            "last_compile_ms": 0.0,
+            "evaluations": 0,
+            "last_rules_evaluated": 0
+        }
+        self.load_configuration()
         
         # Callbacks
         self.alert_callbacks = []
@@ -119,6 +144,7 @@ class AlertEvaluator:
                                 burst_window_seconds=rule_config.get('burst_window_seconds')
                             )
             
+            self._rules_version += 1
             logger.info(f"Loaded {len(self.rules)} alert rules from {config_path}")
             
         except Exception as e:
@@ -160,6 +186,28 @@ class AlertEvaluator:
                 actions=['log_alert', 'ui_notification']
             )
         }
+        self._rules_version += 1
+
+    def add_rule(self, rule: AlertRule):
+        """Add or replace a rule"""
+        self.rules[rule.name] = rule
+        self._rules_version += 1
+
+    def remove_rule(self, rule_name: str) -> bool:
+        if self.rules.pop(rule_name, None) is None:
+            return False
+        self.active_alerts.pop(rule_name, None)
+        self.burst_tracker.pop(rule_name, None)
+        self._rules_version += 1
+        return True
+
+    def set_rule_enabled(self, rule_name: str, enabled: bool):
+        self.rules[rule_name].enabled = enabled
+        self._rules_version += 1
+
+    def invalidate_rules(self):
+        """Recompile on the next evaluation (after editing rules in place)"""
+        self._rules_version += 1
 
     def add_alert_callback(self, callback: Callable[[Alert], None]):
         """Add callback for alert notifications"""
@@ -170,53 +218,130 @@ class AlertEvaluator:
         self.adaptation_callbacks.append(callback)
 
     def evaluate_metrics(self, metrics: Dict[str, Any]):
-        """Evaluate all metrics against alert rules"""
+        """Evaluate changed metrics against alert rules"""
         if not self.global_settings.get('enabled', True):
             return
         
         current_time = time.time()
         
         # Flatten metrics for evaluation
-        flat_metrics = self._flatten_metrics(metrics)
-        
-        # Evaluate each rule
-        for rule_name, rule in self.rules.items():
-            if not rule.enabled:
-                continue
-            
+        flat_metrics: Dict[str, float] = {}
+        self._flatten_into(metrics, "", flat_metrics)
+        
+        paths = tuple(flat_metrics)
+        if self._compiled_version != self._rules_version or paths != self._metric_paths:
+            self._compile(paths)
+        
+        # Rules whose metric changed, plus rules still in a met state
+        last_values = self._last_values
+        touched = set(self._condition_held)
+        for path, value in flat_metrics.items():
+            if last_values.get(path) != value:
+                rules = self._rules_by_metric.get(path)
+                if rules:
+                    touched.update(rule.name for rule in rules)
+        self._last_values = flat_metrics
+        
+        for rule_name in sorted(touched, key=self._rule_order.__getitem__):
+            rule = self.rules[rule_name]
+            metric_name = self._rule_metric[rule_name]
             try:
-                self._evaluate_rule(rule, flat_metrics, current_time)
+                if self._evaluate_rule(rule, metric_name, flat_metrics[metric_name], current_time):
+                    self._condition_held.add(rule_name)
+                else:
+                    self._condition_held.discard(rule_name)
             except Exception as e:
+                self._condition_held.add(rule_name)  # Retry on the next evaluation
                 logger.error(f"Error evaluating rule {rule_name}: {e}")
         
+        self.engine_stats["evaluations"] += 1
+        self.engine_stats["last_rules_evaluated"] = len(touched)
+        
         # Clean up old burst tracking data
         self._cleanup_burst_tracking(current_time)
 
     def _flatten_metrics(self, metrics: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
         """Flatten nested metrics dictionary"""
         flat = {}
-        
+        self._flatten_into(metrics, prefix, flat)
+        return flat
+
+    def _flatten_into(self, metrics: Dict[str, Any], prefix: str, flat: Dict[str, float]):
         for key, value in metrics.items():
             full_key = f"{prefix}.{key}" if prefix else key
             
             if isinstance(value, dict):
-                flat.update(self._flatten_metrics(value, full_key))
+                self._flatten_into(value, full_key, flat)
             elif isinstance(value, (int, float)):
                 flat[full_key] = float(value)
-        
-        return flat
 
-    def _evaluate_rule(self, rule: AlertRule, metrics: Dict[str, float], current_time: float):
-        """Evaluate a single alert rule"""
-        # Extract metric name from rule name (e.g., "frame_performance.fps_critical" -> look for fps metrics)
-        metric_candidates = self._find_metric_candidates(rule.name, metrics)
+    def _compile(self, paths: Tuple[str, ...]):
+        """Resolve every enabled rule to a metric path and rebuild the path -> rules index"""
+        start = time.perf_counter()
         
-        if not metric_candidates:
-            return
-        
-        # Use the most relevant metric
-        metric_name, metric_value = metric_candidates[0]
+        # metric name part -> indices of the paths containing it
+        paths_by_part: Dict[str, List[int]] = defaultdict(list)
+        for index, path in enumerate(paths):
+            for part in set(path.lower().split('.')):
+                paths_by_part[part].append(index)
+        parts = list(paths_by_part)
         
+        rule_metric: Dict[str, str] = {}
+        rules_by_metric: Dict[str, List[AlertRule]] = defaultdict(list)
+        for rule in self.rules.values():
+            if not rule.enabled:
+                continue
+            index = self._resolve_metric(rule.name, parts, paths_by_part)
+            if index is not None:
+                rule_metric[rule.name] = paths[index]
+                rules_by_metric[paths[index]].append(rule)
+        
+        self._metric_paths = paths
+        self._rule_metric = rule_metric
+        self._rules_by_metric = dict(rules_by_metric)
+        self._rule_order = {name: order for order, name in enumerate(self.rules)}
+        self._last_values = {}  # Evaluate every resolved rule once
+        self._condition_held &= rule_metric.keys()
+        for rule_name in list(self.burst_tracker):
+            rule = self.rules.get(rule_name)
+            if rule is None or self.burst_tracker[rule_name].maxlen != rule.burst_threshold:
+                del self.burst_tracker[rule_name]
+        self._compiled_version = self._rules_version
+        
+        self.engine_stats["compilations"] += 1
+        self.engine_stats["last_compile_ms"] = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _resolve_metric(rule_name: str, parts: List[str],
+                        paths_by_part: Dict[str, List[int]]) -> Optional[int]:
+        """
+        Index of the metric path a rule evaluates, or None
+        
+        A path is a candidate when any rule name part is a substring of one
+        of its parts or the other way round. Candidates are ranked by how
+        many rule parts occur inside some path part; ties go to the path
+        that comes first in the metrics dict.
+        """
+        rule_parts = rule_name.lower().split('.')
+        candidates: Set[int] = set()
+        scores: Dict[int, int] = defaultdict(int)
+        for rule_part in rule_parts:
+            contained_in: Set[int] = set()
+            for part in parts:
+                if rule_part in part:
+                    contained_in.update(paths_by_part[part])
+                elif part in rule_part:
+                    candidates.update(paths_by_part[part])
+            candidates |= contained_in
+            for index in contained_in:
+                scores[index] += 1
+        if not candidates:
+            return None
+        return min(candidates, key=lambda index: (-scores.get(index, 0), index))
+
+    def _evaluate_rule(self, rule: AlertRule, metric_name: str, metric_value: float,
+                       current_time: float) -> bool:
+        """Evaluate a single alert rule against its resolved metric; returns whether the condition held"""
         # Check if condition is met
         condition_met = self._check_condition(metric_value, rule.threshold, rule.operator)
         
@@ -224,11 +349,11 @@ class AlertEvaluator:
             # Check burst threshold if configured
             if rule.burst_threshold and rule.burst_window_seconds:
                 if not self._check_burst_threshold(rule.name, current_time, rule.burst_threshold, rule.burst_window_seconds):
-                    return
+                    return True
             
             # Check cooldown
             if self._is_in_cooldown(rule.name, current_time, rule.cooldown_seconds):
-                return
+                return True
             
             # Check if alert already exists
             if rule.name in self.active_alerts:
@@ -257,7 +382,7 @@ class AlertEvaluator:
                 if rule.duration_seconds > 0:
                     # Need to track condition over time
                     if not self._check_duration_requirement(rule.name, current_time, rule.duration_seconds):
-                        return
+                        return True
                 
                 self.active_alerts[rule.name] = alert
                 self.alert_history.append(alert)
@@ -276,31 +401,8 @@ class AlertEvaluator:
                 alert.auto_resolved = True
                 alert.resolved_at = current_time
                 logger.info(f"Alert auto-resolved: {alert.message}")
-
-    def _find_metric_candidates(self, rule_name: str, metrics: Dict[str, float]) -> List[tuple]:
-        """Find metrics that match the rule name pattern"""
-        candidates = []
         
-        # Extract key terms from rule name
-        rule_parts = rule_name.lower().split('.')
-        
-        for metric_name, metric_value in metrics.items():
-            metric_parts = metric_name.lower().split('.')
-            
-            # Score based on matching terms
-            score = 0
-            for rule_part in rule_parts:
-                for metric_part in metric_parts:
-                    if rule_part in metric_part or metric_part in rule_part:
-                        score += 1
-            
-            if score > 0:
-                candidates.append((metric_name, metric_value))
-        
-        # Sort by relevance score (descending)
-        candidates.sort(key=lambda x: len([p for p in rule_parts if any(p in mp for mp in x[0].lower().split('.'))]), reverse=True)
-        
-        return candidates
+        return condition_met
 
     def _check_condition(self, value: float, threshold: float, operator: str) -> bool:
         """Check if metric value meets alert condition"""
@@ -322,15 +424,13 @@ class AlertEvaluator:
 
     def _check_burst_threshold(self, rule_name: str, current_time: float, burst_threshold: int, burst_window: float) -> bool:
         """Check if burst threshold is exceeded"""
-        # Clean old entries
-        cutoff_time = current_time - burst_window
-        self.burst_tracker[rule_name] = [t for t in self.burst_tracker[rule_name] if t >= cutoff_time]
-        
-        # Add current trigger
-        self.burst_tracker[rule_name].append(current_time)
-        
-        # Check if threshold exceeded
-        return len(self.burst_tracker[rule_name]) >= burst_threshold
+        # Only the newest burst_threshold triggers matter: the threshold is
+        # reached when the oldest of them is still inside the window
+        ring = self.burst_tracker.get(rule_name)
+        if ring is None:
+            ring = self.burst_tracker[rule_name] = deque(maxlen=burst_threshold)
+        ring.append(current_time)
+        return len(ring) == burst_threshold and ring[0] >= current_time - burst_window
 
     def _is_in_cooldown(self, rule_name: str, current_time: float, cooldown_seconds: float) -> bool:
         """Check if rule is in cooldown period"""
@@ -347,13 +447,8 @@ class AlertEvaluator:
         """Clean up old burst tracking data"""
         cutoff_time = current_time - 3600  # Keep 1 hour of data
         
-        for rule_name in list(self.burst_tracker.keys()):
-            self.burst_tracker[rule_name] = [
-                t for t in self.burst_tracker[rule_name] if t >= cutoff_time
-            ]
-            
-            if not self.burst_tracker[rule_name]:
-                del self.burst_tracker[rule_name]
+        for rule_name in [name for name, ring in self.burst_tracker.items() if ring[-1] < cutoff_time]:
+            del self.burst_tracker[rule_name]
 
     def _trigger_alert_callbacks(self, alert: Alert):
         """Trigger all registered alert callbacks"""
@@ -401,7 +496,12 @@ class AlertEvaluator:
             "total_rules": len(self.rules),
             "enabled_rules": sum(1 for rule in self.rules.values() if rule.enabled),
             "alert_history_count": len(self.alert_history),
-            "system_enabled": self.global_settings.get('enabled', True)
+            "system_enabled": self.global_settings.get('enabled', True),
+            "engine": {
+                **self.engine_stats,
+                "resolved_rules": len(self._rule_metric),
+                "indexed_metrics": len(self._rules_by_metric)
+            }
         }
 
     def export_alert_data(self, hours: int = 24) -> Dict[str, Any]:
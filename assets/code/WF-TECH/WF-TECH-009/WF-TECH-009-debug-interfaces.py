@@ -329,7 +329,7 @@ class SystemDiagnostics:
                 # Check if tables exist
                 cursor.execute("""
                     SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='metrics_snapshots'
+                    WHERE type='table' AND name='metrics_series'
                 """)
                 
                 if not cursor.fetchone():
@@ -338,7 +338,7 @@ class SystemDiagnostics:
                         "table_missing",
                         DiagnosticLevel.ERROR,
                         "Metrics table missing from database",
-                        {"table": "metrics_snapshots", "db_path": db_path},
+                        {"table": "metrics_series", "db_path": db_path},
                         "Run database initialization script"
                     )
                 else:
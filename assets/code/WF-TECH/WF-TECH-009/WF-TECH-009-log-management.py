@@ -11,8 +11,11 @@ import json
 import time
 import logging
 import threading
+import itertools
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
+from collections import defaultdict, deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from enum import Enum
@@ -50,13 +53,260 @@ class LogEntry:
     session_id: Optional[str] = None
     correlation_id: Optional[str] = None
 
+class LogDurability(Enum):
+    """When the log writer thread hands written batches to the OS / disk"""
+    BUFFERED = "buffered"  # Flush file buffers every flush_interval_ms
+    BATCH = "batch"        # Flush after every batch
+    FSYNC = "fsync"        # Flush and fsync after every batch
+
+@dataclass
+class LogSinkConfig:
+    """Configuration for the queued log sink"""
+    max_queue: int = 10000
+    high_water_fraction: float = 0.75  # Overload policies apply above this depth
+    batch_size: int = 512
+    flush_interval_ms: float = 100.0
+    durability: LogDurability = LogDurability.BUFFERED
+    sample_every: int = 10  # "sample" keeps one record in this many under overload
+    # Per-level overload policy: "drop", "sample" or "keep" (kept until the queue is full)
+    level_policies: Dict[str, str] = field(default_factory=lambda: {
+        "DEBUG": "drop",
+        "INFO": "sample",
+        "METRICS": "sample",
+        "WARNING": "keep",
+        "ERROR": "keep",
+        "CRITICAL": "keep",
+        "ALERT": "keep"
+    })
+
+class LogSink:
+    """
+    Bounded in-memory queue drained by one writer thread
+    
+    submit() only checks the depth and appends to a deque (atomic under the
+    GIL), so callers on the frame loop never wait on encoding or disk I/O.
+    The writer thread encodes entries to JSON lines, writes them in batches
+    per file and flushes according to the durability policy. Above the
+    high-water mark each level's overload policy decides whether a record
+    is dropped, sampled or kept; a full queue drops everything. Entries are
+    encoded later on the writer thread, so callers must not mutate `data`
+    after logging it.
+    
+    The writer holds an I/O lock while it writes, flushes or reopens files;
+    paused() takes the same lock so a log file can be moved away without a
+    batch landing between the final flush and the move.
+    """
+    
+    def __init__(self, config: Optional[LogSinkConfig] = None):
+        self.config = config or LogSinkConfig()
+        self._queue: deque = deque()
+        self._high_water = int(self.config.max_queue * self.config.high_water_fraction)
+        self._wakeup = threading.Event()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._files: Dict[Path, Tuple[Any, int]] = {}  # path -> (file, inode), under _io_lock
+        self._io_lock = threading.Lock()
+        self._last_flush = 0.0
+        
+        self._samplers = {level: itertools.count() for level in self.config.level_policies}
+        self._stats_lock = threading.Lock()  # Overload path only
+        self._enqueue_ns: deque = deque(maxlen=4096)  # Recent submit() latencies
+        self.stats = {
+            "written": 0,
+            "batches": 0,
+            "write_errors": 0,
+            "max_queue_depth": 0,
+            "last_batch_ms": 0.0,
+            "dropped": defaultdict(int),      # level -> records dropped under overload
+            "sampled_out": defaultdict(int)   # level -> records skipped by sampling
+        }
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="log-sink-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Write everything queued, close the files and stop the thread"""
+        if self._thread is None:
+            return
+        self._stop = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def submit(self, path: Path, entry: "LogEntry") -> bool:
+        """Queue an entry for `path`; returns False if the overload policy dropped it"""
+        start = time.perf_counter_ns()
+        depth = len(self._queue)
+        if depth >= self._high_water and not self._admit(entry.level.value, depth):
+            self._enqueue_ns.append(time.perf_counter_ns() - start)
+            return False
+        self._queue.append((path, entry))
+        if depth + 1 >= self.config.batch_size and not self._wakeup.is_set():
+            self._wakeup.set()
+        self._enqueue_ns.append(time.perf_counter_ns() - start)
+        return True
+    
+    def _admit(self, level: str, depth: int) -> bool:
+        policy = self.config.level_policies.get(level, "keep")
+        if depth >= self.config.max_queue:
+            counter = "dropped"
+        elif policy == "keep":
+            return True
+        elif policy == "sample":
+            if next(self._samplers[level]) % self.config.sample_every == 0:
+                return True
+            counter = "sampled_out"
+        else:
+            counter = "dropped"
+        with self._stats_lock:
+            self.stats[counter][level] += 1
+        return False
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until everything submitted before this call has been written"""
+        if self._thread is None:
+            return False
+        done = threading.Event()
+        self._queue.append((None, done))  # Marker, not subject to the bound
+        self._wakeup.set()
+        return done.wait(timeout)
+    
+    @contextmanager
+    def paused(self, timeout: Optional[float] = 5.0):
+        """
+        Write everything queued, then keep the writer off the files until exit
+        
+        Records submitted meanwhile stay queued; once the block exits the
+        writer reopens any file that was moved away and writes them there.
+        """
+        self.flush(timeout)
+        with self._io_lock:
+            self._sync(fsync=False)  # Nothing may sit in a file buffer across a move
+            yield
+    
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._enqueue_ns)
+        with self._stats_lock:
+            dropped = dict(self.stats["dropped"])
+            sampled_out = dict(self.stats["sampled_out"])
+        return {
+            **self.stats,
+            "dropped": dropped,
+            "sampled_out": sampled_out,
+            "queue_depth": len(self._queue),
+            "enqueue_p50_us": latencies[len(latencies) // 2] / 1000 if latencies else 0.0,
+            "enqueue_p99_us": latencies[int(len(latencies) * 0.99)] / 1000 if latencies else 0.0,
+            "enqueue_max_us": latencies[-1] / 1000 if latencies else 0.0
+        }
+    
+    # Writer thread
+    
+    def _run(self):
+        interval = self.config.flush_interval_ms / 1000
+        try:
+            while True:
+                self._wakeup.wait(interval)
+                self._wakeup.clear()
+                stopping = self._stop
+                while self._queue:
+                    self._write_batch()
+                if self.config.durability is LogDurability.BUFFERED and \
+                        time.monotonic() - self._last_flush >= interval:
+                    with self._io_lock:
+                        self._sync(fsync=False)
+                if stopping:
+                    break
+        finally:
+            with self._io_lock:
+                self._sync(fsync=self.config.durability is LogDurability.FSYNC)
+                for f, _ in self._files.values():
+                    f.close()
+                self._files.clear()
+    
+    def _write_batch(self):
+        start = time.perf_counter()
+        queue_ = self._queue
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(queue_))
+        lines: Dict[Path, List[str]] = defaultdict(list)
+        markers = []
+        for _ in range(min(len(queue_), self.config.batch_size)):
+            path, entry = queue_.popleft()
+            if path is None:
+                markers.append(entry)
+                continue
+            lines[path].append(self._encode(entry))
+        
+        written = 0
+        with self._io_lock:
+            for path, batch in lines.items():
+                try:
+                    self._open(path).write("".join(batch))
+                    written += len(batch)
+                except Exception as e:
+                    self.stats["write_errors"] += 1
+                    logging.error(f"Failed to write {len(batch)} log records to {path}: {e}")
+            if self.config.durability is not LogDurability.BUFFERED or markers:
+                self._sync(fsync=self.config.durability is LogDurability.FSYNC)
+        for marker in markers:
+            marker.set()
+        
+        self.stats["written"] += written
+        self.stats["batches"] += 1
+        self.stats["last_batch_ms"] = (time.perf_counter() - start) * 1000
+    
+    @staticmethod
+    def _encode(entry: "LogEntry") -> str:
+        return json.dumps({
+            "timestamp": entry.timestamp,
+            "level": entry.level.value,
+            "component": entry.component,
+            "message": entry.message,
+            "data": entry.data,
+            "session_id": entry.session_id,
+            "correlation_id": entry.correlation_id
+        }, default=str) + "\n"
+    
+    def _open(self, path: Path):
+        """File handle for path, reopened when the file was rotated away"""
+        cached = self._files.get(path)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if cached is not None and cached[1] == inode:
+            return cached[0]
+        if cached is not None:
+            cached[0].close()
+        f = open(path, 'a', encoding='utf-8')
+        self._files[path] = (f, os.fstat(f.fileno()).st_ino)
+        return f
+    
+    def _sync(self, fsync: bool):
+        for f, _ in self._files.values():
+            try:
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            except Exception as e:
+                self.stats["write_errors"] += 1
+                logging.error(f"Failed to flush log file {f.name}: {e}")
+        self._last_flush = time.monotonic()
+
 class StructuredLogger:
     """
     Structured logger for WIRTHFORGE observability
     Outputs JSON-formatted logs for easy parsing and analysis
+    
+    Entries are handed to a LogSink and written by its thread, so logging
+    from the frame loop costs a deque append rather than encoding and a
+    file write.
     """
     
-    def __init__(self, component: str, log_dir: str):
+    def __init__(self, component: str, log_dir: str, sink: Optional[LogSink] = None):
         self.component = component
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -64,22 +314,21 @@ class StructuredLogger:
         # Create component-specific log file
         self.log_file = self.log_dir / f"{component}.log"
         
-        # Setup Python logger
-        self.logger = logging.getLogger(f"wirthforge.{component}")
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Remove existing handlers
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-        
-        # Add structured file handler
-        handler = logging.FileHandler(str(self.log_file))
-        handler.setFormatter(StructuredLogFormatter())
-        self.logger.addHandler(handler)
+        # Own a sink unless one is shared (LogManager shares one across components)
+        self.owns_sink = sink is None
+        self.sink = sink or LogSink()
+        self.sink.start()
         
         # Thread-local storage for context
         self._local = threading.local()
     
+    def close(self):
+        """Write pending entries; stops the sink if this logger created it"""
+        if self.owns_sink:
+            self.sink.stop()
+        else:
+            self.sink.flush()
+    
     def set_context(self, session_id: Optional[str] = None, 
                    correlation_id: Optional[str] = None):
         """Set logging context for current thread"""
@@ -99,52 +348,36 @@ class StructuredLogger:
             correlation_id=getattr(self._local, 'correlation_id', None)
         )
     
+    def _log(self, level: LogLevel, message: str, data: Optional[Dict[str, Any]]) -> bool:
+        return self.sink.submit(self.log_file, self._create_log_entry(level, message, data))
+    
     def debug(self, message: str, data: Optional[Dict[str, Any]] = None):
         """Log debug message"""
-        entry = self._create_log_entry(LogLevel.DEBUG, message, data)
-        self.logger.debug(json.dumps(asdict(entry)))
+        self._log(LogLevel.DEBUG, message, data)
     
     def info(self, message: str, data: Optional[Dict[str, Any]] = None):
         """Log info message"""
-        entry = self._create_log_entry(LogLevel.INFO, message, data)
-        self.logger.info(json.dumps(asdict(entry)))
+        self._log(LogLevel.INFO, message, data)
     
     def warning(self, message: str, data: Optional[Dict[str, Any]] = None):
         """Log warning message"""
-        entry = self._create_log_entry(LogLevel.WARNING, message, data)
-        self.logger.warning(json.dumps(asdict(entry)))
+        self._log(LogLevel.WARNING, message, data)
     
     def error(self, message: str, data: Optional[Dict[str, Any]] = None):
         """Log error message"""
-        entry = self._create_log_entry(LogLevel.ERROR, message, data)
-        self.logger.error(json.dumps(asdict(entry)))
+        self._log(LogLevel.ERROR, message, data)
     
     def critical(self, message: str, data: Optional[Dict[str, Any]] = None):
         """Log critical message"""
-        entry = self._create_log_entry(LogLevel.CRITICAL, message, data)
-        self.logger.critical(json.dumps(asdict(entry)))
+        self._log(LogLevel.CRITICAL, message, data)
     
     def metrics(self, message: str, metrics_data: Dict[str, Any]):
         """Log metrics data"""
-        entry = self._create_log_entry(LogLevel.METRICS, message, metrics_data)
-        self.logger.info(json.dumps(asdict(entry)))
+        self._log(LogLevel.METRICS, message, metrics_data)
     
     def alert(self, message: str, alert_data: Dict[str, Any]):
         """Log alert event"""
-        entry = self._create_log_entry(LogLevel.ALERT, message, alert_data)
-        self.logger.error(json.dumps(asdict(entry)))
-
-class StructuredLogFormatter(logging.Formatter):
-    """Custom formatter that passes through JSON logs unchanged"""
-    
-    def format(self, record):
-        # If the message is already JSON, pass it through
-        try:
-            json.loads(record.getMessage())
-            return record.getMessage()
-        except json.JSONDecodeError:
-            # Fall back to standard formatting for non-JSON messages
-            return super().format(record)
+        self._log(LogLevel.ALERT, message, alert_data)
 
 class LogRotator:
     """
@@ -152,8 +385,9 @@ class LogRotator:
     Implements size-based and time-based rotation strategies
     """
     
-    def __init__(self, config: LogRotationConfig):
+    def __init__(self, config: LogRotationConfig, index: Optional["LogIndex"] = None):
         self.config = config
+        self.index = index  # Carried over to rotated files when given
         self.rotation_lock = threading.Lock()
     
     def should_rotate(self, log_file: Path) -> bool:
@@ -191,10 +425,14 @@ class LogRotator:
                     rotated_file = log_file.parent / f"{base_name}_{timestamp}.log"
                 
                 # Rotate the file
+                if self.index is not None:
+                    self.index.update(log_file)
                 if self.config.compress_rotated:
                     self._compress_and_move(log_file, rotated_file)
                 else:
                     shutil.move(str(log_file), str(rotated_file))
+                if self.index is not None:
+                    self.index.move(log_file, rotated_file)
                 
                 # Clean up old rotated files
                 self._cleanup_old_files(log_file.parent, base_name)
@@ -239,14 +477,269 @@ class LogRotator:
                 except Exception as e:
                     logging.error(f"Failed to remove expired log file {old_file}: {e}")
 
+class LogIndex:
+    """
+    Sidecar indexes that let LogAnalyzer seek instead of rescanning logs
+    
+    Each log file gets a JSON index in <log_dir>/.index/ holding, per time
+    bucket of its entries, the byte range the bucket's lines span and line
+    counts per component and level. The index also records how far the file
+    has been indexed. A growing file is only parsed from that offset on.
+    A truncated or replaced file (different inode or leading bytes) is
+    reindexed from the start. For .log.gz files the offsets refer to the
+    decompressed stream; rotation hands the live file's index over to the
+    rotated file, so compressing a log does not require reindexing it.
+    """
+    
+    VERSION = 1
+    HEAD_BYTES = 4096  # Leading bytes fingerprinted to detect a replaced file
+    
+    def __init__(self, log_dir: str, bucket_seconds: int = 60):
+        self.log_dir = Path(log_dir)
+        self.index_dir = self.log_dir / ".index"
+        self.bucket_seconds = bucket_seconds
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    # Index maintenance
+    
+    def update(self, log_file: Path) -> Dict[str, Any]:
+        """Bring the index of log_file up to date and return it"""
+        log_file = Path(log_file)
+        with self._lock:
+            index = self._load(log_file)
+            stat = log_file.stat()
+            identity = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+            if index is not None and index["identity"] == identity and index["complete"]:
+                return index
+            
+            compressed = log_file.suffix == ".gz"
+            opener = gzip.open if compressed else open
+            with opener(log_file, 'rb') as f:
+                if index is None or not self._continues(index, f, stat, compressed):
+                    index = self._new_index(log_file)
+                f.seek(index["offset"])
+                self._index_stream(f, index)
+                if index["head_length"] < min(index["offset"], self.HEAD_BYTES):
+                    f.seek(0)
+                    head = f.read(min(index["offset"], self.HEAD_BYTES))
+                    index["head_length"] = len(head)
+                    index["head_sha1"] = hashlib.sha1(head).hexdigest()
+            
+            index["identity"] = identity
+            index["complete"] = True
+            self._save(log_file, index)
+            return index
+    
+    def _continues(self, index: Dict[str, Any], f, stat: os.stat_result, compressed: bool) -> bool:
+        """Whether the file still starts with the bytes the index was built from"""
+        if not compressed and (stat.st_ino != index["identity"][0] or stat.st_size < index["offset"]):
+            return False
+        head = f.read(index["head_length"])
+        return hashlib.sha1(head).hexdigest() == index["head_sha1"]
+    
+    def _new_index(self, log_file: Path) -> Dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "file": log_file.name,
+            "bucket_seconds": self.bucket_seconds,
+            "identity": None,
+            "head_length": 0,
+            "head_sha1": hashlib.sha1(b"").hexdigest(),
+            "complete": False,
+            "offset": 0,  # End of the last complete line indexed
+            "lines": 0,
+            "unparsed_lines": 0,
+            "min_timestamp": None,
+            "max_timestamp": None,
+            "buckets": {}  # bucket start -> [first_offset, end_offset, {component: {level: count}}]
+        }
+    
+    def _index_stream(self, f, index: Dict[str, Any]):
+        """Index complete lines from the current position of a binary file"""
+        buckets = index["buckets"]
+        bucket_seconds = index["bucket_seconds"]
+        offset = index["offset"]
+        lo, hi = index["min_timestamp"], index["max_timestamp"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Partial line still being written
+            start, offset = offset, offset + len(line)
+            index["lines"] += 1
+            try:
+                entry = json.loads(line)
+                timestamp = float(entry["timestamp"])
+                level = str(entry.get("level", "INFO"))
+                component = str(entry.get("component", "unknown"))
+            except (ValueError, TypeError, KeyError, AttributeError):
+                index["unparsed_lines"] += 1
+                continue
+            
+            bucket_start = int(timestamp // bucket_seconds * bucket_seconds)
+            bucket = buckets.get(bucket_start)
+            if bucket is None:
+                bucket = buckets[bucket_start] = [start, offset, {}]
+            else:
+                bucket[0] = min(bucket[0], start)
+                bucket[1] = offset
+            levels = bucket[2].setdefault(component, {})
+            levels[level] = levels.get(level, 0) + 1
+            lo = timestamp if lo is None else min(lo, timestamp)
+            hi = timestamp if hi is None else max(hi, timestamp)
+        index["offset"] = offset
+        index["min_timestamp"], index["max_timestamp"] = lo, hi
+    
+    def move(self, source: Path, destination: Path):
+        """Hand the index of a rotated file over to its new name"""
+        with self._lock:
+            index = self._load(Path(source))
+            self._drop(Path(source))
+            if index is None:
+                return
+            index["file"] = Path(destination).name
+            index["complete"] = False  # Lines written after the last update are picked up next time
+            self._save(Path(destination), index)
+    
+    def prune(self) -> int:
+        """Remove indexes whose log file is gone"""
+        removed = 0
+        with self._lock:
+            for sidecar in self.index_dir.glob("*.json"):
+                if not (self.log_dir / sidecar.stem).exists():
+                    self._drop(self.log_dir / sidecar.stem)
+                    removed += 1
+        return removed
+    
+    def _sidecar(self, log_file: Path) -> Path:
+        return self.index_dir / f"{log_file.name}.json"
+    
+    def _load(self, log_file: Path) -> Optional[Dict[str, Any]]:
+        index = self._indexes.get(log_file.name)
+        if index is None:
+            try:
+                with open(self._sidecar(log_file), 'r') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if index.get("version") != self.VERSION or index.get("bucket_seconds") != self.bucket_seconds:
+                return None
+            index["buckets"] = {int(start): bucket for start, bucket in index["buckets"].items()}
+            self._indexes[log_file.name] = index
+        return index
+    
+    def _save(self, log_file: Path, index: Dict[str, Any]):
+        self._indexes[log_file.name] = index
+        self.index_dir.mkdir(exist_ok=True)
+        sidecar = self._sidecar(log_file)
+        tmp = sidecar.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, sidecar)
+    
+    def _drop(self, log_file: Path):
+        self._indexes.pop(log_file.name, None)
+        try:
+            self._sidecar(log_file).unlink()
+        except FileNotFoundError:
+            pass
+    
+    # Queries
+    
+    def counts(self, log_file: Path, start: Optional[float] = None,
+               end: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """
+        {component: {level: count}} for entries in [start, end]
+        
+        Buckets entirely inside the range are counted from the index; only
+        the buckets cut by start or end are read. Out-of-order lines make
+        bucket byte ranges overlap, so re-read lines are only counted if
+        they belong to one of the cut buckets.
+        """
+        index = self.update(log_file)
+        bucket_seconds = index["bucket_seconds"]
+        totals: Dict[str, Dict[str, int]] = {}
+        partial: Dict[int, Tuple[int, int]] = {}
+        for bucket_start, (first, last, by_component) in index["buckets"].items():
+            bucket_end = bucket_start + bucket_seconds
+            if (start is not None and bucket_end <= start) or (end is not None and bucket_start > end):
+                continue
+            if (start is not None and bucket_start < start) or (end is not None and bucket_end > end):
+                partial[bucket_start] = (first, last)
+                continue
+            for component, levels in by_component.items():
+                target = totals.setdefault(component, {})
+                for level, count in levels.items():
+                    target[level] = target.get(level, 0) + count
+        
+        for entry in self._read_ranges(log_file, list(partial.values())):
+            timestamp = entry["timestamp"]
+            if int(timestamp // bucket_seconds * bucket_seconds) not in partial:
+                continue  # Already counted from the index
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                target = totals.setdefault(str(entry.get("component", "unknown")), {})
+                level = str(entry.get("level", "INFO"))
+                target[level] = target.get(level, 0) + 1
+        return totals
+    
+    def query(self, log_file: Path, start: Optional[float] = None, end: Optional[float] = None,
+              levels: Optional[List[str]] = None,
+              components: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Entries in [start, end] matching the level/component filters, in file order"""
+        index = self.update(log_file)
+        ranges = []
+        for bucket_start, (first, last, by_component) in index["buckets"].items():
+            if (start is not None and bucket_start + index["bucket_seconds"] <= start) or \
+               (end is not None and bucket_start > end):
+                continue
+            if not any((components is None or component in components) and
+                       (levels is None or any(level in levels_seen for level in levels))
+                       for component, levels_seen in by_component.items()):
+                continue  # Nothing in this bucket can match
+            ranges.append((first, last))
+        
+        return [
+            entry for entry in self._read_ranges(log_file, ranges)
+            if (start is None or entry["timestamp"] >= start)
+            and (end is None or entry["timestamp"] <= end)
+            and (levels is None or entry.get("level", "INFO") in levels)
+            and (components is None or entry.get("component", "unknown") in components)
+        ]
+    
+    def _read_ranges(self, log_file: Path, ranges: List[Tuple[int, int]]):
+        """Parsed entries from the merged byte ranges of a file"""
+        merged: List[List[int]] = []
+        for first, last in sorted(ranges):
+            if merged and first <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        if not merged:
+            return
+        
+        opener = gzip.open if log_file.suffix == ".gz" else open
+        with opener(log_file, 'rb') as f:
+            for first, last in merged:
+                f.seek(first)
+                for line in f.read(last - first).splitlines():
+                    try:
+                        entry = json.loads(line)
+                        entry["timestamp"] = float(entry["timestamp"])
+                    except (ValueError, TypeError, KeyError):
+                        continue
+                    yield entry
+
 class LogAnalyzer:
     """
     Analyzes log files for patterns, errors, and insights
     Provides log-based metrics and alerting
+    
+    Counts come from the LogIndex; only the time buckets that hold errors
+    or metrics entries in the requested range are read and parsed.
     """
     
-    def __init__(self, log_dir: str):
+    def __init__(self, log_dir: str, index: Optional[LogIndex] = None):
         self.log_dir = Path(log_dir)
+        self.index = index or LogIndex(log_dir)
         
     def analyze_logs(self, hours_back: int = 24) -> Dict[str, Any]:
         """Analyze logs from the specified time period"""
@@ -281,8 +774,29 @@ class LogAnalyzer:
         for log_file in self.log_dir.glob("*.log.gz"):
             self._analyze_compressed_logs(log_file, cutoff_time, analysis)
         
+        self.index.prune()
         return analysis
     
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              levels: Optional[List[str]] = None,
+              components: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Entries from all live and rotated logs in [start, end], oldest first"""
+        entries = []
+        for log_file in self._log_files():
+            try:
+                entries.extend(self.index.query(log_file, start, end, levels, components))
+            except Exception as e:
+                logging.error(f"Failed to query log file {log_file}: {e}")
+        entries.sort(key=lambda entry: entry["timestamp"])
+        return entries
+    
+    def recent_errors(self, minutes: float = 15) -> List[Dict[str, Any]]:
+        """ERROR and CRITICAL entries of the last `minutes`"""
+        return self.query(start=time.time() - minutes * 60, levels=["ERROR", "CRITICAL"])
+    
+    def _log_files(self) -> List[Path]:
+        return sorted(self.log_dir.glob("*.log")) + sorted(self.log_dir.glob("*.log.gz"))
+    
     def _analyze_component_logs(self, log_file: Path, cutoff_time: float) -> Dict[str, Any]:
         """Analyze logs for a specific component"""
         counts = {level.value: 0 for level in LogLevel}
@@ -290,34 +804,27 @@ class LogAnalyzer:
         performance_issues = []
         
         try:
-            with open(log_file, 'r') as f:
-                for line in f:
-                    try:
-                        log_entry = json.loads(line.strip())
-                        
-                        # Skip entries outside time range
-                        if log_entry.get('timestamp', 0) < cutoff_time:
-                            continue
-                        
-                        level = log_entry.get('level', 'INFO')
-                        counts[level] = counts.get(level, 0) + 1
-                        
-                        # Detect error patterns
-                        if level in ['ERROR', 'CRITICAL']:
-                            errors.append({
-                                "timestamp": log_entry.get('timestamp'),
-                                "message": log_entry.get('message'),
-                                "component": log_entry.get('component'),
-                                "data": log_entry.get('data')
-                            })
-                        
-                        # Detect performance issues
-                        if level == 'METRICS':
-                            self._check_performance_metrics(log_entry, performance_issues)
-                        
-                    except json.JSONDecodeError:
-                        # Skip non-JSON lines
-                        continue
+            for levels in self.index.counts(log_file, start=cutoff_time).values():
+                for level, count in levels.items():
+                    counts[level] = counts.get(level, 0) + count
+            
+            if counts.get('ERROR') or counts.get('CRITICAL') or counts.get('METRICS'):
+                for log_entry in self.index.query(log_file, start=cutoff_time,
+                                                  levels=['ERROR', 'CRITICAL', 'METRICS']):
+                    level = log_entry.get('level')
+                    
+                    # Detect error patterns
+                    if level in ['ERROR', 'CRITICAL']:
+                        errors.append({
+                            "timestamp": log_entry.get('timestamp'),
+                            "message": log_entry.get('message'),
+                            "component": log_entry.get('component'),
+                            "data": log_entry.get('data')
+                        })
+                    
+                    # Detect performance issues
+                    if level == 'METRICS':
+                        self._check_performance_metrics(log_entry, performance_issues)
                         
         except Exception as e:
             logging.error(f"Failed to analyze log file {log_file}: {e}")
@@ -380,26 +887,14 @@ class LogAnalyzer:
                                analysis: Dict[str, Any]):
         """Analyze compressed log files"""
         try:
-            with gzip.open(log_file, 'rt') as f:
-                for line in f:
-                    try:
-                        log_entry = json.loads(line.strip())
-                        
-                        # Skip entries outside time range
-                        if log_entry.get('timestamp', 0) < cutoff_time:
-                            continue
-                        
-                        # Add to analysis (simplified for compressed logs)
-                        component = log_entry.get('component', 'unknown')
-                        level = log_entry.get('level', 'INFO')
-                        
-                        if component not in analysis["log_counts"]:
-                            analysis["log_counts"][component] = {l.value: 0 for l in LogLevel}
-                        
-                        analysis["log_counts"][component][level] += 1
-                        
-                    except json.JSONDecodeError:
-                        continue
+            # Add to analysis (simplified for compressed logs)
+            for component, levels in self.index.counts(log_file, start=cutoff_time).items():
+                if component not in analysis["log_counts"]:
+                    analysis["log_counts"][component] = {l.value: 0 for l in LogLevel}
+                
+                for level, count in levels.items():
+                    target = analysis["log_counts"][component]
+                    target[level] = target.get(level, 0) + count
                         
         except Exception as e:
             logging.error(f"Failed to analyze compressed log file {log_file}: {e}")
@@ -410,13 +905,19 @@ class LogManager:
     Coordinates logging, rotation, and analysis
     """
     
-    def __init__(self, log_dir: str, rotation_config: Optional[LogRotationConfig] = None):
+    def __init__(self, log_dir: str, rotation_config: Optional[LogRotationConfig] = None,
+                 sink_config: Optional[LogSinkConfig] = None):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
+        # One writer thread for all component logs
+        self.sink = LogSink(sink_config)
+        self.sink.start()
+        
         self.rotation_config = rotation_config or LogRotationConfig()
-        self.rotator = LogRotator(self.rotation_config)
-        self.analyzer = LogAnalyzer(str(self.log_dir))
+        self.index = LogIndex(str(self.log_dir))
+        self.rotator = LogRotator(self.rotation_config, self.index)
+        self.analyzer = LogAnalyzer(str(self.log_dir), self.index)
         
         # Component loggers
         self.loggers: Dict[str, StructuredLogger] = {}
@@ -431,7 +932,7 @@ class LogManager:
     def get_logger(self, component: str) -> StructuredLogger:
         """Get or create logger for component"""
         if component not in self.loggers:
-            self.loggers[component] = StructuredLogger(component, str(self.log_dir))
+            self.loggers[component] = StructuredLogger(component, str(self.log_dir), self.sink)
         
         return self.loggers[component]
     
@@ -453,6 +954,11 @@ class LogManager:
             self.rotation_stop_event.set()
             self.rotation_thread.join(timeout=5)
     
+    def close(self):
+        """Stop rotation and write all queued log records"""
+        self.stop_rotation_service()
+        self.sink.stop()
+    
     def _rotation_worker(self):
         """Background worker for log rotation"""
         while not self.rotation_stop_event.is_set():
@@ -460,7 +966,10 @@ class LogManager:
                 # Check all log files for rotation
                 for log_file in self.log_dir.glob("*.log"):
                     if self.rotator.should_rotate(log_file):
-                        self.rotator.rotate_log(log_file)
+                        # Queued records belong in the file being rotated, and
+                        # nothing may be written between the flush and the move
+                        with self.sink.paused():
+                            self.rotator.rotate_log(log_file)
                 
                 # Sleep for rotation check interval (every 10 minutes)
                 self.rotation_stop_event.wait(600)
@@ -471,27 +980,38 @@ class LogManager:
     
     def force_rotation(self, component: Optional[str] = None):
         """Force rotation of log files"""
-        if component:
-            log_file = self.log_dir / f"{component}.log"
-            if log_file.exists():
-                self.rotator.rotate_log(log_file)
-        else:
-            # Rotate all log files
-            for log_file in self.log_dir.glob("*.log"):
-                self.rotator.rotate_log(log_file)
+        with self.sink.paused():
+            if component:
+                log_file = self.log_dir / f"{component}.log"
+                if log_file.exists():
+                    self.rotator.rotate_log(log_file)
+            else:
+                # Rotate all log files
+                for log_file in self.log_dir.glob("*.log"):
+                    self.rotator.rotate_log(log_file)
     
     def get_log_analysis(self, hours_back: int = 24) -> Dict[str, Any]:
         """Get comprehensive log analysis"""
+        self.sink.flush()
         return self.analyzer.analyze_logs(hours_back)
     
+    def query_logs(self, start: Optional[float] = None, end: Optional[float] = None,
+                   levels: Optional[List[str]] = None,
+                   components: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Indexed time-range/level query over live and rotated logs"""
+        self.sink.flush()
+        return self.analyzer.query(start, end, levels, components)
+    
     def get_log_statistics(self) -> Dict[str, Any]:
         """Get log file statistics"""
+        self.sink.flush()
         stats = {
             "total_log_files": 0,
             "total_size_mb": 0,
             "components": {},
             "rotated_files": 0,
-            "compressed_files": 0
+            "compressed_files": 0,
+            "sink": self.sink.get_stats()
         }
         
         # Analyze current log files
@@ -515,10 +1035,11 @@ class LogManager:
         return stats
     
     def _count_lines(self, file_path: Path) -> int:
-        """Count lines in a file"""
+        """Count lines in a file (from its index, parsing only what was appended)"""
         try:
-            with open(file_path, 'r') as f:
-                return sum(1 for _ in f)
+            index = self.index.update(file_path)
+            partial = file_path.stat().st_size > index["offset"]  # Unterminated last line
+            return index["lines"] + partial
         except Exception:
             return 0
     
@@ -560,6 +1081,7 @@ class LogManager:
                 except Exception as e:
                     logging.error(f"Failed to remove old log file {log_file}: {e}")
         
+        self.index.prune()
         return removed_count
 
 
@@ -650,7 +1172,7 @@ if __name__ == "__main__":
         print(f"Logs exported to: {export_file}")
         
     finally:
-        log_manager.stop_rotation_service()
+        log_manager.close()
         
         # Cleanup
         import shutil
@@ -10,7 +10,8 @@ import json
 import time
 import threading
 import uuid
-from datetime import datetime, timedelta
+import queue
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -18,6 +19,8 @@ import logging
 from collections import deque, defaultdict
 import statistics
 
+from quantile_sketch import DDSketch, WindowedSketch
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,26 +43,498 @@ class MetricsSnapshot:
         if self.metadata is None:
             self.metadata = {}
 
+def flatten_metrics(metrics: Dict[str, Any], prefix: str = "") -> List[Tuple[str, float]]:
+    """Numeric leaves of a nested snapshot as (dotted_name, value) pairs"""
+    values = []
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.extend(flatten_metrics(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values.append((name, float(value)))
+    return values
+
+def snapshot_epoch_seconds(timestamp: str) -> float:
+    """Whole epoch seconds of a snapshot's ISO timestamp (naive means UTC)"""
+    return float(int(datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()))
+
+def unflatten_metrics(values: List[Tuple[str, float]]) -> Dict[str, Any]:
+    """Inverse of flatten_metrics"""
+    metrics: Dict[str, Any] = {}
+    for name, value in values:
+        *parents, leaf = name.split(".")
+        node = metrics
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return metrics
+
+class MetricsStore:
+    """
+    SQLite time-series store with one long-lived writer thread
+    
+    Samples are typed (series_id, ts, value) rows, where a series is one
+    metric of one session. They go into the 1s tier and are folded into the
+    1m and 1h rollup tiers (min/max/sum/count) in the same transaction. Each
+    tier is split into time-partitioned tables (metrics_<tier>_<n>), so
+    retention drops whole tables instead of deleting rows. All writes run on
+    the writer thread's WAL connection; callers only enqueue. Reads share
+    one long-lived connection, which WAL lets run alongside the writer.
+    
+    Databases written before the tiered store keep snapshots as JSON blobs
+    in metrics_snapshots (and samples in metrics_timeseries). Their rows are
+    folded into the tiers by the writer's first batch, and the legacy tables
+    are dropped in the same transaction.
+    """
+    
+    # name, resolution (s), partition length (s)
+    TIERS = (
+        ("1s", 1, 86400),
+        ("1m", 60, 7 * 86400),
+        ("1h", 3600, 30 * 86400),
+    )
+    RETENTION_CHECK_SECONDS = 3600
+    LEGACY_TABLES = ("metrics_snapshots", "metrics_timeseries")
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS metrics_series (
+            id INTEGER PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            UNIQUE (session_id, metric_name)
+        );
+        CREATE TABLE IF NOT EXISTS alert_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            alert_id TEXT NOT NULL,
+            alert_type TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            threshold_value REAL,
+            actual_value REAL,
+            message TEXT NOT NULL,
+            triggered_at TEXT NOT NULL,
+            resolved_at TEXT,
+            duration_ms INTEGER,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            ended_at TEXT,
+            wirthforge_version TEXT,
+            system_info_json TEXT,
+            total_metrics_collected INTEGER DEFAULT 0,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS metrics_sketches (
+            session_id TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            window_start REAL NOT NULL,
+            window_seconds REAL NOT NULL,
+            sample_count INTEGER NOT NULL,
+            sketch_json TEXT NOT NULL,
+            PRIMARY KEY (session_id, metric_name, window_start)
+        );
+        CREATE INDEX IF NOT EXISTS idx_series_metric ON metrics_series(metric_name);
+        CREATE INDEX IF NOT EXISTS idx_alerts_session ON alert_history(session_id);
+        CREATE INDEX IF NOT EXISTS idx_sketches_metric_window ON metrics_sketches(metric_name, window_start);
+    """
+    
+    def __init__(self, db_path: Path, retention_days: Dict[str, float]):
+        self.db_path = db_path
+        self.retention_days = retention_days  # Per tier name
+        
+        self._read_db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._read_db.execute("PRAGMA journal_mode = WAL")
+        self._read_db.executescript(self.SCHEMA)
+        self._read_lock = threading.Lock()
+        
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = 0  # Items submitted but not yet written
+        self._pending_lock = threading.Lock()
+        self._idle = threading.Condition(self._pending_lock)
+        self._thread: Optional[threading.Thread] = None
+        
+        # Writer-thread caches
+        self._series: Dict[Tuple[str, str], int] = {}
+        self._tables: set = set()
+        self._last_retention = 0.0
+        
+        self.metrics = {
+            "samples_written": 0,
+            "batches_written": 0,
+            "last_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+            "partitions_dropped": 0,
+            "legacy_samples_migrated": 0,
+            "write_errors": 0
+        }
+        
+        legacy = self._read_db.execute(
+            f"SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            f"AND name IN ({','.join('?' * len(self.LEGACY_TABLES))})", self.LEGACY_TABLES
+        ).fetchone()
+        if legacy:
+            self._submit(("legacy",))
+        
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-store-writer", daemon=True)
+        self._thread.start()
+        
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Write everything still queued, then stop the thread and close the reader"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        with self._read_lock:
+            self._read_db.close()
+            
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted item has been written"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+            
+    def _submit(self, item: Tuple):
+        with self._pending_lock:
+            self._pending += 1
+        self._queue.put(item)
+        
+    def submit_samples(self, session_id: str, timestamp: float, values: List[Tuple[str, float]]):
+        """Queue one sample per metric taken at `timestamp` (epoch seconds)"""
+        if values:
+            self._submit(("samples", session_id, timestamp, values))
+            
+    def execute(self, sql: str, params: Tuple = ()):
+        """Queue a write statement for the writer thread"""
+        self._submit(("execute", sql, params))
+        
+    def executemany(self, sql: str, rows: List[Tuple]):
+        if rows:
+            self._submit(("executemany", sql, rows))
+            
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._read_lock:
+            return self._read_db.execute(sql, params).fetchall()
+            
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.metrics, "queue_depth": self._pending}
+        
+    # Writer thread
+    
+    def _run(self):
+        db = sqlite3.connect(self.db_path, isolation_level=None)
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        try:
+            stopping = False
+            while not stopping:
+                items = [self._queue.get()]
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = None in items
+                work = [item for item in items if item is not None]
+                if work:
+                    self._write(db, work)
+                    with self._idle:
+                        self._pending -= len(work)
+                        self._idle.notify_all()
+                        
+                now = time.time()
+                if now - self._last_retention >= self.RETENTION_CHECK_SECONDS:
+                    self._apply_retention(db, now)
+        finally:
+            db.close()
+            
+    def _write(self, db: sqlite3.Connection, items: List[Tuple]):
+        start = time.perf_counter()
+        samples = 0
+        try:
+            db.execute("BEGIN")
+            raw: Dict[str, List[Tuple]] = defaultdict(list)
+            rollups: Dict[str, Dict[Tuple[int, float], List[float]]] = {
+                tier: {} for tier, _, _ in self.TIERS[1:]
+            }
+            for item in items:
+                kind = item[0]
+                if kind == "samples":
+                    _, session_id, ts, values = item
+                    self._add_samples(db, raw, rollups, session_id, ts, values)
+                    samples += len(values)
+                elif kind == "legacy":
+                    samples += self._migrate_legacy(db, raw, rollups)
+                elif kind == "execute":
+                    db.execute(item[1], item[2])
+                else:
+                    db.executemany(item[1], item[2])
+                    
+            for table, rows in raw.items():
+                db.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)", rows)
+            for tier_spec in self.TIERS[1:]:
+                by_table: Dict[str, List[Tuple]] = defaultdict(list)
+                for (series_id, bucket), (lo, hi, total, count) in rollups[tier_spec[0]].items():
+                    by_table[self._partition(db, tier_spec, bucket)].append(
+                        (series_id, bucket, lo, hi, total, count)
+                    )
+                for table, rows in by_table.items():
+                    db.executemany(f"""
+                        INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (series_id, bucket) DO UPDATE SET
+                            min = MIN(min, excluded.min),
+                            max = MAX(max, excluded.max),
+                            sum = sum + excluded.sum,
+                            count = count + excluded.count
+                    """, rows)
+            db.execute("COMMIT")
+        except Exception as e:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            # Cached ids/tables may refer to rolled-back rows
+            self._series.clear()
+            self._tables.clear()
+            self.metrics["write_errors"] += 1
+            logger.error(f"Failed to write metrics batch of {len(items)}: {e}")
+        else:
+            commit_ms = (time.perf_counter() - start) * 1000
+            self.metrics["samples_written"] += samples
+            self.metrics["batches_written"] += 1
+            self.metrics["last_commit_ms"] = commit_ms
+            self.metrics["max_commit_ms"] = max(self.metrics["max_commit_ms"], commit_ms)
+            
+    def _add_samples(self, db: sqlite3.Connection, raw: Dict[str, List[Tuple]],
+                     rollups: Dict[str, Dict[Tuple[int, float], List[float]]],
+                     session_id: str, ts: float, values: List[Tuple[str, float]]):
+        """Stage samples for the 1s tier and fold them into the pending rollups"""
+        raw_table = self._partition(db, self.TIERS[0], ts)
+        for name, value in values:
+            series_id = self._series_id(db, session_id, name)
+            raw[raw_table].append((series_id, ts, value))
+            for tier, resolution, _ in self.TIERS[1:]:
+                key = (series_id, ts - ts % resolution)
+                acc = rollups[tier].get(key)
+                if acc is None:
+                    rollups[tier][key] = [value, value, value, 1]
+                else:
+                    acc[0] = min(acc[0], value)
+                    acc[1] = max(acc[1], value)
+                    acc[2] += value
+                    acc[3] += 1
+                    
+    def _migrate_legacy(self, db: sqlite3.Connection, raw: Dict[str, List[Tuple]],
+                        rollups: Dict[str, Dict[Tuple[int, float], List[float]]]) -> int:
+        """Stage the legacy tables' rows as samples and drop the tables; returns the sample count"""
+        samples = 0
+        existing = {name for (name,) in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "metrics_snapshots" in existing:
+            for session_id, timestamp, metrics_json in db.execute(
+                    "SELECT session_id, timestamp, metrics_json FROM metrics_snapshots ORDER BY id").fetchall():
+                try:
+                    values = flatten_metrics(json.loads(metrics_json))
+                    ts = snapshot_epoch_seconds(timestamp)
+                except (ValueError, TypeError, AttributeError) as e:
+                    logger.warning(f"Skipping unreadable legacy snapshot at {timestamp}: {e}")
+                    continue
+                self._add_samples(db, raw, rollups, session_id, ts, values)
+                samples += len(values)
+        if "metrics_timeseries" in existing:
+            for session_id, timestamp, name, value in db.execute(
+                    "SELECT session_id, timestamp, metric_name, metric_value FROM metrics_timeseries ORDER BY id").fetchall():
+                try:
+                    ts = snapshot_epoch_seconds(timestamp)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable legacy sample at {timestamp}: {e}")
+                    continue
+                self._add_samples(db, raw, rollups, session_id, ts, [(name, float(value))])
+                samples += 1
+                
+        for table in self.LEGACY_TABLES:
+            db.execute(f"DROP TABLE IF EXISTS {table}")
+        self.metrics["legacy_samples_migrated"] += samples
+        logger.info(f"Migrated {samples} legacy metrics samples into the tiered store")
+        return samples
+        
+    def _series_id(self, db: sqlite3.Connection, session_id: str, name: str) -> int:
+        key = (session_id, name)
+        series_id = self._series.get(key)
+        if series_id is None:
+            db.execute("INSERT OR IGNORE INTO metrics_series (session_id, metric_name) VALUES (?, ?)", key)
+            series_id = db.execute(
+                "SELECT id FROM metrics_series WHERE session_id = ? AND metric_name = ?", key
+            ).fetchone()[0]
+            self._series[key] = series_id
+        return series_id
+        
+    def _partition(self, db: sqlite3.Connection, tier_spec: Tuple[str, int, int], ts: float) -> str:
+        """Name of the partition table holding ts, created on first use"""
+        tier, _, partition_seconds = tier_spec
+        table = f"metrics_{tier}_{int(ts // partition_seconds)}"
+        if table not in self._tables:
+            if tier == self.TIERS[0][0]:
+                db.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        series_id INTEGER NOT NULL,
+                        ts REAL NOT NULL,
+                        value REAL NOT NULL,
+                        PRIMARY KEY (series_id, ts)
+                    ) WITHOUT ROWID
+                """)
+            else:
+                db.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        series_id INTEGER NOT NULL,
+                        bucket REAL NOT NULL,
+                        min REAL NOT NULL,
+                        max REAL NOT NULL,
+                        sum REAL NOT NULL,
+                        count INTEGER NOT NULL,
+                        PRIMARY KEY (series_id, bucket)
+                    ) WITHOUT ROWID
+                """)
+            self._tables.add(table)
+        return table
+        
+    def _apply_retention(self, db: sqlite3.Connection, now: float):
+        """Drop partitions that ended before their tier's retention window"""
+        self._last_retention = now
+        try:
+            for tier, _, partition_seconds in self.TIERS:
+                cutoff = now - self.retention_days[tier] * 86400
+                for table, index in self._list_partitions(db, tier):
+                    if (index + 1) * partition_seconds <= cutoff:
+                        db.execute(f"DROP TABLE {table}")
+                        self._tables.discard(table)
+                        self.metrics["partitions_dropped"] += 1
+                        
+            # Alerts and quantile windows are sparse; plain deletes are cheap here
+            cutoff = now - max(self.retention_days.values()) * 86400
+            db.execute("DELETE FROM alert_history WHERE created_at < ?", (cutoff,))
+            db.execute("DELETE FROM metrics_sketches WHERE window_start < ?", (cutoff,))
+        except Exception as e:
+            logger.error(f"Failed to apply metrics retention: {e}")
+            
+    @staticmethod
+    def _list_partitions(db: sqlite3.Connection, tier: str) -> List[Tuple[str, int]]:
+        prefix = f"metrics_{tier}_"
+        rows = db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?", (prefix + "%",)
+        ).fetchall()
+        return sorted((name, int(name[len(prefix):])) for (name,) in rows
+                      if name[len(prefix):].isdigit())
+        
+    # Range queries
+    
+    def select_tier(self, start: float, end: float, max_points: Optional[int] = None,
+                    now: Optional[float] = None) -> Tuple[str, int, int]:
+        """
+        Finest tier that still holds data from `start` and returns at most
+        max_points points per series over [start, end]
+        """
+        now = time.time() if now is None else now
+        for tier_spec in self.TIERS:
+            tier, resolution, _ = tier_spec
+            retained = now - self.retention_days[tier] * 86400 <= start
+            if retained and (max_points is None or (end - start) / resolution <= max_points):
+                return tier_spec
+        return self.TIERS[-1]
+        
+    def read_range(self, start: float, end: float, metric_names: Optional[List[str]] = None,
+                   session_id: Optional[str] = None, max_points: Optional[int] = None,
+                   ) -> Tuple[str, Dict[str, List[Tuple[float, float, float, float, int]]]]:
+        """
+        Points per metric over [start, end] from the tier picked by select_tier
+        
+        Returns (tier, {metric_name: [(ts, min, max, avg, count), ...]}); 1s
+        points have min = max = avg and count 1. Series of different sessions
+        with the same name are returned together, in time order.
+        """
+        tier_spec = self.select_tier(start, end, max_points)
+        tier, _, partition_seconds = tier_spec
+        
+        where, params = [], []
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if metric_names is not None:
+            where.append(f"metric_name IN ({','.join('?' * len(metric_names))})")
+            params.extend(metric_names)
+        sql = "SELECT id, metric_name FROM metrics_series"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        names = dict(self.query(sql, tuple(params)))
+        if not names:
+            return tier, {}
+            
+        with self._read_lock:
+            partitions = [
+                table for table, index in self._list_partitions(self._read_db, tier)
+                if index * partition_seconds <= end and (index + 1) * partition_seconds > start
+            ]
+        if tier == self.TIERS[0][0]:
+            columns, ts_column = "series_id, ts, value, value, value, 1", "ts"
+        else:
+            columns, ts_column = "series_id, bucket, min, max, sum / count, count", "bucket"
+        ids = ",".join(str(series_id) for series_id in names)
+        
+        series: Dict[str, List[Tuple]] = defaultdict(list)
+        for table in partitions:
+            rows = self.query(
+                f"SELECT {columns} FROM {table} WHERE series_id IN ({ids}) "
+                f"AND {ts_column} >= ? AND {ts_column} <= ? ORDER BY {ts_column}",
+                (start, end)
+            )
+            for series_id, ts, lo, hi, avg, count in rows:
+                series[names[series_id]].append((ts, lo, hi, avg, count))
+        if session_id is None:
+            for points in series.values():
+                points.sort()
+        return tier, dict(series)
+
 class MetricsCollector:
     """
     Local-first metrics collection and aggregation system
     Integrates with WF-TECH-004 SQLite database for unified storage
+    
+    Latency and frame-time percentiles come from per-window DDSketches
+    (1% relative error) instead of sorting the raw samples on every snapshot;
+    closed windows are persisted to metrics_sketches for historical merges.
+    Numeric snapshot fields are written as typed samples to a MetricsStore,
+    which keeps 1s raw data for raw_retention_days, 1m rollups for
+    retention_days and 1h rollups for hourly_retention_days.
     """
     
+    MEASUREMENT_WINDOW_SECONDS = 60
+    SKETCH_WINDOW_SECONDS = 10
+    SKETCHED_METRICS = ("latency_ms", "frame_time_ms")
+    
     def __init__(self, db_path: str = "wirthforge_metrics.db", 
                  collection_interval: float = 1.0,
-                 retention_days: int = 30):
+                 retention_days: int = 30,
+                 raw_retention_days: int = 2,
+                 hourly_retention_days: int = 365):
         self.db_path = Path(db_path)
         self.collection_interval = collection_interval
         self.retention_days = retention_days
+        self.raw_retention_days = raw_retention_days
+        self.hourly_retention_days = hourly_retention_days
+        self.snapshots_stored = 0
         self.session_id = str(uuid.uuid4())
         self.running = False
         self.collection_thread = None
         
         # In-memory aggregation buffers (60Hz frame budget: 16.67ms)
         self.frame_times = deque(maxlen=3600)  # Last hour of frame times
-        self.latencies = deque(maxlen=1000)    # Last 1000 latencies
+        self.last_latency_ms = 0.0
         self.error_counts = defaultdict(int)
+        
+        # Streaming quantiles per metric, one sketch per 10s window (10 minutes in memory)
+        self.sketches = {
+            name: WindowedSketch(self.SKETCH_WINDOW_SECONDS, max_windows=60)
+            for name in self.SKETCHED_METRICS
+        }
         self.energy_samples = deque(maxlen=3600)
         
         # Alert system
@@ -109,80 +584,15 @@ class MetricsCollector:
         }
 
     def _init_database(self):
-        """Initialize SQLite database with metrics tables"""
+        """Open the metrics store and start its writer thread"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Metrics snapshots table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS metrics_snapshots (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        schema_version TEXT NOT NULL,
-                        metrics_json TEXT NOT NULL,
-                        alerts_json TEXT,
-                        metadata_json TEXT,
-                        created_at REAL NOT NULL,
-                        FOREIGN KEY (session_id) REFERENCES sessions(id)
-                    )
-                """)
-                
-                # Time-series metrics for detailed analysis
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS metrics_timeseries (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        metric_name TEXT NOT NULL,
-                        metric_value REAL NOT NULL,
-                        metric_unit TEXT,
-                        tags_json TEXT,
-                        created_at REAL NOT NULL,
-                        INDEX(session_id, metric_name, timestamp)
-                    )
-                """)
-                
-                # Alert history table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS alert_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id TEXT NOT NULL,
-                        alert_id TEXT NOT NULL,
-                        alert_type TEXT NOT NULL,
-                        metric_name TEXT NOT NULL,
-                        threshold_value REAL,
-                        actual_value REAL,
-                        message TEXT NOT NULL,
-                        triggered_at TEXT NOT NULL,
-                        resolved_at TEXT,
-                        duration_ms INTEGER,
-                        created_at REAL NOT NULL
-                    )
-                """)
-                
-                # Session metadata table (extends WF-TECH-004)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        id TEXT PRIMARY KEY,
-                        started_at TEXT NOT NULL,
-                        ended_at TEXT,
-                        wirthforge_version TEXT,
-                        system_info_json TEXT,
-                        total_metrics_collected INTEGER DEFAULT 0,
-                        created_at REAL NOT NULL
-                    )
-                """)
-                
-                # Create indexes for performance
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_session_time ON metrics_snapshots(session_id, timestamp)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_timeseries_session_metric ON metrics_timeseries(session_id, metric_name)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_session ON alert_history(session_id)")
-                
-                conn.commit()
-                logger.info("Database initialized successfully")
-                
+            self.store = MetricsStore(self.db_path, {
+                "1s": self.raw_retention_days,
+                "1m": self.retention_days,
+                "1h": self.hourly_retention_days
+            })
+            self.store.start()
+            logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
             raise
@@ -210,45 +620,44 @@ class MetricsCollector:
         if self.collection_thread:
             self.collection_thread.join(timeout=5.0)
             
+        self._persist_sketches(flush=True)  # Include the open windows
         self._finalize_session()
+        self.store.flush(timeout=5.0)
         logger.info("Metrics collection stopped")
 
+    def close(self):
+        """Stop collection, write everything queued and close the database"""
+        self.stop_collection()
+        self.store.stop()
+
     def _register_session(self):
         """Register new session in database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO sessions (id, started_at, wirthforge_version, system_info_json, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    self.session_id,
-                    datetime.utcnow().isoformat(),
-                    "1.0.0",  # TODO: Get from actual version
-                    json.dumps(self._get_system_info()),
-                    time.time()
-                ))
-                conn.commit()
+            self.store.execute("""
+                INSERT INTO sessions (id, started_at, wirthforge_version, system_info_json, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                self.session_id,
+                datetime.utcnow().isoformat(),
+                "1.0.0",  # TODO: Get from actual version
+                json.dumps(self._get_system_info()),
+                time.time()
+            ))
         except Exception as e:
             logger.error(f"Failed to register session: {e}")
 
     def _finalize_session(self):
         """Finalize session in database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE sessions 
-                    SET ended_at = ?, total_metrics_collected = (
-                        SELECT COUNT(*) FROM metrics_snapshots WHERE session_id = ?
-                    )
-                    WHERE id = ?
-                """, (
-                    datetime.utcnow().isoformat(),
-                    self.session_id,
-                    self.session_id
-                ))
-                conn.commit()
+            self.store.execute("""
+                UPDATE sessions 
+                SET ended_at = ?, total_metrics_collected = ?
+                WHERE id = ?
+            """, (
+                datetime.utcnow().isoformat(),
+                self.snapshots_stored,
+                self.session_id
+            ))
         except Exception as e:
             logger.error(f"Failed to finalize session: {e}")
 
@@ -275,15 +684,13 @@ class MetricsCollector:
                 # Collect current metrics
                 snapshot = self._collect_snapshot()
                 
-                # Store snapshot
+                # Store snapshot and closed quantile windows
                 self._store_snapshot(snapshot)
+                self._persist_sketches()
                 
                 # Check alerts
                 self._check_alerts(snapshot)
                 
-                # Cleanup old data
-                self._cleanup_old_data()
-                
                 # Maintain collection interval
                 elapsed = time.time() - start_time
                 sleep_time = max(0, self.collection_interval - elapsed)
@@ -315,7 +722,7 @@ class MetricsCollector:
         # Metadata
         metadata = {
             "collection_interval_ms": self.collection_interval * 1000,
-            "measurement_window_seconds": 60,
+            "measurement_window_seconds": self.MEASUREMENT_WINDOW_SECONDS,
             "wirthforge_version": "1.0.0",
             "system_info": self._get_system_info()
         }
@@ -329,8 +736,9 @@ class MetricsCollector:
         )
 
     def _calculate_latency_metrics(self) -> Dict[str, float]:
-        """Calculate latency metrics from recent samples"""
-        if not self.latencies:
+        """Calculate latency metrics over the measurement window"""
+        sketch = self.sketches["latency_ms"].merged(self.MEASUREMENT_WINDOW_SECONDS)
+        if not sketch.count:
             return {
                 "prompt_to_response_ms": 0.0,
                 "p50_latency_ms": 0.0,
@@ -342,16 +750,17 @@ class MetricsCollector:
                 "ui_render_ms": 0.0
             }
         
-        latencies_list = list(self.latencies)
+        p50, p95, p99 = sketch.quantiles((0.50, 0.95, 0.99))
+        mean_latency = sketch.mean
         return {
-            "prompt_to_response_ms": latencies_list[-1] if latencies_list else 0.0,
-            "p50_latency_ms": statistics.median(latencies_list),
-            "p95_latency_ms": statistics.quantiles(latencies_list, n=20)[18] if len(latencies_list) > 20 else max(latencies_list),
-            "p99_latency_ms": statistics.quantiles(latencies_list, n=100)[98] if len(latencies_list) > 100 else max(latencies_list),
-            "average_latency_ms": statistics.mean(latencies_list),
-            "model_computation_ms": statistics.mean(latencies_list) * 0.7,  # Estimated
-            "decipher_processing_ms": statistics.mean(latencies_list) * 0.2,  # Estimated
-            "ui_render_ms": statistics.mean(latencies_list) * 0.1  # Estimated
+            "prompt_to_response_ms": self.last_latency_ms,
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
+            "average_latency_ms": mean_latency,
+            "model_computation_ms": mean_latency * 0.7,  # Estimated
+            "decipher_processing_ms": mean_latency * 0.2,  # Estimated
+            "ui_render_ms": mean_latency * 0.1  # Estimated
         }
 
     def _calculate_frame_metrics(self) -> Dict[str, float]:
@@ -364,7 +773,10 @@ class MetricsCollector:
                 "frame_drops_percentage": 0.0,
                 "longest_frame_ms": 16.67,
                 "frame_budget_violations": 0,
-                "frame_stability_score": 100.0
+                "frame_stability_score": 100.0,
+                "p50_frame_time_ms": 16.67,
+                "p95_frame_time_ms": 16.67,
+                "p99_frame_time_ms": 16.67
             }
         
         frame_times_list = list(self.frame_times)
@@ -383,6 +795,10 @@ class MetricsCollector:
         # Stability score (inverse of frame drop percentage)
         stability_score = max(0, 100 - frame_drops_percentage)
         
+        # Frame time percentiles over the measurement window
+        sketch = self.sketches["frame_time_ms"].merged(self.MEASUREMENT_WINDOW_SECONDS)
+        p50, p95, p99 = sketch.quantiles((0.50, 0.95, 0.99)) if sketch.count else (frame_times_list[-1],) * 3
+        
         return {
             "current_fps": current_fps,
             "average_fps": average_fps,
@@ -390,7 +806,10 @@ class MetricsCollector:
             "frame_drops_percentage": frame_drops_percentage,
             "longest_frame_ms": max(frame_times_list),
             "frame_budget_violations": frame_drops_count,
-            "frame_stability_score": stability_score
+            "frame_stability_score": stability_score,
+            "p50_frame_time_ms": p50,
+            "p95_frame_time_ms": p95,
+            "p99_frame_time_ms": p99
         }
 
     def _calculate_progression_metrics(self) -> Dict[str, Any]:
@@ -487,27 +906,27 @@ class MetricsCollector:
         }
 
     def _store_snapshot(self, snapshot: MetricsSnapshot):
-        """Store metrics snapshot in database"""
+        """Queue the snapshot's numeric metrics as typed samples"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO metrics_snapshots 
-                    (session_id, timestamp, schema_version, metrics_json, alerts_json, metadata_json, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    snapshot.session_id,
-                    snapshot.timestamp,
-                    snapshot.schema_version,
-                    json.dumps(snapshot.metrics),
-                    json.dumps(snapshot.alerts),
-                    json.dumps(snapshot.metadata),
-                    time.time()
-                ))
-                conn.commit()
+            self.store.submit_samples(snapshot.session_id, snapshot_epoch_seconds(snapshot.timestamp),
+                                      flatten_metrics(snapshot.metrics))
+            self.snapshots_stored += 1
         except Exception as e:
             logger.error(f"Failed to store snapshot: {e}")
 
+    def _persist_sketches(self, flush: bool = False):
+        """Store quantile sketches of windows that closed since the last call"""
+        rows = []
+        for metric_name, windows in self.sketches.items():
+            for window_start, sketch in windows.pop_closed(flush=flush):
+                rows.append((self.session_id, metric_name, window_start, windows.window_seconds,
+                             sketch.count, sketch.to_json()))
+        self.store.executemany("""
+            INSERT OR REPLACE INTO metrics_sketches
+            (session_id, metric_name, window_start, window_seconds, sample_count, sketch_json)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
     def _check_alerts(self, snapshot: MetricsSnapshot):
         """Check metrics against alert thresholds"""
         metrics = snapshot.metrics
@@ -576,74 +995,45 @@ class MetricsCollector:
 
     def _log_alert(self, alert: Dict[str, Any], action: str):
         """Log alert to database"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if action == "triggered":
-                    cursor.execute("""
-                        INSERT INTO alert_history 
-                        (session_id, alert_id, alert_type, metric_name, threshold_value, 
-                         actual_value, message, triggered_at, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        self.session_id,
-                        alert["id"],
-                        alert["type"],
-                        alert["metric"],
-                        alert["threshold"],
-                        alert["current_value"],
-                        alert["message"],
-                        alert["timestamp"],
-                        time.time()
-                    ))
-                elif action == "resolved":
-                    cursor.execute("""
-                        UPDATE alert_history 
-                        SET resolved_at = ?, duration_ms = ?
-                        WHERE alert_id = ?
-                    """, (
-                        datetime.utcnow().isoformat(),
-                        alert.get("duration_ms", 0),
-                        alert["id"]
-                    ))
-                
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Failed to log alert: {e}")
-
-    def _cleanup_old_data(self):
-        """Clean up old metrics data based on retention policy"""
-        try:
-            cutoff_time = datetime.utcnow() - timedelta(days=self.retention_days)
-            cutoff_timestamp = cutoff_time.isoformat()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Clean up old snapshots
-                cursor.execute("DELETE FROM metrics_snapshots WHERE timestamp < ?", (cutoff_timestamp,))
-                
-                # Clean up old timeseries data
-                cursor.execute("DELETE FROM metrics_timeseries WHERE timestamp < ?", (cutoff_timestamp,))
-                
-                # Clean up old alerts
-                cursor.execute("DELETE FROM alert_history WHERE triggered_at < ?", (cutoff_timestamp,))
-                
-                conn.commit()
-                
-        except Exception as e:
-            logger.error(f"Failed to cleanup old data: {e}")
+        if action == "triggered":
+            self.store.execute("""
+                INSERT INTO alert_history 
+                (session_id, alert_id, alert_type, metric_name, threshold_value, 
+                 actual_value, message, triggered_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                self.session_id,
+                alert["id"],
+                alert["type"],
+                alert["metric"],
+                alert["threshold"],
+                alert["current_value"],
+                alert["message"],
+                alert["timestamp"],
+                time.time()
+            ))
+        elif action == "resolved":
+            self.store.execute("""
+                UPDATE alert_history 
+                SET resolved_at = ?, duration_ms = ?
+                WHERE alert_id = ?
+            """, (
+                datetime.utcnow().isoformat(),
+                alert.get("duration_ms", 0),
+                alert["id"]
+            ))
 
     # Public API methods for external integration
     
     def record_frame_time(self, frame_time_ms: float):
         """Record frame processing time for stability metrics"""
         self.frame_times.append(frame_time_ms)
+        self.sketches["frame_time_ms"].add(frame_time_ms)
 
     def record_latency(self, latency_ms: float):
         """Record end-to-end latency measurement"""
-        self.latencies.append(latency_ms)
+        self.last_latency_ms = latency_ms
+        self.sketches["latency_ms"].add(latency_ms)
 
     def record_error(self, error_type: str):
         """Record system error for reliability metrics"""
@@ -662,64 +1052,100 @@ class MetricsCollector:
         snapshot = self._collect_snapshot()
         return asdict(snapshot)
 
-    def get_metrics_history(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get historical metrics for dashboard charts"""
+    def get_metrics_history(self, hours: float = 24, max_points: int = 1500) -> List[Dict[str, Any]]:
+        """
+        Historical metrics for dashboard charts
+        
+        Reads the finest tier that returns at most max_points points per
+        metric (1m rollups for the default 24h); rollup points carry the
+        bucket averages.
+        """
+        end = time.time()
+        return self._read_history(end - hours * 3600, end, max_points)
+
+    def _read_history(self, start: float, end: float,
+                      max_points: Optional[int] = None) -> List[Dict[str, Any]]:
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-            cutoff_timestamp = cutoff_time.isoformat()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT timestamp, metrics_json 
-                    FROM metrics_snapshots 
-                    WHERE session_id = ? AND timestamp >= ?
-                    ORDER BY timestamp
-                """, (self.session_id, cutoff_timestamp))
-                
-                results = []
-                for row in cursor.fetchall():
-                    timestamp, metrics_json = row
-                    results.append({
-                        "timestamp": timestamp,
-                        "metrics": json.loads(metrics_json)
-                    })
-                
-                return results
-                
+            _, series = self.store.read_range(start, end, session_id=self.session_id,
+                                              max_points=max_points)
         except Exception as e:
             logger.error(f"Failed to get metrics history: {e}")
             return []
+        
+        by_time: Dict[float, List[Tuple[str, float]]] = defaultdict(list)
+        for name, points in series.items():
+            for ts, _, _, avg, _ in points:
+                by_time[ts].append((name, avg))
+        return [
+            {
+                "timestamp": datetime.utcfromtimestamp(ts).isoformat(),
+                "metrics": unflatten_metrics(by_time[ts])
+            }
+            for ts in sorted(by_time)
+        ]
+
+    def load_sketch(self, metric_name: str, hours: float = 24,
+                    session_id: Optional[str] = None) -> DDSketch:
+        """Merge the persisted quantile windows of a metric over the last `hours`"""
+        merged = DDSketch()
+        for _, sketch in self._load_sketch_windows(metric_name, hours, session_id):
+            merged.merge(sketch)
+        return merged
+
+    def get_quantile_history(self, metric_name: str, hours: float = 24,
+                             quantiles: Tuple[float, ...] = (0.50, 0.95, 0.99),
+                             session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-window quantiles of a metric for dashboard charts"""
+        history = []
+        for window_start, sketch in self._load_sketch_windows(metric_name, hours, session_id):
+            entry = {"window_start": window_start, "count": sketch.count, "mean": sketch.mean}
+            for q, value in zip(quantiles, sketch.quantiles(quantiles)):
+                entry[f"p{round(q * 100):g}"] = value
+            history.append(entry)
+        return history
+
+    def _load_sketch_windows(self, metric_name: str, hours: float,
+                             session_id: Optional[str]) -> List[Tuple[float, DDSketch]]:
+        """Persisted windows of a metric, all sessions unless session_id is given"""
+        query = "SELECT window_start, sketch_json FROM metrics_sketches WHERE metric_name = ? AND window_start >= ?"
+        params: List[Any] = [metric_name, time.time() - hours * 3600]
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params.append(session_id)
+        
+        try:
+            rows = self.store.query(query + " ORDER BY window_start", tuple(params))
+        except Exception as e:
+            logger.error(f"Failed to load quantile sketches: {e}")
+            return []
+        
+        # Windows of different sessions with the same start are merged
+        windows: Dict[float, DDSketch] = {}
+        for window_start, sketch_json in rows:
+            sketch = DDSketch.from_json(sketch_json)
+            if window_start in windows:
+                windows[window_start].merge(sketch)
+            else:
+                windows[window_start] = sketch
+        return list(windows.items())
 
     def export_metrics(self, output_path: str, format: str = "json"):
-        """Export metrics data for analysis or backup"""
+        """Export this session's retained 1s metrics for analysis or backup"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM metrics_snapshots 
-                    WHERE session_id = ?
-                    ORDER BY timestamp
-                """, (self.session_id,))
-                
-                if format == "json":
-                    data = []
-                    for row in cursor.fetchall():
-                        data.append({
-                            "id": row[0],
-                            "session_id": row[1],
-                            "timestamp": row[2],
-                            "schema_version": row[3],
-                            "metrics": json.loads(row[4]),
-                            "alerts": json.loads(row[5]) if row[5] else [],
-                            "metadata": json.loads(row[6]) if row[6] else {}
-                        })
-                    
-                    with open(output_path, 'w') as f:
-                        json.dump(data, f, indent=2)
-                
-                logger.info(f"Metrics exported to {output_path}")
-                
+            self.store.flush(timeout=5.0)
+            end = time.time()
+            history = self._read_history(end - self.raw_retention_days * 86400, end)
+            
+            if format == "json":
+                data = [
+                    {"session_id": self.session_id, "schema_version": "1.0.0", **entry}
+                    for entry in history
+                ]
+                with open(output_path, 'w') as f:
+                    json.dump(data, f, indent=2)
+            
+            logger.info(f"Metrics exported to {output_path}")
+            
         except Exception as e:
             logger.error(f"Failed to export metrics: {e}")
 
@@ -743,4 +1169,4 @@ if __name__ == "__main__":
         print("Current metrics:", json.dumps(current, indent=2))
         
     finally:
-        collector.stop_collection()
+        collector.close()
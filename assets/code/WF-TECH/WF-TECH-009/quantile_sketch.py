@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+WF-TECH-009 Streaming Quantile Sketches
+Mergeable DDSketch quantiles per metric and per time window
+
+A DDSketch maps each value to a logarithmic bucket, so any quantile is
+returned within a fixed relative error (1% by default) using constant memory
+and O(1) work per sample. Sketches of the same accuracy merge by adding
+bucket counts, which lets snapshots combine recent windows and dashboards
+combine persisted historical windows without rereading raw samples.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class DDSketch:
+    """
+    Relative-error quantile sketch (Masson et al., VLDB 2019)
+
+    Bucket i holds values in (gamma^(i-1), gamma^i] with
+    gamma = (1 + alpha) / (1 - alpha). Negative values use a mirrored store
+    and values too close to zero share one bucket. When more than max_bins
+    buckets are in use the lowest ones are collapsed, which only affects the
+    accuracy of the smallest quantiles.
+    """
+
+    MIN_INDEXABLE = 1e-9
+
+    def __init__(self, alpha: float = 0.01, max_bins: int = 2048):
+        if not 0.0 < alpha < 1.0:
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.gamma = (1.0 + alpha) / (1.0 - alpha)
+        self._inv_log_gamma = 1.0 / math.log(self.gamma)
+
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self.gamma ** index / (1.0 + self.gamma)
+
+    def add(self, value: float, weight: int = 1):
+        """Record a value (weight times)"""
+        if value > self.MIN_INDEXABLE:
+            bins = self.positive
+            index = math.ceil(math.log(value) * self._inv_log_gamma)
+        elif value < -self.MIN_INDEXABLE:
+            bins = self.negative
+            index = math.ceil(math.log(-value) * self._inv_log_gamma)
+        else:
+            self.zero_count += weight
+            bins = None
+        if bins is not None:
+            bins[index] = bins.get(index, 0) + weight
+            if len(bins) > self.max_bins:
+                self._collapse(bins)
+
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch"):
+        """Add another sketch's samples into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if not other.count:
+            return
+        for source, target in ((other.positive, self.positive), (other.negative, self.negative)):
+            for index, count in source.items():
+                target[index] = target.get(index, 0) + count
+            if len(target) > self.max_bins:
+                self._collapse(target)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _collapse(self, bins: Dict[int, int]):
+        """Fold the lowest-magnitude buckets into one so at most max_bins remain"""
+        indices = sorted(bins)
+        excess = indices[:len(indices) - self.max_bins + 1]
+        total = sum(bins.pop(index) for index in excess)
+        target = excess[-1]
+        bins[target] = bins.get(target, 0) + total
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0.0-1.0), within alpha relative error"""
+        if not self.count:
+            return 0.0
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return max(self.min, -self._value(index))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return min(self.max, self._value(index))
+        return self.max
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        return [self.quantile(q) for q in qs]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def copy(self) -> "DDSketch":
+        sketch = DDSketch(self.alpha, self.max_bins)
+        sketch.merge(self)
+        return sketch
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable sketch state"""
+        return {
+            "alpha": self.alpha,
+            "max_bins": self.max_bins,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "positive": sorted(self.positive.items()),
+            "negative": sorted(self.negative.items())
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        sketch = cls(data["alpha"], data.get("max_bins", 2048))
+        sketch.positive = {int(index): int(count) for index, count in data["positive"]}
+        sketch.negative = {int(index): int(count) for index, count in data["negative"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "DDSketch":
+        return cls.from_dict(json.loads(text))
+
+
+class WindowedSketch:
+    """
+    One DDSketch per fixed time window for a single metric
+
+    Windows are aligned to multiples of window_seconds on the wall clock, so
+    windows from different collectors or sessions line up when merged. Only
+    the newest max_windows windows are kept in memory; closed windows can be
+    drained with pop_closed() for persistence. Thread-safe, since samples are
+    usually recorded from the frame loop while snapshots run on the
+    collection thread.
+    """
+
+    def __init__(self, window_seconds: float = 10.0, max_windows: int = 60,
+                 alpha: float = 0.01):
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self.alpha = alpha
+        self._windows: "OrderedDict[float, DDSketch]" = OrderedDict()
+        self._persisted_until = -math.inf  # Windows starting before this were handed out
+        self._lock = threading.Lock()
+
+    def _window_start(self, now: float) -> float:
+        return math.floor(now / self.window_seconds) * self.window_seconds
+
+    def add(self, value: float, now: Optional[float] = None):
+        start = self._window_start(time.time() if now is None else now)
+        with self._lock:
+            sketch = self._windows.get(start)
+            if sketch is None:
+                sketch = self._windows[start] = DDSketch(self.alpha)
+                while len(self._windows) > self.max_windows:
+                    self._windows.popitem(last=False)
+            sketch.add(value)
+
+    def merged(self, seconds: Optional[float] = None, now: Optional[float] = None) -> DDSketch:
+        """Merge of the windows overlapping the last `seconds` (all in memory if None)"""
+        now = time.time() if now is None else now
+        result = DDSketch(self.alpha)
+        with self._lock:
+            for start, sketch in self._windows.items():
+                if seconds is None or start + self.window_seconds > now - seconds:
+                    result.merge(sketch)
+        return result
+
+    def pop_closed(self, now: Optional[float] = None, flush: bool = False) -> List[Tuple[float, DDSketch]]:
+        """
+        Closed windows not returned before, oldest first
+
+        flush also returns the open window's samples so far, but does not
+        mark it as handed out: it is returned again, complete, once closed.
+        """
+        current = self._window_start(time.time() if now is None else now)
+        with self._lock:
+            closed = [(start, sketch.copy()) for start, sketch in self._windows.items()
+                      if self._persisted_until <= start and (flush or start < current)]
+            if closed:
+                self._persisted_until = min(closed[-1][0] + self.window_seconds, current)
+        return closed
@@ -0,0 +1,117 @@
+"""
+WF-FND-003 Layer 3 Interference Benchmark
+CPU cost of Layer3_OrchestrationEnergy._detect_interference versus token rate
+
+Compares per-model sorted timelines with two-pointer alignment against the
+previous approach (regrouping a shared 1000-entry deque every frame and
+matching each token with min() over the other stream).
+
+Author: WIRTHFORGE Development Team
+Version: 1.0
+License: MIT
+"""
+
+import importlib.util
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-003' / 'layer-examples'
+MODULE_PATH = CODE_DIR / 'layer3-orchestrator.py'
+# rolling_correlation is shared with the DECIPHER core
+sys.path.insert(0, str(CODE_DIR.parents[1] / 'WF-FND-004'))
+
+spec = importlib.util.spec_from_file_location('wf_fnd_003_layer3_orchestrator', MODULE_PATH)
+assert spec and spec.loader
+layer3_orchestrator = importlib.util.module_from_spec(spec)
+sys.modules['wf_fnd_003_layer3_orchestrator'] = layer3_orchestrator
+spec.loader.exec_module(layer3_orchestrator)  # type: ignore
+
+Layer3_OrchestrationEnergy = layer3_orchestrator.Layer3_OrchestrationEnergy
+TokenEvent = layer3_orchestrator.TokenEvent
+
+MODEL_COUNT = 4
+TOKEN_RATES = [20, 50, 100, 200, 500]  # Tokens per second per model
+FRAMES_PER_RUN = 60
+FRAME_BUDGET_MS = 16.67
+
+
+def make_events(rate: int, now: float) -> List[TokenEvent]:
+    """One interference window of interleaved tokens from every model"""
+    events = []
+    span = 0.5
+    for k in range(int(rate * span)):
+        for m in range(MODEL_COUNT):
+            events.append(TokenEvent(
+                request_id=f"req_{m}", model_name=f"model_{m}", token="tok",
+                token_index=k, timestamp=now - span + k / rate + m * 0.003,
+                duration=1000.0 / rate, energy=0.01, stream_id=f"stream_{m}"
+            ))
+    return events
+
+
+def legacy_detect(buffer: deque, window: float) -> List[float]:
+    """Previous algorithm: regroup the shared deque, then min() per token"""
+    now = time.time()
+    model_streams: Dict[str, List[TokenEvent]] = {}
+    for event in buffer:
+        if now - event.timestamp < window:
+            model_streams.setdefault(event.model_name, []).append(event)
+
+    correlations = []
+    models = list(model_streams.keys())
+    for i in range(len(models)):
+        for j in range(i + 1, len(models)):
+            stream1, stream2 = model_streams[models[i]], model_streams[models[j]]
+            diffs = [abs(e1.timestamp - min(stream2, key=lambda e: abs(e.timestamp - e1.timestamp)).timestamp)
+                     for e1 in stream1]
+            correlations.append(max(0, 1.0 - (sum(diffs) / len(diffs) / 0.1)))
+    return correlations
+
+
+def measure(rate: int) -> Dict[str, float]:
+    """Measure CPU ms per frame for both interference paths at one token rate"""
+    now = time.time()
+    events = make_events(rate, now)
+
+    legacy_buffer = deque(events, maxlen=1000)
+    start = time.process_time_ns()
+    for _ in range(FRAMES_PER_RUN):
+        legacy_detect(legacy_buffer, 0.5)
+    legacy_ms = (time.process_time_ns() - start) / FRAMES_PER_RUN / 1e6
+
+    orchestrator = Layer3_OrchestrationEnergy(None, None)
+    orchestrator.interference_window = 60.0  # Keep the window populated across frames
+    orchestrator.correlation_threshold = 1.1  # Measure detection only, no event emission
+    for event in events:
+        orchestrator._buffer_interference_event(event)
+    start = time.process_time_ns()
+    for _ in range(FRAMES_PER_RUN):
+        orchestrator._detect_interference()
+    sorted_ms = (time.process_time_ns() - start) / FRAMES_PER_RUN / 1e6
+
+    return {
+        'rate': rate,
+        'window_tokens': len(events),
+        'legacy_ms': legacy_ms,
+        'sorted_ms': sorted_ms,
+        'speedup': legacy_ms / max(sorted_ms, 1e-9),
+        'budget_pct': sorted_ms / FRAME_BUDGET_MS * 100
+    }
+
+
+def main():
+    """Print interference frame cost table"""
+    results: List[Dict[str, Any]] = [measure(rate) for rate in TOKEN_RATES]
+
+    print(f"WF-FND-003 interference detection, {MODEL_COUNT} models (CPU ms per frame)")
+    print(f"{'tok/s':>6} {'tokens':>7} {'legacy':>10} {'sorted':>10} {'speedup':>8} {'budget%':>8}")
+    for row in results:
+        print(f"{row['rate']:>6} {row['window_tokens']:>7} {row['legacy_ms']:>10.3f} "
+              f"{row['sorted_ms']:>10.3f} {row['speedup']:>7.1f}x {row['budget_pct']:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
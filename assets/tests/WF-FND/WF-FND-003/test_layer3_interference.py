@@ -0,0 +1,68 @@
+"""
+WF-FND-003: Layer 3 Interference Test Suite
+Per-model timelines and sorted stream alignment
+"""
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-003' / 'layer-examples'
+MODULE_PATH = CODE_DIR / 'layer3-orchestrator.py'
+# rolling_correlation is shared with the DECIPHER core
+sys.path.insert(0, str(CODE_DIR.parents[1] / 'WF-FND-004'))
+
+spec = importlib.util.spec_from_file_location('wf_fnd_003_layer3_orchestrator', MODULE_PATH)
+assert spec and spec.loader
+layer3_orchestrator = importlib.util.module_from_spec(spec)
+sys.modules['wf_fnd_003_layer3_orchestrator'] = layer3_orchestrator
+spec.loader.exec_module(layer3_orchestrator)  # type: ignore
+
+Layer3_OrchestrationEnergy = layer3_orchestrator.Layer3_OrchestrationEnergy
+ModelTimeline = layer3_orchestrator.ModelTimeline
+TokenEvent = layer3_orchestrator.TokenEvent
+
+
+def _event(model_name, timestamp):
+    return TokenEvent("req", model_name, "tok", 0, timestamp, 50.0, 0.01, f"stream_{model_name}")
+
+
+class TestLayer3Interference:
+    """Test suite for interference buffering and stream alignment."""
+
+    def test_alignment_matches_nearest_neighbour_scan(self):
+        rng = random.Random(3)
+        orchestrator = Layer3_OrchestrationEnergy(None, None)
+        for _ in range(50):
+            times1 = sorted(rng.uniform(0, 0.5) for _ in range(rng.randint(1, 40)))
+            times2 = sorted(rng.uniform(0, 0.5) for _ in range(rng.randint(1, 40)))
+            diffs = [min(abs(t1 - t2) for t2 in times2) for t1 in times1]
+            expected = max(0, 1.0 - (sum(diffs) / len(diffs) / 0.1))
+            assert orchestrator._calculate_stream_correlation(times1, times2) == pytest.approx(expected)
+
+    def test_timeline_sorts_late_events_and_prunes(self):
+        timeline = ModelTimeline(max_events=5)
+        for timestamp in [1.0, 2.0, 1.5, 3.0, 0.5, 4.0, 5.0]:
+            timeline.append(_event("a", timestamp))
+
+        assert timeline.timestamps == [1.5, 2.0, 3.0, 4.0, 5.0]
+        assert [e.timestamp for e in timeline.events] == timeline.timestamps
+
+        timeline.prune(3.0)
+        assert timeline.timestamps == [4.0, 5.0]
+
+    def test_detect_interference_expires_idle_models(self):
+        orchestrator = Layer3_OrchestrationEnergy(None, None)
+        orchestrator.correlation_threshold = 1.1  # Detection only, no event emission
+        orchestrator._buffer_interference_event(_event("a", 0.0))
+        orchestrator._buffer_interference_event(_event("b", 0.0))
+        orchestrator.frame_model_energy = {"a": 1.0, "b": 2.0}
+        orchestrator._record_energy_frame()
+        assert "a" in orchestrator.energy_correlation
+
+        orchestrator._detect_interference()
+        assert orchestrator.global_state["interference_buffer"] == {}
+        assert orchestrator.energy_correlation.stream_ids == []
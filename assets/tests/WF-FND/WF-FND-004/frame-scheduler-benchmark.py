@@ -0,0 +1,107 @@
+"""
+WF-FND-004 Frame Scheduler Benchmark
+Frame start jitter and drift at 60Hz: sleep-after-work vs absolute deadlines
+
+The previous loops slept `budget - duration` measured with time.time() after
+each frame, so sleep overshoot accumulated and the loop fell behind 60Hz.
+FrameScheduler releases frames at t0 + n*period on perf_counter_ns with a
+hybrid coarse-sleep/spin-yield wait. Both loops run the same simulated frame
+work (2-9ms, with an occasional 20ms overrun).
+
+Author: WIRTHFORGE Development Team
+Version: 1.0
+License: MIT
+"""
+
+import asyncio
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-004'
+MODULE_PATH = CODE_DIR / 'frame_scheduler.py'
+
+spec = importlib.util.spec_from_file_location('frame_scheduler', MODULE_PATH)
+assert spec and spec.loader
+frame_scheduler = importlib.util.module_from_spec(spec)
+sys.modules['frame_scheduler'] = frame_scheduler
+spec.loader.exec_module(frame_scheduler)  # type: ignore
+
+FrameScheduler = frame_scheduler.FrameScheduler
+MissedFramePolicy = frame_scheduler.MissedFramePolicy
+
+TARGET_FPS = 60
+FRAME_COUNT = 600
+PERIOD = 1.0 / TARGET_FPS
+
+
+def make_workload(seed: int = 7) -> List[float]:
+    """Per-frame busy time in seconds"""
+    rng = random.Random(seed)
+    return [0.020 if i % 300 == 299 else rng.uniform(0.002, 0.009) for i in range(FRAME_COUNT)]
+
+
+async def run_legacy(workload: List[float]) -> List[float]:
+    """Previous FrameLoop.start / DecipherLoop.start_loop timing"""
+    starts = []
+    for work in workload:
+        frame_start = time.time()
+        starts.append(time.perf_counter())
+        time.sleep(work)
+        frame_duration = time.time() - frame_start
+        sleep_time = max(0, PERIOD - frame_duration)
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+    return starts
+
+
+async def run_scheduler(workload: List[float], policy) -> List[float]:
+    scheduler = FrameScheduler(TARGET_FPS, policy)
+    scheduler.start()
+    starts = []
+    for work in workload:
+        tick = await scheduler.wait_next_frame()
+        starts.append(tick.start)
+        time.sleep(work)
+    return starts
+
+
+def percentile(data: List[float], p: float) -> float:
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * p / 100))]
+
+
+def summarize(starts: List[float]) -> Dict[str, float]:
+    """Interval jitter |dt - period| and drift of the last frame against the ideal grid"""
+    intervals = [b - a for a, b in zip(starts, starts[1:])]
+    jitter = [abs(dt - PERIOD) * 1000 for dt in intervals]
+    elapsed = starts[-1] - starts[0]
+    return {
+        'fps': (len(starts) - 1) / elapsed,
+        'p50_ms': percentile(jitter, 50),
+        'p99_ms': percentile(jitter, 99),
+        'drift_ms': (elapsed - (len(starts) - 1) * PERIOD) * 1000
+    }
+
+
+def main():
+    """Print jitter/drift table"""
+    workload = make_workload()
+    results = [
+        ('sleep-after-work', summarize(asyncio.run(run_legacy(workload)))),
+        ('deadline skip', summarize(asyncio.run(run_scheduler(workload, MissedFramePolicy.SKIP)))),
+        ('deadline catch-up', summarize(asyncio.run(run_scheduler(workload, MissedFramePolicy.CATCH_UP)))),
+    ]
+
+    print(f"WF-FND-004 frame scheduler, {FRAME_COUNT} frames at {TARGET_FPS}Hz")
+    print(f"{'mode':<18} {'fps':>7} {'p50 ms':>8} {'p99 ms':>8} {'drift ms':>9}")
+    for name, row in results:
+        print(f"{name:<18} {row['fps']:>7.2f} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f} "
+              f"{row['drift_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+WF-FND-004: Frame Scheduler Test Suite
+Absolute deadlines, missed-frame policies and the jitter histogram
+"""
+
+import asyncio
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-004'
+MODULE_PATH = CODE_DIR / 'frame_scheduler.py'
+
+spec = importlib.util.spec_from_file_location('wf_fnd_004_frame_scheduler', MODULE_PATH)
+assert spec and spec.loader
+frame_scheduler = importlib.util.module_from_spec(spec)
+sys.modules['wf_fnd_004_frame_scheduler'] = frame_scheduler
+spec.loader.exec_module(frame_scheduler)  # type: ignore
+
+FrameScheduler = frame_scheduler.FrameScheduler
+JitterHistogram = frame_scheduler.JitterHistogram
+MissedFramePolicy = frame_scheduler.MissedFramePolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameScheduler:
+    """Test suite for the monotonic deadline scheduler."""
+
+    def test_histogram_percentiles_within_bucket_error(self):
+        histogram = JitterHistogram()
+        for value_us in range(1, 10001):
+            histogram.record(value_us * 1000)
+
+        assert histogram.total == 10000
+        assert histogram.percentile(50) == pytest.approx(5000, rel=0.07)
+        assert histogram.percentile(99) == pytest.approx(9900, rel=0.07)
+        assert histogram.percentile(100) == 10000
+        assert histogram.to_dict()["mean_ms"] == pytest.approx(5.0, rel=0.01)
+
+        histogram.record(10 ** 15)  # Far beyond the last bucket
+        assert histogram.max_us == 10 ** 12
+
+    @pytest.mark.asyncio
+    async def test_skip_policy_resumes_at_latest_passed_deadline(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(60, MissedFramePolicy.SKIP, clock=clock)
+        scheduler.start()
+        period = scheduler.period_ns
+
+        first = await scheduler.wait_next_frame()
+        assert (first.index, first.lateness_ns) == (0, 0)
+
+        clock.now = int(3.5 * period)  # Frame 0 overran by 2.5 periods
+        tick = await scheduler.wait_next_frame()
+        assert (tick.index, tick.skipped) == (3, 2)
+        assert tick.deadline_ns == 3 * period
+        assert tick.lateness_ns == clock.now - 3 * period
+        assert scheduler.skipped_frames == 2
+
+    @pytest.mark.asyncio
+    async def test_catch_up_policy_runs_missed_frames_back_to_back(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(60, MissedFramePolicy.CATCH_UP, max_catch_up=1, clock=clock)
+        scheduler.start()
+        period = scheduler.period_ns
+
+        await scheduler.wait_next_frame()
+        clock.now = int(3.5 * period)
+        ticks = [await scheduler.wait_next_frame() for _ in range(2)]
+        assert [(t.index, t.skipped) for t in ticks] == [(2, 1), (3, 0)]
+        assert scheduler.skipped_frames == 1
+        assert scheduler.caught_up_frames == 1
+
+    @pytest.mark.asyncio
+    async def test_deadlines_do_not_drift(self):
+        scheduler = FrameScheduler(120)
+        scheduler.start()
+        ticks = []
+        for _ in range(30):
+            ticks.append(await scheduler.wait_next_frame())
+            time.sleep(0.002)  # Frame work
+
+        assert [t.index for t in ticks] == list(range(30))
+        assert ticks[-1].deadline_ns - ticks[0].deadline_ns == 29 * scheduler.period_ns
+        assert all(t.lateness_ns >= 0 for t in ticks)
+        assert scheduler.get_jitter_report()["frames"] == 30
+
+    @pytest.mark.asyncio
+    async def test_wakeup_releases_frame_early_without_moving_grid(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(60, clock=clock)
+        scheduler.start()
+        period = scheduler.period_ns
+        await scheduler.wait_next_frame()
+
+        wakeup = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.001, wakeup.set)
+        tick = await scheduler.wait_next_frame(wakeup)
+        assert (tick.index, tick.early, tick.lateness_ns) == (1, True, -period)
+        assert not wakeup.is_set()
+
+        clock.now = 2 * period
+        tick = await scheduler.wait_next_frame(wakeup)
+        assert (tick.index, tick.early, tick.deadline_ns) == (2, False, 2 * period)
+        report = scheduler.get_jitter_report()
+        assert (report["early_wakeups"], report["frames"]) == (1, 2)
@@ -0,0 +1,123 @@
+"""
+WF-FND-004: Rolling Correlation Matrix Test Suite
+Incremental correlation against a full recomputation over the same window
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-004'
+MODULE_PATH = CODE_DIR / 'rolling_correlation.py'
+
+spec = importlib.util.spec_from_file_location('wf_fnd_004_rolling_correlation', MODULE_PATH)
+assert spec and spec.loader
+rolling_correlation = importlib.util.module_from_spec(spec)
+sys.modules['wf_fnd_004_rolling_correlation'] = rolling_correlation
+spec.loader.exec_module(rolling_correlation)  # type: ignore
+
+RollingCorrelationMatrix = rolling_correlation.RollingCorrelationMatrix
+
+
+def _reference(frames, stream_ids, window):
+    """np.corrcoef over the last `window` frames"""
+    recent = np.array([[frame.get(s, 0.0) for s in stream_ids] for frame in frames[-window:]])
+    return np.corrcoef(recent, rowvar=False)
+
+
+class TestRollingCorrelationMatrix:
+    """Test suite for the incremental rolling correlation matrix."""
+
+    def test_matches_full_recomputation(self):
+        rng = np.random.default_rng(7)
+        streams = [f"model_{i}" for i in range(12)]
+        matrix = RollingCorrelationMatrix(window=30, recompute_interval=50, initial_streams=2)
+        frames = []
+        for _ in range(200):
+            base = rng.normal()
+            frame = {s: base * (i % 3) + rng.normal() for i, s in enumerate(streams)}
+            frames.append(frame)
+            matrix.update(frame)
+
+        ids, corr = matrix.matrix()
+        assert ids == streams
+        np.testing.assert_allclose(corr, _reference(frames, streams, 30), atol=1e-9)
+        assert matrix.correlation("model_1", "model_4") == pytest.approx(corr[1, 4])
+
+    def test_missing_samples_and_stream_removal(self):
+        rng = np.random.default_rng(11)
+        matrix = RollingCorrelationMatrix(window=10)
+        frames = []
+        for step in range(40):
+            frame = {"a": rng.normal(), "b": rng.normal()}
+            if step % 4:
+                frame["c"] = rng.normal()
+            frames.append(frame)
+            matrix.update(frame)
+
+        ids, corr = matrix.matrix()
+        np.testing.assert_allclose(corr, _reference(frames, ids, 10), atol=1e-9)
+
+        matrix.remove_stream("b")
+        assert "b" not in matrix
+        matrix.add_stream("d")
+        for _ in range(10):
+            frame = {"a": rng.normal(), "c": rng.normal(), "d": rng.normal()}
+            frames.append(frame)
+            matrix.update(frame)
+
+        ids, corr = matrix.matrix()
+        assert sorted(ids) == ["a", "c", "d"]
+        np.testing.assert_allclose(corr, _reference(frames, ids, 10), atol=1e-9)
+
+    def test_constant_stream_and_threshold_pairs(self):
+        matrix = RollingCorrelationMatrix(window=8, min_samples=4)
+        for step in range(3):
+            matrix.update({"up": step, "down": -step, "flat": 1.0})
+        assert matrix.pairs_above(0.7) == []  # Below min_samples
+
+        for step in range(3, 20):
+            matrix.update({"up": step, "down": -step, "flat": 1.0})
+
+        assert matrix.correlation("up", "flat") == 0.0
+        pairs = matrix.pairs_above(0.7)
+        assert [(a, b) for a, b, _ in pairs] == [("up", "down")]
+        assert pairs[0][2] == pytest.approx(-1.0)
+
+    def test_removed_columns_are_reused_and_trimmed(self):
+        rng = np.random.default_rng(5)
+        matrix = RollingCorrelationMatrix(window=10, initial_streams=2)
+        for name in "abcdef":
+            matrix.add_stream(name)
+        matrix.remove_stream("b")
+        matrix.remove_stream("e")
+        matrix.remove_stream("f")
+        assert matrix.stream_ids == ["a", None, "c", "d"]
+
+        # Lowest free column first; trimmed columns are not handed out twice
+        assert matrix.add_stream("g") == 1
+        assert matrix.add_stream("h") == 4
+        assert matrix.add_stream("i") == 5
+
+        frames = []
+        for _ in range(25):
+            frame = {s: rng.normal() for s in "acdghi"}
+            frames.append(frame)
+            matrix.update(frame)
+        ids, corr = matrix.matrix()
+        np.testing.assert_allclose(corr, _reference(frames, ids, 10), atol=1e-9)
+
+    def test_idle_streams(self):
+        matrix = RollingCorrelationMatrix(window=4)
+        matrix.add_stream("registered")
+        for step in range(6):
+            frame = {"busy": float(step)}
+            if step < 2:
+                frame["quiet"] = 1.0
+            matrix.update(frame)
+
+        assert sorted(matrix.idle_streams(4)) == ["quiet", "registered"]
+        assert matrix.idle_streams(5) == ["registered"]
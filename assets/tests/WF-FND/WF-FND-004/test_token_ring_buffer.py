@@ -0,0 +1,130 @@
+"""
+WF-FND-004: Token Ring Buffer Test Suite
+Ordering, overflow coalescing and single-producer/single-consumer safety
+"""
+
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-FND' / 'WF-FND-004'
+MODULE_PATH = CODE_DIR / 'decipher-core.py'
+sys.path.insert(0, str(CODE_DIR))
+
+spec = importlib.util.spec_from_file_location('wf_fnd_004_decipher_core', MODULE_PATH)
+assert spec and spec.loader
+decipher_core = importlib.util.module_from_spec(spec)
+sys.modules['wf_fnd_004_decipher_core'] = decipher_core
+spec.loader.exec_module(decipher_core)  # type: ignore
+
+TokenRingBuffer = decipher_core.TokenRingBuffer
+TokenBatch = decipher_core.TokenBatch
+
+
+def _batch(stream_id, timestamp, token_count=1, complexity=1.0, speed=10.0, metadata=None):
+    return TokenBatch(timestamp, stream_id, f"model_{stream_id}", token_count,
+                      complexity, speed, metadata or {})
+
+
+class TestTokenRingBuffer:
+    """Test suite for the lock-free token ring buffer."""
+
+    def test_drain_preserves_order_across_wraparound(self):
+        ring = TokenRingBuffer(max_size=4)
+        drained = []
+        for i in range(30):
+            ring.enqueue(_batch("a" if i % 2 else "b", float(i), token_count=i))
+            if i % 3 == 2:
+                drained.extend(ring.drain())
+        drained.extend(ring.drain())
+
+        assert [b.token_count for b in drained] == list(range(30))
+        assert [b.stream_id for b in drained] == ["a" if i % 2 else "b" for i in range(30)]
+        assert ring.size() == 0
+        assert ring.overflow_count == 0 and ring.merge_count == 0
+
+    def test_drain_records_respects_max_items(self):
+        ring = TokenRingBuffer(max_size=10)
+        for i in range(6):
+            ring.enqueue(_batch("a", float(i), token_count=i))
+
+        records = ring.drain_records(max_items=4)
+        assert records.token_count.tolist() == [0, 1, 2, 3]
+        assert ring.size() == 2
+        assert ring.drain_records().token_count.tolist() == [4, 5]
+
+    def test_overflow_merges_same_stream_batches(self):
+        ring = TokenRingBuffer(max_size=2)
+        ring.enqueue(_batch("a", 0.00, token_count=2, complexity=1.0, speed=10.0))
+        ring.enqueue(_batch("a", 0.01, token_count=2, complexity=1.0, speed=10.0, metadata={"x": 1}))
+        ring.enqueue(_batch("a", 0.02, token_count=6, complexity=3.0, speed=40.0, metadata={"y": 2}))
+
+        assert ring.merge_count == 1
+        assert ring.size() == 2
+
+        batches = ring.drain()
+        assert [b.token_count for b in batches] == [2, 8]
+        assert batches[1].complexity == pytest.approx(2.5)
+        assert batches[1].speed == 40.0
+        assert batches[1].timestamp == 0.02
+        assert batches[1].metadata == {"x": 1, "y": 2}
+
+    def test_overflow_drops_oldest_without_merge(self):
+        ring = TokenRingBuffer(max_size=2)
+        ring.enqueue(_batch("a", 0.0, token_count=1))
+        ring.enqueue(_batch("b", 0.0, token_count=2))
+        ring.enqueue(_batch("a", 0.0, token_count=3))
+
+        assert ring.overflow_count == 1
+        assert ring.size() == 2
+        assert [b.token_count for b in ring.drain()] == [2, 3]
+
+    def test_stalled_consumer_keeps_newest_batches(self):
+        ring = TokenRingBuffer(max_size=1000)
+        for i in range(5000):
+            ring.enqueue(_batch(f"s{i % 3}", i * 0.001, token_count=i))
+
+        assert ring.overwrite_count == 3000
+        assert ring.overflow_count == 4000
+        assert ring.size() == 1000
+        assert [b.token_count for b in ring.drain()] == list(range(4000, 5000))
+        assert ring.size() == 0
+
+        ring.enqueue(_batch("s0", 10.0, token_count=7))
+        assert [b.token_count for b in ring.drain()] == [7]
+
+    def test_overwrite_keeps_merge_records_of_surviving_batch(self):
+        ring = TokenRingBuffer(max_size=2)
+        ring.enqueue(_batch("b", 0.00, token_count=1))
+        for i in range(4):
+            ring.enqueue(_batch("a", 0.01 * (i + 1), token_count=10))
+
+        assert ring.merge_count == 3 and ring.overwrite_count == 1
+        assert [b.token_count for b in ring.drain()] == [40]
+
+    def test_concurrent_producer_and_consumer_conserve_tokens(self):
+        ring = TokenRingBuffer(max_size=64)
+        total_batches = 20_000
+        drained = []
+        done = threading.Event()
+
+        def produce():
+            for i in range(total_batches):
+                while ring._head - ring._tail >= ring.capacity:
+                    pass  # Wait for the consumer instead of overwriting
+                ring.push(i * 0.001, f"s{(i // 8) % 4}", "m", 1, 1.0, 10.0)
+            done.set()
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while not done.is_set() or ring.size():
+            drained.append(int(ring.drain_records().token_count.sum()))
+        producer.join()
+        drained.append(int(ring.drain_records().token_count.sum()))
+
+        # Merged batches keep their tokens; only dropped batches lose them
+        assert ring.overwrite_count == 0
+        assert sum(drained) + ring.dropped_tokens == total_batches
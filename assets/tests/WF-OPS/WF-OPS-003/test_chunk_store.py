@@ -0,0 +1,134 @@
+import hashlib
+import io
+import random
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'code' / 'WF-OPS' / 'WF-OPS-003'))
+
+import chunk_store  # noqa: E402
+from chunk_store import CODEC_RAW, ChunkStore, ContentChunker  # noqa: E402
+
+
+def _random_bytes(size, seed=3):
+    return random.Random(seed).randbytes(size)
+
+
+def _small_chunker():
+    return ContentChunker(min_size=256, avg_size=1024, max_size=4096)
+
+
+def test_split_covers_stream_within_size_bounds():
+    data = _random_bytes(200_000)
+    chunker = _small_chunker()
+    chunks = list(chunker.split(io.BytesIO(data), read_size=5000))
+    assert b"".join(chunks) == data
+    assert all(len(c) <= chunker.max_size for c in chunks)
+    assert all(len(c) > chunker.min_size for c in chunks[:-1])
+    assert 100 < len(chunks) < 800
+
+
+def test_boundaries_do_not_depend_on_read_size():
+    data = _random_bytes(100_000)
+    chunker = _small_chunker()
+    whole = list(chunker.split(io.BytesIO(data), read_size=len(data)))
+    streamed = list(chunker.split(io.BytesIO(data), read_size=4097))
+    assert whole == streamed
+
+
+def test_insert_only_changes_nearby_chunks():
+    data = _random_bytes(300_000)
+    edited = data[:50_000] + b"inserted row" + data[50_000:]
+    chunker = _small_chunker()
+    before = set(chunker.split(io.BytesIO(data)))
+    after = list(chunker.split(io.BytesIO(edited)))
+    changed = [c for c in after if c not in before]
+    assert len(changed) <= 3
+    assert sum(map(len, changed)) < 3 * chunker.max_size
+
+
+def test_pure_python_matches_numpy_cut_points(monkeypatch):
+    pytest.importorskip("numpy")
+    data = _random_bytes(50_000)
+    chunker = _small_chunker()
+    vectorized = chunker.cut_points(data, True)
+    monkeypatch.setattr(chunk_store, "np", None)
+    assert chunker.cut_points(data, True) == vectorized
+
+
+def test_put_stream_deduplicates_and_round_trips(tmp_path):
+    store = ChunkStore(tmp_path, compression="zlib", chunker=_small_chunker())
+    data = _random_bytes(60_000)
+    file_hash, size, chunks, _ = store.put_stream(io.BytesIO(data))
+    assert file_hash == hashlib.sha256(data).hexdigest()
+    assert size == len(data)
+    written = store.get_stats()["chunks_written"]
+
+    again = store.put_stream(io.BytesIO(data))
+    assert again[2] == chunks
+    assert store.get_stats()["chunks_written"] == written
+    assert b"".join(store.iter_file(chunks)) == data
+    store.close()
+
+
+def test_compresses_only_when_it_helps(tmp_path):
+    store = ChunkStore(tmp_path, compression="zlib")
+    _, compressed = store.put(b"log line\n" * 1000)
+    _, raw_compressed = store.put(_random_bytes(4000))
+    assert compressed and not raw_compressed
+    assert store.get_stats()["bytes_written"] < 9000 + 4000
+
+
+def test_index_survives_reopen(tmp_path):
+    store = ChunkStore(tmp_path, compression="none")
+    digest, _ = store.put(b"chunk")
+    store.close()
+    reopened = ChunkStore(tmp_path, compression="none")
+    assert reopened.contains(digest)
+    assert reopened._known[digest] == CODEC_RAW
+    reopened.close()
+
+
+def test_gc_removes_only_unreferenced_chunks(tmp_path):
+    store = ChunkStore(tmp_path, compression="none")
+    kept, _ = store.put(b"kept")
+    released, _ = store.put(b"released")
+    orphan, _ = store.put(b"from a failed backup")
+    store.add_refs([kept, released])
+    store.add_refs([kept])
+    store.release_refs([kept, released])
+
+    result = store.collect_garbage()
+    assert result["chunks_removed"] == 2
+    assert store.contains(kept) and store.get(kept) == b"kept"
+    assert not store.contains(released) and not store.contains(orphan)
+    assert not store._object_path(orphan).exists()
+    store.close()
+
+
+def test_corrupt_chunk_is_detected(tmp_path):
+    store = ChunkStore(tmp_path, compression="none")
+    digest, _ = store.put(b"payload")
+    path = store._object_path(digest)
+    path.write_bytes(path.read_bytes()[:-1] + b"!")
+    with pytest.raises(ValueError):
+        store.get(digest)
+    store.close()
+
+
+def test_concurrent_puts_of_same_chunk_write_once(tmp_path):
+    store = ChunkStore(tmp_path, compression="zlib")
+    data = _random_bytes(100_000)
+    digests = []
+    threads = [threading.Thread(target=lambda: digests.append(store.put(data)[0])) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(digests)) == 1
+    stats = store.get_stats()
+    assert stats["chunks_written"] == 1 and stats["chunks_deduplicated"] == 7
+    store.close()
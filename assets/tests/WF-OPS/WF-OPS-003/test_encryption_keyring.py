@@ -0,0 +1,137 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-OPS' / 'WF-OPS-003'
+MODULE_PATH = CODE_DIR / 'encryption-helper.py'
+
+spec = importlib.util.spec_from_file_location('encryption_helper', MODULE_PATH)
+assert spec and spec.loader
+encryption_helper = importlib.util.module_from_spec(spec)
+sys.modules['encryption_helper'] = encryption_helper
+spec.loader.exec_module(encryption_helper)  # type: ignore
+
+EncryptionConfig = encryption_helper.EncryptionConfig
+EncryptionHelper = encryption_helper.EncryptionHelper
+KeyRing = encryption_helper.KeyRing
+KeyringEntry = encryption_helper.KeyringEntry
+
+PASSWORD = "correct horse"
+
+
+def _helper(**overrides):
+    config = dict(iterations=1000, min_iterations=1000, segment_size=1024)
+    config.update(overrides)
+    return EncryptionHelper(EncryptionConfig(**config))
+
+
+def _count_pbkdf2(monkeypatch, helper):
+    calls = []
+    original = helper.derive_key
+
+    def counting(password, salt, iterations=None):
+        calls.append(salt)
+        return original(password, salt, iterations)
+
+    monkeypatch.setattr(helper, "derive_key", counting)
+    return calls
+
+
+def test_export_session_derives_master_once(monkeypatch):
+    helper = _helper()
+    calls = _count_pbkdf2(monkeypatch, helper)
+    exports = [helper.encrypt_content(b"file %d" % i * 100, PASSWORD) for i in range(5)]
+    assert len(calls) == 1
+
+    metas = [meta for _, meta in exports]
+    assert len({m.master_salt for m in metas}) == 1
+    assert len({m.salt for m in metas}) == 5
+    assert all(m.key_derivation == encryption_helper.HIERARCHICAL_KEY_DERIVATION for m in metas)
+
+    reader = _helper()
+    reader_calls = _count_pbkdf2(monkeypatch, reader)
+    for i, (data, meta) in enumerate(exports):
+        assert reader.decrypt_content(data, meta, PASSWORD) == b"file %d" % i * 100
+    assert len(reader_calls) == 1
+
+
+def test_cached_master_does_not_bypass_password():
+    helper = _helper()
+    data, meta = helper.encrypt_content(b"secret", PASSWORD)
+    with pytest.raises(ValueError):
+        helper.decrypt_content(data, meta, "wrong password")
+    assert helper.decrypt_content(data, meta, PASSWORD) == b"secret"
+
+    # A different password starts a new session instead of reusing the master
+    _, other = helper.encrypt_content(b"secret", "another password")
+    assert other.master_salt != meta.master_salt
+
+
+def test_end_export_session_rotates_master(monkeypatch):
+    helper = _helper()
+    _, first = helper.encrypt_content(b"a", PASSWORD)
+    helper.end_export_session()
+    _, second = helper.encrypt_content(b"b", PASSWORD)
+    assert first.master_salt != second.master_salt
+
+
+def test_backup_export_uses_one_session(tmp_path, monkeypatch):
+    helper = _helper()
+    calls = _count_pbkdf2(monkeypatch, helper)
+    files = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.bin"
+        path.write_bytes(b"x" * (i + 1) * 700)
+        files.append({"path": str(path)})
+    manifest = helper.encrypt_backup_export({"files": files}, {"password": PASSWORD})
+    assert len(calls) == 1
+    assert helper.keyring.get(("encrypt",)) is None
+    assert len({f["encryption_metadata"]["master_salt"] for f in manifest["files"]}) == 1
+
+    out = tmp_path / "restored.bin"
+    assert helper.decrypt_file(Path(manifest["files"][2]["encrypted_path"]), out, PASSWORD)
+    assert out.read_bytes() == b"x" * 2100
+
+
+def test_keyring_expires_and_zeroizes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(encryption_helper.time, "monotonic", lambda: now[0])
+    ring = KeyRing(ttl_seconds=10)
+    ring.put(("k",), KeyringEntry(bytearray(b"\x01" * 32), b"salt", 1000, b"v"))
+    stored = ring._entries[("k",)].key
+
+    copy = ring.get(("k",))
+    assert copy.key == stored and copy.key is not stored
+
+    now[0] += 11
+    assert ring.get(("k",)) is None
+    assert stored == bytearray(32)
+    assert copy.key == bytearray(b"\x01" * 32)  # Callers' copies are unaffected
+
+
+def test_keyring_discard_and_clear_zeroize():
+    ring = KeyRing()
+    ring.put(("a",), KeyringEntry(bytearray(b"\x02" * 32), b"", 1, b""))
+    ring.put(("b",), KeyringEntry(bytearray(b"\x03" * 32), b"", 1, b""))
+    a, b = ring._entries[("a",)].key, ring._entries[("b",)].key
+    ring.discard(("a",))
+    assert a == bytearray(32) and len(ring) == 1
+    ring.clear()
+    assert b == bytearray(32) and len(ring) == 0
+
+
+def test_calibrate_kdf_respects_floor():
+    helper = _helper(min_iterations=5000)
+    result = helper.calibrate_kdf(target_ms=1000, probe_iterations=2000)
+    assert result["calibrated_iterations"] > 5000
+    assert helper.config.iterations == result["calibrated_iterations"]
+
+    result = helper.calibrate_kdf(target_ms=0.001, probe_iterations=2000)
+    assert helper.config.iterations == 5000
+
+    _, meta = helper.encrypt_content(b"data", PASSWORD)
+    assert meta.iterations == 5000
@@ -0,0 +1,122 @@
+import hashlib
+import importlib.util
+import json
+import secrets
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-OPS' / 'WF-OPS-003'
+MODULE_PATH = CODE_DIR / 'encryption-helper.py'
+
+spec = importlib.util.spec_from_file_location('encryption_helper', MODULE_PATH)
+assert spec and spec.loader
+encryption_helper = importlib.util.module_from_spec(spec)
+sys.modules['encryption_helper'] = encryption_helper
+spec.loader.exec_module(encryption_helper)  # type: ignore
+
+EncryptionConfig = encryption_helper.EncryptionConfig
+EncryptionHelper = encryption_helper.EncryptionHelper
+EncryptionMetadata = encryption_helper.EncryptionMetadata
+STREAM_HEADER = encryption_helper.STREAM_HEADER
+
+SEGMENT = 1024
+SEALED = SEGMENT + 16
+PASSWORD = "correct horse"
+
+
+@pytest.fixture
+def helper():
+    return EncryptionHelper(EncryptionConfig(iterations=1000, segment_size=SEGMENT, verify_workers=3))
+
+
+def _encrypt(helper, tmp_path, content):
+    source = tmp_path / "data.bin"
+    source.write_bytes(content)
+    encrypted = tmp_path / "data.bin.enc"
+    metadata = helper.encrypt_file(source, encrypted, PASSWORD)
+    return encrypted, metadata
+
+
+@pytest.mark.parametrize("size", [0, 100, SEGMENT, 3 * SEGMENT, 5 * SEGMENT + 7])
+def test_file_round_trip(helper, tmp_path, size):
+    content = secrets.token_bytes(size)
+    encrypted, metadata = _encrypt(helper, tmp_path, content)
+    segments = max(1, -(-size // SEGMENT))
+    assert encrypted.stat().st_size == STREAM_HEADER.size + size + 16 * segments
+    assert metadata.content_hash == hashlib.sha256(content).hexdigest()
+
+    output = tmp_path / "restored.bin"
+    assert helper.decrypt_file(encrypted, output, PASSWORD)
+    assert output.read_bytes() == content
+
+
+def test_truncation_at_segment_boundary_is_rejected(helper, tmp_path):
+    encrypted, metadata = _encrypt(helper, tmp_path, secrets.token_bytes(3 * SEGMENT + 5))
+    data = encrypted.read_bytes()
+    truncated = data[:STREAM_HEADER.size + 3 * SEALED]
+    with pytest.raises(ValueError, match="segment 2"):
+        helper.decrypt_content(truncated, metadata, PASSWORD)
+
+
+def test_reordered_segments_are_rejected(helper, tmp_path):
+    encrypted, metadata = _encrypt(helper, tmp_path, secrets.token_bytes(3 * SEGMENT))
+    data = encrypted.read_bytes()
+    h = STREAM_HEADER.size
+    swapped = data[:h] + data[h + SEALED:h + 2 * SEALED] + data[h:h + SEALED] + data[h + 2 * SEALED:]
+    with pytest.raises(ValueError, match="segment 0"):
+        helper.decrypt_content(swapped, metadata, PASSWORD)
+
+
+def test_failed_decrypt_leaves_no_output(helper, tmp_path):
+    encrypted, _ = _encrypt(helper, tmp_path, secrets.token_bytes(2 * SEGMENT))
+    output = tmp_path / "restored.bin"
+    with pytest.raises(ValueError):
+        helper.decrypt_file(encrypted, output, "wrong password")
+    assert not output.exists()
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_parallel_segment_verification(helper, tmp_path):
+    encrypted, _ = _encrypt(helper, tmp_path, secrets.token_bytes(10 * SEGMENT + 1))
+    assert helper.verify_encryption_integrity(encrypted)
+    assert helper.verify_encryption_integrity(encrypted, PASSWORD)
+    assert not helper.verify_encryption_integrity(encrypted, "wrong password")
+
+    data = bytearray(encrypted.read_bytes())
+    data[STREAM_HEADER.size + 7 * SEALED + 3] ^= 1
+    encrypted.write_bytes(bytes(data))
+    assert not helper.verify_encryption_integrity(encrypted)
+    assert not helper.verify_encryption_integrity(encrypted, PASSWORD)
+
+
+def test_content_api_and_single_shot_exports(helper, tmp_path):
+    content = b"backup export" * 500
+    encrypted, metadata = helper.encrypt_content(content, PASSWORD)
+    assert metadata.format == encryption_helper.STREAM_FORMAT
+    assert helper.decrypt_content(encrypted, metadata, PASSWORD) == content
+
+    # Exports written before segmented streams: one GCM message plus tag
+    salt, nonce = secrets.token_bytes(32), secrets.token_bytes(12)
+    key = helper.derive_key(PASSWORD, salt)
+    sealed = encryption_helper.AESGCM(key).encrypt(nonce, content, None)
+    legacy = EncryptionMetadata(
+        algorithm="AES-256-GCM", key_derivation="PBKDF2-SHA256", iterations=1000,
+        salt=salt.hex(), nonce=nonce.hex(), tag=sealed[-16:].hex(),
+        content_hash=hashlib.sha256(content).hexdigest(),
+        encrypted_hash=hashlib.sha256(sealed).hexdigest(),
+        timestamp="", user_consent=True, export_purpose="backup_export")
+    assert helper.decrypt_content(sealed, legacy, PASSWORD) == content
+
+    path = tmp_path / "legacy.enc"
+    path.write_bytes(sealed)
+    meta = asdict(legacy)
+    for key_name in ("format", "segment_size", "content_size"):
+        del meta[key_name]
+    (tmp_path / "legacy.enc.meta").write_text(json.dumps(meta))
+    assert helper.decrypt_file(path, tmp_path / "legacy.out", PASSWORD)
+    assert (tmp_path / "legacy.out").read_bytes() == content
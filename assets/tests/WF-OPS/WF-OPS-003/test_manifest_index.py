@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'code' / 'WF-OPS' / 'WF-OPS-003'))
+
+from manifest_index import (  # noqa: E402
+    INDEX_FILENAME, RACY_WINDOW_NS, IndexEntry, ManifestIndex, trusted_mtime_ns
+)
+
+
+def _item(path, sha256, size=10, mtime_ns=1_000, inode=7):
+    return {"path": path, "size": size, "sha256": sha256, "mtime_ns": mtime_ns, "inode": inode}
+
+
+def _write_manifest(root, backup_id, strategy, items, parent=None):
+    backup_dir = root / backup_id
+    backup_dir.mkdir(parents=True)
+    manifest = {"backup_id": backup_id, "strategy": strategy, "items": items,
+                "dependencies": {"parent_backup_id": parent} if parent else {}}
+    (backup_dir / "manifest.json").write_text(json.dumps(manifest))
+    return backup_dir
+
+
+def _chain(root):
+    _write_manifest(root, "full", "full", [_item("a", "a0"), _item("b", "b0")])
+    _write_manifest(root, "inc1", "incremental", [_item("b", "b1")], parent="full")
+    _write_manifest(root, "inc2", "incremental", [_item("c", "c2")], parent="inc1")
+
+
+def test_load_merges_chain_nearest_first(tmp_path):
+    _chain(tmp_path)
+    index = ManifestIndex.load(tmp_path, "inc2")
+    assert index.base_backup_id == "full"
+    assert {p: (e.sha256, e.backup_id) for p, e in index.entries.items()} == {
+        "a": ("a0", "full"), "b": ("b1", "inc1"), "c": ("c2", "inc2")}
+
+
+def test_missing_backup_gives_empty_index(tmp_path):
+    index = ManifestIndex.load(tmp_path, "gone")
+    assert len(index) == 0 and index.base_backup_id == "gone"
+
+
+def test_persisted_index_replaces_chain_walk(tmp_path):
+    _chain(tmp_path)
+    ManifestIndex.load(tmp_path, "inc2").save(tmp_path / "inc2")
+    for backup_id in ("full", "inc1"):
+        (tmp_path / backup_id / "manifest.json").unlink()
+
+    index = ManifestIndex.load(tmp_path, "inc2")
+    assert index.base_backup_id == "full"
+    assert index.get("a") == IndexEntry(10, 1_000, 7, "a0", "full")
+    assert index.get("c").backup_id == "inc2"
+
+
+def test_walk_stops_at_ancestor_with_persisted_index(tmp_path):
+    _chain(tmp_path)
+    ManifestIndex.load(tmp_path, "inc1").save(tmp_path / "inc1")
+    (tmp_path / "full" / "manifest.json").unlink()
+    index = ManifestIndex.load(tmp_path, "inc2")
+    assert set(index.entries) == {"a", "b", "c"}
+
+
+def test_extend_builds_next_backup_index(tmp_path):
+    _chain(tmp_path)
+    parent = ManifestIndex.load(tmp_path, "inc2")
+    new = [SimpleNamespace(path="a", size=11, mtime_ns=2_000, inode=7, sha256="a3")]
+    extended = parent.extend("inc3", new)
+    assert extended.base_backup_id == "full"
+    assert extended.get("a").backup_id == "inc3" and extended.get("b").sha256 == "b1"
+
+    restarted = parent.extend("full2", new, full=True)
+    assert restarted.base_backup_id == "full2" and set(restarted.entries) == {"a"}
+
+
+def test_metadata_match_and_racy_mtime(tmp_path):
+    path = tmp_path / "f"
+    path.write_bytes(b"data")
+    old = time.time_ns() - 10 * RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+    stat = path.stat()
+
+    assert trusted_mtime_ns(stat) == old
+    entry = IndexEntry(stat.st_size, trusted_mtime_ns(stat), stat.st_ino, "x", "b")
+    assert ManifestIndex.metadata_matches(entry, stat)
+    assert not ManifestIndex.metadata_matches(entry._replace(size=5), stat)
+
+    os.utime(path, None)
+    assert trusted_mtime_ns(path.stat()) == 0
+    assert not ManifestIndex.metadata_matches(entry._replace(mtime_ns=0), stat)
+
+
+def test_save_is_compact_and_round_trips(tmp_path):
+    index = ManifestIndex("inc", "full", {"a": IndexEntry(1, 2, 3, "h", "inc"),
+                                          "b": IndexEntry(4, 5, 6, "g", "full")})
+    index.save(tmp_path)
+    data = json.loads((tmp_path / INDEX_FILENAME).read_text())
+    assert data["entries"]["a"][-1] is None
+    assert ManifestIndex._read_persisted(tmp_path / INDEX_FILENAME).entries == index.entries
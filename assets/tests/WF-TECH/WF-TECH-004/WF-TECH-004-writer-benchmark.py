@@ -0,0 +1,152 @@
+"""
+WF-TECH-004 Event Writer Benchmark
+Sustained event throughput and frame-loop stall for the StateManager writer
+
+Compares the previous writer (one db.execute per event, committed on the
+asyncio loop thread every batch) against the EventWriter thread in SQLite
+mode (WAL, synchronous=NORMAL, adaptive executemany) and in event log mode.
+
+Author: WIRTHFORGE Development Team
+Version: 1.0
+License: MIT
+"""
+
+import importlib.util
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-004'
+MODULE_PATH = CODE_DIR / 'WF-TECH-004-snapshot-recovery.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_004_snapshot_recovery', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_004_snapshot_recovery = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_004_snapshot_recovery'] = wf_tech_004_snapshot_recovery
+spec.loader.exec_module(wf_tech_004_snapshot_recovery)  # type: ignore
+
+EventLog = wf_tech_004_snapshot_recovery.EventLog
+EventWriter = wf_tech_004_snapshot_recovery.EventWriter
+
+EVENT_COUNT = 20000
+EVENTS_PER_FRAME = 12
+
+SCHEMA = """
+    CREATE TABLE session (
+        session_id TEXT PRIMARY KEY,
+        total_energy REAL NOT NULL DEFAULT 0.0,
+        total_events INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE event (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        type TEXT NOT NULL,
+        data TEXT NOT NULL,
+        frame_id INTEGER,
+        energy_delta REAL
+    );
+    CREATE INDEX idx_event_session_timestamp ON event(session_id, timestamp);
+    INSERT INTO session (session_id) VALUES ('bench');
+"""
+
+
+def make_frames() -> List[List[Dict[str, Any]]]:
+    """energy.update events grouped per 60Hz frame"""
+    events = [
+        {
+            'session_id': 'bench',
+            'timestamp': f"2025-01-01T00:00:{i / 1000:09.3f}Z",
+            'type': 'energy.update',
+            'data': {'energy': i * 0.1, 'accumulator': i * 1.0, 'fps': 60.0},
+            'frame_id': i,
+            'energy_delta': 0.1
+        }
+        for i in range(EVENT_COUNT)
+    ]
+    return [events[i:i + EVENTS_PER_FRAME] for i in range(0, EVENT_COUNT, EVENTS_PER_FRAME)]
+
+
+def create_db(directory: Path) -> Path:
+    db_path = directory / 'bench.db'
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(SCHEMA)
+    return db_path
+
+
+def measure_legacy(frames: List[List[Dict[str, Any]]], directory: Path) -> Dict[str, float]:
+    """Previous path: per-event execute and commit, blocking the caller"""
+    db = sqlite3.connect(str(create_db(directory)))
+    worst_stall = 0.0
+    start = time.perf_counter()
+    for frame in frames:
+        frame_start = time.perf_counter()
+        db.execute("BEGIN TRANSACTION")
+        for event in frame:
+            db.execute(EventWriter.INSERT_EVENT_SQL, (
+                event['session_id'], event['timestamp'], event['type'],
+                json.dumps(event['data']), event.get('frame_id'), event.get('energy_delta')
+            ))
+        db.execute("COMMIT")
+        worst_stall = max(worst_stall, time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return {'events_per_s': EVENT_COUNT / elapsed, 'worst_stall_ms': worst_stall * 1000}
+
+
+def measure_writer(frames: List[List[Dict[str, Any]]], directory: Path, use_log: bool) -> Dict[str, float]:
+    """EventWriter thread: the caller only pays for submit()"""
+    db_path = create_db(directory)
+    event_log = EventLog(directory / 'events') if use_log else None
+    writer = EventWriter(db_path, event_log)
+    writer.start()
+
+    worst_stall = 0.0
+    start = time.perf_counter()
+    for frame in frames:
+        frame_start = time.perf_counter()
+        writer.submit(frame)
+        worst_stall = max(worst_stall, time.perf_counter() - frame_start)
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    writer.stop()
+    if event_log:
+        event_log.close()
+
+    metrics = writer.get_metrics()
+    return {
+        'events_per_s': EVENT_COUNT / elapsed,
+        'worst_stall_ms': worst_stall * 1000,
+        'batches': metrics['batches_written'],
+        'avg_commit_ms': metrics['avg_commit_ms']
+    }
+
+
+def main():
+    """Print writer throughput table"""
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'legacy').mkdir()
+        (root / 'sqlite').mkdir()
+        (root / 'log').mkdir()
+        results = [
+            ('legacy execute', measure_legacy(frames, root / 'legacy')),
+            ('writer sqlite', measure_writer(frames, root / 'sqlite', use_log=False)),
+            ('writer log', measure_writer(frames, root / 'log', use_log=True)),
+        ]
+
+    baseline = results[0][1]['events_per_s']
+    print(f"WF-TECH-004 event writer, {EVENT_COUNT} events in frames of {EVENTS_PER_FRAME}")
+    print(f"{'mode':<16} {'events/s':>10} {'speedup':>8} {'stall ms':>9} {'batches':>8}")
+    for name, row in results:
+        print(f"{name:<16} {row['events_per_s']:>10.0f} {row['events_per_s'] / baseline:>7.1f}x "
+              f"{row['worst_stall_ms']:>9.3f} {row.get('batches', len(frames)):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Load StateManager module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-004'
+MODULE_PATH = CODE_DIR / 'WF-TECH-004-snapshot-recovery.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_004_snapshot_recovery', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_004_snapshot_recovery = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_004_snapshot_recovery'] = wf_tech_004_snapshot_recovery
+spec.loader.exec_module(wf_tech_004_snapshot_recovery)  # type: ignore
+
+SessionEventLog = getattr(wf_tech_004_snapshot_recovery, 'SessionEventLog')
+StateManager = getattr(wf_tech_004_snapshot_recovery, 'StateManager')
+
+
+def _energy_event(i, session_id="s1"):
+    return {
+        "session_id": session_id,
+        "timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}Z",
+        "type": "energy.update",
+        "data": {"energy": i * 0.5, "accumulator": i * 1.0},
+        "frame_id": i,
+        "energy_delta": 0.5,
+    }
+
+
+def test_event_log_round_trip_across_segments(tmp_path: Path):
+    log = SessionEventLog(tmp_path / "s1", segment_max_bytes=512, fsync_policy="never")
+    for start in range(0, 100, 10):
+        log.write_batch([_energy_event(i) for i in range(start, start + 10)])
+    log.close()
+
+    assert len(list((tmp_path / "s1").glob("*.seg"))) > 1
+
+    reopened = SessionEventLog(tmp_path / "s1")
+    assert reopened.next_seq == 101
+    events = reopened.read_after("2025-01-01T00:01:00Z")
+    assert [e["frame_id"] for e in events] == list(range(61, 100))
+    assert events[0]["event_id"] == 62
+    assert events[0]["data"] == {"energy": 30.5, "accumulator": 61.0}
+    assert events[0]["type"] == "energy.update"
+
+
+def test_event_log_truncates_torn_tail_and_rebuilds_index(tmp_path: Path):
+    log = SessionEventLog(tmp_path / "s1", fsync_policy="always")
+    log.write_batch([_energy_event(i) for i in range(5)])
+    log.write_batch([_energy_event(i) for i in range(5, 10)])
+    log.close()
+
+    segment = next((tmp_path / "s1").glob("*.seg"))
+    index = segment.with_suffix(".idx")
+    index.write_bytes(b"")  # Index lost entirely
+    with open(segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")  # Torn block from a crash
+
+    reopened = SessionEventLog(tmp_path / "s1")
+    assert len(reopened.segments[1]) == 2
+    assert reopened.next_seq == 11
+    reopened.write_batch([_energy_event(10)])
+    assert [e["frame_id"] for e in reopened.read_after(None)] == list(range(11))
+
+
+def test_read_only_open_stops_at_torn_tail_without_truncating(tmp_path: Path):
+    log = SessionEventLog(tmp_path / "s1", fsync_policy="always")
+    log.write_batch([_energy_event(i) for i in range(5)])
+    log.close()
+
+    segment = next((tmp_path / "s1").glob("*.seg"))
+    index = segment.with_suffix(".idx")
+    with open(segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+    segment_bytes, index_bytes = segment.read_bytes(), index.read_bytes()
+
+    reader = SessionEventLog(tmp_path / "s1", read_only=True)
+    assert [e["frame_id"] for e in reader.read_after(None)] == list(range(5))
+    with pytest.raises(RuntimeError):
+        reader.write_batch([_energy_event(5)])
+    reader.close()
+    assert segment.read_bytes() == segment_bytes and index.read_bytes() == index_bytes
+
+    assert not SessionEventLog(tmp_path / "missing", read_only=True).segments
+    assert not (tmp_path / "missing").exists()
+
+
+@pytest.mark.asyncio
+async def test_recovery_replays_events_from_log(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE session (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                start_time TEXT NOT NULL,
+                end_time TEXT NULL,
+                total_energy REAL NOT NULL DEFAULT 0.0,
+                total_events INTEGER NOT NULL DEFAULT 0,
+                clean_shutdown BOOLEAN NOT NULL DEFAULT TRUE
+            );
+            CREATE TABLE snapshot (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                snapshot_type TEXT,
+                state TEXT NOT NULL,
+                last_event_id INTEGER NULL,
+                energy_accumulator REAL,
+                frame_count INTEGER,
+                schema_version TEXT
+            );
+            """
+        )
+        state = {
+            "frame_state": {"frame_id": 0, "timestamp": "2025-01-01T00:00:00Z", "energy_current": 0.0},
+            "energy_accumulator": {"total_energy": 0.0, "session_start": "2025-01-01T00:00:00Z",
+                                   "frame_count": 0},
+            "session_context": {"session_id": "s1", "user_id": "u1", "hardware_tier": "mid"},
+        }
+        conn.execute("INSERT INTO session (session_id, start_time, clean_shutdown) "
+                     "VALUES ('s1', '2025-01-01T00:00:00Z', FALSE)")
+        conn.execute("INSERT INTO snapshot (session_id, timestamp, state, schema_version) "
+                     "VALUES ('s1', '2025-01-01T00:00:29Z', ?, '1.0.0')", (json.dumps(state),))
+
+    writer = StateManager(db_path=str(db_path), event_store="log")
+    assert await writer.initialize() is True
+    for i in range(60):
+        writer.event_queue.put_nowait(_energy_event(i))
+    await writer.shutdown()
+    with sqlite3.connect(str(db_path)) as conn:
+        assert conn.execute("SELECT total_events FROM session").fetchone()[0] == 60
+
+    m = StateManager(db_path=str(db_path), event_store="log")
+    assert await m.initialize() is True
+    assert m.current_state.frame_state.frame_id == 59
+    assert m.current_state.energy_accumulator.total_energy == 59.0
+    assert m.current_state.recovery_context["last_event_id"] == 60
+    await m.shutdown()
+
+
+def test_sqlite_event_table_is_default(tmp_path: Path):
+    # The validator and backup CLI still read the event table
+    m = StateManager(db_path=str(tmp_path / "wf_state.db"))
+    assert m.event_store == "sqlite" and m.event_log is None
+    assert not (tmp_path / "wf_state.events").exists()
@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Load StateManager module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-004'
+MODULE_PATH = CODE_DIR / 'WF-TECH-004-snapshot-recovery.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_004_snapshot_recovery', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_004_snapshot_recovery = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_004_snapshot_recovery'] = wf_tech_004_snapshot_recovery
+spec.loader.exec_module(wf_tech_004_snapshot_recovery)  # type: ignore
+
+EventWriter = getattr(wf_tech_004_snapshot_recovery, 'EventWriter')
+
+
+def _create_event_table(db_path: Path):
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE event (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                frame_id INTEGER,
+                energy_delta REAL
+            );
+            """
+        )
+
+
+def test_writer_thread_batches_backlog_with_executemany(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_event_table(db_path)
+
+    writer = EventWriter(db_path, group_commit_ms=5.0)
+    # Build a backlog before the thread starts so batching has to adapt
+    for start in range(0, 6000, 12):
+        writer.submit([
+            {"session_id": "s1", "timestamp": f"t{i:06d}", "type": "energy.update",
+             "data": {"energy": i}, "frame_id": i, "energy_delta": 0.1}
+            for i in range(start, start + 12)
+        ])
+    assert writer.queue_depth == 6000
+
+    writer.start()
+    assert writer.flush(timeout=10.0) is True
+    writer.stop()
+
+    metrics = writer.get_metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["events_written"] == 6000
+    assert metrics["max_batch_size"] == writer.max_batch
+    assert metrics["batches_written"] < 6000 // 12
+
+    with sqlite3.connect(str(db_path)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        rows = conn.execute("SELECT frame_id FROM event ORDER BY event_id").fetchall()
+    assert [row[0] for row in rows] == list(range(6000))
+
+
+def test_writer_counts_failed_batches(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"  # No event table: every insert fails
+    writer = EventWriter(db_path)
+    writer.start()
+    writer.submit([{"session_id": "s1", "timestamp": "t", "type": "x", "data": {}}])
+    assert writer.flush(timeout=5.0) is True
+    writer.stop()
+    assert writer.get_metrics()["write_errors"] == 1
+
+
+class _SlowLog:
+    """Event log stand-in whose writes outlast the stop timeout"""
+
+    def __init__(self):
+        self.closed_by = None
+        self.writing = False
+
+    def write_batch(self, events):
+        self.writing = True
+        time.sleep(0.3)
+        self.writing = False
+        return {}
+
+    def close(self):
+        assert not self.writing
+        self.closed_by = threading.current_thread().name
+
+
+def test_stop_timeout_leaves_log_open_until_writer_drains(tmp_path: Path):
+    log = _SlowLog()
+    writer = EventWriter(tmp_path / "wf_state.db", event_log=log)
+    writer.start()
+    writer.submit([{"session_id": "s1", "timestamp": "t", "type": "x", "data": {}}])
+
+    assert writer.stop(timeout=0.05) is False
+    assert log.closed_by is None
+
+    assert writer.stop(timeout=5.0) is True
+    assert log.closed_by == "state-event-writer"
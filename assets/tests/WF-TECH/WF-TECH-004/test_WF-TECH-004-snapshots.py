@@ -0,0 +1,223 @@
+import json
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+# Load StateManager module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-004'
+MODULE_PATH = CODE_DIR / 'WF-TECH-004-snapshot-recovery.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_004_snapshot_recovery', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_004_snapshot_recovery = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_004_snapshot_recovery'] = wf_tech_004_snapshot_recovery
+spec.loader.exec_module(wf_tech_004_snapshot_recovery)  # type: ignore
+
+StateManager = getattr(wf_tech_004_snapshot_recovery, 'StateManager')
+StateSnapshot = getattr(wf_tech_004_snapshot_recovery, 'StateSnapshot')
+FrameState = getattr(wf_tech_004_snapshot_recovery, 'FrameState')
+EnergyAccumulator = getattr(wf_tech_004_snapshot_recovery, 'EnergyAccumulator')
+SessionContext = getattr(wf_tech_004_snapshot_recovery, 'SessionContext')
+
+
+def _create_db(db_path: Path):
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE session (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                start_time TEXT NOT NULL,
+                end_time TEXT NULL,
+                total_energy REAL NOT NULL DEFAULT 0.0,
+                total_events INTEGER NOT NULL DEFAULT 0,
+                clean_shutdown BOOLEAN NOT NULL DEFAULT TRUE
+            );
+            CREATE TABLE snapshot (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                snapshot_type TEXT,
+                state BLOB NOT NULL,
+                last_event_id INTEGER NULL,
+                energy_accumulator REAL,
+                frame_count INTEGER,
+                schema_version TEXT
+            );
+            INSERT INTO session (session_id, start_time, clean_shutdown)
+            VALUES ('s1', '2025-01-01T00:00:00Z', FALSE);
+            """
+        )
+
+
+def _state():
+    return StateSnapshot(
+        frame_state=FrameState(frame_id=0, timestamp="2025-01-01T00:00:00Z", energy_current=0.0),
+        energy_accumulator=EnergyAccumulator(total_energy=0.0, session_start="2025-01-01T00:00:00Z",
+                                             frame_count=0),
+        session_context=SessionContext(session_id="s1", user_id="u1", hardware_tier="mid")
+    )
+
+
+def _advance(state, step):
+    state.frame_state.frame_id = step * 60
+    state.frame_state.energy_current = step * 0.5
+    state.energy_accumulator.total_energy += 1.5
+    state.energy_accumulator.frame_count = step * 60
+    state.energy_accumulator.energy_peaks.append({"frame_id": step * 60, "energy": step * 0.5})
+    state.energy_accumulator.model_contributions.setdefault("m1", {"energy": 0.0})["energy"] += 1.5
+
+
+@pytest.mark.asyncio
+async def test_periodic_snapshots_store_deltas_and_recover(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_db(db_path)
+
+    m = StateManager(db_path=str(db_path), event_store="log", full_snapshot_interval=4)
+    m.db = sqlite3.connect(str(db_path))
+    m.current_state = _state()
+    for i in range(300):  # Long session: many peaks already recorded
+        m.current_state.energy_accumulator.energy_peaks.append(
+            {"frame_id": i * 97, "energy": i * 0.731, "timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}Z"}
+        )
+
+    sizes = []
+    for step in range(1, 8):
+        _advance(m.current_state, step)
+        assert await m.create_snapshot("s1") is not None
+        sizes.append(len(m.db.execute("SELECT state FROM snapshot ORDER BY snapshot_id DESC").fetchone()[0]))
+    expected = asdict(m.current_state)
+    m.db.close()
+
+    # Bases at snapshots 1 and 6, deltas in between stay small
+    assert sizes[0] > 4 * max(sizes[1:5])
+    assert sizes[5] > 4 * sizes[6]
+
+    recovered = StateManager(db_path=str(db_path), event_store="log")
+    recovered.db = sqlite3.connect(str(db_path))
+    assert await recovered.recover_from_crash("s1") is True
+    restored = asdict(recovered.current_state)
+    for section in ("frame_state", "energy_accumulator", "session_context"):
+        assert restored[section] == expected[section]
+    assert recovered.current_state.recovery_context["last_snapshot_id"] == 7
+    recovered.db.close()
+
+
+@pytest.mark.asyncio
+async def test_broken_delta_chain_falls_back_to_last_good_snapshot(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_db(db_path)
+
+    m = StateManager(db_path=str(db_path), event_store="log")
+    m.db = sqlite3.connect(str(db_path))
+    m.current_state = _state()
+    for step in range(1, 5):
+        _advance(m.current_state, step)
+        await m.create_snapshot("s1")
+    m.db.execute("DELETE FROM snapshot WHERE snapshot_id = 3")
+    m.db.commit()
+    m.db.close()
+
+    recovered = StateManager(db_path=str(db_path), event_store="log")
+    recovered.db = sqlite3.connect(str(db_path))
+    assert await recovered.recover_from_crash("s1") is True
+    assert recovered.current_state.frame_state.frame_id == 120
+    assert recovered.current_state.recovery_context["last_snapshot_id"] == 2
+    recovered.db.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_snapshot_still_recovers(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_db(db_path)
+    state = asdict(_state())
+    state["frame_state"]["frame_id"] = 42
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("INSERT INTO snapshot (session_id, timestamp, state, schema_version) "
+                     "VALUES ('s1', '2025-01-01T00:00:10Z', ?, '1.0.0')", (json.dumps(state),))
+
+    m = StateManager(db_path=str(db_path), event_store="log")
+    m.db = sqlite3.connect(str(db_path))
+    assert await m.recover_from_crash("s1") is True
+    assert m.current_state.frame_state.frame_id == 42
+    m.db.close()
+
+
+@pytest.mark.asyncio
+async def test_initialize_migrates_json_checked_snapshot_table(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    state = asdict(_state())
+    state["frame_state"]["frame_id"] = 42
+    with sqlite3.connect(str(db_path)) as conn:
+        # Snapshot table as created by schema 1.0.0
+        conn.executescript(
+            """
+            CREATE TABLE session (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                start_time TEXT NOT NULL,
+                end_time TEXT NULL,
+                total_energy REAL NOT NULL DEFAULT 0.0,
+                total_events INTEGER NOT NULL DEFAULT 0,
+                clean_shutdown BOOLEAN NOT NULL DEFAULT TRUE
+            );
+            CREATE TABLE event (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                frame_id INTEGER NULL,
+                energy_delta REAL NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshot (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                snapshot_type TEXT NOT NULL DEFAULT 'periodic' CHECK (snapshot_type IN ('periodic', 'session_end', 'migration', 'manual')),
+                state TEXT NOT NULL, -- JSON blob of serialized state
+                last_event_id INTEGER NULL,
+                energy_accumulator REAL NOT NULL DEFAULT 0.0,
+                frame_count INTEGER NOT NULL DEFAULT 0,
+                schema_version INTEGER NOT NULL DEFAULT 1,
+                created_at TEXT NOT NULL DEFAULT (datetime('now', 'utc')),
+
+                FOREIGN KEY (session_id) REFERENCES session(session_id) ON DELETE CASCADE,
+                FOREIGN KEY (last_event_id) REFERENCES event(event_id) ON DELETE SET NULL,
+
+                -- Validate JSON structure
+                CHECK (json_valid(state))
+            );
+            CREATE INDEX idx_snapshot_session_id ON snapshot(session_id);
+            CREATE TABLE schema_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            INSERT INTO schema_info (key, value) VALUES ('version', '1.0.0');
+            INSERT INTO session (session_id, start_time, clean_shutdown)
+            VALUES ('s1', '2025-01-01T00:00:00Z', FALSE);
+            """
+        )
+        conn.execute("INSERT INTO snapshot (session_id, timestamp, state, schema_version) "
+                     "VALUES ('s1', '2025-01-01T00:00:10Z', ?, '1.0.0')", (json.dumps(state),))
+
+    m = StateManager(db_path=str(db_path), full_snapshot_interval=4)
+    assert await m.initialize() is True
+    assert m.current_state.frame_state.frame_id == 42
+
+    table_sql = m.db.execute("SELECT sql FROM sqlite_master WHERE name = 'snapshot'").fetchone()[0]
+    assert "json_valid" not in table_sql and "state BLOB" in table_sql
+    assert m.db.execute("SELECT value FROM schema_info WHERE key = 'version'").fetchone()[0] == "1.1.0"
+    assert m.db.execute("SELECT name FROM sqlite_master WHERE name = 'idx_snapshot_session_id'").fetchone()
+
+    _advance(m.current_state, 3)
+    assert await m.create_snapshot("s1") is not None
+    _advance(m.current_state, 4)
+    assert await m.create_snapshot("s1") is not None
+    await m.shutdown()
+
+    recovered = StateManager(db_path=str(db_path))
+    recovered.db = sqlite3.connect(str(db_path))
+    assert await recovered.recover_from_crash("s1") is True
+    assert recovered.current_state.frame_state.frame_id == 240
+    recovered.db.close()
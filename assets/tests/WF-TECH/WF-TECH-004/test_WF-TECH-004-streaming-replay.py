@@ -0,0 +1,140 @@
+import json
+import sqlite3
+from pathlib import Path
+
+# Load replay and StateManager modules by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-004'
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, CODE_DIR / filename)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+wf_tech_004_replay = _load('wf_tech_004_replay', 'WF-TECH-004-replay.py')
+wf_tech_004_snapshot_recovery = _load('wf_tech_004_snapshot_recovery', 'WF-TECH-004-snapshot-recovery.py')
+
+EventReplayer = getattr(wf_tech_004_replay, 'EventReplayer')
+replay_sessions_parallel = getattr(wf_tech_004_replay, 'replay_sessions_parallel')
+SessionEventLog = getattr(wf_tech_004_snapshot_recovery, 'SessionEventLog')
+
+
+def _events(count):
+    """energy.update per frame with a token event in between frames"""
+    events = []
+    accumulator = 0.0
+    for i in range(count):
+        accumulator += 0.5
+        events.append({"timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}.000Z",
+                       "type": "energy.update", "frame_id": i, "energy_delta": 0.5,
+                       "data": {"energy": 0.5, "accumulator": accumulator, "model_id": "m1", "fps": 60}})
+        events.append({"timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}.500Z",
+                       "type": "ai.output", "frame_id": None, "energy_delta": None,
+                       "data": {"model_id": "m1", "token_index": i}})
+    return events
+
+
+def _create_db(db_path: Path, sessions):
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE session (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                start_time TEXT NOT NULL,
+                end_time TEXT NULL,
+                total_energy REAL NOT NULL DEFAULT 0.0,
+                total_events INTEGER NOT NULL DEFAULT 0,
+                clean_shutdown BOOLEAN NOT NULL DEFAULT TRUE
+            );
+            CREATE TABLE event (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                frame_id INTEGER,
+                energy_delta REAL
+            );
+            CREATE INDEX idx_event_session_timestamp ON event(session_id, timestamp);
+            CREATE INDEX idx_event_frame_id ON event(frame_id);
+            """
+        )
+        for session_id, events in sessions.items():
+            conn.execute("INSERT INTO session (session_id, start_time) VALUES (?, ?)",
+                         (session_id, events[0]["timestamp"]))
+            conn.executemany(
+                "INSERT INTO event (session_id, timestamp, type, data, frame_id, energy_delta) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, e["timestamp"], e["type"], json.dumps(e["data"]), e["frame_id"],
+                  e["energy_delta"]) for e in events]
+            )
+
+
+def test_streaming_replay_matches_full_replay(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_db(db_path, {"s1": _events(500)})
+
+    full = EventReplayer(str(db_path))
+    assert full.load_events_from_db("s1") is True
+    expected = full.run_replay()
+
+    streamed = EventReplayer(str(db_path))
+    summary = streamed.run_streaming_replay(streamed.iter_events_from_db("s1", chunk_size=64))
+
+    assert streamed.replay_log == []
+    assert summary["replay_statistics"]["total_events"] == 1000
+    for key in ("errors", "warnings"):
+        assert summary["replay_statistics"][key] == expected["replay_statistics"][key]
+    assert summary["event_type_distribution"] == expected["event_type_distribution"]
+    assert summary["final_state"] == expected["final_state"]
+    assert summary["validation_passed"] is True
+    assert len(summary["replay_log"]) == 50
+    assert summary["replay_log"][0]["state_before"] is None
+
+
+def test_frame_range_seek_includes_events_between_frames(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    events = _events(300)
+    _create_db(db_path, {"s1": events})
+
+    r = EventReplayer(str(db_path))
+    window = list(r.iter_events_from_db("s1", start_frame=100, end_frame=119, chunk_size=7))
+    assert [e["frame_id"] for e in window if e["frame_id"] is not None] == list(range(100, 120))
+    assert len(window) == 39  # 20 frames and the 19 token events between them
+
+    by_time = list(r.iter_events_from_db("s1", start_time=events[10]["timestamp"],
+                                         end_time=events[13]["timestamp"]))
+    assert [e["timestamp"] for e in by_time] == [e["timestamp"] for e in events[10:14]]
+
+    # Same window from the binary event log
+    log = SessionEventLog(tmp_path / "events" / "s1", segment_max_bytes=2048, fsync_policy="never")
+    for start in range(0, len(events), 25):
+        log.write_batch(events[start:start + 25])
+    log.close()
+    from_log = list(r.iter_events_from_log(str(tmp_path / "events"), "s1", start_frame=100, end_frame=119))
+    assert [(e["timestamp"], e["type"]) for e in from_log] == [(e["timestamp"], e["type"]) for e in window]
+
+    # Replay must not repair a log a writer may still be appending to
+    segment = max((tmp_path / "events" / "s1").glob("*.seg"))
+    with open(segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+    size = segment.stat().st_size
+    assert len(list(r.iter_events_from_log(str(tmp_path / "events"), "s1"))) == len(events)
+    assert segment.stat().st_size == size
+
+
+def test_parallel_session_replay(tmp_path: Path):
+    db_path = tmp_path / "wf_state.db"
+    _create_db(db_path, {"a": _events(200), "b": _events(100), "c": _events(50)})
+
+    summaries = replay_sessions_parallel(["a", "b", "c", "missing"], db_path=str(db_path), workers=2)
+    assert list(summaries) == ["a", "b", "c", "missing"]
+    assert [summaries[s]["replay_statistics"]["total_events"] for s in "abc"] == [400, 200, 100]
+    assert all(summaries[s]["validation_passed"] for s in "abc")
+    assert summaries["missing"] == {"error": "No events to replay"}
@@ -0,0 +1,137 @@
+"""
+WF-TECH-005 Broadcast Fan-out Benchmark
+CPU cost of DecipherWebSocketServer.broadcast_event versus connection count
+
+Compares the serialize-once broadcast path against per-connection encoding
+(the behaviour of sending the same event dict to every connection) for a
+representative 60Hz energy.update frame.
+
+Author: WIRTHFORGE Development Team
+Version: 1.0
+License: MIT
+"""
+
+import asyncio
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-005'
+MODULE_PATH = CODE_DIR / 'WF-TECH-005-websocket-integration.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_005_websocket_integration', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_005_websocket_integration = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_005_websocket_integration'] = wf_tech_005_websocket_integration
+spec.loader.exec_module(wf_tech_005_websocket_integration)  # type: ignore
+
+DecipherWebSocketServer = wf_tech_005_websocket_integration.DecipherWebSocketServer
+WebSocketConfig = wf_tech_005_websocket_integration.WebSocketConfig
+WebSocketConnection = wf_tech_005_websocket_integration.WebSocketConnection
+
+CONNECTION_COUNTS = [1, 10, 50, 100, 200, 500]
+EVENTS_PER_RUN = 120  # Two seconds of frames at 60Hz
+
+
+class NullWebSocket:
+    """WebSocket stand-in that accepts and discards messages"""
+
+    remote_address = ('127.0.0.1', 0)
+
+    async def send(self, message):
+        return None
+
+
+def make_energy_event(frame_id: int) -> Dict[str, Any]:
+    """Build a representative energy.update frame"""
+    return {
+        'id': f"energy_{frame_id}",
+        'type': 'energy.update',
+        'timestamp': int(time.time() * 1000),
+        'payload': {
+            'frame_id': frame_id,
+            'new_tokens': 4,
+            'energy_generated': 1.5,
+            'total_energy': frame_id * 1.5,
+            'energy_rate': 90.0,
+            'state': 'FLOWING',
+            'queue_depth': 5,
+            'processing_time_ms': 12.3,
+            'particles': [
+                {'x': i * 0.1, 'y': i * 0.2, 'vx': 0.5, 'vy': -0.5, 'life': 1.0, 'color': '#ffd700'}
+                for i in range(32)
+            ]
+        }
+    }
+
+
+async def _drain(connections: List[WebSocketConnection]):
+    """Yield to the loop until every sender task has emptied its queue"""
+    while any(not conn.message_queue.empty() for conn in connections):
+        await asyncio.sleep(0)
+
+
+async def measure(connection_count: int, shared_encoding: bool) -> Dict[str, float]:
+    """Measure CPU time per broadcast event, including the sender tasks"""
+    server = DecipherWebSocketServer(WebSocketConfig(max_connections=connection_count))
+    connections = []
+    for i in range(connection_count):
+        conn = WebSocketConnection(NullWebSocket(), f"bench_{i}")
+        await conn.start()
+        server.connections[conn.connection_id] = conn
+        connections.append(conn)
+
+    events = [make_energy_event(i) for i in range(EVENTS_PER_RUN)]
+
+    start_cpu = time.process_time_ns()
+    for event in events:
+        if shared_encoding:
+            await server.broadcast_event(event)
+        else:
+            await asyncio.gather(*(conn.send_event(event) for conn in connections))
+        await _drain(connections)
+    elapsed_ns = time.process_time_ns() - start_cpu
+
+    for conn in connections:
+        await conn.stop()
+
+    per_event_ms = elapsed_ns / EVENTS_PER_RUN / 1e6
+    return {
+        'connections': connection_count,
+        'cpu_ms_per_event': per_event_ms,
+        'frame_budget_pct': per_event_ms / 16.67 * 100
+    }
+
+
+async def run_benchmark() -> List[Dict[str, Any]]:
+    """Run both broadcast modes across all connection counts"""
+    results = []
+    for count in CONNECTION_COUNTS:
+        per_connection = await measure(count, shared_encoding=False)
+        shared = await measure(count, shared_encoding=True)
+        results.append({
+            'connections': count,
+            'per_connection_ms': per_connection['cpu_ms_per_event'],
+            'shared_ms': shared['cpu_ms_per_event'],
+            'speedup': per_connection['cpu_ms_per_event'] / max(shared['cpu_ms_per_event'], 1e-9),
+            'shared_budget_pct': shared['frame_budget_pct']
+        })
+    return results
+
+
+async def main():
+    """Print broadcast CPU cost table"""
+    results = await run_benchmark()
+
+    print("WF-TECH-005 broadcast fan-out (CPU ms per event)")
+    print(f"{'conns':>6} {'per-conn':>10} {'shared':>10} {'speedup':>8} {'budget%':>8}")
+    for row in results:
+        print(f"{row['connections']:>6} {row['per_connection_ms']:>10.3f} "
+              f"{row['shared_ms']:>10.3f} {row['speedup']:>7.1f}x "
+              f"{row['shared_budget_pct']:>7.1f}%")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
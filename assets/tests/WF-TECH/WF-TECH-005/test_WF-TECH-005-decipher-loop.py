@@ -0,0 +1,95 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+# Load Decipher loop module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-005'
+MODULE_PATH = CODE_DIR / 'WF-TECH-005-decipher-loop.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_005_decipher_loop', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_005_decipher_loop = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_005_decipher_loop'] = wf_tech_005_decipher_loop
+spec.loader.exec_module(wf_tech_005_decipher_loop)  # type: ignore
+
+DecipherLoop = getattr(wf_tech_005_decipher_loop, 'DecipherLoop')
+DecipherConfig = getattr(wf_tech_005_decipher_loop, 'DecipherConfig')
+TokenData = getattr(wf_tech_005_decipher_loop, 'TokenData')
+TokenIntake = getattr(wf_tech_005_decipher_loop, 'TokenIntake')
+
+
+def _tokens(model_id, count, timestamp=0.0):
+    return [TokenData(f"{model_id}-{i}", timestamp, model_id) for i in range(count)]
+
+
+def test_intake_shares_frame_quota_across_models():
+    intake = TokenIntake(max_backlog=100)
+    intake.put(_tokens("a", 12) + _tokens("b", 2) + _tokens("c", 5))
+
+    first = intake.take(9)
+    assert [t.content for t in first] == ["a-0", "a-1", "a-2", "b-0", "b-1", "c-0", "c-1", "c-2", "a-3"]
+    assert intake.backlog == 10
+
+    # Whatever fits is swapped out whole, in per-model arrival order
+    rest = intake.take(10)
+    assert [t.content for t in rest] == [f"a-{i}" for i in range(4, 12)] + ["c-3", "c-4"]
+    assert intake.backlog == 0 and intake.take(10) == []
+    assert all(buffer == [] for buffer in intake.buffers.values())
+
+
+def test_intake_backlog_limit_and_age_metrics():
+    intake = TokenIntake(max_backlog=5)
+    assert intake.put(_tokens("a", 3, timestamp=10.0)) == 3
+    assert intake.put(_tokens("b", 4, timestamp=10.5)) == 2
+    intake.take(2)
+
+    stats = intake.get_stats(now=11.0)
+    assert (stats["backlog"], stats["ingested"], stats["dropped"]) == (3, 5, 2)
+    assert stats["models"]["a"] == {"backlog": 2, "oldest_age_ms": 1000.0}
+    assert stats["models"]["b"] == {"backlog": 1, "oldest_age_ms": 500.0}
+
+
+def test_wakeup_fires_when_backlog_crosses_threshold():
+    intake = TokenIntake(max_backlog=100, wake_threshold=8)
+    intake.put(_tokens("a", 5))
+    assert not intake.wakeup.is_set()
+    intake.put(_tokens("b", 5))
+    assert intake.wakeup.is_set()
+
+    intake.wakeup.clear()
+    intake.put(_tokens("a", 5))  # Still above the threshold: no new wakeup
+    assert not intake.wakeup.is_set()
+    intake.take(100)
+    intake.put(_tokens("a", 9))
+    assert intake.wakeup.is_set() and intake.wakeups == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_wakes_loop_before_deadline():
+    decipher = DecipherLoop(DecipherConfig(target_fps=2, max_tokens_per_frame=50,
+                                           intake_wake_threshold=20, enable_particle_effects=False))
+    frames = []
+
+    async def capture(event):
+        if event["type"] == "energy.update":
+            frames.append((time.perf_counter(), event["payload"]["new_tokens"]))
+
+    decipher.add_event_callback(capture)
+    decipher.current_state = wf_tech_005_decipher_loop.EnergyState.CHARGING
+    loop_task = asyncio.create_task(decipher.start_loop())
+    await asyncio.sleep(0.05)  # First frame runs at the start of the grid
+
+    sent = time.perf_counter()
+    assert await decipher.ingest_tokens(_tokens("a", 15, time.time()) + _tokens("b", 15, time.time())) == 30
+    while len(frames) < 2:
+        await asyncio.sleep(0.005)
+    await decipher.stop_loop()
+    loop_task.cancel()
+
+    assert frames[1][1] == 30
+    assert frames[1][0] - sent < 0.2  # Well before the 500ms deadline
+    assert decipher.current_state.value == "FLOWING"
+    assert decipher.get_timing_report()["early_wakeups"] == 1
@@ -0,0 +1,134 @@
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+# Load energy mapper module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-005'
+MODULE_PATH = CODE_DIR / 'WF-TECH-005-energy-mapper.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_005_energy_mapper', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_005_energy_mapper = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_005_energy_mapper'] = wf_tech_005_energy_mapper
+spec.loader.exec_module(wf_tech_005_energy_mapper)  # type: ignore
+
+EnergyMapper = wf_tech_005_energy_mapper.EnergyMapper
+TokenMetrics = wf_tech_005_energy_mapper.TokenMetrics
+TokenType = wf_tech_005_energy_mapper.TokenType
+
+
+def _random_tokens(seed: int, count: int):
+    rng = random.Random(seed)
+    models = ["llama", "mistral", "phi"]
+    timestamp = 1_700_000_000.0
+    tokens = []
+    for i in range(count):
+        timestamp += rng.choice([0.0, 0.01, 0.03, 0.08, 0.2, 0.7, 1.6])
+        logprobs = None
+        if rng.random() < 0.3:
+            logprobs = {"top_logprobs": [{"logprob": -rng.random() * 4} for _ in range(rng.randint(0, 5))]}
+        tokens.append(TokenMetrics(
+            content="x" * rng.randint(1, 12),
+            timestamp=timestamp,
+            model_id=rng.choice(models),
+            token_length=rng.randint(1, 12),
+            confidence=rng.choice([None, rng.random()]),
+            logprobs=logprobs,
+            generation_velocity=rng.choice([None, None, rng.uniform(0.01, 40.0)]),
+            position_in_sequence=i,
+            total_sequence_length=rng.choice([None, count]),
+            token_type=rng.choice(list(TokenType)),
+        ))
+    return tokens
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vectorized_batch_matches_scalar_path(seed):
+    scalar = EnergyMapper({"enable_caching": False, "enable_vectorized_batch": False})
+    vectorized = EnergyMapper({"enable_caching": False, "vectorized_batch_min_size": 1})
+
+    for chunk in range(3):  # Histories must carry over between frames
+        expected = scalar.batch_calculate_energy(_random_tokens(seed * 10 + chunk, 400))
+        actual = vectorized.batch_calculate_energy(_random_tokens(seed * 10 + chunk, 400))
+        assert actual == expected
+
+    for model_id, history in scalar.model_histories.items():
+        assert list(vectorized.model_histories[model_id]) == list(history)
+
+
+def test_vectorized_batch_matches_scalar_path_with_caching():
+    scalar = EnergyMapper({"enable_vectorized_batch": False})
+    vectorized = EnergyMapper({"vectorized_batch_min_size": 1})
+
+    for chunk in range(3):
+        expected = scalar.batch_calculate_energy(_random_tokens(40 + chunk, 300))
+        actual = vectorized.batch_calculate_energy(_random_tokens(40 + chunk, 300))
+        assert actual == expected
+
+    assert scalar.cache_hits > 0
+    scalar_stats = scalar.get_performance_stats()
+    vectorized_stats = vectorized.get_performance_stats()
+    for key in ("cache_hits", "cache_misses", "cache_size", "cache_bytes", "cache_by_model"):
+        assert vectorized_stats[key] == scalar_stats[key]
+    for model_id, history in scalar.model_histories.items():
+        assert list(vectorized.model_histories[model_id]) == list(history)
+
+
+def test_columns_without_optional_fields():
+    mapper = EnergyMapper()
+    tokens = _random_tokens(7, 50)
+    columns = mapper.build_token_columns(tokens)
+    columns.time_since_last = None
+    columns.generation_velocity = None
+    columns.has_logprobs = None
+
+    batch = mapper.calculate_energy_columns(columns)
+    assert len(batch) == 50
+    assert all(math.isfinite(value) for value in batch.total_energy.tolist())
+
+
+def _token(model_id: str, length: int, time_since_last: float = 0.0) -> "TokenMetrics":
+    return TokenMetrics(
+        content="x" * length,
+        timestamp=1_700_000_000.0,
+        model_id=model_id,
+        token_length=length,
+        confidence=0.9,
+        time_since_last=time_since_last,
+        generation_velocity=10.0,
+    )
+
+
+def test_cache_evicts_least_recently_used_within_byte_budget():
+    mapper = EnergyMapper()
+    mapper.calculate_energy(_token("a", 1))
+    entry_bytes = mapper.calculation_cache.current_bytes
+    mapper = EnergyMapper({"cache_max_bytes": entry_bytes * 2})
+
+    mapper.calculate_energy(_token("a", 1))
+    mapper.calculate_energy(_token("a", 2))
+    mapper.calculate_energy(_token("a", 1))  # Refresh length 1
+    mapper.calculate_energy(_token("b", 3))  # Evicts length 2
+    mapper.calculate_energy(_token("a", 1))
+    mapper.calculate_energy(_token("a", 2))  # Evicts model b's entry
+
+    stats = mapper.get_performance_stats()
+    assert stats["cache_size"] == 2
+    assert stats["cache_bytes"] <= stats["cache_max_bytes"]
+    assert stats["cache_evictions"] == 2
+    assert stats["cache_by_model"]["a"] == {"hits": 2, "misses": 3, "evictions": 1, "hit_rate": 0.4}
+    assert stats["cache_by_model"]["b"] == {"hits": 0, "misses": 1, "evictions": 1, "hit_rate": 0.0}
+
+
+def test_cache_time_buckets_are_configurable():
+    fine = EnergyMapper({"cache_time_bucket_ms": 1.0})
+    coarse = EnergyMapper({"cache_time_bucket_ms": 100.0})
+    for mapper in (fine, coarse):
+        mapper.calculate_energy(_token("a", 4, time_since_last=0.010))
+        mapper.calculate_energy(_token("a", 4, time_since_last=0.030))
+
+    assert fine.cache_hits == 0
+    assert coarse.cache_hits == 1
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+# Load frame composer module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-005'
+MODULE_PATH = CODE_DIR / 'WF-TECH-005-frame-composer.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_005_frame_composer', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_005_frame_composer = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_005_frame_composer'] = wf_tech_005_frame_composer
+spec.loader.exec_module(wf_tech_005_frame_composer)  # type: ignore
+
+FrameComposer = wf_tech_005_frame_composer.FrameComposer
+SchemaJsonEncoder = wf_tech_005_frame_composer.SchemaJsonEncoder
+PerformanceMetrics = wf_tech_005_frame_composer.PerformanceMetrics
+ObjectPool = wf_tech_005_frame_composer.ObjectPool
+ParticleBuffer = wf_tech_005_frame_composer.ParticleBuffer
+add_particle_burst = wf_tech_005_frame_composer.add_particle_burst
+create_particle_burst = wf_tech_005_frame_composer.create_particle_burst
+create_interference_pattern = wf_tech_005_frame_composer.create_interference_pattern
+create_resonance_pattern = wf_tech_005_frame_composer.create_resonance_pattern
+
+
+async def _capture_events(config=None):
+    composer = FrameComposer({"enable_object_pooling": False, "event_encoder": "generic", **(config or {})})
+    events = []
+    composer.add_event_callback(lambda data: events.append(json.loads(data)))
+    await composer.emit_session_start("s1", {"fps": 60})
+    await composer.emit_energy_update(1, 1_700_000_000.0, 2, 1.5, 10.5, 3.2, "FLOWING",
+                                      particles=create_particle_burst(1.5, "m1", 4),
+                                      interference=create_interference_pattern(["a", "b"], 0.7),
+                                      performance=PerformanceMetrics(frame_time_ms=3.3, queue_depth=4))
+    await composer.emit_energy_update(2, 1_700_000_000.0, 0, 0.0, 10.5, float("nan"), "IDLE")
+    await composer.emit_token_event('café "quoted"\n', "m1", 1.25, None, 7, True)
+    await composer.emit_token_event("tok", "m1", 0.5, 0.875, 8)
+    await composer.emit_interference_event(create_interference_pattern(["a", "b", "c"], 0.2, "destructive"))
+    await composer.emit_resonance_event(create_resonance_pattern(0.9, 2.5))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_schema_encoder_matches_json_dumps():
+    encoder = SchemaJsonEncoder()
+    generic = encoder._encode
+    fallbacks = []
+    encoder._encode = lambda event: fallbacks.append(event["type"]) or generic(event)
+
+    events = await _capture_events()
+    debug_events = await _capture_events({"include_debug_info": True})
+    for event in events + debug_events:
+        assert encoder.encode(event) == json.dumps(event, separators=(',', ':'))
+    # Templates for the fixed types; session.start, the NaN frame and debug events fall back
+    assert fallbacks[:2] == ["session.start", "energy.update"]
+    assert len(fallbacks) == 2 + len(debug_events)
+
+
+@pytest.mark.asyncio
+async def test_event_ids_are_monotonic_per_session():
+    events = await _capture_events()
+    assert [e["id"] for e in events] == [f"s1:{i}" for i in range(1, len(events) + 1)]
+
+
+@pytest.mark.asyncio
+async def test_wire_formats_are_encoded_once_and_negotiated():
+    msgpack = pytest.importorskip("msgpack")
+    composer = FrameComposer()
+    received = {"json": [], "msgpack": []}
+    wire_format = composer.negotiate_wire_format(["cbor", "msgpack", "json"])
+    assert wire_format == "msgpack"
+    composer.add_event_callback(received["json"].append)
+    composer.add_event_callback(received["json"].append)
+    composer.add_event_callback(received["msgpack"].append, wire_format)
+
+    assert await composer.emit_token_event("tok", "m1", 0.5, 0.9, 1) is True
+    assert received["json"][0] is received["json"][1]
+    assert msgpack.unpackb(received["msgpack"][0]) == json.loads(received["json"][0])
+
+    by_type = composer.get_performance_stats()["serialization_by_type"]
+    assert by_type["json"]["experience.token"]["count"] == 1
+    assert by_type["msgpack"]["experience.token"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_is_bounded_by_budget():
+    composer = FrameComposer({"callback_budget_ms": 20.0})
+    release = asyncio.Event()
+    fast, slow = [], []
+
+    async def fast_callback(data):
+        fast.append(data)
+
+    async def slow_callback(data):
+        await release.wait()
+        slow.append(data)
+
+    composer.add_event_callback(fast_callback)
+    composer.add_event_callback(slow_callback)
+
+    start = time.perf_counter()
+    assert await composer.emit_heartbeat() is False
+    assert time.perf_counter() - start < 0.5
+    assert await composer.emit_heartbeat() is False  # Slow subscriber still busy: skipped
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await composer.emit_heartbeat() is True
+
+    assert len(fast) == 3
+    assert len(slow) == 2
+    callbacks = composer.get_performance_stats()["callbacks"]
+    assert callbacks[1] == {"wire_format": "json", "deliveries": 2, "timeouts": 1, "skipped": 1, "errors": 0}
+    assert composer.dropped_events == 1
+
+
+def test_object_pool_counters_and_bounds():
+    pool = ObjectPool(dict, dict.clear, 2)
+    objs = [pool.acquire() for _ in range(3)]
+    objs[0]["stale"] = True
+    stats = pool.get_stats()
+    assert (stats["hits"], stats["misses"], stats["in_use"], stats["high_water"]) == (2, 1, 3, 3)
+
+    for obj in objs:
+        pool.release(obj)
+    assert (pool.free, pool.in_use, pool.discarded) == (2, 0, 1)
+    assert all(obj == {} for obj in pool._free)
+    with pytest.raises(ValueError):
+        pool.release({})
+
+
+@pytest.mark.asyncio
+async def test_pooled_particles_are_returned_after_emit():
+    composer = FrameComposer({"max_particles_per_frame": 3})
+    events = []
+    composer.add_event_callback(lambda data: events.append(json.loads(data)))
+
+    for frame_id in range(5):
+        await composer.emit_energy_update(frame_id, time.time(), 1, 0.5, 1.0, 0.5, "FLOWING",
+                                          particles=create_particle_burst(1.5, "m1", 5))
+
+    # Payloads were encoded before their dicts went back to the pools
+    assert [len(e["payload"]["particles"]) for e in events] == [3] * 5
+    assert events[-1]["payload"]["particles"][2]["lifetime_ms"] == 300
+    pools = composer.get_performance_stats()["pools"]
+    assert pools["events"]["in_use"] == 0 and pools["events"]["misses"] == 0
+    assert pools["particles"]["in_use"] == 0 and pools["particles"]["high_water"] == 3
+    assert pools["particles"]["hits"] == 15
+
+
+@pytest.mark.asyncio
+async def test_pooled_dicts_are_returned_when_serialization_fails():
+    composer = FrameComposer({"max_particles_per_frame": 5})
+    particles = create_particle_burst(1.5, "m1", 4)
+    particles[2].energy = None
+
+    with pytest.raises(TypeError):
+        await composer.emit_energy_update(1, time.time(), 1, 0.5, 1.0, 0.5, "FLOWING",
+                                          particles=particles)
+    interference = create_interference_pattern(["a", "b"], 0.7)
+    interference.strength = "strong"
+    with pytest.raises(TypeError):
+        await composer.emit_energy_update(2, time.time(), 1, 0.5, 1.0, 0.5, "FLOWING",
+                                          particles=create_particle_burst(1.5, "m1", 4),
+                                          interference=interference)
+
+    pools = composer.get_performance_stats()["pools"]
+    assert pools["events"]["in_use"] == 0
+    assert pools["particles"]["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_particle_buffer_matches_dataclass_particles():
+    composer = FrameComposer({"max_particles_per_frame": 4})
+    events = []
+    composer.add_event_callback(lambda data: events.append(json.loads(data)))
+    particles = create_particle_burst(2.0, "m1", 5)
+    buffer = composer.acquire_particle_buffer()
+    add_particle_burst(buffer, 2.0, "m1", 5)
+    for particle, i in zip(particles, range(buffer.count)):
+        buffer.ids[i] = particle.id  # Same ids regardless of the millisecond clock
+
+    await composer.emit_energy_update(1, 1.0, 1, 2.0, 2.0, 1.0, "FLOWING", particles=particles)
+    await composer.emit_energy_update(1, 1.0, 1, 2.0, 2.0, 1.0, "FLOWING", particles=buffer)
+    composer.release_particle_buffer(buffer)
+    assert events[0]["payload"]["particles"] == events[1]["payload"]["particles"]
+    assert len(events[1]["payload"]["particles"]) == 4
+
+    reused = composer.acquire_particle_buffer()
+    assert reused is buffer and reused.count == 0
+    capacity = reused.capacity
+    for i in range(capacity + 1):  # Grows past the preallocated slots
+        reused.add(f"p{i}", "spark", 0.1, 0.2, lifetime_ms=100, model_id="m2")
+    assert reused.capacity > capacity
+    assert reused.rows()[-1] == {"id": f"p{capacity}", "type": "spark", "energy": 0.1,
+                                 "intensity": 0.2, "lifetime_ms": 100, "model_id": "m2"}
@@ -0,0 +1,104 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Load particle engine and Decipher loop modules by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-005'
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, CODE_DIR / filename)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+particle_engine = _load('particle_engine', 'particle_engine.py')
+wf_tech_005_decipher_loop = _load('wf_tech_005_decipher_loop', 'WF-TECH-005-decipher-loop.py')
+
+ParticleEngine = getattr(particle_engine, 'ParticleEngine')
+unpack_particles = getattr(particle_engine, 'unpack_particles')
+DecipherLoop = getattr(wf_tech_005_decipher_loop, 'DecipherLoop')
+DecipherConfig = getattr(wf_tech_005_decipher_loop, 'DecipherConfig')
+TokenData = getattr(wf_tech_005_decipher_loop, 'TokenData')
+
+
+def test_step_moves_and_culls_expired_particles():
+    engine = ParticleEngine(capacity=16, base_lifetime_ms=100.0, seed=1)
+    # Lifetime is base * (1 + intensity): 100ms and 200ms
+    engine.spawn(["a", "b"], np.array([0.5, 0.5]), np.array([0.0, 1.0]), np.array([0, 1]))
+    first = engine.arrays()["state"]
+
+    engine.step(50.0)
+    moved = engine.arrays()["state"]
+    assert np.allclose(moved[:, 0:2], first[:, 2:4] * 0.05)
+    assert engine.count == 2
+
+    engine.step(60.0)
+    assert engine.count == 1
+    assert engine.arrays()["ids"].tolist() == [1]
+    assert engine.to_dicts()[0]["model_id"] == "b"
+    assert engine.get_stats()["expired"] == 1
+
+
+def test_quality_cap_evicts_oldest_first():
+    engine = ParticleEngine(capacity=100, min_particles=10, seed=2)
+    assert engine.spawn(["m"] * 150, 0.2, 0.4, 0) == 100  # Oversized batch keeps the newest
+    assert engine.arrays()["ids"][0] == 50
+
+    engine.set_quality(0.3)
+    assert (engine.max_particles, engine.count) == (30, 30)
+    assert engine.arrays()["ids"].tolist() == list(range(120, 150))
+
+    engine.set_quality(0.0)
+    assert engine.max_particles == 10
+    engine.spawn(["m"] * 4, 0.2, 0.4, 0)
+    assert engine.count == 10
+    assert engine.get_stats()["evicted"] == 50 + 70 + 20 + 4
+
+
+def test_packed_payload_round_trips():
+    engine = ParticleEngine(capacity=8, seed=3)
+    engine.spawn(["a", "b", "a"], np.array([0.2, 0.7, 1.5]), 0.5, np.array([0, 1, 2]))
+    engine.step(16.0)
+
+    packed = engine.to_packed()
+    decoded = unpack_particles(packed)
+    assert np.array_equal(decoded["state"], engine.arrays()["state"])
+    assert decoded["ids"].tolist() == [0, 1, 2]
+    assert packed["models"] == ["a", "b"]
+    assert [packed["types"][int(t)] for t in decoded["state"][:, -1]] == ["spark", "bolt", "burst"]
+
+
+@pytest.mark.asyncio
+async def test_decipher_loop_emits_packed_particles_under_cap():
+    decipher = DecipherLoop(DecipherConfig(max_particles=40, min_particles=8))
+    events = []
+
+    async def capture(event):
+        events.append(event)
+
+    decipher.add_event_callback(capture)
+    decipher.scheduler.start()
+    for i in range(30):
+        await decipher.ingest_token(TokenData(f"t{i}", time.time(), f"m{i % 2}", 0.9))
+    await decipher._process_frame(time.perf_counter())
+
+    payload = events[-1]["payload"]["particles"]
+    assert payload["count"] == 10  # max_tokens_per_frame
+    assert sorted(payload["models"]) == ["m0", "m1"]
+
+    decipher.degraded_mode = True
+    decipher.config.degradation_queue_threshold = -1  # Stay degraded for the next frame
+    await decipher._process_frame(time.perf_counter())
+    # The cap is applied at the end of the frame and holds for the next one
+    assert decipher.particles.max_particles == 10  # 40 * degraded_particle_quality
+    assert decipher.particles.count == 10
+    await decipher._process_frame(time.perf_counter())
+    assert events[-1]["payload"]["particles"]["count"] == 10
+    assert decipher.get_timing_report()["particles"]["max_particles"] == 10
@@ -0,0 +1,100 @@
+import random
+from pathlib import Path
+
+# Load alert system module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-009'
+MODULE_PATH = CODE_DIR / 'WF-TECH-009-alert-system.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_009_alert_system', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_009_alert_system = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_009_alert_system'] = wf_tech_009_alert_system
+spec.loader.exec_module(wf_tech_009_alert_system)  # type: ignore
+
+AlertEvaluator = getattr(wf_tech_009_alert_system, 'AlertEvaluator')
+AlertRule = getattr(wf_tech_009_alert_system, 'AlertRule')
+
+
+def _rule(name, threshold, operator='greater_than', **kwargs):
+    config = dict(enabled=True, duration_seconds=0, severity='warning', message='{value}',
+                  cooldown_seconds=0, auto_resolve=True, actions=['log_alert'])
+    config.update(kwargs)
+    return AlertRule(name=name, threshold=threshold, operator=operator, **config)
+
+
+def _evaluator(tmp_path, *rules):
+    evaluator = AlertEvaluator(str(tmp_path / "missing.yaml"))
+    for name in list(evaluator.rules):
+        evaluator.remove_rule(name)
+    for rule in rules:
+        evaluator.add_rule(rule)
+    return evaluator
+
+
+def _legacy_match(rule_name, metric_names):
+    """Per-evaluation fuzzy match the compiled index replaces"""
+    rule_parts = rule_name.lower().split('.')
+    candidates = [m for m in metric_names
+                  if any(r in p or p in r for r in rule_parts for p in m.lower().split('.'))]
+    candidates.sort(key=lambda m: len([r for r in rule_parts if any(r in p for p in m.lower().split('.'))]),
+                    reverse=True)
+    return candidates[0] if candidates else None
+
+
+def test_compiled_resolution_matches_fuzzy_match(tmp_path):
+    rng = random.Random(4)
+    words = ["fps", "latency", "p95", "cpu", "memory", "frame", "energy", "queue", "gpu", "disk"]
+    metric_names = list(dict.fromkeys(
+        f"{rng.choice(words)}_{rng.randint(0, 9)}.{rng.choice(words)}{rng.choice(['', '_ms', '_pct'])}"
+        for _ in range(200)
+    ))
+    rule_names = [f"{rng.choice(words)}.{rng.choice(words)}_{rng.randint(0, 12)}" for _ in range(60)]
+    evaluator = _evaluator(tmp_path, *(_rule(name, 1e9) for name in dict.fromkeys(rule_names)))
+
+    evaluator._compile(tuple(metric_names))
+    for name in evaluator.rules:
+        assert evaluator._rule_metric.get(name) == _legacy_match(name, metric_names)
+
+
+def test_only_changed_or_firing_rules_are_evaluated(tmp_path):
+    evaluator = _evaluator(tmp_path,
+                           _rule("frame.fps_low", 45.0, 'less_than'),
+                           _rule("latency.p95_high", 2000.0),
+                           _rule("memory.usage_high", 85.0))
+    metrics = {"frame": {"fps": 60.0}, "latency": {"p95": 900.0}, "memory": {"usage": 50.0}}
+    evaluator.evaluate_metrics(metrics)
+    assert evaluator.engine_stats["last_rules_evaluated"] == 3
+
+    evaluator.evaluate_metrics(metrics)
+    assert evaluator.engine_stats["last_rules_evaluated"] == 0
+
+    metrics["latency"]["p95"] = 2500.0
+    evaluator.evaluate_metrics(metrics)
+    assert [a.rule_name for a in evaluator.get_active_alerts()] == ["latency.p95_high"]
+    # A rule in a met state keeps being evaluated so its alert duration advances
+    evaluator.evaluate_metrics(metrics)
+    assert evaluator.engine_stats["last_rules_evaluated"] == 1
+
+    metrics["latency"]["p95"] = 100.0
+    evaluator.evaluate_metrics(metrics)
+    assert evaluator.get_active_alerts() == []
+    assert evaluator.engine_stats["compilations"] == 1
+
+    metrics["gpu"] = {"usage": 10.0}  # New metric path recompiles
+    evaluator.set_rule_enabled("memory.usage_high", False)
+    evaluator.evaluate_metrics(metrics)
+    assert evaluator.engine_stats["compilations"] == 2
+    assert "memory.usage_high" not in evaluator._rule_metric
+
+
+def test_burst_ring_counts_triggers_inside_window(tmp_path):
+    evaluator = _evaluator(tmp_path, _rule("queue.depth_high", 10.0, burst_threshold=3,
+                                           burst_window_seconds=5.0))
+    results = [evaluator._check_burst_threshold("queue.depth_high", t, 3, 5.0)
+               for t in (0.0, 1.0, 7.0, 8.0, 9.0, 20.0)]
+    assert results == [False, False, False, False, True, False]
+    assert len(evaluator.burst_tracker["queue.depth_high"]) == 3
+
+    evaluator._cleanup_burst_tracking(20.0 + 3601)
+    assert evaluator.burst_tracker == {}
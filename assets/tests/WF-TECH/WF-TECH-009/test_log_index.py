@@ -0,0 +1,111 @@
+import json
+import time
+from pathlib import Path
+
+# Load log management module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-009'
+MODULE_PATH = CODE_DIR / 'WF-TECH-009-log-management.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_009_log_management', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_009_log_management = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_009_log_management'] = wf_tech_009_log_management
+spec.loader.exec_module(wf_tech_009_log_management)  # type: ignore
+
+LogIndex = getattr(wf_tech_009_log_management, 'LogIndex')
+LogAnalyzer = getattr(wf_tech_009_log_management, 'LogAnalyzer')
+LogRotator = getattr(wf_tech_009_log_management, 'LogRotator')
+LogRotationConfig = getattr(wf_tech_009_log_management, 'LogRotationConfig')
+
+
+def _line(timestamp, level="DEBUG", component="engine", message="tick"):
+    return json.dumps({"timestamp": timestamp, "level": level, "component": component,
+                       "message": message, "data": None}) + "\n"
+
+
+def _write(path, lines, mode="a"):
+    with open(path, mode) as f:
+        f.writelines(lines)
+
+
+def test_index_grows_incrementally_and_ignores_partial_lines(tmp_path):
+    log_file = tmp_path / "engine.log"
+    base = 1_700_000_000.0
+    _write(log_file, [_line(base + i) for i in range(100)] + ["not json\n"])
+    index = LogIndex(str(tmp_path))
+    first = index.update(log_file)
+    assert (first["lines"], first["unparsed_lines"]) == (101, 1)
+    offset = first["offset"]
+
+    _write(log_file, [_line(base + 100, "ERROR"), '{"timestamp": 1'])  # Last line still being written
+    second = index.update(log_file)
+    assert second["lines"] == 102
+    assert second["offset"] == offset + len(_line(base + 100, "ERROR"))
+
+    # A fresh instance picks the sidecar up and only parses the completed tail
+    _write(log_file, ["700000200, \"level\": \"INFO\", \"component\": \"engine\"}\n"])
+    reloaded = LogIndex(str(tmp_path))
+    assert reloaded.update(log_file)["lines"] == 103
+    assert reloaded.counts(log_file) == {"engine": {"DEBUG": 100, "ERROR": 1, "INFO": 1}}
+    assert reloaded.counts(log_file, start=base + 90, end=base + 99) == {"engine": {"DEBUG": 10}}
+
+    # A replaced file is reindexed from the start
+    _write(log_file, [_line(base, "WARNING")], mode="w")
+    assert reloaded.update(log_file)["lines"] == 1
+
+
+def test_counts_do_not_double_count_out_of_order_lines(tmp_path):
+    log_file = tmp_path / "engine.log"
+    # 59.95 lands in bucket 0 after a bucket-60 line, so bucket 0's byte range covers it
+    _write(log_file, [_line(ts) for ts in (10, 20, 59.9, 60.1, 59.95, 70, 80)])
+    index = LogIndex(str(tmp_path))
+    assert index.counts(log_file, start=30) == {"engine": {"DEBUG": 5}}
+    assert index.counts(log_file, end=60.05) == {"engine": {"DEBUG": 4}}
+    assert index.counts(log_file) == {"engine": {"DEBUG": 7}}
+
+
+def test_recent_errors_only_reads_matching_buckets(tmp_path):
+    now = time.time()
+    log_file = tmp_path / "engine.log"
+    lines = [_line(now - 3 * 3600 + i) for i in range(3 * 3600)]
+    lines[3 * 3600 - 600] = _line(now - 600, "ERROR", message="recent failure")
+    lines[60] = _line(now - 3 * 3600 + 60, "ERROR", message="old failure")
+    _write(log_file, lines)
+
+    analyzer = LogAnalyzer(str(tmp_path))
+    read = []
+    original = analyzer.index._read_ranges
+    analyzer.index._read_ranges = lambda path, ranges: (read.extend(ranges), original(path, ranges))[1]
+
+    errors = analyzer.recent_errors(minutes=15)
+    assert [entry["message"] for entry in errors] == ["recent failure"]
+    assert sum(last - first for first, last in read) < 2 * 60 * len(lines[0])  # At most two buckets
+
+    analysis = analyzer.analyze_logs(hours_back=1)
+    assert analysis["log_counts"]["engine"]["ERROR"] == 1
+    cutoff = analysis["time_range"]["start"]
+    expected = sum(1 for line in lines if json.loads(line)["timestamp"] >= cutoff) - 1
+    assert analysis["log_counts"]["engine"]["DEBUG"] == expected
+    assert [e["message"] for e in analysis["error_patterns"]] == ["recent failure"]
+
+
+def test_rotation_carries_index_to_compressed_file(tmp_path):
+    base = 1_700_000_000.0
+    log_file = tmp_path / "engine.log"
+    _write(log_file, [_line(base + i, "INFO" if i % 2 else "ERROR") for i in range(50)])
+    index = LogIndex(str(tmp_path))
+    index.update(log_file)
+    _write(log_file, [_line(base + 50, "CRITICAL")])  # Written after the last update
+
+    rotator = LogRotator(LogRotationConfig(compress_rotated=True), index)
+    assert rotator.rotate_log(log_file)
+    rotated = next(tmp_path.glob("engine_*.log.gz"))
+    assert not (index.index_dir / "engine.log.json").exists()
+
+    assert index.counts(rotated) == {"engine": {"ERROR": 25, "INFO": 25, "CRITICAL": 1}}
+    assert [e["level"] for e in index.query(rotated, start=base + 48)] == ["ERROR", "INFO", "CRITICAL"]
+
+    rotated.unlink()
+    assert index.prune() == 1
+    assert list(index.index_dir.glob("*.json")) == []
@@ -0,0 +1,128 @@
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+
+# Load log management module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-009'
+MODULE_PATH = CODE_DIR / 'WF-TECH-009-log-management.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_009_log_management', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_009_log_management = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_009_log_management'] = wf_tech_009_log_management
+spec.loader.exec_module(wf_tech_009_log_management)  # type: ignore
+
+LogSink = getattr(wf_tech_009_log_management, 'LogSink')
+LogSinkConfig = getattr(wf_tech_009_log_management, 'LogSinkConfig')
+LogDurability = getattr(wf_tech_009_log_management, 'LogDurability')
+StructuredLogger = getattr(wf_tech_009_log_management, 'StructuredLogger')
+LogManager = getattr(wf_tech_009_log_management, 'LogManager')
+LogRotationConfig = getattr(wf_tech_009_log_management, 'LogRotationConfig')
+LogEntry = getattr(wf_tech_009_log_management, 'LogEntry')
+LogLevel = getattr(wf_tech_009_log_management, 'LogLevel')
+
+
+def _read(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_logger_writes_json_lines_on_writer_thread(tmp_path):
+    sink = LogSink(LogSinkConfig(durability=LogDurability.FSYNC))
+    logger = StructuredLogger("engine", str(tmp_path), sink)
+    logger.set_context(session_id="s1")
+    logger.debug("frame", {"frame": 1})
+    logger.alert("fps drop", {"fps": 40})
+    assert sink.flush()
+
+    entries = _read(tmp_path / "engine.log")
+    assert [(e["level"], e["message"], e["session_id"]) for e in entries] == \
+        [("DEBUG", "frame", "s1"), ("ALERT", "fps drop", "s1")]
+    stats = sink.get_stats()
+    assert (stats["written"], stats["queue_depth"]) == (2, 0)
+    assert stats["enqueue_p99_us"] > 0
+    sink.stop()
+
+
+def test_overload_policies_per_level(tmp_path):
+    path = tmp_path / "engine.log"
+    sink = LogSink(LogSinkConfig(max_queue=20, high_water_fraction=0.5, sample_every=5))
+
+    def submit(level, message, data=None):
+        sink.submit(path, LogEntry(time.time(), level, "engine", message, data))
+
+    # Sink not started yet, so nothing drains the queue
+    for i in range(10):
+        submit(LogLevel.INFO, "fill", {"i": i})
+    for i in range(10):
+        submit(LogLevel.DEBUG, "noise")
+        submit(LogLevel.INFO, "sampled")
+    for i in range(15):
+        submit(LogLevel.ERROR, "kept until full")
+
+    stats = sink.get_stats()
+    assert stats["queue_depth"] == 20
+    assert stats["dropped"] == {"DEBUG": 10, "ERROR": 7}
+    assert stats["sampled_out"] == {"INFO": 8}
+
+    sink.start()
+    assert sink.flush()
+    levels = [e["level"] for e in _read(tmp_path / "engine.log")]
+    assert levels.count("INFO") == 12 and levels.count("ERROR") == 8
+    sink.stop()
+
+
+def test_writer_reopens_rotated_file(tmp_path):
+    manager = LogManager(str(tmp_path))
+    try:
+        logger = manager.get_logger("engine")
+        logger.info("before rotation")
+        manager.sink.flush()
+        (tmp_path / "engine.log").rename(tmp_path / "engine_old.log")
+        logger.info("after rotation")
+        stats = manager.get_log_statistics()
+        assert stats["components"]["engine"]["line_count"] == 1
+        assert [e["message"] for e in _read(tmp_path / "engine.log")] == ["after rotation"]
+        assert stats["sink"]["written"] == 2
+    finally:
+        manager.close()
+
+
+def test_rotation_loses_no_records_written_concurrently(tmp_path):
+    manager = LogManager(str(tmp_path), LogRotationConfig(compress_rotated=True, max_files=10),
+                         LogSinkConfig(max_queue=10 ** 6))  # Room for everything, so no overload drops
+    logger = manager.get_logger("engine")
+    rotate_at, rotated = threading.Event(), threading.Event()
+    written = []
+
+    def produce():
+        # Keep logging through the rotation and for a while after it
+        i = tail = 0
+        while tail < 5000:
+            logger.warning("line", {"i": i})
+            i += 1
+            if i == 5000:
+                rotate_at.set()
+            if rotated.is_set():
+                tail += 1
+        written.append(i)
+
+    producer = threading.Thread(target=produce)
+    try:
+        producer.start()
+        rotate_at.wait(5)
+        manager.force_rotation("engine")
+        rotated.set()
+        producer.join()
+    finally:
+        manager.close()
+
+    rotated_files = list(tmp_path.glob("engine_*.log.gz"))
+    assert len(rotated_files) == 1
+    with gzip.open(rotated_files[0], 'rt') as f:
+        before = [json.loads(line)["data"]["i"] for line in f]
+    after = [e["data"]["i"] for e in _read(tmp_path / "engine.log")]
+    assert sorted(before + after) == list(range(written[0]))
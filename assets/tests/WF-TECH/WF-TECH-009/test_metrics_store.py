@@ -0,0 +1,171 @@
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+# Load metrics storage module by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-009'
+sys.path.insert(0, str(CODE_DIR))
+MODULE_PATH = CODE_DIR / 'WF-TECH-009-metrics-storage.py'
+
+spec = importlib.util.spec_from_file_location('wf_tech_009_metrics_storage', MODULE_PATH)
+assert spec and spec.loader
+wf_tech_009_metrics_storage = importlib.util.module_from_spec(spec)
+sys.modules['wf_tech_009_metrics_storage'] = wf_tech_009_metrics_storage
+spec.loader.exec_module(wf_tech_009_metrics_storage)  # type: ignore
+
+MetricsStore = getattr(wf_tech_009_metrics_storage, 'MetricsStore')
+MetricsCollector = getattr(wf_tech_009_metrics_storage, 'MetricsCollector')
+MetricsSnapshot = getattr(wf_tech_009_metrics_storage, 'MetricsSnapshot')
+
+RETENTION = {"1s": 2, "1m": 30, "1h": 365}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MetricsStore(tmp_path / "metrics.db", dict(RETENTION))
+    store.start()
+    yield store
+    store.stop()
+
+
+def test_samples_roll_up_into_minute_and_hour_tiers(store):
+    base = (time.time() // 3600 - 1) * 3600  # Start of the previous hour
+    for second in range(180):
+        store.submit_samples("s1", base + second, [("fps", float(second % 60)), ("cpu", 50.0)])
+    # Late sample for an already written bucket is merged, not overwritten
+    store.submit_samples("s1", base + 30.5, [("fps", 100.0)])
+    assert store.flush(timeout=5.0)
+
+    tier, series = store.read_range(base, base + 179, ["fps"], max_points=10)
+    assert tier == "1m" and list(series) == ["fps"]
+    first = series["fps"][0]
+    assert first[0] == base
+    assert (first[1], first[2], first[4]) == (0.0, 100.0, 61)
+    assert first[3] == pytest.approx((sum(range(60)) + 100.0) / 61)
+
+    tier, series = store.read_range(base, base + 3599, ["cpu"], max_points=10)
+    assert tier == "1h"
+    assert series["cpu"] == [(base, 50.0, 50.0, 50.0, 180)]
+
+    tier, series = store.read_range(base, base + 9, session_id="s1")
+    assert tier == "1s" and sorted(series) == ["cpu", "fps"]
+    assert [point[3] for point in series["fps"]] == [float(s) for s in range(10)]
+    assert store.get_metrics()["samples_written"] == 361
+
+
+def test_tier_selection_respects_retention_and_point_budget(store):
+    now = time.time()
+    assert store.select_tier(now - 600, now, now=now)[0] == "1s"
+    assert store.select_tier(now - 86400, now, max_points=1500, now=now)[0] == "1m"
+    assert store.select_tier(now - 5 * 86400, now, now=now)[0] == "1m"  # Raw data already dropped
+    assert store.select_tier(now - 90 * 86400, now, max_points=1500, now=now)[0] == "1h"
+    assert store.select_tier(now - 400 * 86400, now, now=now)[0] == "1h"
+
+
+def test_retention_drops_whole_partitions(store):
+    now = time.time()
+    old, recent = now - 3 * 86400, now - 60
+    store._last_retention = now  # Keep the writer's hourly pass out of the way
+    store.submit_samples("s1", old, [("fps", 1.0)])
+    store.submit_samples("s1", recent, [("fps", 2.0)])
+    assert store.flush(timeout=5.0)
+
+    def tables():
+        rows = store.query("SELECT name FROM sqlite_master WHERE name LIKE 'metrics_1s_%'")
+        return sorted(name for (name,) in rows)
+
+    assert len(tables()) == 2
+    db = sqlite3.connect(store.db_path, isolation_level=None)
+    store._apply_retention(db, now)
+    db.close()
+    assert tables() == [f"metrics_1s_{int(recent // 86400)}"]
+    assert store.metrics["partitions_dropped"] == 1
+    # The rollups of the dropped raw data are still there
+    _, series = store.read_range(old - 60, old + 60, ["fps"], max_points=10)
+    assert [point[3] for point in series["fps"]] == [1.0]
+
+
+def test_collector_history_rebuilds_snapshot_shape(tmp_path):
+    collector = MetricsCollector(db_path=str(tmp_path / "metrics.db"))
+    try:
+        for second in range(3):
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() - 3 + second))
+            collector._store_snapshot(MetricsSnapshot(
+                session_id=collector.session_id,
+                timestamp=timestamp,
+                metrics={"latency": {"p95_latency_ms": 100.0 * second},
+                         "progression_rate": {"progression_velocity": "optimal", "current_level": 1}}
+            ))
+        collector.store.flush(timeout=5.0)
+
+        history = collector.get_metrics_history(hours=0.01, max_points=None)
+        assert len(history) == 3
+        assert history[2]["metrics"] == {"latency": {"p95_latency_ms": 200.0},
+                                         "progression_rate": {"current_level": 1.0}}
+        assert 1 <= len(collector.get_metrics_history(hours=1)) <= 2  # 1m rollups
+    finally:
+        collector.store.stop()
+
+
+def test_legacy_snapshot_tables_are_backfilled_on_first_open(tmp_path):
+    db_path = tmp_path / "metrics.db"
+    base = (time.time() // 60 - 2) * 60
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE metrics_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                schema_version TEXT NOT NULL,
+                metrics_json TEXT NOT NULL,
+                alerts_json TEXT,
+                metadata_json TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE metrics_timeseries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                metric_name TEXT NOT NULL,
+                metric_value REAL NOT NULL,
+                metric_unit TEXT,
+                tags_json TEXT,
+                created_at REAL NOT NULL
+            );
+        """)
+        for second in range(3):
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(base + second))
+            conn.execute(
+                "INSERT INTO metrics_snapshots (session_id, timestamp, schema_version, metrics_json, created_at) "
+                "VALUES ('old', ?, '1.0.0', ?, 0)",
+                (timestamp, '{"latency": {"p95_latency_ms": %d}, "state": "ok"}' % (100 * second)))
+        conn.execute("INSERT INTO metrics_snapshots (session_id, timestamp, schema_version, metrics_json, created_at) "
+                     "VALUES ('old', 'not a time', '1.0.0', '{}', 0)")
+        conn.execute("INSERT INTO metrics_timeseries (session_id, timestamp, metric_name, metric_value, created_at) "
+                     "VALUES ('old', ?, 'fps', 58.0, 0)",
+                     (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(base)),))
+
+    store = MetricsStore(db_path, dict(RETENTION))
+    store.start()
+    try:
+        assert store.flush(timeout=5.0)
+        assert store.get_metrics()["legacy_samples_migrated"] == 4
+        assert not store.query("SELECT name FROM sqlite_master WHERE name IN "
+                               "('metrics_snapshots', 'metrics_timeseries')")
+
+        tier, series = store.read_range(base, base + 2, session_id="old")
+        assert tier == "1s"
+        assert [point[3] for point in series["latency.p95_latency_ms"]] == [0.0, 100.0, 200.0]
+        assert series["fps"] == [(base, 58.0, 58.0, 58.0, 1)]
+        tier, series = store.read_range(base, base + 59, ["latency.p95_latency_ms"], max_points=1)
+        assert tier == "1m"
+        assert series["latency.p95_latency_ms"] == [(base, 0.0, 200.0, 100.0, 3)]
+    finally:
+        store.stop()
+
+    reopened = MetricsStore(db_path, dict(RETENTION))
+    assert reopened._pending == 0  # Nothing left to migrate
+    reopened.stop()
@@ -0,0 +1,119 @@
+import random
+import statistics
+from pathlib import Path
+
+import pytest
+
+# Load sketch and metrics storage modules by file path
+import sys, importlib.util
+CODE_DIR = Path(__file__).resolve().parents[3] / 'code' / 'WF-TECH' / 'WF-TECH-009'
+sys.path.insert(0, str(CODE_DIR))
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, CODE_DIR / filename)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+quantile_sketch = _load('quantile_sketch', 'quantile_sketch.py')
+wf_tech_009_metrics_storage = _load('wf_tech_009_metrics_storage', 'WF-TECH-009-metrics-storage.py')
+
+DDSketch = getattr(quantile_sketch, 'DDSketch')
+WindowedSketch = getattr(quantile_sketch, 'WindowedSketch')
+MetricsCollector = getattr(wf_tech_009_metrics_storage, 'MetricsCollector')
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(5)
+    values = [rng.lognormvariate(3.0, 1.2) for _ in range(20000)] + [0.0] * 50 + [-5.0, -1.0]
+    sketch = DDSketch(alpha=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99, 0.999):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+    assert sketch.quantile(0.0) == -5.0
+    assert sketch.quantile(1.0) == max(values)
+    assert sketch.mean == pytest.approx(statistics.mean(values))
+    assert len(sketch.positive) < 1000
+
+
+def test_merge_and_persistence_match_single_sketch():
+    rng = random.Random(9)
+    values = [rng.uniform(1, 5000) for _ in range(6000)]
+    whole, parts = DDSketch(), [DDSketch() for _ in range(3)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 3].add(value)
+
+    merged = DDSketch.from_json(parts[0].to_json())
+    for part in parts[1:]:
+        merged.merge(DDSketch.from_dict(part.to_dict()))
+    assert merged.count == whole.count
+    assert merged.quantiles((0.5, 0.95, 0.99)) == whole.quantiles((0.5, 0.95, 0.99))
+
+    with pytest.raises(ValueError):
+        merged.merge(DDSketch(alpha=0.02))
+
+
+def test_windowed_sketch_merges_recent_windows_and_pops_closed_once():
+    windows = WindowedSketch(window_seconds=10, max_windows=3)
+    for second in range(45):
+        windows.add(float(second), now=1000.0 + second)
+
+    assert windows.merged(now=1044.0).count == 25  # Oldest windows were evicted
+    recent = windows.merged(seconds=4, now=1044.0)  # Only the window starting at 1040 overlaps
+    assert (recent.min, recent.max) == (40.0, 44.0)
+
+    closed = windows.pop_closed(now=1044.0)
+    assert [start for start, _ in closed] == [1020.0, 1030.0]
+    assert windows.pop_closed(now=1044.0) == []
+    assert [start for start, _ in windows.pop_closed(now=1044.0, flush=True)] == [1040.0]
+
+    # A flushed open window is handed out again, with its later samples, once it closes
+    windows.add(49.0, now=1049.0)
+    reclosed = windows.pop_closed(now=1050.0)
+    assert [(start, sketch.count) for start, sketch in reclosed] == [(1040.0, 6)]
+    assert windows.pop_closed(now=1050.0) == []
+
+
+def test_collector_snapshot_fields_and_history(tmp_path):
+    collector = MetricsCollector(db_path=str(tmp_path / "metrics.db"))
+    latencies = [500, 800, 1200, 1500, 2000] * 40
+    for latency in latencies:
+        collector.record_latency(latency)
+    for frame_time in [16.0] * 90 + [30.0] * 10:
+        collector.record_frame_time(frame_time)
+
+    latency = collector._calculate_latency_metrics()
+    assert latency["p50_latency_ms"] == pytest.approx(1200, rel=0.01)
+    assert latency["p95_latency_ms"] == pytest.approx(2000, rel=0.01)
+    assert latency["average_latency_ms"] == pytest.approx(statistics.mean(latencies))
+    assert latency["prompt_to_response_ms"] == 2000
+    frames = collector._calculate_frame_metrics()
+    assert frames["p50_frame_time_ms"] == pytest.approx(16.0, rel=0.01)
+    assert frames["p99_frame_time_ms"] == pytest.approx(30.0, rel=0.01)
+
+    collector._persist_sketches(flush=True)
+    other = MetricsCollector(db_path=str(tmp_path / "metrics.db"))
+    for latency in latencies:
+        other.record_latency(latency * 2)
+    other._persist_sketches(flush=True)
+    other.store.flush(timeout=5.0)
+
+    assert collector.load_sketch("latency_ms", session_id=collector.session_id).count == 200
+    combined = collector.load_sketch("latency_ms")
+    assert combined.count == 400
+    assert combined.quantile(0.99) == pytest.approx(4000, rel=0.01)
+    history = collector.get_quantile_history("latency_ms")
+    assert sum(entry["count"] for entry in history) == 400
+    assert set(history[0]) == {"window_start", "count", "mean", "p50", "p95", "p99"}